@@ -0,0 +1,66 @@
+"""Add estimate cost references
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.services.cost_refs import cost_refs_for_inputs
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the rate -> open estimate reverse index and fill it."""
+
+    cost_refs = op.create_table(
+        'estimate_cost_refs',
+        sa.Column('ref_type', sa.String(20), primary_key=True),
+        sa.Column('ref_key', sa.String(100), primary_key=True),
+        sa.Column(
+            'estimate_id',
+            sa.Integer,
+            sa.ForeignKey('estimates.id', ondelete='CASCADE'),
+            primary_key=True
+        )
+    )
+    op.create_index('idx_estimate_cost_refs_estimate', 'estimate_cost_refs', ['estimate_id'])
+
+    # Backfill from open estimates (the status enum stores member names)
+    estimates = sa.table(
+        'estimates',
+        sa.column('id', sa.Integer),
+        sa.column('status', sa.String),
+        sa.column('calculation_inputs', sa.JSON),
+        sa.column('deleted_at', sa.DateTime)
+    )
+    rows = op.get_bind().execute(
+        sa.select(estimates.c.id, estimates.c.calculation_inputs).where(
+            sa.and_(
+                estimates.c.status.in_(['DRAFT', 'PENDING']),
+                estimates.c.deleted_at.is_(None)
+            )
+        )
+    )
+    refs = [
+        {"ref_type": ref_type, "ref_key": ref_key, "estimate_id": estimate_id}
+        for estimate_id, calculation_inputs in rows
+        for ref_type, ref_key in sorted(cost_refs_for_inputs(calculation_inputs))
+    ]
+    if refs:
+        op.bulk_insert(cost_refs, refs)
+
+
+def downgrade() -> None:
+    """Drop the estimate cost references."""
+
+    op.drop_index('idx_estimate_cost_refs_estimate', 'estimate_cost_refs')
+    op.drop_table('estimate_cost_refs')
@@ -0,0 +1,35 @@
+"""Add cost timeline segments
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the materialized effective-costs timeline table."""
+
+    op.create_table(
+        'cost_timeline_segments',
+        sa.Column('version', sa.Integer, primary_key=True),
+        sa.Column('segment_key', sa.String(255), primary_key=True),
+        sa.Column('segment_start', sa.Date, nullable=False),
+        sa.Column('segment_end', sa.Date, nullable=True),
+        sa.Column('payload', sa.Text, nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Drop the cost timeline table."""
+
+    op.drop_table('cost_timeline_segments')
@@ -0,0 +1,44 @@
+"""Key cost timeline segments by cost content hash
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Replace the version key with the content hash; stored segments are rebuilt on demand."""
+
+    op.drop_table('cost_timeline_segments')
+    op.create_table(
+        'cost_timeline_segments',
+        sa.Column('content_hash', sa.String(64), primary_key=True),
+        sa.Column('segment_key', sa.String(255), primary_key=True),
+        sa.Column('segment_start', sa.Date, nullable=False),
+        sa.Column('segment_end', sa.Date, nullable=True),
+        sa.Column('payload', sa.Text, nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Restore the version-keyed table."""
+
+    op.drop_table('cost_timeline_segments')
+    op.create_table(
+        'cost_timeline_segments',
+        sa.Column('version', sa.Integer, primary_key=True),
+        sa.Column('segment_key', sa.String(255), primary_key=True),
+        sa.Column('segment_start', sa.Date, nullable=False),
+        sa.Column('segment_end', sa.Date, nullable=True),
+        sa.Column('payload', sa.Text, nullable=False)
+    )
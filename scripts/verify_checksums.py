@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Re-verify calculation checksums of all stored estimates.
+
+Streams the estimates table, recomputes each checksum in a worker pool and
+writes mismatches as JSON lines. Progress is checkpointed so an
+interrupted run resumes where it stopped.
+
+Usage:
+    python scripts/verify_checksums.py --checkpoint verify.json --mismatches mismatches.jsonl
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.db.session import async_session_maker, close_db
+from src.services.checksum_verifier import ChecksumVerifier, VerificationReport
+
+
+def print_progress(report: VerificationReport) -> None:
+    """Print a single progress line."""
+    print(
+        f"\r{report.verified:,} rows verified, {report.mismatches:,} mismatches, "
+        f"{report.rows_per_second:,.0f} rows/sec (last id {report.last_id})",
+        end="",
+        flush=True
+    )
+
+
+async def main(args: argparse.Namespace) -> int:
+    async with async_session_maker() as db:
+        verifier = ChecksumVerifier(
+            db,
+            checkpoint_path=args.checkpoint,
+            mismatch_path=args.mismatches,
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+            progress_callback=print_progress
+        )
+        report = await verifier.run(resume=not args.restart)
+
+    await close_db()
+
+    print()
+    print(f"Verified {report.verified:,} estimates in {report.elapsed_seconds:.1f}s "
+          f"({report.rows_per_second:,.0f} rows/sec)")
+    if report.resumed_from:
+        print(f"Resumed after estimate id {report.resumed_from}")
+
+    if report.mismatches:
+        print(f"❌ {report.mismatches:,} checksum mismatches written to {args.mismatches}")
+        return 1
+
+    print("✅ All checksums match")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--checkpoint", type=Path, default=Path("checksum_checkpoint.json"),
+                        help="Checkpoint file used to resume (default: %(default)s)")
+    parser.add_argument("--mismatches", type=Path, default=Path("checksum_mismatches.jsonl"),
+                        help="JSON lines file for mismatches (default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="Rows per streamed batch (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the checkpoint and verify from the first estimate")
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
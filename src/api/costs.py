@@ -2,14 +2,19 @@
 Cost management API endpoints.
 """
 from typing import List, Optional, Any
+from dataclasses import replace
 from datetime import date
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Path, Request, Response
+)
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func, desc
 from sqlalchemy.exc import IntegrityError
 
 from src.api.deps import get_db, get_current_active_user, require_role
+from src.core.etag import conditional_response, etag_matches, make_etag, not_modified
 from src.models.user import User, UserRole
 from src.models.costs import (
     LaborRate, EquipmentCost, OverheadSettings,
@@ -22,17 +27,62 @@ from src.schemas.costs import (
     VehicleRateCreate, VehicleRateUpdate, VehicleRateResponse,
     DisposalFeeCreate, DisposalFeeUpdate, DisposalFeeResponse,
     SeasonalAdjustmentCreate, SeasonalAdjustmentUpdate, SeasonalAdjustmentResponse,
-    EffectiveCostsResponse
+    EffectiveCostsResponse, CostImpactPreviewRequest
 )
 from src.services.audit import audit_service
+from src.services.calculation import (
+    CalculationService, get_cost_snapshots, refresh_quick_quote_rates
+)
+from src.services.cost_index import CostIndex, get_cost_index
+from src.services.cost_refs import find_affected_estimates
+from src.services.cost_timeline import get_cost_timeline
+from src.services.repricing import (
+    RepricingJob, run_repricing_job, get_repricing_report, price_rows
+)
 
 router = APIRouter()
 
 
+def _schedule_repricing(
+    background_tasks: BackgroundTasks,
+    current_user: User,
+    reason: str,
+    effective_from: date
+) -> None:
+    """
+    Queue a re-pricing job and a quick-quote rate refresh if the written
+    cost row is already in effect. Rows starting later are re-priced by the
+    daily check once their effective_from arrives (see repricing_scheduler).
+    """
+    if effective_from > date.today():
+        return
+    background_tasks.add_task(refresh_quick_quote_rates)
+    job = RepricingJob(user_id=str(current_user.id), reason=reason)
+    background_tasks.add_task(run_repricing_job, job)
+
+
+async def _record_cost_write(row: Any) -> None:
+    """Invalidate cost snapshots and update the cost index after a committed write."""
+    version = await get_cost_snapshots().invalidate(row.__tablename__)
+    get_cost_index().record_write(row, version)
+
+
+async def _cost_etag(db: AsyncSession, table_name: str, *parts: Any) -> str:
+    """
+    ETag of a cost table read, from the table's version counter and a hash
+    of its rows. The counter starts over if the shared cache is reset; the
+    hash keeps ETags issued before that from matching different rows.
+    """
+    version = await get_cost_snapshots().table_version(table_name)
+    cost_index = await get_cost_index().ensure_current(db)
+    return make_etag(table_name, version, cost_index.table_hash(table_name), *parts)
+
+
 # Labor Rate Endpoints
 @router.post("/labor-rates", response_model=LaborRateResponse)
 async def create_labor_rate(
     rate_data: LaborRateCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
@@ -41,34 +91,16 @@ async def create_labor_rate(
     
     - Requires Manager or Admin role
     - Validates no overlapping effective dates
+    - Re-prices open estimates in the background when the rate is in effect
     """
     # Check for overlapping dates
-    overlap_query = select(LaborRate).where(
-        and_(
-            LaborRate.role == rate_data.role,
-            LaborRate.deleted_at.is_(None),
-            or_(
-                and_(
-                    LaborRate.effective_from <= rate_data.effective_from,
-                    or_(
-                        LaborRate.effective_to.is_(None),
-                        LaborRate.effective_to >= rate_data.effective_from
-                    )
-                ),
-                and_(
-                    rate_data.effective_to.is_not(None),
-                    LaborRate.effective_from <= rate_data.effective_to,
-                    or_(
-                        LaborRate.effective_to.is_(None),
-                        LaborRate.effective_to >= rate_data.effective_to
-                    )
-                )
-            )
-        )
-    )
-    
-    result = await db.execute(overlap_query)
-    if result.scalar_one_or_none():
+    cost_index = await get_cost_index().ensure_current(db)
+    if cost_index.overlaps(
+        LaborRate.__tablename__,
+        rate_data.effective_from,
+        rate_data.effective_to,
+        lambda existing: existing.role == rate_data.role
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Labor rate dates overlap with existing rate for this role"
@@ -89,6 +121,7 @@ async def create_labor_rate(
     db.add(labor_rate)
     await db.commit()
     await db.refresh(labor_rate)
+    await _record_cost_write(labor_rate)
     
     # Create audit log
     await audit_service.log_action(
@@ -104,11 +137,18 @@ async def create_labor_rate(
         }
     )
     
+    _schedule_repricing(
+        background_tasks, current_user,
+        f"labor_rate:{labor_rate.id}", labor_rate.effective_from
+    )
+    
     return LaborRateResponse.model_validate(labor_rate)
 
 
 @router.get("/labor-rates", response_model=List[LaborRateResponse])
 async def list_labor_rates(
+    request: Request,
+    response: Response,
     role: Optional[str] = None,
     effective_date: Optional[date] = Query(None, description="Get rates effective on this date"),
     include_inactive: bool = Query(False, description="Include inactive rates"),
@@ -118,6 +158,13 @@ async def list_labor_rates(
     """
     List labor rates with optional filtering.
     """
+    etag = await _cost_etag(
+        db, LaborRate.__tablename__, role, effective_date, include_inactive, date.today()
+    )
+    unchanged = conditional_response(request, response, etag)
+    if unchanged:
+        return unchanged
+    
     query = select(LaborRate).where(LaborRate.deleted_at.is_(None))
     
     if role:
@@ -157,10 +204,17 @@ async def list_labor_rates(
 @router.get("/labor-rates/{rate_id}", response_model=LaborRateResponse)
 async def get_labor_rate(
     rate_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get a specific labor rate by ID."""
+    etag = await _cost_etag(db, LaborRate.__tablename__, rate_id)
+    unchanged = conditional_response(request, response, etag)
+    if unchanged:
+        return unchanged
+    
     query = select(LaborRate).where(
         and_(
             LaborRate.id == rate_id,
@@ -183,6 +237,7 @@ async def get_labor_rate(
 async def update_labor_rate(
     rate_id: int,
     rate_update: LaborRateUpdate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
@@ -191,6 +246,7 @@ async def update_labor_rate(
     
     - Can only update rates that haven't started yet
     - Validates no overlapping dates
+    - Re-prices open estimates in the background when the rate is in effect
     """
     # Get labor rate
     query = select(LaborRate).where(
@@ -223,33 +279,13 @@ async def update_labor_rate(
         new_from = update_data.get('effective_from', rate.effective_from)
         new_to = update_data.get('effective_to', rate.effective_to)
         
-        overlap_query = select(LaborRate).where(
-            and_(
-                LaborRate.id != rate_id,
-                LaborRate.role == rate.role,
-                LaborRate.deleted_at.is_(None),
-                or_(
-                    and_(
-                        LaborRate.effective_from <= new_from,
-                        or_(
-                            LaborRate.effective_to.is_(None),
-                            LaborRate.effective_to >= new_from
-                        )
-                    ),
-                    and_(
-                        new_to is not None,
-                        LaborRate.effective_from <= new_to,
-                        or_(
-                            LaborRate.effective_to.is_(None),
-                            LaborRate.effective_to >= new_to
-                        )
-                    )
-                )
-            )
-        )
-        
-        result = await db.execute(overlap_query)
-        if result.scalar_one_or_none():
+        cost_index = await get_cost_index().ensure_current(db)
+        if cost_index.overlaps(
+            LaborRate.__tablename__,
+            new_from,
+            new_to,
+            lambda existing: existing.id != rate_id and existing.role == rate.role
+        ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Updated dates would overlap with existing rate"
@@ -264,6 +300,7 @@ async def update_labor_rate(
     
     await db.commit()
     await db.refresh(rate)
+    await _record_cost_write(rate)
     
     # Create audit log
     await audit_service.log_action(
@@ -278,6 +315,11 @@ async def update_labor_rate(
         }
     )
     
+    _schedule_repricing(
+        background_tasks, current_user,
+        f"labor_rate:{rate.id}", rate.effective_from
+    )
+    
     return LaborRateResponse.model_validate(rate)
 
 
@@ -310,6 +352,7 @@ async def create_equipment_cost(
     db.add(equipment)
     await db.commit()
     await db.refresh(equipment)
+    await _record_cost_write(equipment)
     
     # Create audit log
     await audit_service.log_action(
@@ -330,12 +373,19 @@ async def create_equipment_cost(
 
 @router.get("/equipment-costs", response_model=List[EquipmentCostResponse])
 async def list_equipment_costs(
+    request: Request,
+    response: Response,
     type: Optional[str] = None,
     available_only: bool = Query(True, description="Show only available equipment"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """List equipment costs with optional filtering."""
+    etag = await _cost_etag(db, EquipmentCost.__tablename__, type, available_only)
+    unchanged = conditional_response(request, response, etag)
+    if unchanged:
+        return unchanged
+    
     query = select(EquipmentCost).where(EquipmentCost.deleted_at.is_(None))
     
     if type:
@@ -356,6 +406,7 @@ async def list_equipment_costs(
 @router.post("/overhead-settings", response_model=OverheadSettingsResponse)
 async def create_overhead_settings(
     settings_data: OverheadSettingsCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
@@ -364,33 +415,15 @@ async def create_overhead_settings(
     
     - Requires Admin role
     - Validates no overlapping effective dates
+    - Re-prices open estimates in the background when the settings are in effect
     """
     # Check for overlapping dates
-    overlap_query = select(OverheadSettings).where(
-        and_(
-            OverheadSettings.deleted_at.is_(None),
-            or_(
-                and_(
-                    OverheadSettings.effective_from <= settings_data.effective_from,
-                    or_(
-                        OverheadSettings.effective_to.is_(None),
-                        OverheadSettings.effective_to >= settings_data.effective_from
-                    )
-                ),
-                and_(
-                    settings_data.effective_to.is_not(None),
-                    OverheadSettings.effective_from <= settings_data.effective_to,
-                    or_(
-                        OverheadSettings.effective_to.is_(None),
-                        OverheadSettings.effective_to >= settings_data.effective_to
-                    )
-                )
-            )
-        )
-    )
-    
-    result = await db.execute(overlap_query)
-    if result.scalar_one_or_none():
+    cost_index = await get_cost_index().ensure_current(db)
+    if cost_index.overlaps(
+        OverheadSettings.__tablename__,
+        settings_data.effective_from,
+        settings_data.effective_to
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Overhead settings dates overlap with existing settings"
@@ -413,6 +446,7 @@ async def create_overhead_settings(
     db.add(overhead)
     await db.commit()
     await db.refresh(overhead)
+    await _record_cost_write(overhead)
     
     # Create audit log
     await audit_service.log_action(
@@ -427,16 +461,28 @@ async def create_overhead_settings(
         }
     )
     
+    _schedule_repricing(
+        background_tasks, current_user,
+        f"overhead_settings:{overhead.id}", overhead.effective_from
+    )
+    
     return OverheadSettingsResponse.model_validate(overhead)
 
 
 @router.get("/overhead-settings/current", response_model=OverheadSettingsResponse)
 async def get_current_overhead_settings(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get current overhead settings."""
     today = date.today()
+    etag = await _cost_etag(db, OverheadSettings.__tablename__, today)
+    unchanged = conditional_response(request, response, etag)
+    if unchanged:
+        return unchanged
+    
     query = select(OverheadSettings).where(
         and_(
             OverheadSettings.deleted_at.is_(None),
@@ -489,6 +535,7 @@ async def create_seasonal_adjustment(
     db.add(adjustment)
     await db.commit()
     await db.refresh(adjustment)
+    await _record_cost_write(adjustment)
     
     # Create audit log
     await audit_service.log_action(
@@ -509,11 +556,36 @@ async def create_seasonal_adjustment(
 
 @router.get("/seasonal-adjustments", response_model=List[SeasonalAdjustmentResponse])
 async def list_seasonal_adjustments(
+    request: Request,
+    response: Response,
     active_only: bool = Query(True, description="Show only active adjustments"),
+    from_date: Optional[date] = Query(None, description="Only active adjustments in effect from this date"),
+    to_date: Optional[date] = Query(None, description="... through this date (default: from_date)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    """List seasonal adjustments."""
+    """
+    List seasonal adjustments.
+    
+    With from_date (and optionally to_date), lists the active adjustments
+    in effect on any day of that range, in the order they take effect.
+    """
+    etag = await _cost_etag(db, SeasonalAdjustment.__tablename__, active_only, from_date, to_date)
+    unchanged = conditional_response(request, response, etag)
+    if unchanged:
+        return unchanged
+    
+    if from_date is not None:
+        to_date = to_date or from_date
+        if to_date < from_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="to_date must not be before from_date"
+            )
+        cost_index = await get_cost_index().ensure_current(db)
+        adjustments = cost_index.seasonal_calendar.between(from_date, to_date)
+        return [SeasonalAdjustmentResponse.model_validate(adj) for adj in adjustments]
+    
     query = select(SeasonalAdjustment).where(SeasonalAdjustment.deleted_at.is_(None))
     
     if active_only:
@@ -528,8 +600,48 @@ async def list_seasonal_adjustments(
 
 
 # Effective Costs Endpoint
+def _render_effective_costs(cost_index: CostIndex, effective_date: date) -> bytes:
+    """Effective-costs payload for a date, without the effective_date field."""
+    # Get labor rates
+    labor_rates = cost_index.as_of(LaborRate.__tablename__, effective_date)
+    
+    # Get equipment costs (always current)
+    equipment_costs = [
+        equipment for equipment in cost_index.rows(EquipmentCost.__tablename__)
+        if equipment.is_available
+    ]
+    
+    # Get overhead settings (the latest to start if several are in effect)
+    overhead_rows = cost_index.as_of(OverheadSettings.__tablename__, effective_date)
+    overhead_settings = overhead_rows[-1] if overhead_rows else None
+    
+    # Get vehicle rates
+    vehicle_rates = cost_index.as_of(VehicleRate.__tablename__, effective_date)
+    
+    # Get disposal fees (always current)
+    disposal_fees = [
+        fee for fee in cost_index.rows(DisposalFee.__tablename__)
+        if fee.is_active
+    ]
+    
+    # Get seasonal adjustments in effect on the date
+    active_adjustments = cost_index.seasonal_calendar.on(effective_date)
+    
+    response = EffectiveCostsResponse(
+        effective_date=effective_date,
+        labor_rates=[LaborRateResponse.model_validate(rate) for rate in labor_rates],
+        equipment_costs=[EquipmentCostResponse.model_validate(eq) for eq in equipment_costs],
+        overhead_settings=OverheadSettingsResponse.model_validate(overhead_settings) if overhead_settings else None,
+        vehicle_rates=[VehicleRateResponse.model_validate(rate) for rate in vehicle_rates],
+        disposal_fees=[DisposalFeeResponse.model_validate(fee) for fee in disposal_fees],
+        seasonal_adjustments=[SeasonalAdjustmentResponse.model_validate(adj) for adj in active_adjustments]
+    )
+    return response.model_dump_json(exclude={"effective_date"}).encode()
+
+
 @router.get("/effective-costs", response_model=EffectiveCostsResponse)
 async def get_effective_costs(
+    request: Request,
     effective_date: date = Query(date.today(), description="Get costs effective on this date"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -537,104 +649,168 @@ async def get_effective_costs(
     """
     Get all costs effective on a specific date.
     
-    This is useful for historical quote recreation.
+    This is useful for historical quote recreation. Responses are served
+    pre-serialized from the materialized cost timeline, which is rebuilt
+    only when cost data changes.
     """
-    # Get labor rates
-    labor_query = select(LaborRate).where(
-        and_(
-            LaborRate.deleted_at.is_(None),
-            LaborRate.effective_from <= effective_date,
-            or_(
-                LaborRate.effective_to.is_(None),
-                LaborRate.effective_to >= effective_date
-            )
+    # Every cost table feeds the payload, so tag it with the hash of all
+    # cost rows (version counters start over if the shared cache is reset)
+    cost_index = await get_cost_index().ensure_current(db)
+    etag = make_etag("effective_costs", cost_index.content_hash, effective_date)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
+    body = await get_cost_timeline().body(db, cost_index, _render_effective_costs, effective_date)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+# Cost Impact Endpoints
+@router.post("/impact-preview")
+async def preview_cost_impact(
+    preview: CostImpactPreviewRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Preview how proposed rates would change open estimates.
+    
+    - Requires Admin or Manager role
+    - Finds the draft and pending estimates using the changed roles and
+      equipment through the cost reference index
+    - Prices each with current and proposed rates in a worker thread;
+      nothing is saved
+    - Estimates that only price with current rates (their equipment is
+      taken out of service) are listed as blocked
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to preview cost changes"
         )
-    )
-    labor_result = await db.execute(labor_query)
-    labor_rates = labor_result.scalars().all()
     
-    # Get equipment costs (always current)
-    equipment_query = select(EquipmentCost).where(
-        and_(
-            EquipmentCost.deleted_at.is_(None),
-            EquipmentCost.available == True
+    if not preview.labor_rates and not preview.equipment_costs:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one proposed labor rate or equipment cost is required"
         )
+    
+    effective_date = preview.effective_date or date.today()
+    snapshot = await CalculationService(db).get_cost_snapshot(effective_date)
+    current_rates = snapshot.to_rates()
+    equipment_costs = dict(current_rates.equipment_costs)
+    for cost in preview.equipment_costs:
+        if cost.out_of_service:
+            # Priced like unavailable equipment: estimates using it fail
+            equipment_costs.pop(cost.equipment_id, None)
+        else:
+            equipment_costs[cost.equipment_id] = cost.hourly_cost
+    proposed_rates = replace(
+        current_rates,
+        labor_rates={
+            **current_rates.labor_rates,
+            **{rate.role: rate.hourly_rate for rate in preview.labor_rates}
+        },
+        equipment_costs=equipment_costs
     )
-    equipment_result = await db.execute(equipment_query)
-    equipment_costs = equipment_result.scalars().all()
     
-    # Get overhead settings
-    overhead_query = select(OverheadSettings).where(
-        and_(
-            OverheadSettings.deleted_at.is_(None),
-            OverheadSettings.effective_from <= effective_date,
-            or_(
-                OverheadSettings.effective_to.is_(None),
-                OverheadSettings.effective_to >= effective_date
-            )
-        )
+    affected = await find_affected_estimates(
+        db,
+        roles=[rate.role for rate in preview.labor_rates],
+        equipment_ids=[cost.equipment_id for cost in preview.equipment_costs]
     )
-    overhead_result = await db.execute(overhead_query)
-    overhead_settings = overhead_result.scalar_one_or_none()
+    rows = [(row.id, row.calculation_inputs) for row in affected]
+    # Pricing is CPU-bound: keep it off the event loop
+    current = await run_in_threadpool(price_rows, rows, current_rates)
+    proposed = await run_in_threadpool(price_rows, rows, proposed_rates)
+    
+    estimates = []
+    blocked = []
+    failures = []
+    total_delta = Decimal("0.00")
+    for row in affected:
+        current_payload, current_error = current[row.id]
+        proposed_payload, proposed_error = proposed[row.id]
+        if current_error:
+            failures.append({"estimate_id": row.id, "error": current_error})
+            continue
+        
+        current_total = Decimal(current_payload["result"]["final_total"])
+        if proposed_error:
+            blocked.append({
+                "estimate_id": row.id,
+                "estimate_number": row.estimate_number,
+                "stored_total": str(row.final_total),
+                "current_total": str(current_total),
+                "error": proposed_error
+            })
+            continue
+        
+        proposed_total = Decimal(proposed_payload["result"]["final_total"])
+        delta = proposed_total - current_total
+        total_delta += delta
+        estimates.append({
+            "estimate_id": row.id,
+            "estimate_number": row.estimate_number,
+            "stored_total": str(row.final_total),
+            "current_total": str(current_total),
+            "proposed_total": str(proposed_total),
+            "delta": str(delta)
+        })
+    
+    return {
+        "effective_date": effective_date.isoformat(),
+        "affected_count": len(estimates) + len(blocked),
+        "total_delta": str(total_delta),
+        "estimates": estimates,
+        "blocked_estimates": blocked,
+        "failures": failures
+    }
+
+
+# Re-pricing Endpoints
+@router.post("/reprice-estimates", status_code=status.HTTP_202_ACCEPTED)
+async def reprice_estimates(
+    background_tasks: BackgroundTasks,
+    calculation_date: Optional[date] = Query(None, description="Price with rates effective on this date"),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Re-price all draft and pending estimates with current rates.
     
-    # Get vehicle rates
-    vehicle_query = select(VehicleRate).where(
-        and_(
-            VehicleRate.deleted_at.is_(None),
-            VehicleRate.effective_from <= effective_date,
-            or_(
-                VehicleRate.effective_to.is_(None),
-                VehicleRate.effective_to >= effective_date
-            )
+    - Requires Admin role
+    - Runs in the background; poll the returned job for progress
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can re-price estimates"
         )
-    )
-    vehicle_result = await db.execute(vehicle_query)
-    vehicle_rates = vehicle_result.scalars().all()
     
-    # Get disposal fees (always current)
-    disposal_query = select(DisposalFee).where(
-        and_(
-            DisposalFee.deleted_at.is_(None),
-            DisposalFee.active == True
+    job = RepricingJob(user_id=str(current_user.id), reason="manual")
+    background_tasks.add_task(run_repricing_job, job, calculation_date)
+    
+    return job.report.to_dict()
+
+
+@router.get("/reprice-estimates/{job_id}")
+async def get_repricing_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Get progress and throughput of a re-pricing job.
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to view re-pricing jobs"
         )
-    )
-    disposal_result = await db.execute(disposal_query)
-    disposal_fees = disposal_result.scalars().all()
     
-    # Get seasonal adjustments (check if date falls within range)
-    seasonal_query = select(SeasonalAdjustment).where(
-        and_(
-            SeasonalAdjustment.deleted_at.is_(None),
-            SeasonalAdjustment.active == True
+    report = get_repricing_report(job_id)
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Re-pricing job not found"
         )
-    )
-    seasonal_result = await db.execute(seasonal_query)
-    all_adjustments = seasonal_result.scalars().all()
-    
-    # Filter seasonal adjustments by date
-    active_adjustments = []
-    for adj in all_adjustments:
-        # Check if effective_date falls within the adjustment period
-        month = effective_date.month
-        day = effective_date.day
-        
-        if adj.start_month <= adj.end_month:
-            # Normal case: adjustment doesn't span year boundary
-            if (month > adj.start_month or (month == adj.start_month and day >= adj.start_day)) and \
-               (month < adj.end_month or (month == adj.end_month and day <= adj.end_day)):
-                active_adjustments.append(adj)
-        else:
-            # Adjustment spans year boundary (e.g., Dec to Feb)
-            if (month > adj.start_month or (month == adj.start_month and day >= adj.start_day)) or \
-               (month < adj.end_month or (month == adj.end_month and day <= adj.end_day)):
-                active_adjustments.append(adj)
     
-    return EffectiveCostsResponse(
-        effective_date=effective_date,
-        labor_rates=[LaborRateResponse.model_validate(rate) for rate in labor_rates],
-        equipment_costs=[EquipmentCostResponse.model_validate(eq) for eq in equipment_costs],
-        overhead_settings=OverheadSettingsResponse.model_validate(overhead_settings) if overhead_settings else None,
-        vehicle_rates=[VehicleRateResponse.model_validate(rate) for rate in vehicle_rates],
-        disposal_fees=[DisposalFeeResponse.model_validate(fee) for fee in disposal_fees],
-        seasonal_adjustments=[SeasonalAdjustmentResponse.model_validate(adj) for adj in active_adjustments]
-    )
\ No newline at end of file
+    return report.to_dict()
@@ -1,18 +1,32 @@
 """
 Estimate API endpoints.
 """
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Type
 from datetime import date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Path, Request, Response
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func, desc
 from sqlalchemy.orm import selectinload
+from pydantic import ValidationError
 import structlog
+import json
 
 from src.api.deps import get_db, get_current_active_user, require_role
+from src.core.etag import conditional_response, make_etag
 from src.models.user import User, UserRole
 from src.models.estimate import Estimate, EstimateStatus
 from src.core.calculator import TreeServiceCalculator
+from src.core.sweep import ScenarioSweep
+from src.core.quick_quote import quick_quote
+from src.core.risk import Distribution, RiskSimulator
+from src.core.target_solver import TargetPriceSolver
+from src.schemas.calculation import (
+    ScenarioSweepInput, RiskAnalysisInput, QuickCalculationInput, TargetPriceInput,
+    BulkValidationInput, CalculationInput
+)
 from src.schemas.estimate import (
     EstimateCreate, EstimateUpdate, EstimateResponse,
     EstimateDetailResponse, EstimateListResponse,
@@ -20,12 +34,69 @@ from src.schemas.estimate import (
     EstimateFilter, EstimateDuplicate, EstimateCustomerView
 )
 from src.services.audit import audit_service
+from src.services.calculation import CalculationService, refresh_stale_quick_quote_rates
+from src.services.cost_refs import sync_estimate_cost_refs
 from src.services.external_apis import get_external_api_service, QuickBooksError
 
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Statuses visible to viewers
+VIEWER_STATUSES = [EstimateStatus.APPROVED, EstimateStatus.INVOICED]
+
+
+def _estimate_response(
+    estimate: Estimate,
+    schema: Type[EstimateResponse] = EstimateResponse
+) -> EstimateResponse:
+    """Response schema of an estimate, with its workflow flags evaluated."""
+    values = estimate.to_dict()
+    values.update(
+        is_editable=estimate.is_editable(),
+        is_valid=estimate.is_valid(),
+        can_approve=estimate.can_approve(),
+        can_invoice=estimate.can_invoice()
+    )
+    return schema.model_validate(values)
+
+
+def _estimate_etag(representation: str, estimate: Any) -> str:
+    """
+    ETag of one estimate from its version columns.
+    
+    Today's date is included because validity flags depend on it.
+    """
+    return make_etag(
+        representation,
+        estimate.id,
+        estimate.updated_at,
+        estimate.calculation_checksum,
+        estimate.status,
+        date.today()
+    )
+
+
+def _estimate_list_etag(total: int, page: int, page_size: int, estimates: List[Any]) -> str:
+    """ETag of a page of estimates from the page's version columns."""
+    return make_etag(
+        "estimate_list",
+        total,
+        page,
+        page_size,
+        date.today(),
+        *((estimate.id, estimate.updated_at, estimate.calculation_checksum, estimate.status)
+          for estimate in estimates)
+    )
+
+
+async def _estimate_versions(db: AsyncSession, query: Any) -> List[Any]:
+    """Run an estimates query for only the columns the ETags use."""
+    result = await db.execute(query.with_only_columns(
+        Estimate.id, Estimate.updated_at, Estimate.calculation_checksum, Estimate.status
+    ))
+    return result.all()
+
 
 @router.post("/", response_model=EstimateResponse)
 async def create_estimate(
@@ -47,10 +118,11 @@ async def create_estimate(
             detail="Insufficient permissions to create estimates"
         )
     
-    # Perform calculation
-    calculator = TreeServiceCalculator()
+    # Perform calculation with today's cost rates
     try:
-        calculation_result = calculator.calculate_estimate(estimate_data.calculation_input)
+        calculation_result = await CalculationService(db).calculate_estimate(
+            estimate_data.calculation_input
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -78,9 +150,9 @@ async def create_estimate(
         scheduled_date=estimate_data.scheduled_date,
         internal_notes=estimate_data.internal_notes,
         customer_notes=estimate_data.customer_notes,
-        calculation_inputs=estimate_data.calculation_input.model_dump(),
+        calculation_inputs=estimate_data.calculation_input.model_dump(mode="json"),
         calculation_id=calculation_result.calculation_id,
-        calculation_result=calculation_result.model_dump(),
+        calculation_result=calculation_result.model_dump(mode="json"),
         calculation_checksum=calculation_result.checksum,
         travel_cost=calculation_result.travel_cost,
         labor_cost=calculation_result.labor_cost,
@@ -99,6 +171,8 @@ async def create_estimate(
     )
     
     db.add(estimate)
+    await db.flush()
+    await sync_estimate_cost_refs(db, estimate.id, estimate.calculation_inputs, estimate.status)
     await db.commit()
     await db.refresh(estimate)
     
@@ -117,17 +191,246 @@ async def create_estimate(
     )
     
     # Convert to response
-    response = EstimateResponse.model_validate(estimate)
-    response.is_editable = estimate.is_editable()
-    response.is_valid = estimate.is_valid()
-    response.can_approve = estimate.can_approve()
-    response.can_invoice = estimate.can_invoice()
+    response = _estimate_response(estimate)
     
     return response
 
 
+@router.post("/sweep")
+async def sweep_scenarios(
+    sweep_input: ScenarioSweepInput,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Price a scenario over a grid of hours, crew size and margin values.
+    
+    - Requires authenticated user
+    - Prices the base scenario's roles and equipment with today's cost rates
+    - Streams newline-delimited JSON: a header line describing the axes,
+      then one line per row of the last axis with final totals in dollars
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER, UserRole.ESTIMATOR]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to run scenario sweeps"
+        )
+    
+    try:
+        axes = [(axis.parameter, axis.expand()) for axis in sweep_input.axes]
+        sweep = ScenarioSweep(
+            await CalculationService(db).calculation_kwargs(sweep_input.base_scenario)
+        )
+        result = sweep.run(axes)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Sweep error: {str(e)}"
+        )
+    
+    logger.info(
+        "Scenario sweep priced",
+        user_id=str(current_user.id),
+        shape=list(result.shape)
+    )
+    
+    def stream_rows():
+        yield json.dumps(result.header()) + "\n"
+        for index, totals in result.iter_rows():
+            yield json.dumps({"index": index, "final_totals": totals}) + "\n"
+    
+    return StreamingResponse(stream_rows(), media_type="application/x-ndjson")
+
+
+@router.post("/price-range")
+async def estimate_price_range(
+    risk_input: RiskAnalysisInput,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Estimate a price range for a scenario with uncertain inputs.
+    
+    - Requires authenticated user
+    - Prices the base scenario's roles and equipment with today's cost rates
+    - Samples hours, travel minutes and disposal volume (Monte Carlo)
+    - Returns P10/P50/P90 totals and a suggested safety buffer percent
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER, UserRole.ESTIMATOR]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to run price range analysis"
+        )
+    
+    def to_distribution(schema) -> Distribution:
+        return Distribution(schema.kind, float(schema.low), float(schema.mode), float(schema.high))
+    
+    try:
+        simulator = RiskSimulator(
+            await CalculationService(db).calculation_kwargs(risk_input.base_scenario)
+        )
+        price_range = simulator.run(
+            hours=to_distribution(risk_input.estimated_hours),
+            travel_minutes=(
+                to_distribution(risk_input.travel_minutes) if risk_input.travel_minutes else None
+            ),
+            disposal_volume=(
+                to_distribution(risk_input.disposal_volume) if risk_input.disposal_volume else None
+            ),
+            disposal_fee_per_unit=risk_input.disposal_fee_per_unit,
+            samples=risk_input.samples,
+            target_percentile=risk_input.target_percentile,
+            seed=risk_input.seed
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Price range error: {str(e)}"
+        )
+    
+    return price_range.to_dict()
+
+
+@router.post("/solve-target")
+async def solve_target_price(
+    target_input: TargetPriceInput,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Find configurations of a scenario that price nearest a target total.
+    
+    - Requires authenticated user
+    - Prices the base scenario's roles and equipment with today's cost rates
+    - Searches the allowed variables (profit percent, crew size, hours) in one sweep
+    - Returns the nearest configurations, preferring the smallest changes
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER, UserRole.ESTIMATOR]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to solve target prices"
+        )
+    
+    try:
+        solver = TargetPriceSolver(
+            await CalculationService(db).calculation_kwargs(target_input.base_scenario)
+        )
+        solutions = solver.solve(
+            target_input.target_total,
+            [
+                (variable.parameter, variable.low, variable.high, variable.step)
+                for variable in target_input.variables
+            ],
+            max_results=target_input.max_results
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Solver error: {str(e)}"
+        )
+    
+    return {
+        "target_total": str(target_input.target_total),
+        "solutions": [solution.to_dict() for solution in solutions]
+    }
+
+
+@router.post("/quick-quote")
+async def create_quick_quote(
+    quote_input: QuickCalculationInput,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Price a ballpark quote from averaged rates.
+    
+    - Requires authenticated user
+    - Uses the in-process rate snapshot; no database access
+    - Returns component totals and the final total, not a full breakdown
+    - Reloads the snapshot after responding if cost data has changed
+    """
+    try:
+        quote = quick_quote(
+            travel_miles=quote_input.travel_miles,
+            estimated_hours=quote_input.estimated_hours,
+            crew_size=quote_input.crew_size,
+            average_hourly_rate=quote_input.average_hourly_rate,
+            equipment_count=quote_input.equipment_count,
+            average_equipment_rate=quote_input.average_equipment_rate
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Quick quote error: {str(e)}"
+        )
+    
+    background_tasks.add_task(refresh_stale_quick_quote_rates)
+    return quote.to_dict()
+
+
+@router.post("/validate-batch")
+async def validate_calculation_inputs_batch(
+    validation_input: BulkValidationInput,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Validate many calculation inputs at once (CSV imports, offline sync).
+    
+    - Requires authenticated user
+    - Checks every input against one cost snapshot for the effective date
+    - Returns per-item errors; schema errors are reported for the item, not the request
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER, UserRole.ESTIMATOR]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to validate calculation inputs"
+        )
+    
+    errors: List[List[str]] = [[] for _ in validation_input.inputs]
+    parsed = []
+    for index, raw_input in enumerate(validation_input.inputs):
+        try:
+            parsed.append((index, CalculationInput.model_validate(raw_input)))
+        except ValidationError as e:
+            errors[index] = [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            ]
+    
+    service = CalculationService(db)
+    effective_date = validation_input.effective_date or date.today()
+    rule_errors = await service.validate_calculation_inputs_batch(
+        [calculation_input for _, calculation_input in parsed],
+        effective_date
+    )
+    for (index, _), item_errors in zip(parsed, rule_errors):
+        errors[index] = item_errors
+    
+    invalid_count = sum(1 for item_errors in errors if item_errors)
+    logger.info(
+        "Calculation inputs validated",
+        user_id=str(current_user.id),
+        count=len(errors),
+        invalid=invalid_count,
+        effective_date=effective_date.isoformat()
+    )
+    
+    return {
+        "effective_date": effective_date.isoformat(),
+        "valid_count": len(errors) - invalid_count,
+        "invalid_count": invalid_count,
+        "results": [
+            {"index": index, "valid": not item_errors, "errors": item_errors}
+            for index, item_errors in enumerate(errors)
+        ]
+    }
+
+
 @router.get("/", response_model=EstimateListResponse)
 async def list_estimates(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status: Optional[EstimateStatus] = None,
@@ -144,18 +447,13 @@ async def list_estimates(
     
     - Viewers can only see approved/invoiced estimates
     - Other roles can see all estimates
+    - Supports conditional GET with If-None-Match
     """
-    # Build query with eager loading to prevent N+1 queries
-    query = select(Estimate).options(
-        selectinload(Estimate.created_by_user),
-        selectinload(Estimate.approved_by_user)
-    ).where(Estimate.deleted_at.is_(None))
+    query = select(Estimate).where(Estimate.deleted_at.is_(None))
     
     # Apply role-based filtering
     if current_user.role == UserRole.VIEWER:
-        query = query.where(
-            Estimate.status.in_([EstimateStatus.APPROVED, EstimateStatus.INVOICED])
-        )
+        query = query.where(Estimate.status.in_(VIEWER_STATUSES))
     
     # Apply filters
     if status:
@@ -206,19 +504,23 @@ async def list_estimates(
     query = query.order_by(desc(Estimate.created_at))
     query = query.offset((page - 1) * page_size).limit(page_size)
     
-    # Execute query
-    result = await db.execute(query)
+    # Answer conditional requests from the page's version columns alone
+    if request.headers.get("if-none-match"):
+        etag = _estimate_list_etag(total, page, page_size, await _estimate_versions(db, query))
+        unchanged = conditional_response(request, response, etag)
+        if unchanged:
+            return unchanged
+    
+    # Execute query with eager loading to prevent N+1 queries
+    result = await db.execute(query.options(selectinload(Estimate.approved_by_user)))
     estimates = result.scalars().all()
+    response.headers["ETag"] = _estimate_list_etag(total, page, page_size, estimates)
     
     # Convert to responses
     estimate_responses = []
     for estimate in estimates:
-        response = EstimateResponse.model_validate(estimate)
-        response.is_editable = estimate.is_editable()
-        response.is_valid = estimate.is_valid()
-        response.can_approve = estimate.can_approve()
-        response.can_invoice = estimate.can_invoice()
-        estimate_responses.append(response)
+        estimate_response = _estimate_response(estimate)
+        estimate_responses.append(estimate_response)
     
     return EstimateListResponse(
         estimates=estimate_responses,
@@ -230,6 +532,8 @@ async def list_estimates(
 
 @router.get("/{estimate_id}", response_model=EstimateDetailResponse)
 async def get_estimate(
+    request: Request,
+    response: Response,
     estimate_id: int = Path(..., title="The ID of the estimate to get"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -238,14 +542,27 @@ async def get_estimate(
     Get detailed estimate by ID.
     
     - Viewers can only see approved/invoiced estimates
+    - Supports conditional GET with If-None-Match
     """
-    # Get estimate
     query = select(Estimate).where(
         and_(
             Estimate.id == estimate_id,
             Estimate.deleted_at.is_(None)
         )
     )
+    
+    # Answer conditional requests from the version columns alone
+    if request.headers.get("if-none-match"):
+        versions = await _estimate_versions(db, query)
+        if versions and (
+            current_user.role != UserRole.VIEWER or versions[0].status in VIEWER_STATUSES
+        ):
+            etag = _estimate_etag("estimate_detail", versions[0])
+            unchanged = conditional_response(request, response, etag)
+            if unchanged:
+                return unchanged
+    
+    # Get estimate
     result = await db.execute(query)
     estimate = result.scalar_one_or_none()
     
@@ -257,24 +574,24 @@ async def get_estimate(
     
     # Check permissions
     if current_user.role == UserRole.VIEWER:
-        if estimate.status not in [EstimateStatus.APPROVED, EstimateStatus.INVOICED]:
+        if estimate.status not in VIEWER_STATUSES:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to view this estimate"
             )
     
+    response.headers["ETag"] = _estimate_etag("estimate_detail", estimate)
+    
     # Convert to detailed response
-    response = EstimateDetailResponse.model_validate(estimate)
-    response.is_editable = estimate.is_editable()
-    response.is_valid = estimate.is_valid()
-    response.can_approve = estimate.can_approve()
-    response.can_invoice = estimate.can_invoice()
+    detail = _estimate_response(estimate, EstimateDetailResponse)
     
-    return response
+    return detail
 
 
 @router.get("/{estimate_id}/customer-view", response_model=EstimateCustomerView)
 async def get_estimate_customer_view(
+    request: Request,
+    response: Response,
     estimate_id: int = Path(..., title="The ID of the estimate"),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
@@ -283,8 +600,8 @@ async def get_estimate_customer_view(
     
     - Only shows pending, approved, or invoiced estimates
     - Hides internal information
+    - Supports conditional GET with If-None-Match
     """
-    # Get estimate
     query = select(Estimate).where(
         and_(
             Estimate.id == estimate_id,
@@ -296,6 +613,17 @@ async def get_estimate_customer_view(
             ])
         )
     )
+    
+    # Answer conditional requests from the version columns alone
+    if request.headers.get("if-none-match"):
+        versions = await _estimate_versions(db, query)
+        if versions:
+            etag = _estimate_etag("estimate_customer_view", versions[0])
+            unchanged = conditional_response(request, response, etag)
+            if unchanged:
+                return unchanged
+    
+    # Get estimate
     result = await db.execute(query)
     estimate = result.scalar_one_or_none()
     
@@ -305,6 +633,8 @@ async def get_estimate_customer_view(
             detail="Estimate not found or not available for viewing"
         )
     
+    response.headers["ETag"] = _estimate_etag("estimate_customer_view", estimate)
+    
     # Convert to customer view
     return EstimateCustomerView.model_validate(estimate.to_customer_dict())
 
@@ -361,31 +691,46 @@ async def update_estimate(
     if estimate_update.calculation_input:
         calculator = TreeServiceCalculator()
         try:
-            calculation_result = calculator.calculate_estimate(estimate_update.calculation_input)
+            snapshot = await CalculationService(db).get_cost_snapshot(date.today())
+            calculation_result, recomputed_stages = calculator.recalculate_estimate(
+                estimate_update.calculation_input,
+                snapshot,
+                previous_result=estimate.calculation_result
+            )
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Calculation error: {str(e)}"
             )
         
-        # Update calculation fields
-        estimate.calculation_inputs = estimate_update.calculation_input.model_dump()
-        estimate.calculation_id = calculation_result.calculation_id
-        estimate.calculation_result = calculation_result.model_dump()
-        estimate.calculation_checksum = calculation_result.checksum
-        estimate.travel_cost = calculation_result.travel_cost
-        estimate.labor_cost = calculation_result.labor_cost
-        estimate.equipment_cost = calculation_result.equipment_cost
-        estimate.disposal_fees = calculation_result.disposal_fees
-        estimate.permit_cost = calculation_result.permit_cost
-        estimate.direct_costs = calculation_result.direct_costs
-        estimate.overhead_amount = calculation_result.overhead_amount
-        estimate.safety_buffer_amount = calculation_result.safety_buffer_amount
-        estimate.profit_amount = calculation_result.profit_amount
-        estimate.subtotal = calculation_result.subtotal
-        estimate.final_total = calculation_result.final_total
+        estimate.calculation_inputs = estimate_update.calculation_input.model_dump(mode="json")
+        
+        if recomputed_stages:
+            # Update calculation fields
+            estimate.calculation_id = calculation_result.calculation_id
+            estimate.calculation_result = calculation_result.model_dump(mode="json")
+            estimate.calculation_checksum = calculation_result.checksum
+            
+            # Only write money columns whose value changed
+            money_columns = {
+                "travel_cost": calculation_result.travel_cost,
+                "labor_cost": calculation_result.labor_cost,
+                "equipment_cost": calculation_result.equipment_cost,
+                "disposal_fees": calculation_result.disposal_fees,
+                "permit_cost": calculation_result.permit_cost,
+                "direct_costs": calculation_result.direct_costs,
+                "overhead_amount": calculation_result.overhead_amount,
+                "safety_buffer_amount": calculation_result.safety_buffer_amount,
+                "profit_amount": calculation_result.profit_amount,
+                "subtotal": calculation_result.subtotal,
+                "final_total": calculation_result.final_total
+            }
+            for column, value in money_columns.items():
+                if getattr(estimate, column) != value:
+                    setattr(estimate, column, value)
         
         changes["recalculated"] = True
+        changes["recomputed_stages"] = recomputed_stages
         changes["new_total"] = str(calculation_result.final_total)
     
     # Update other fields
@@ -399,6 +744,9 @@ async def update_estimate(
     estimate.updated_by = str(current_user.id)
     estimate.updated_at = func.now()
     
+    if estimate_update.calculation_input:
+        await sync_estimate_cost_refs(db, estimate.id, estimate.calculation_inputs, estimate.status)
+    
     await db.commit()
     await db.refresh(estimate)
     
@@ -416,11 +764,7 @@ async def update_estimate(
     )
     
     # Convert to response
-    response = EstimateResponse.model_validate(estimate)
-    response.is_editable = estimate.is_editable()
-    response.is_valid = estimate.is_valid()
-    response.can_approve = estimate.can_approve()
-    response.can_invoice = estimate.can_invoice()
+    response = _estimate_response(estimate)
     
     return response
 
@@ -498,6 +842,8 @@ async def update_estimate_status(
     if new_status == EstimateStatus.EXPIRED:
         estimate.expire()
     
+    await sync_estimate_cost_refs(db, estimate.id, estimate.calculation_inputs, estimate.status)
+    
     await db.commit()
     await db.refresh(estimate)
     
@@ -517,11 +863,7 @@ async def update_estimate_status(
     )
     
     # Convert to response
-    response = EstimateResponse.model_validate(estimate)
-    response.is_editable = estimate.is_editable()
-    response.is_valid = estimate.is_valid()
-    response.can_approve = estimate.can_approve()
-    response.can_invoice = estimate.can_invoice()
+    response = _estimate_response(estimate)
     
     return response
 
@@ -570,6 +912,8 @@ async def approve_estimate(
     estimate.updated_by = str(current_user.id)
     estimate.updated_at = func.now()
     
+    await sync_estimate_cost_refs(db, estimate.id, estimate.calculation_inputs, estimate.status)
+    
     await db.commit()
     await db.refresh(estimate)
     
@@ -589,11 +933,7 @@ async def approve_estimate(
     )
     
     # Convert to response
-    response = EstimateResponse.model_validate(estimate)
-    response.is_editable = estimate.is_editable()
-    response.is_valid = estimate.is_valid()
-    response.can_approve = estimate.can_approve()
-    response.can_invoice = estimate.can_invoice()
+    response = _estimate_response(estimate)
     
     return response
 
@@ -639,6 +979,8 @@ async def reject_estimate(
     estimate.updated_by = str(current_user.id)
     estimate.updated_at = func.now()
     
+    await sync_estimate_cost_refs(db, estimate.id, estimate.calculation_inputs, estimate.status)
+    
     await db.commit()
     await db.refresh(estimate)
     
@@ -657,11 +999,7 @@ async def reject_estimate(
     )
     
     # Convert to response
-    response = EstimateResponse.model_validate(estimate)
-    response.is_editable = estimate.is_editable()
-    response.is_valid = estimate.is_valid()
-    response.can_approve = estimate.can_approve()
-    response.can_invoice = estimate.can_invoice()
+    response = _estimate_response(estimate)
     
     return response
 
@@ -731,14 +1069,21 @@ async def duplicate_estimate(
     
     # Handle calculation
     if duplicate_data.recalculate:
-        # Recalculate with original inputs
+        # Recalculate original inputs with today's cost rates
         calculator = TreeServiceCalculator()
         calc_input = original.calculation_inputs
-        calculation_result = calculator.calculate_estimate_from_dict(calc_input)
+        snapshot = await CalculationService(db).get_cost_snapshot(date.today())
+        try:
+            calculation_result = calculator.calculate_estimate_from_dict(calc_input, snapshot)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Calculation error: {str(e)}"
+            )
         
         new_estimate.calculation_inputs = calc_input
         new_estimate.calculation_id = calculation_result.calculation_id
-        new_estimate.calculation_result = calculation_result.model_dump()
+        new_estimate.calculation_result = calculation_result.model_dump(mode="json")
         new_estimate.calculation_checksum = calculation_result.checksum
         new_estimate.travel_cost = calculation_result.travel_cost
         new_estimate.labor_cost = calculation_result.labor_cost
@@ -770,6 +1115,10 @@ async def duplicate_estimate(
         new_estimate.final_total = original.final_total
     
     db.add(new_estimate)
+    await db.flush()
+    await sync_estimate_cost_refs(
+        db, new_estimate.id, new_estimate.calculation_inputs, new_estimate.status
+    )
     await db.commit()
     await db.refresh(new_estimate)
     
@@ -789,11 +1138,7 @@ async def duplicate_estimate(
     )
     
     # Convert to response
-    response = EstimateResponse.model_validate(new_estimate)
-    response.is_editable = new_estimate.is_editable()
-    response.is_valid = new_estimate.is_valid()
-    response.can_approve = new_estimate.can_approve()
-    response.can_invoice = new_estimate.can_invoice()
+    response = _estimate_response(new_estimate)
     
     return response
 
@@ -830,6 +1175,10 @@ async def delete_estimate(
     estimate.deleted_at = func.now()
     estimate.deleted_by = str(current_user.id)
     
+    await sync_estimate_cost_refs(
+        db, estimate.id, estimate.calculation_inputs, estimate.status, deleted=True
+    )
+    
     await db.commit()
     
     # Create audit log
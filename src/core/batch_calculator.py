@@ -0,0 +1,527 @@
+"""
+Vectorized batch pricing engine for tree service estimates.
+
+Prices many jobs in one call using NumPy arrays of integer cents.
+Every stage mirrors DeterministicCalculator exactly (same rounding points,
+same multiplier rules), so each row matches the scalar path and produces
+the same checksum.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Dict, List, Optional, Sequence, Union
+import hashlib
+import json
+
+import numpy as np
+
+from src.core.formulas import CURRENT_FORMULA_VERSION, get_formula
+
+
+FORMULA_VERSION = CURRENT_FORMULA_VERSION
+
+# Margin pipeline implemented by apply_formula_pipeline
+PIPELINE_STEPS = ("overhead", "safety_buffer", "profit")
+
+# Fixed-point scales (number of decimal places) for each input column
+MILES_PLACES = 2
+MINUTES_PLACES = 0
+HOURS_PLACES = 2
+VEHICLE_RATE_PLACES = 3
+MONEY_PLACES = 2
+PERCENT_PLACES = 2
+
+# Labor multipliers in tenths (2.5x emergency, 2.0x weekend)
+EMERGENCY_MULTIPLIER_TENTHS = 25
+WEEKEND_MULTIPLIER_TENTHS = 20
+BASE_MULTIPLIER_TENTHS = 10
+
+ArrayLike = Union[Sequence[Any], np.ndarray, Decimal, int, float, str]
+
+POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+
+def round_half_up_div(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    """
+    Divide non-negative integer arrays, rounding half up.
+
+    Args:
+        numerator: Integer array (must be non-negative)
+        denominator: Positive integer divisor
+
+    Returns:
+        Integer array of rounded quotients
+    """
+    return (numerator * 2 + denominator) // (denominator * 2)
+
+
+def round_half_even_div(numerator: np.ndarray, denominator: Union[int, np.ndarray]) -> np.ndarray:
+    """
+    Divide non-negative integer arrays, rounding half to even.
+
+    Args:
+        numerator: Integer array (must be non-negative)
+        denominator: Positive integer divisor (scalar or array)
+
+    Returns:
+        Integer array of rounded quotients
+    """
+    quotient, remainder = np.divmod(numerator, denominator)
+    twice = remainder * 2
+    round_up = (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    return quotient + round_up
+
+
+def decimal_digits(values: np.ndarray) -> np.ndarray:
+    """Number of decimal digits of non-negative integers (0 for zero)."""
+    return np.searchsorted(POWERS_OF_TEN, values, side="right")
+
+
+def round_significant(values: np.ndarray, digits: int) -> np.ndarray:
+    """Round non-negative integers to a number of significant digits, half to even."""
+    scale = POWERS_OF_TEN[np.maximum(decimal_digits(values) - digits, 0)]
+    return round_half_even_div(values, scale) * scale
+
+
+def to_fixed_point(values: ArrayLike, places: int, name: str, size: Optional[int] = None) -> np.ndarray:
+    """
+    Convert a column of decimal values to scaled int64 values.
+
+    Scalars are broadcast to ``size`` rows. Values must be non-negative and
+    exactly representable with ``places`` decimal places. Integer and float
+    columns are converted with array operations; Decimal and str values are
+    parsed exactly, one by one.
+
+    Args:
+        values: Sequence (or scalar) of Decimal, int, float or str values
+        places: Number of decimal places kept by the scaled integers
+        name: Column name used in error messages
+        size: Number of rows to broadcast a scalar to
+
+    Returns:
+        int64 array of values multiplied by 10 ** places
+
+    Raises:
+        ValueError: If a value is negative, malformed or too precise
+    """
+    if isinstance(values, (Decimal, int, float, str)):
+        if size is None:
+            raise ValueError(f"{name}: cannot broadcast a scalar without a batch size")
+        return np.full(size, to_fixed_point([values], places, name)[0], dtype=np.int64)
+
+    column = values if isinstance(values, np.ndarray) else None
+    if column is None and not any(isinstance(value, (Decimal, str)) for value in values):
+        column = np.asarray(values)
+
+    if column is None or column.dtype.kind not in "iuf":
+        scaled = _decimals_to_fixed_point(values, places, name)
+    elif column.dtype.kind == "f":
+        scaled = _floats_to_fixed_point(column, places, name)
+    else:
+        scaled = column.astype(np.int64) * POWERS_OF_TEN[places]
+
+    if scaled.ndim != 1:
+        raise ValueError(f"{name}: expected a flat column")
+    negative = np.flatnonzero(scaled < 0)
+    if len(negative):
+        i = negative[0]
+        raise ValueError(f"{name}[{i}]: {values[i]} cannot be negative")
+    if size is not None and len(scaled) != size:
+        raise ValueError(f"{name}: expected {size} rows, got {len(scaled)}")
+
+    return scaled
+
+
+def _floats_to_fixed_point(column: np.ndarray, places: int, name: str) -> np.ndarray:
+    """Scale a float column, rejecting values with more than ``places`` decimals."""
+    exact = column * POWERS_OF_TEN[places]
+    malformed = np.flatnonzero(~np.isfinite(exact))
+    if len(malformed):
+        i = malformed[0]
+        raise ValueError(f"{name}[{i}]: cannot parse {column[i]!r} as a decimal")
+    scaled = np.rint(exact)
+    # Allow the representation error of the float itself, nothing more
+    inexact = np.flatnonzero(np.abs(exact - scaled) > np.maximum(np.abs(exact), 1) * 1e-12)
+    if len(inexact):
+        i = inexact[0]
+        raise ValueError(f"{name}[{i}]: {column[i]} has more than {places} decimal places")
+    return scaled.astype(np.int64)
+
+
+def _decimals_to_fixed_point(values: Sequence[Any], places: int, name: str) -> np.ndarray:
+    """Scale a column of Decimal (or str) values exactly."""
+    scaled = np.empty(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        try:
+            decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
+            scaled_value = decimal_value.scaleb(places)
+            integral = int(scaled_value)
+        except (InvalidOperation, ValueError, OverflowError):
+            raise ValueError(f"{name}[{i}]: cannot parse {value!r} as a decimal")
+        if integral != scaled_value:
+            raise ValueError(f"{name}[{i}]: {value} has more than {places} decimal places")
+        scaled[i] = integral
+    return scaled
+
+
+def to_fixed_point_matrix(rows: Sequence[Sequence[Any]], places: int, name: str) -> np.ndarray:
+    """
+    Convert ragged per-row lists (crew rates, equipment rates) to a padded matrix.
+
+    Missing cells are zero, which contributes nothing to any sum.
+
+    Args:
+        rows: One sequence of decimal values per job
+        places: Number of decimal places kept by the scaled integers
+        name: Column name used in error messages
+
+    Returns:
+        int64 matrix of shape (len(rows), longest row)
+    """
+    width = max((len(row) for row in rows), default=0)
+    matrix = np.zeros((len(rows), max(width, 1)), dtype=np.int64)
+
+    for i, row in enumerate(rows):
+        if len(row):
+            matrix[i, :len(row)] = to_fixed_point(list(row), places, f"{name}[{i}]")
+
+    return matrix
+
+
+def format_cents(cents: int) -> str:
+    """Format integer cents the way str() renders a cent-quantized Decimal."""
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def format_whole_dollars(cents: int) -> str:
+    """Format a whole-dollar amount the way str() renders a $5-rounded Decimal."""
+    return str(cents // 100)
+
+
+class BatchEstimateResult:
+    """
+    Columnar result of a batch calculation.
+
+    Every attribute is an int64 array of cents with one entry per job.
+    """
+
+    STAGES = (
+        "mileage_cost", "time_cost", "travel_cost",
+        "labor_base_cost", "labor_cost", "equipment_cost",
+        "disposal_fees", "permit_cost",
+        "direct_costs", "overhead", "safety_buffer", "profit",
+        "subtotal", "final_total"
+    )
+
+    def __init__(self, formula_version: str = FORMULA_VERSION, **stages: np.ndarray):
+        missing = set(self.STAGES) - set(stages)
+        if missing:
+            raise ValueError(f"Missing stages: {', '.join(sorted(missing))}")
+
+        self.formula_version = formula_version
+        for stage in self.STAGES:
+            setattr(self, stage, stages[stage])
+
+    def __len__(self) -> int:
+        return len(self.final_total)
+
+    def as_decimals(self, stage: str) -> List[Decimal]:
+        """Return a stage column as Decimal dollars."""
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        return [Decimal(int(cents)).scaleb(-2) for cents in getattr(self, stage)]
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        Return one job's totals keyed like the scalar calculation result.
+
+        Money values are Decimals with the same representation the scalar
+        path produces, so they can be compared or checksummed directly.
+        """
+        def dollars(stage: str) -> Decimal:
+            return Decimal(format_cents(int(getattr(self, stage)[index])))
+
+        return {
+            "travel_cost": dollars("travel_cost"),
+            "labor_cost": dollars("labor_cost"),
+            "equipment_cost": dollars("equipment_cost"),
+            "disposal_fees": dollars("disposal_fees"),
+            "permit_cost": dollars("permit_cost"),
+            "direct_costs": dollars("direct_costs"),
+            "overhead": dollars("overhead"),
+            "safety_buffer": dollars("safety_buffer"),
+            "profit": dollars("profit"),
+            "subtotal": dollars("subtotal"),
+            "final_total": Decimal(format_whole_dollars(int(self.final_total[index]))),
+            "formula_version": self.formula_version
+        }
+
+    def checksum(self, index: int) -> str:
+        """Checksum for one row, identical to DeterministicCalculator.generate_checksum."""
+        checksum_data = {
+            "direct_costs": format_cents(int(self.direct_costs[index])),
+            "overhead": format_cents(int(self.overhead[index])),
+            "safety_buffer": format_cents(int(self.safety_buffer[index])),
+            "profit": format_cents(int(self.profit[index])),
+            "final_total": format_whole_dollars(int(self.final_total[index])),
+            "formula_version": self.formula_version
+        }
+        json_str = json.dumps(checksum_data, sort_keys=True)
+        return hashlib.sha256(json_str.encode()).hexdigest()
+
+    def checksums(self) -> List[str]:
+        """Checksums for every row."""
+        return [self.checksum(i) for i in range(len(self))]
+
+
+class BatchCalculator:
+    """
+    Columnar counterpart of DeterministicCalculator.
+
+    Stage methods take and return int64 arrays so other engines (sweeps,
+    simulations) can reuse individual stages without re-pricing a whole job.
+    """
+
+    @staticmethod
+    def travel_costs(
+        miles: np.ndarray,
+        time_minutes: np.ndarray,
+        vehicle_rate_per_mile: np.ndarray,
+        driver_hourly_rate: np.ndarray,
+        formula_version: str = FORMULA_VERSION
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate travel costs in cents.
+
+        Args:
+            miles: Miles in hundredths
+            time_minutes: Whole minutes
+            vehicle_rate_per_mile: Rate in thousandths of a dollar
+            driver_hourly_rate: Rate in cents
+            formula_version: Formula version deciding how travel time is rounded
+        """
+        # miles (1e-2) * rate (1e-3 dollars) = 1e-3 cents
+        mileage_cost = round_half_up_div(miles * vehicle_rate_per_mile, 1000)
+        time_cost = BatchCalculator.travel_time_costs(
+            time_minutes, driver_hourly_rate, get_formula(formula_version).travel_time_precision
+        )
+
+        return {
+            "mileage_cost": mileage_cost,
+            "time_cost": time_cost,
+            "total": mileage_cost + time_cost
+        }
+
+    @staticmethod
+    def travel_time_costs(
+        time_minutes: np.ndarray,
+        driver_hourly_rate: np.ndarray,
+        precision: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Calculate driver time costs in cents.
+
+        Without a precision this is minutes * rate / 60 rounded half up.
+        With one, hours are minutes / 60 rounded to ``precision`` significant
+        digits, and their cost is rounded to as many digits before rounding
+        to cents, exactly as the scalar path's decimal context does.
+
+        Args:
+            time_minutes: Whole minutes
+            driver_hourly_rate: Rate in cents
+            precision: The formula's travel_time_precision
+        """
+        if precision is None:
+            return round_half_up_div(time_minutes * driver_hourly_rate, 60)
+
+        # Decimal places of the rounded hours: floor(hours * 1000) has
+        # (exponent of the hours + 4) digits
+        places = precision + 3 - decimal_digits(time_minutes * 50 // 3)
+        scale = POWERS_OF_TEN[places]
+        hours = round_half_even_div(time_minutes * scale, 60)
+        # hours (10 ** -places) * rate (cents) = 10 ** -places cents
+        cost = round_significant(hours * driver_hourly_rate, precision)
+        return (cost * 2 + scale) // (scale * 2)
+
+    @staticmethod
+    def labor_costs(
+        hours: np.ndarray,
+        crew_hourly_total: np.ndarray,
+        multiplier_tenths: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate labor costs in cents.
+
+        Args:
+            hours: Hours in hundredths
+            crew_hourly_total: Sum of crew hourly rates in cents
+            multiplier_tenths: Labor multiplier in tenths (10 = 1.0x)
+        """
+        # hours (1e-2) * rate (cents) = 1e-2 cents; the multiplier is applied
+        # to the unrounded base exactly as the scalar path does
+        base_exact = hours * crew_hourly_total
+
+        return {
+            "base_cost": round_half_up_div(base_exact, 100),
+            "total": round_half_up_div(base_exact * multiplier_tenths, 1000)
+        }
+
+    @staticmethod
+    def equipment_costs(hours: np.ndarray, hourly_costs: np.ndarray) -> np.ndarray:
+        """
+        Calculate equipment costs in cents.
+
+        Args:
+            hours: Hours in hundredths
+            hourly_costs: Matrix of equipment hourly costs in cents (zero padded)
+        """
+        # Each item is rounded to cents before summing, like the scalar path
+        itemized = round_half_up_div(hours[:, None] * hourly_costs, 100)
+        return itemized.sum(axis=1)
+
+    @staticmethod
+    def apply_formula_pipeline(
+        direct_costs: np.ndarray,
+        overhead_percent: np.ndarray,
+        profit_percent: np.ndarray,
+        safety_buffer_percent: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Apply overhead, safety buffer, profit and $5 rounding in cents.
+
+        Args:
+            direct_costs: Direct costs in cents
+            overhead_percent: Overhead percent in hundredths (25.0% = 2500)
+            profit_percent: Profit percent in hundredths
+            safety_buffer_percent: Safety buffer percent in hundredths
+        """
+        overhead = round_half_up_div(direct_costs * overhead_percent, 10000)
+        subtotal_with_overhead = direct_costs + overhead
+
+        safety_buffer = round_half_up_div(subtotal_with_overhead * safety_buffer_percent, 10000)
+        subtotal_with_buffer = subtotal_with_overhead + safety_buffer
+
+        profit = round_half_up_div(subtotal_with_buffer * profit_percent, 10000)
+        subtotal = subtotal_with_buffer + profit
+
+        final_total = round_half_up_div(subtotal, 500) * 500
+
+        return {
+            "direct_costs": direct_costs,
+            "overhead": overhead,
+            "safety_buffer": safety_buffer,
+            "profit": profit,
+            "subtotal": subtotal,
+            "final_total": final_total
+        }
+
+    @staticmethod
+    def labor_multipliers(
+        size: int,
+        emergency_job: Optional[ArrayLike] = None,
+        weekend_work: Optional[ArrayLike] = None
+    ) -> np.ndarray:
+        """Labor multipliers in tenths; emergency takes precedence over weekend."""
+        emergency = np.zeros(size, dtype=bool) if emergency_job is None else np.broadcast_to(
+            np.asarray(emergency_job, dtype=bool), (size,)
+        )
+        weekend = np.zeros(size, dtype=bool) if weekend_work is None else np.broadcast_to(
+            np.asarray(weekend_work, dtype=bool), (size,)
+        )
+
+        return np.where(
+            emergency,
+            EMERGENCY_MULTIPLIER_TENTHS,
+            np.where(weekend, WEEKEND_MULTIPLIER_TENTHS, BASE_MULTIPLIER_TENTHS)
+        ).astype(np.int64)
+
+    @staticmethod
+    def calculate_batch(
+        travel_miles: ArrayLike,
+        travel_time_minutes: ArrayLike,
+        estimated_hours: ArrayLike,
+        crew_rates: Sequence[Sequence[Any]],
+        equipment_rates: Sequence[Sequence[Any]],
+        vehicle_rate_per_mile: ArrayLike,
+        driver_hourly_rate: ArrayLike,
+        disposal_fees: ArrayLike,
+        permit_cost: ArrayLike,
+        overhead_percent: ArrayLike,
+        profit_percent: ArrayLike,
+        safety_buffer_percent: ArrayLike,
+        emergency_job: Optional[ArrayLike] = None,
+        weekend_work: Optional[ArrayLike] = None,
+        formula_version: str = FORMULA_VERSION
+    ) -> BatchEstimateResult:
+        """
+        Price a batch of jobs with columnar inputs.
+
+        Per-job columns are sequences with one value per job; rate and margin
+        columns may also be scalars shared by the whole batch.
+
+        Args:
+            travel_miles: Distance per job
+            travel_time_minutes: Travel minutes per job
+            estimated_hours: Work hours per job
+            crew_rates: Hourly rates of each crew member, one list per job
+            equipment_rates: Hourly costs of each equipment item, one list per job
+            vehicle_rate_per_mile: Vehicle cost per mile
+            driver_hourly_rate: Driver hourly rate
+            disposal_fees: Disposal fees per job
+            permit_cost: Permit cost per job
+            overhead_percent: Overhead percentage (e.g., 25.0 for 25%)
+            profit_percent: Profit margin percentage
+            safety_buffer_percent: Safety buffer percentage
+            emergency_job: Emergency flag per job (or shared)
+            weekend_work: Weekend flag per job (or shared)
+            formula_version: Registered formula version to apply
+
+        Returns:
+            BatchEstimateResult with every stage in cents
+
+        Raises:
+            ValueError: If an input is invalid, or the formula version is
+                unknown or uses a margin pipeline the batch engine lacks
+        """
+        definition = get_formula(formula_version)
+        if (definition.steps, definition.round_to, definition.rounding) != (PIPELINE_STEPS, 5, ROUND_HALF_UP):
+            raise ValueError(f"Batch pricing does not support formula version {formula_version}")
+
+        size = len(crew_rates)
+        if len(equipment_rates) != size:
+            raise ValueError(f"equipment_rates: expected {size} rows, got {len(equipment_rates)}")
+
+        miles = to_fixed_point(travel_miles, MILES_PLACES, "travel_miles", size)
+        minutes = to_fixed_point(travel_time_minutes, MINUTES_PLACES, "travel_time_minutes", size)
+        hours = to_fixed_point(estimated_hours, HOURS_PLACES, "estimated_hours", size)
+        vehicle_rate = to_fixed_point(vehicle_rate_per_mile, VEHICLE_RATE_PLACES, "vehicle_rate_per_mile", size)
+        driver_rate = to_fixed_point(driver_hourly_rate, MONEY_PLACES, "driver_hourly_rate", size)
+        disposal = to_fixed_point(disposal_fees, MONEY_PLACES, "disposal_fees", size)
+        permits = to_fixed_point(permit_cost, MONEY_PLACES, "permit_cost", size)
+        overhead_pct = to_fixed_point(overhead_percent, PERCENT_PLACES, "overhead_percent", size)
+        profit_pct = to_fixed_point(profit_percent, PERCENT_PLACES, "profit_percent", size)
+        buffer_pct = to_fixed_point(safety_buffer_percent, PERCENT_PLACES, "safety_buffer_percent", size)
+
+        crew = to_fixed_point_matrix(crew_rates, MONEY_PLACES, "crew_rates")
+        equipment = to_fixed_point_matrix(equipment_rates, MONEY_PLACES, "equipment_rates")
+        multipliers = BatchCalculator.labor_multipliers(size, emergency_job, weekend_work)
+
+        travel = BatchCalculator.travel_costs(miles, minutes, vehicle_rate, driver_rate, formula_version)
+        labor = BatchCalculator.labor_costs(hours, crew.sum(axis=1), multipliers)
+        equipment_cost = BatchCalculator.equipment_costs(hours, equipment)
+
+        direct_costs = travel["total"] + labor["total"] + equipment_cost + disposal + permits
+        pipeline = BatchCalculator.apply_formula_pipeline(
+            direct_costs, overhead_pct, profit_pct, buffer_pct
+        )
+
+        return BatchEstimateResult(
+            formula_version=formula_version,
+            mileage_cost=travel["mileage_cost"],
+            time_cost=travel["time_cost"],
+            travel_cost=travel["total"],
+            labor_base_cost=labor["base_cost"],
+            labor_cost=labor["total"],
+            equipment_cost=equipment_cost,
+            disposal_fees=disposal,
+            permit_cost=permits,
+            **pipeline
+        )
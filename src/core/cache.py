@@ -3,88 +3,289 @@ Cache implementation for the Tree Service Estimating application.
 
 Uses Redis for distributed caching with fallback to in-memory cache.
 """
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+import heapq
 import json
-from typing import Any, Optional, Union
-from datetime import datetime, timedelta
+import time
+import uuid
+
+from prometheus_client import Counter, Gauge
 import redis.asyncio as redis
 from redis.exceptions import RedisError
 import structlog
 
+from src.core import cache_codec
+from src.core.cache_codec import CacheCodec, CacheCodecError
 from src.core.config import settings
 
 
 logger = structlog.get_logger()
 
 
+memory_cache_evictions = Counter(
+    'memory_cache_evictions_total',
+    'In-memory cache entries evicted to stay within the entry or byte budget'
+)
+
+memory_cache_expirations = Counter(
+    'memory_cache_expirations_total',
+    'In-memory cache entries removed after their expiry time'
+)
+
+memory_cache_entries = Gauge(
+    'memory_cache_entries',
+    'Entries held in the in-memory cache'
+)
+
+memory_cache_bytes = Gauge(
+    'memory_cache_bytes',
+    'Approximate size of the in-memory cache contents'
+)
+
+cache_computations = Counter(
+    'cache_computations_total',
+    'get_or_compute outcomes: computed, coalesced in-process, waited on another process, served stale',
+    ['outcome']
+)
+
+cache_requests = Counter(
+    'cache_requests_total',
+    'Cache lookups through CacheManager by tier (l1 in-process, l2 Redis)',
+    ['tier', 'result']
+)
+
+
 class CacheError(Exception):
     """Base exception for cache-related errors."""
     pass
 
 
 class InMemoryCache:
-    """Simple in-memory cache fallback when Redis is unavailable."""
+    """
+    Bounded in-memory cache, the fallback when Redis is unavailable.
+    
+    Entries are kept in LRU order and evicted (O(1) each) once the entry
+    count or the approximate byte budget is exceeded. Expiry times live in
+    a min-heap: reads still treat an expired entry as missing, and a
+    background sweeper pops expired keys off the heap so entries nobody
+    reads again don't pile up.
+    """
+    
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = settings.MEMORY_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = settings.MEMORY_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.sweep_interval = (
+            settings.MEMORY_CACHE_SWEEP_INTERVAL_SECONDS if sweep_interval is None else sweep_interval
+        )
+        self._clock = clock
+        # key -> (value, size in bytes, expiry time or None), least recently used first
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        # (expiry time, key); stale items are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self.evictions = 0
+        self.expirations = 0
+    
+    @staticmethod
+    def _entry_size(key: str, value: Any) -> int:
+        """Approximate size of an entry: its key plus the value as JSON."""
+        if isinstance(value, (str, bytes)):
+            size = len(value)
+        else:
+            size = len(json.dumps(value, default=str))
+        return len(key) + size
+    
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+    
+    def _store(self, key: str, value: Any, expires_at: Optional[float]) -> bool:
+        size = self._entry_size(key, value)
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return False
+        
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            lru_key = next(iter(self._entries))
+            self._remove(lru_key)
+            self.evictions += 1
+            memory_cache_evictions.inc()
+        self._update_gauges()
+        return True
+    
+    def _expire_entry(self, key: str) -> None:
+        self._remove(key)
+        self.expirations += 1
+        memory_cache_expirations.inc()
     
-    def __init__(self):
-        self._cache: dict = {}
-        self._expiry: dict = {}
+    def _update_gauges(self) -> None:
+        memory_cache_entries.set(len(self._entries))
+        memory_cache_bytes.set(self._bytes)
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        # Check if key exists and hasn't expired
-        if key in self._cache:
-            if key in self._expiry:
-                if datetime.utcnow() > self._expiry[key]:
-                    # Expired, remove it
-                    del self._cache[key]
-                    del self._expiry[key]
-                    return None
-            return self._cache[key]
-        return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, _, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            self._expire_entry(key)
+            self._update_gauges()
+            return None
+        self._entries.move_to_end(key)
+        return value
     
     async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
         """Set value in cache with optional expiration in seconds."""
-        self._cache[key] = value
-        if expire:
-            self._expiry[key] = datetime.utcnow() + timedelta(seconds=expire)
-        return True
+        expires_at = self._clock() + expire if expire else None
+        return self._store(key, value, expires_at)
     
     async def delete(self, key: str) -> bool:
         """Delete value from cache."""
-        if key in self._cache:
-            del self._cache[key]
-            if key in self._expiry:
-                del self._expiry[key]
+        if key in self._entries:
+            self._remove(key)
+            self._update_gauges()
             return True
         return False
     
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values; missing keys are left out of the result."""
+        values = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+    
+    async def set_many(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
+        """Set several values with the same optional expiration in seconds."""
+        expires_at = self._clock() + expire if expire else None
+        stored = [self._store(key, value, expires_at) for key, value in mapping.items()]
+        return all(stored)
+    
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys; returns how many existed."""
+        keys = [key for key in keys if key in self._entries]
+        for key in keys:
+            self._remove(key)
+        if keys:
+            self._update_gauges()
+        return len(keys)
+    
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete keys matching a glob-style pattern; returns how many were deleted."""
+        keys = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in keys:
+            self._remove(key)
+        if keys:
+            self._update_gauges()
+        return len(keys)
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         return await self.get(key) is not None
     
     async def expire(self, key: str, seconds: int) -> bool:
         """Set expiration time for a key."""
-        if key in self._cache:
-            self._expiry[key] = datetime.utcnow() + timedelta(seconds=seconds)
-            return True
-        return False
+        if await self.get(key) is None:
+            return False
+        value, size, _ = self._entries[key]
+        expires_at = self._clock() + seconds
+        self._entries[key] = (value, size, expires_at)
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        return True
+    
+    async def increment(self, key: str, amount: int = 1) -> Optional[int]:
+        """Increment a counter in cache, keeping its expiry."""
+        value = int(await self.get(key) or 0) + amount
+        entry = self._entries.get(key)
+        self._store(key, value, entry[2] if entry is not None else None)
+        return value
+    
+    def sweep(self) -> int:
+        """Remove every expired entry; returns how many were removed."""
+        now = self._clock()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Skip items left behind by a later set/expire or a delete
+            if entry is not None and entry[2] == expires_at:
+                self._expire_entry(key)
+                removed += 1
+        if len(heap) > 2 * len(self._entries) + 64:
+            # Mostly stale items: rebuild from the live entries
+            self._expiry_heap = [
+                (expires_at, key)
+                for key, (_, _, expires_at) in self._entries.items()
+                if expires_at is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+        if removed:
+            self._update_gauges()
+        return removed
+    
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+    
+    def start_sweeper(self) -> None:
+        """Start the background expiry sweeper on the running event loop."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return size, budget and eviction/expiry counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
     
     async def clear(self) -> None:
         """Clear all cache entries."""
-        self._cache.clear()
-        self._expiry.clear()
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self._bytes = 0
+        self._update_gauges()
     
     async def close(self) -> None:
-        """Close cache connection (no-op for in-memory)."""
-        pass
+        """Stop the expiry sweeper."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
 
 
 class RedisCache:
     """Redis-based cache implementation."""
     
-    def __init__(self, redis_url: str = None):
+    def __init__(self, redis_url: str = None, codec: Optional[CacheCodec] = None):
         self.redis_url = redis_url or settings.REDIS_URL
         self.redis_client: Optional[redis.Redis] = None
         self.default_ttl = settings.CACHE_TTL_SECONDS
+        self.codec = codec or cache_codec.DEFAULT_CODEC
+        cache_codec.register_codec(self.codec)
         self._connected = False
     
     async def connect(self):
@@ -93,10 +294,11 @@ class RedisCache:
             return
         
         try:
+            # Values are binary (see cache_codec), so responses stay bytes
             self.redis_client = redis.from_url(
                 self.redis_url,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=False
             )
             # Test connection
             await self.redis_client.ping()
@@ -119,19 +321,22 @@ class RedisCache:
             await self.connect()
         
         try:
-            value = await self.redis_client.get(key)
-            if value:
-                # Try to deserialize JSON
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    # Return as string if not JSON
-                    return value
-            return None
+            return self._decode(await self.redis_client.get(key))
         except RedisError as e:
             logger.error("Redis get error", key=key, error=str(e))
             return None
     
+    def _decode(self, value: Optional[bytes]) -> Optional[Any]:
+        try:
+            return cache_codec.decode(value)
+        except CacheCodecError as e:
+            # Treat as a miss; the next write replaces it
+            logger.warning("Undecodable cache value", error=str(e))
+            return None
+    
+    def _encode(self, value: Any) -> bytes:
+        return cache_codec.encode(value, self.codec)
+    
     async def set(
         self,
         key: str,
@@ -143,18 +348,63 @@ class RedisCache:
             await self.connect()
         
         try:
-            # Serialize to JSON if not a string
-            if not isinstance(value, str):
-                value = json.dumps(value, default=str)
-            
             # Use default TTL if not specified
             expire = expire or self.default_ttl
             
-            return await self.redis_client.set(key, value, ex=expire)
-        except RedisError as e:
+            return await self.redis_client.set(key, self._encode(value), ex=expire)
+        except (RedisError, CacheCodecError) as e:
             logger.error("Redis set error", key=key, error=str(e))
             return False
     
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values in one MGET; missing keys are left out of the result."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        if not self._connected:
+            await self.connect()
+        
+        try:
+            values = await self.redis_client.mget(keys)
+        except RedisError as e:
+            logger.error("Redis mget error", keys=len(keys), error=str(e))
+            return {}
+        decoded = {key: self._decode(value) for key, value in zip(keys, values)}
+        return {key: value for key, value in decoded.items() if value is not None}
+    
+    async def set_many(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
+        """Set several values in one pipelined round trip, each with the same expiration."""
+        if not mapping:
+            return True
+        if not self._connected:
+            await self.connect()
+        
+        expire = expire or self.default_ttl
+        try:
+            # MSET can't set expirations, so pipeline SET EX instead
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, self._encode(value), ex=expire)
+                results = await pipe.execute()
+            return all(results)
+        except (RedisError, CacheCodecError) as e:
+            logger.error("Redis set_many error", keys=len(mapping), error=str(e))
+            return False
+    
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys in one DEL; returns how many existed."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        if not self._connected:
+            await self.connect()
+        
+        try:
+            return await self.redis_client.delete(*keys)
+        except RedisError as e:
+            logger.error("Redis delete_many error", keys=len(keys), error=str(e))
+            return 0
+    
     async def delete(self, key: str) -> bool:
         """Delete value from cache."""
         if not self._connected:
@@ -206,6 +456,49 @@ class RedisCache:
             logger.error("Redis clear pattern error", pattern=pattern, error=str(e))
             return 0
     
+    # Deletes the lock only if it still holds the caller's token
+    RELEASE_LOCK_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+    
+    async def acquire_lock(self, key: str, token: str, seconds: float) -> bool:
+        """Take a short-lived lock unless another holder has it."""
+        if not self._connected:
+            await self.connect()
+        
+        try:
+            return bool(await self.redis_client.set(key, token, nx=True, px=int(seconds * 1000)))
+        except RedisError as e:
+            logger.error("Redis lock error", key=key, error=str(e))
+            return False
+    
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with the same token."""
+        if not self._connected:
+            await self.connect()
+        
+        try:
+            return bool(await self.redis_client.eval(self.RELEASE_LOCK_SCRIPT, 1, key, token))
+        except RedisError as e:
+            logger.error("Redis unlock error", key=key, error=str(e))
+            return False
+    
+    async def publish(self, channel: str, message: Any) -> int:
+        """Publish a message on a pub/sub channel; returns the receiver count."""
+        if not self._connected:
+            await self.connect()
+        
+        try:
+            if not isinstance(message, str):
+                message = json.dumps(message, default=str)
+            return await self.redis_client.publish(channel, message)
+        except RedisError as e:
+            logger.error("Redis publish error", channel=channel, error=str(e))
+            return 0
+    
     async def increment(self, key: str, amount: int = 1) -> Optional[int]:
         """Increment a counter in cache."""
         if not self._connected:
@@ -223,10 +516,8 @@ class RedisCache:
             await self.connect()
         
         try:
-            if not isinstance(value, str):
-                value = json.dumps(value, default=str)
-            return await self.redis_client.hset(key, field, value)
-        except RedisError as e:
+            return await self.redis_client.hset(key, field, self._encode(value))
+        except (RedisError, CacheCodecError) as e:
             logger.error("Redis hset error", key=key, field=field, error=str(e))
             return False
     
@@ -236,13 +527,7 @@ class RedisCache:
             await self.connect()
         
         try:
-            value = await self.redis_client.hget(key, field)
-            if value:
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    return value
-            return None
+            return self._decode(await self.redis_client.hget(key, field))
         except RedisError as e:
             logger.error("Redis hget error", key=key, field=field, error=str(e))
             return None
@@ -254,13 +539,7 @@ class RedisCache:
         
         try:
             data = await self.redis_client.hgetall(key)
-            result = {}
-            for field, value in data.items():
-                try:
-                    result[field] = json.loads(value)
-                except json.JSONDecodeError:
-                    result[field] = value
-            return result
+            return {field.decode(): self._decode(value) for field, value in data.items()}
         except RedisError as e:
             logger.error("Redis hgetall error", key=key, error=str(e))
             return {}
@@ -273,13 +552,34 @@ class RedisCache:
 class CacheManager:
     """
     Main cache manager that handles Redis with in-memory fallback.
+    
+    Keys in opted-in namespaces (the part of the key before the first
+    ":") are also held in a small in-process L1 tier for a few seconds in
+    front of Redis. Writes through any CacheManager drop the key from
+    every process's L1 by publishing on a Redis pub/sub channel; while a
+    process isn't subscribed, its L1 is bypassed.
     """
     
-    def __init__(self):
+    def __init__(self, l1_namespaces: Optional[Iterable[str]] = None):
         self.redis_cache: Optional[RedisCache] = None
         self.memory_cache = InMemoryCache()
         self.use_redis = True
         self._initialized = False
+        
+        # In-process tier in front of Redis
+        self.l1_namespaces = frozenset(
+            settings.CACHE_L1_NAMESPACES if l1_namespaces is None else l1_namespaces
+        )
+        self.l1_cache = InMemoryCache(max_entries=settings.CACHE_L1_MAX_ENTRIES)
+        self.l1_ttl = settings.CACHE_L1_TTL_SECONDS
+        self.l1_active = False
+        self._l1_generation = 0
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_listener: Optional[asyncio.Task] = None
+        
+        # get_or_compute fills in progress in this process, by key
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
     
     async def initialize(self):
         """Initialize cache connection."""
@@ -301,6 +601,61 @@ class CacheManager:
             logger.info("Cache initialized with in-memory storage")
             self.use_redis = False
             self._initialized = True
+        
+        if not self.use_redis:
+            self.memory_cache.start_sweeper()
+        elif self.l1_namespaces:
+            self.l1_cache.start_sweeper()
+            self._invalidation_listener = asyncio.get_running_loop().create_task(
+                self._listen_for_invalidations()
+            )
+    
+    def _uses_l1(self, key: str) -> bool:
+        return self.l1_active and key.split(":", 1)[0] in self.l1_namespaces
+    
+    async def _invalidate_l1(self, keys: Iterable[str] = (), pattern: Optional[str] = None) -> None:
+        """Drop keys from this process's L1 and tell every other process to."""
+        keys = [key for key in keys if key.split(":", 1)[0] in self.l1_namespaces]
+        if not keys and pattern is None:
+            return
+        await self._apply_invalidation({"keys": keys, "pattern": pattern})
+        await self.redis_cache.publish(
+            settings.CACHE_INVALIDATION_CHANNEL,
+            {"origin": self._instance_id, "keys": keys, "pattern": pattern}
+        )
+    
+    async def _apply_invalidation(self, message: Dict[str, Any]) -> None:
+        """Apply an invalidation message to the L1 tier."""
+        self._l1_generation += 1
+        for key in message.get("keys") or ():
+            await self.l1_cache.delete(key)
+        if message.get("pattern"):
+            await self.l1_cache.delete_pattern(message["pattern"])
+    
+    async def _listen_for_invalidations(self) -> None:
+        """Apply other processes' invalidations; re-subscribes after errors."""
+        while True:
+            pubsub = self.redis_cache.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                # Invalidations may have been missed while unsubscribed
+                await self.l1_cache.clear()
+                self.l1_active = True
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        invalidation = json.loads(message["data"])
+                    except json.JSONDecodeError:
+                        continue
+                    if invalidation.get("origin") != self._instance_id:
+                        await self._apply_invalidation(invalidation)
+            except RedisError as e:
+                logger.warning("Cache invalidation channel lost, bypassing L1", error=str(e))
+            finally:
+                self.l1_active = False
+                await pubsub.aclose()
+            await asyncio.sleep(1)
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
@@ -308,7 +663,21 @@ class CacheManager:
             await self.initialize()
         
         if self.use_redis and self.redis_cache:
-            return await self.redis_cache.get(key)
+            uses_l1 = self._uses_l1(key)
+            if uses_l1:
+                value = await self.l1_cache.get(key)
+                if value is not None:
+                    cache_requests.labels(tier="l1", result="hit").inc()
+                    return value
+                cache_requests.labels(tier="l1", result="miss").inc()
+            
+            generation = self._l1_generation
+            value = await self.redis_cache.get(key)
+            cache_requests.labels(tier="l2", result="hit" if value is not None else "miss").inc()
+            # Skip the fill if an invalidation arrived while reading
+            if uses_l1 and value is not None and generation == self._l1_generation:
+                await self.l1_cache.set(key, value, self.l1_ttl)
+            return value
         return await self.memory_cache.get(key)
     
     async def set(
@@ -322,7 +691,9 @@ class CacheManager:
             await self.initialize()
         
         if self.use_redis and self.redis_cache:
-            return await self.redis_cache.set(key, value, expire)
+            result = await self.redis_cache.set(key, value, expire)
+            await self._invalidate_l1([key])
+            return result
         return await self.memory_cache.set(key, value, expire)
     
     async def delete(self, key: str) -> bool:
@@ -331,9 +702,66 @@ class CacheManager:
             await self.initialize()
         
         if self.use_redis and self.redis_cache:
-            return await self.redis_cache.delete(key)
+            result = await self.redis_cache.delete(key)
+            await self._invalidate_l1([key])
+            return result
         return await self.memory_cache.delete(key)
     
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values at once; missing keys are left out of the result."""
+        if not self._initialized:
+            await self.initialize()
+        
+        keys = list(dict.fromkeys(keys))
+        if not (self.use_redis and self.redis_cache):
+            return await self.memory_cache.get_many(keys)
+        
+        values = {}
+        remote_keys = []
+        for key in keys:
+            if self._uses_l1(key):
+                value = await self.l1_cache.get(key)
+                cache_requests.labels(tier="l1", result="hit" if value is not None else "miss").inc()
+                if value is not None:
+                    values[key] = value
+                    continue
+            remote_keys.append(key)
+        
+        generation = self._l1_generation
+        fetched = await self.redis_cache.get_many(remote_keys)
+        cache_requests.labels(tier="l2", result="hit").inc(len(fetched))
+        cache_requests.labels(tier="l2", result="miss").inc(len(remote_keys) - len(fetched))
+        # Skip the fill if an invalidation arrived while reading
+        if generation == self._l1_generation:
+            for key, value in fetched.items():
+                if self._uses_l1(key):
+                    await self.l1_cache.set(key, value, self.l1_ttl)
+        values.update(fetched)
+        return values
+    
+    async def set_many(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
+        """Set several values at once with the same optional expiration."""
+        if not self._initialized:
+            await self.initialize()
+        
+        if self.use_redis and self.redis_cache:
+            result = await self.redis_cache.set_many(mapping, expire)
+            await self._invalidate_l1(mapping)
+            return result
+        return await self.memory_cache.set_many(mapping, expire)
+    
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys at once; returns how many existed."""
+        if not self._initialized:
+            await self.initialize()
+        
+        keys = list(keys)
+        if self.use_redis and self.redis_cache:
+            result = await self.redis_cache.delete_many(keys)
+            await self._invalidate_l1(keys)
+            return result
+        return await self.memory_cache.delete_many(keys)
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         if not self._initialized:
@@ -353,17 +781,192 @@ class CacheManager:
         return await self.memory_cache.expire(key, seconds)
     
     async def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching a pattern (Redis only)."""
+        """Clear all keys matching a glob-style pattern."""
         if not self._initialized:
             await self.initialize()
         
         if self.use_redis and self.redis_cache:
-            return await self.redis_cache.clear_pattern(pattern)
-        # For in-memory, we'd need to implement pattern matching
-        return 0
+            result = await self.redis_cache.clear_pattern(pattern)
+            if self.l1_namespaces:
+                await self._invalidate_l1(pattern=pattern)
+            return result
+        return await self.memory_cache.delete_pattern(pattern)
+    
+    async def increment(self, key: str, amount: int = 1) -> Optional[int]:
+        """Increment a counter in cache."""
+        if not self._initialized:
+            await self.initialize()
+        
+        if self.use_redis and self.redis_cache:
+            result = await self.redis_cache.increment(key, amount)
+            await self._invalidate_l1([key])
+            return result
+        return await self.memory_cache.increment(key, amount)
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Get a value, computing and caching it on a miss, once per miss.
+        
+        Concurrent misses in this process share one computation; across
+        processes, the caller holding a short Redis lock computes while the
+        others poll for its result (and compute themselves if it doesn't
+        appear in time). None results are returned but not cached.
+        
+        With ``stale_ttl``, the value is kept ``stale_ttl`` seconds past its
+        ``ttl``; during that time callers get the stale value at once while
+        a single caller refreshes it in the background. Such keys hold an
+        envelope, so always read them through get_or_compute.
+        
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value
+            ttl: Seconds the value is fresh (default: the cache default)
+            stale_ttl: Seconds a stale value may still be served
+        """
+        ttl = ttl or settings.CACHE_TTL_SECONDS
+        if stale_ttl is None:
+            value = await self.get(key)
+            if value is not None:
+                return value
+            return await self._fill(key, compute, ttl, stale_ttl)
+        
+        envelope = await self.get(key)
+        if isinstance(envelope, dict) and "fresh_until" in envelope:
+            if time.time() >= envelope["fresh_until"]:
+                self._refresh_in_background(key, compute, ttl, stale_ttl)
+                cache_computations.labels(outcome="stale").inc()
+            return envelope["value"]
+        return await self._fill(key, compute, ttl, stale_ttl)
+    
+    async def _fill(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: Optional[int]
+    ) -> Any:
+        """Compute a missing value once per process; returns the value."""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            cache_computations.labels(outcome="coalesced").inc()
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._compute_with_lock(key, compute, ttl, stale_ttl, wait=True)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve it so an unawaited future doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    
+    async def _compute_with_lock(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: Optional[int],
+        wait: bool
+    ) -> Any:
+        """
+        Compute and store a value while holding the key's cross-process
+        lock. If another process holds it, wait for its result (or, with
+        ``wait`` false, return None at once).
+        """
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        if not await self._acquire_lock(lock_key, token):
+            if not wait:
+                return None
+            value = await self._wait_for_value(key, stale_ttl)
+            if value is not None:
+                cache_computations.labels(outcome="waited").inc()
+                return value
+            # The holder is slow or failed; compute without the lock
+            token = None
+        
+        try:
+            value = await compute()
+            cache_computations.labels(outcome="computed").inc()
+            if value is not None:
+                if stale_ttl is None:
+                    await self.set(key, value, ttl)
+                else:
+                    await self.set(
+                        key,
+                        {"value": value, "fresh_until": time.time() + ttl},
+                        ttl + stale_ttl
+                    )
+            return value
+        finally:
+            if token is not None:
+                await self._release_lock(lock_key, token)
+    
+    async def _wait_for_value(self, key: str, stale_ttl: Optional[int]) -> Any:
+        """Poll for a value another process is computing."""
+        deadline = time.monotonic() + settings.CACHE_COMPUTE_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_COMPUTE_POLL_SECONDS)
+            value = await self.get(key)
+            if value is None:
+                continue
+            if stale_ttl is None:
+                return value
+            if isinstance(value, dict) and "fresh_until" in value:
+                return value["value"]
+        return None
+    
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int
+    ) -> None:
+        """Start one refresh of a stale value per process; other processes skip it via the lock."""
+        if key in self._refreshing:
+            return
+        
+        async def refresh() -> None:
+            try:
+                await self._compute_with_lock(key, compute, ttl, stale_ttl, wait=False)
+            except Exception as e:
+                logger.warning("Background cache refresh failed", key=key, error=str(e))
+            finally:
+                self._refreshing.pop(key, None)
+        
+        self._refreshing[key] = asyncio.get_running_loop().create_task(refresh())
+    
+    async def _acquire_lock(self, lock_key: str, token: str) -> bool:
+        if self.use_redis and self.redis_cache:
+            return await self.redis_cache.acquire_lock(
+                lock_key, token, settings.CACHE_COMPUTE_LOCK_SECONDS
+            )
+        # Without Redis there is only this process, already coalesced
+        return True
+    
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        if self.use_redis and self.redis_cache:
+            await self.redis_cache.release_lock(lock_key, token)
     
     async def close(self):
         """Close cache connections."""
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.cancel()
+            self._invalidation_listener = None
+        self.l1_active = False
+        await self.l1_cache.close()
         if self.redis_cache:
             await self.redis_cache.close()
         await self.memory_cache.close()
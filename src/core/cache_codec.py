@@ -0,0 +1,227 @@
+"""
+Binary codecs for values stored in Redis.
+
+Encoded values start with a one-byte codec version, so values are always
+decoded by the codec that wrote them and the format can change without
+flushing the cache. Values written before codecs existed (plain JSON text)
+are still read.
+
+Version 1 is orjson with Decimal, datetime, date, time and pydantic model
+values tagged, so they come back as the same types instead of strings.
+Large payloads are zlib-compressed.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Type
+import importlib
+import json
+import zlib
+
+import orjson
+from pydantic import BaseModel
+
+from src.core.config import settings
+
+
+TYPE_TAG = "__t"
+
+FLAG_COMPRESSED = 0x01
+FLAG_TAGGED = 0x02
+
+# Pydantic models are rebuilt by import path, so only our own are allowed
+MODEL_MODULE_PREFIX = "src."
+
+
+class CacheCodecError(Exception):
+    """Value can't be encoded or decoded."""
+    pass
+
+
+class CacheCodec:
+    """Encodes cache values to bytes and back; the first byte is ``version``."""
+
+    version: int
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+def _tag_model(obj: BaseModel) -> Dict[str, Any]:
+    model = type(obj)
+    # pydantic's own JSON form, which it validates back to the same values
+    return {
+        TYPE_TAG: "model",
+        "c": f"{model.__module__}:{model.__qualname__}",
+        "v": obj.model_dump(mode="json")
+    }
+
+
+_TAGGERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    Decimal: lambda obj: {TYPE_TAG: "decimal", "v": str(obj)},
+    datetime: lambda obj: {TYPE_TAG: "datetime", "v": obj.isoformat()},
+    date: lambda obj: {TYPE_TAG: "date", "v": obj.isoformat()},
+    time: lambda obj: {TYPE_TAG: "time", "v": obj.isoformat()},
+    BaseModel: _tag_model
+}
+
+
+@lru_cache(maxsize=256)
+def _tagger(cls: type) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    # Nearest tagged base, so datetime isn't tagged as a date; looked up by
+    # type because isinstance against pydantic models is slow
+    for base in cls.__mro__:
+        if base in _TAGGERS:
+            return _TAGGERS[base]
+    return None
+
+
+@lru_cache(maxsize=256)
+def _model_class(path: str) -> Type[BaseModel]:
+    module_name, _, qualname = path.partition(":")
+    if not module_name.startswith(MODEL_MODULE_PREFIX):
+        raise CacheCodecError(f"Refusing to load model from {module_name}")
+    target: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        target = getattr(target, name)
+    if not (isinstance(target, type) and issubclass(target, BaseModel)):
+        raise CacheCodecError(f"{path} is not a pydantic model")
+    return target
+
+
+_UNTAGGERS = {
+    "decimal": lambda tagged: Decimal(tagged["v"]),
+    "datetime": lambda tagged: datetime.fromisoformat(tagged["v"]),
+    "date": lambda tagged: date.fromisoformat(tagged["v"]),
+    "time": lambda tagged: time.fromisoformat(tagged["v"]),
+    "model": lambda tagged: _model_class(tagged["c"]).model_validate(tagged["v"])
+}
+
+
+def _untag(value: Any) -> Any:
+    """Replace tagged objects in freshly decoded JSON, in place."""
+    if type(value) is dict:
+        tag = value.get(TYPE_TAG)
+        if tag is not None:
+            return _UNTAGGERS[tag](value)
+        items = value.items()
+    elif type(value) is list:
+        items = enumerate(value)
+    else:
+        return value
+    # Tags are handled here rather than by recursing, which is most of the cost
+    for key, item in items:
+        if type(item) is dict:
+            tag = item.get(TYPE_TAG)
+            if tag is not None:
+                value[key] = _UNTAGGERS[tag](item)
+            else:
+                _untag(item)
+        elif type(item) is list:
+            _untag(item)
+    return value
+
+
+class OrjsonCodec(CacheCodec):
+    """
+    orjson payload behind a version and a flags byte.
+
+    Types JSON can't represent exactly are serialized as tagged objects by
+    orjson's ``default`` hook; the tagged flag lets decode skip walking
+    values that have none. Tuples come back as lists, and other unsupported
+    types are stored as strings, as before.
+    """
+
+    version = 1
+
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def __init__(self, compress_min_bytes: Optional[int] = None, compress_level: int = 1):
+        if compress_min_bytes is None:
+            compress_min_bytes = settings.CACHE_COMPRESS_MIN_BYTES
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+
+    def encode(self, value: Any) -> bytes:
+        flags = 0
+
+        def default(obj: Any) -> Any:
+            nonlocal flags
+            tagger = _tagger(type(obj))
+            if tagger is None:
+                return str(obj)
+            flags |= FLAG_TAGGED
+            return tagger(obj)
+
+        try:
+            payload = orjson.dumps(value, default=default, option=self.OPTIONS)
+        except orjson.JSONEncodeError as e:
+            raise CacheCodecError(str(e)) from e
+
+        if self.compress_min_bytes and len(payload) >= self.compress_min_bytes:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= FLAG_COMPRESSED
+        return bytes((self.version, flags)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            flags = data[1]
+            payload = data[2:]
+            if flags & FLAG_COMPRESSED:
+                payload = zlib.decompress(payload)
+            value = orjson.loads(payload)
+            return _untag(value) if flags & FLAG_TAGGED else value
+        except (
+            zlib.error, orjson.JSONDecodeError, IndexError, KeyError, ValueError,
+            ArithmeticError, ImportError, AttributeError
+        ) as e:
+            raise CacheCodecError(f"Undecodable cache value: {e}") from e
+
+
+_codecs: Dict[int, CacheCodec] = {}
+
+
+def register_codec(codec: CacheCodec) -> None:
+    """Make values written by ``codec`` readable."""
+    if not 0 < codec.version < 0x09:
+        # Higher bytes can start JSON text written before versioning
+        raise ValueError(f"Codec version must be 1-8, got {codec.version}")
+    _codecs[codec.version] = codec
+
+
+DEFAULT_CODEC = OrjsonCodec()
+register_codec(DEFAULT_CODEC)
+
+
+def encode(value: Any, codec: CacheCodec = DEFAULT_CODEC) -> bytes:
+    """
+    Encode a value for Redis.
+
+    Integers are stored as plain digits so Redis INCR still works on them.
+    """
+    if type(value) is int:
+        return str(value).encode()
+    return codec.encode(value)
+
+
+def decode(data: Optional[bytes]) -> Any:
+    """Decode a value read from Redis with the codec that wrote it."""
+    if not data:
+        return None
+    if isinstance(data, str):
+        data = data.encode()
+    codec = _codecs.get(data[0])
+    if codec is not None:
+        return codec.decode(data)
+
+    # Unversioned: plain integers, or JSON text from before codecs
+    try:
+        return json.loads(data)
+    except ValueError:
+        # Return as string if not JSON
+        return data.decode("utf-8", errors="replace")
@@ -0,0 +1,185 @@
+"""
+Content-addressed memo for full estimate calculations.
+
+A full estimate is a pure function of its inputs apart from the
+calculation_id and timestamp stamped on the result. Results are cached
+under a SHA-256 of the normalized inputs plus the formula version, and
+returned with a fresh id and timestamp on every hit.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from threading import Lock
+from typing import Any, Callable, Dict
+import hashlib
+import json
+import uuid
+
+from prometheus_client import Counter, Gauge
+import structlog
+
+from src.core.config import settings
+
+
+logger = structlog.get_logger()
+
+
+memo_requests = Counter(
+    'calculation_memo_requests_total',
+    'Full estimate calculation memo lookups',
+    ['result']
+)
+
+memo_entries = Gauge(
+    'calculation_memo_entries',
+    'Full estimate calculations held in the memo'
+)
+
+
+def _normalize_amount(value: Any) -> str:
+    """Render an amount exactly as the calculator will see it."""
+    if isinstance(value, Decimal):
+        return str(value)
+    return str(Decimal(str(value)))
+
+
+def make_calculation_key(inputs: Dict[str, Any], formula_version: str) -> str:
+    """
+    Build a content-addressed key for calculate_full_estimate inputs.
+
+    Amounts keep their Decimal representation because the result echoes
+    them (e.g. "25.0" vs "25" for percentages). Crew rates are sorted since
+    only their sum is used; equipment keeps its order because duplicate ids
+    make the itemized breakdown order dependent.
+
+    Args:
+        inputs: Keyword arguments for calculate_full_estimate
+        formula_version: Version of the pricing formula
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = {
+        "formula_version": inputs.get("formula_version", formula_version),
+        "crew_rates": sorted(
+            _normalize_amount(worker["hourly_rate"]) for worker in inputs["crew_rates"]
+        ),
+        "equipment_list": [
+            [equipment.get("id"), _normalize_amount(equipment["hourly_cost"])]
+            for equipment in inputs["equipment_list"]
+        ],
+        "travel_time_minutes": int(inputs["travel_time_minutes"]),
+        "emergency_job": bool(inputs.get("emergency_job", False)),
+        "weekend_work": bool(inputs.get("weekend_work", False))
+    }
+    for name in (
+        "travel_miles", "estimated_hours", "vehicle_rate_per_mile",
+        "driver_hourly_rate", "disposal_fees", "permit_cost",
+        "overhead_percent", "profit_percent", "safety_buffer_percent"
+    ):
+        normalized[name] = _normalize_amount(inputs[name])
+
+    json_str = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy the nested dicts of a result; Decimals and strings are immutable."""
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    return value
+
+
+class CalculationMemo:
+    """
+    Bounded LRU memo of calculate_full_estimate results.
+
+    Safe to share between threads. A max_entries of 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def calculate(
+        self,
+        inputs: Dict[str, Any],
+        calculate: Callable[..., Dict[str, Any]],
+        formula_version: str
+    ) -> Dict[str, Any]:
+        """
+        Return the calculation for inputs, computing it on a miss.
+
+        Args:
+            inputs: Keyword arguments for calculate
+            calculate: The full estimate function (called as calculate(**inputs))
+            formula_version: Version of the pricing formula
+
+        Returns:
+            Calculation result owned by the caller
+        """
+        if self.max_entries <= 0:
+            return calculate(**inputs)
+
+        key = make_calculation_key(inputs, formula_version)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if cached is not None:
+            memo_requests.labels(result="hit").inc()
+            result = _copy_result(cached)
+            final_calculation = result["final_calculation"]
+            final_calculation["calculation_id"] = str(uuid.uuid4())
+            final_calculation["timestamp"] = datetime.utcnow().isoformat()
+            return result
+
+        memo_requests.labels(result="miss").inc()
+        result = calculate(**inputs)
+        stored = _copy_result(result)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            memo_entries.set(len(self._entries))
+
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached calculations."""
+        with self._lock:
+            self._entries.clear()
+            memo_entries.set(0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Shared by every TreeServiceCalculator in the process
+calculation_memo = CalculationMemo(settings.CALCULATION_MEMO_SIZE)
+
+
+def get_calculation_memo() -> CalculationMemo:
+    """Get the process-wide calculation memo."""
+    return calculation_memo
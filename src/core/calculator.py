@@ -1,19 +1,69 @@
 """
 Deterministic calculator engine for tree service estimates.
-All calculations use Decimal for precision and produce consistent results.
+All calculations run on integer cents (see src.utils.money) and produce
+consistent results independent of the Decimal context; values are
+returned as Decimal.
 """
-from decimal import Decimal, ROUND_HALF_UP, getcontext
-from typing import Dict, List, Optional, Tuple
+from decimal import Decimal
+from math import lcm
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, date
 import uuid
 import hashlib
 import json
 
+import structlog
+
 from src.core.config import settings
+from src.core.calculation_memo import CalculationMemo, get_calculation_memo
+from src.core.formulas import CURRENT_FORMULA_VERSION, compile_formula, get_formula, travel_time_cost
+from src.utils.money import Money, to_ratio, divide_rounded
+
+
+logger = structlog.get_logger()
+
+FORMULA_VERSION = CURRENT_FORMULA_VERSION
+
+# calculate_full_estimate arguments each pipeline stage reads; the margin
+# stage also depends on every component total
+STAGE_INPUTS = {
+    "travel": ("travel_miles", "travel_time_minutes", "vehicle_rate_per_mile", "driver_hourly_rate"),
+    "labor": ("estimated_hours", "crew_rates", "emergency_job", "weekend_work"),
+    "equipment": ("estimated_hours", "equipment_list"),
+    "disposal": ("disposal_fees",),
+    "permits": ("permit_cost",),
+    "margins": ("overhead_percent", "profit_percent", "safety_buffer_percent")
+}
+
+# FormulaDefinition fields each stage's output depends on; stages not listed
+# price the same under every formula version
+STAGE_FORMULA_FIELDS = {
+    "travel": ("travel_time_precision",),
+    "margins": ("version", "steps", "round_to", "rounding")
+}
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """Return value as a Decimal without re-parsing existing Decimals."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _decimal_str(value: Any) -> str:
+    """Render a value the way str(Decimal(str(value))) would."""
+    return str(_as_decimal(value))
 
 
-# Set decimal precision for financial calculations
-getcontext().prec = 10
+def _normalize_input(value: Any) -> Any:
+    """Comparable form of a calculation input, preserving Decimal representation."""
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_normalize_input(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize_input(item) for key, item in value.items()}
+    if isinstance(value, (Decimal, float)):
+        return _decimal_str(value)
+    return value
 
 
 class DeterministicCalculator:
@@ -25,19 +75,21 @@ class DeterministicCalculator:
     @staticmethod
     def round_to_cents(value: Decimal) -> Decimal:
         """Round a decimal value to 2 decimal places (cents)."""
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        return Money.from_value(value).to_decimal()
     
     @staticmethod
     def round_to_nearest_five(value: Decimal) -> Decimal:
         """Round a decimal value to the nearest $5."""
-        return (value / Decimal('5')).quantize(Decimal('1'), rounding=ROUND_HALF_UP) * Decimal('5')
+        numerator, denominator = to_ratio(value)
+        return Decimal(divide_rounded(numerator, denominator * 5) * 5)
     
     @staticmethod
     def calculate_travel_cost(
         miles: Decimal,
         time_minutes: int,
         vehicle_rate_per_mile: Decimal,
-        driver_hourly_rate: Decimal
+        driver_hourly_rate: Decimal,
+        formula_version: str = FORMULA_VERSION
     ) -> Dict[str, Decimal]:
         """
         Calculate travel costs based on mileage and time.
@@ -47,31 +99,24 @@ class DeterministicCalculator:
             time_minutes: Travel time in minutes
             vehicle_rate_per_mile: Cost per mile for vehicle
             driver_hourly_rate: Driver's hourly rate
+            formula_version: Formula version deciding how travel time is rounded
             
         Returns:
             Dictionary with mileage_cost, time_cost, and total
         """
-        # Ensure all inputs are Decimal
-        miles = Decimal(str(miles))
-        vehicle_rate_per_mile = Decimal(str(vehicle_rate_per_mile))
-        driver_hourly_rate = Decimal(str(driver_hourly_rate))
+        miles_n, miles_d = to_ratio(miles)
+        rate_n, rate_d = to_ratio(vehicle_rate_per_mile)
         
         # Calculate mileage cost
-        mileage_cost = miles * vehicle_rate_per_mile
-        
-        # Calculate time cost (convert minutes to hours)
-        time_hours = Decimal(str(time_minutes)) / Decimal('60')
-        time_cost = time_hours * driver_hourly_rate
+        mileage_cost = Money.from_ratio(miles_n * rate_n, miles_d * rate_d)
         
-        # Round to cents
-        mileage_cost = DeterministicCalculator.round_to_cents(mileage_cost)
-        time_cost = DeterministicCalculator.round_to_cents(time_cost)
-        total = DeterministicCalculator.round_to_cents(mileage_cost + time_cost)
+        # Calculate time cost (minutes * hourly rate / 60, rounded per formula version)
+        time_cost = travel_time_cost(time_minutes, driver_hourly_rate, formula_version)
         
         return {
-            "mileage_cost": mileage_cost,
-            "time_cost": time_cost,
-            "total": total
+            "mileage_cost": mileage_cost.to_decimal(),
+            "time_cost": time_cost.to_decimal(),
+            "total": (mileage_cost + time_cost).to_decimal()
         }
     
     @staticmethod
@@ -91,31 +136,30 @@ class DeterministicCalculator:
         Returns:
             Dictionary with base_cost, multipliers_applied, and total
         """
-        # Ensure hours is Decimal
-        hours = Decimal(str(hours))
+        # Sum crew rates exactly over a common denominator
+        rates = [to_ratio(worker['hourly_rate']) for worker in crew]
+        rate_d = lcm(*(d for _, d in rates)) if rates else 1
+        rate_n = sum(n * (rate_d // d) for n, d in rates)
         
-        # Calculate base cost
-        base_cost = Decimal('0')
-        for worker in crew:
-            hourly_rate = Decimal(str(worker['hourly_rate']))
-            base_cost += hours * hourly_rate
+        hours_n, hours_d = to_ratio(hours)
+        base_n = hours_n * rate_n
+        base_d = hours_d * rate_d
         
         # Apply multipliers in deterministic order (sorted by key)
-        total = base_cost
+        total_n, total_d = base_n, base_d
         applied_multipliers = {}
         for key in sorted(multipliers.keys()):
-            multiplier = Decimal(str(multipliers[key]))
-            total *= multiplier
-            applied_multipliers[key] = str(multiplier)
-        
-        # Round to cents
-        base_cost = DeterministicCalculator.round_to_cents(base_cost)
-        total = DeterministicCalculator.round_to_cents(total)
+            multiplier = multipliers[key]
+            multiplier_n, multiplier_d = to_ratio(multiplier)
+            total_n *= multiplier_n
+            total_d *= multiplier_d
+            applied_multipliers[key] = _decimal_str(multiplier)
         
+        # Round to cents only once, after all multipliers
         return {
-            "base_cost": base_cost,
+            "base_cost": Money.from_ratio(base_n, base_d).to_decimal(),
             "multipliers_applied": applied_multipliers,
-            "total": total
+            "total": Money.from_ratio(total_n, total_d).to_decimal()
         }
     
     @staticmethod
@@ -133,10 +177,9 @@ class DeterministicCalculator:
         Returns:
             Dictionary with itemized costs and total
         """
-        # Ensure hours is Decimal
-        hours = Decimal(str(hours))
+        hours_n, hours_d = to_ratio(hours)
         
-        total = Decimal('0')
+        total = Money()
         itemized = {}
         
         # Sort equipment by ID for deterministic order
@@ -144,15 +187,14 @@ class DeterministicCalculator:
         
         for equipment in sorted_equipment:
             equipment_id = str(equipment.get('id', 'unknown'))
-            hourly_cost = Decimal(str(equipment['hourly_cost']))
-            cost = hours * hourly_cost
-            cost = DeterministicCalculator.round_to_cents(cost)
-            itemized[f"equipment_{equipment_id}"] = cost
+            cost_n, cost_d = to_ratio(equipment['hourly_cost'])
+            cost = Money.from_ratio(hours_n * cost_n, hours_d * cost_d)
+            itemized[f"equipment_{equipment_id}"] = cost.to_decimal()
             total += cost
         
         return {
             "itemized": itemized,
-            "total": DeterministicCalculator.round_to_cents(total)
+            "total": total.to_decimal()
         }
     
     @staticmethod
@@ -160,12 +202,13 @@ class DeterministicCalculator:
         components: Dict[str, Decimal],
         overhead_percent: Decimal,
         profit_percent: Decimal,
-        safety_buffer_percent: Decimal
+        safety_buffer_percent: Decimal,
+        formula_version: str = FORMULA_VERSION
     ) -> Dict[str, any]:
         """
         Apply the deterministic formula pipeline to calculate final estimate.
         
-        Formula order:
+        Formula order (version 1.0, see src.core.formulas):
         1. Sum all direct costs
         2. Apply overhead
         3. Apply safety buffer
@@ -177,57 +220,19 @@ class DeterministicCalculator:
             overhead_percent: Overhead percentage (e.g., 25.0 for 25%)
             profit_percent: Profit margin percentage
             safety_buffer_percent: Safety buffer percentage
+            formula_version: Registered formula version to apply
             
         Returns:
             Dictionary with all calculation steps and final total
         """
-        # Ensure all percentages are Decimal
-        overhead_percent = Decimal(str(overhead_percent))
-        profit_percent = Decimal(str(profit_percent))
-        safety_buffer_percent = Decimal(str(safety_buffer_percent))
-        
-        # Step 1: Sum all direct costs (in sorted order for determinism)
-        direct_costs = Decimal('0')
-        for key in sorted(components.keys()):
-            direct_costs += Decimal(str(components[key]))
-        direct_costs = DeterministicCalculator.round_to_cents(direct_costs)
-        
-        # Step 2: Apply overhead
-        overhead = direct_costs * (overhead_percent / Decimal('100'))
-        overhead = DeterministicCalculator.round_to_cents(overhead)
-        subtotal_with_overhead = direct_costs + overhead
-        
-        # Step 3: Apply safety buffer
-        safety_buffer = subtotal_with_overhead * (safety_buffer_percent / Decimal('100'))
-        safety_buffer = DeterministicCalculator.round_to_cents(safety_buffer)
-        subtotal_with_buffer = subtotal_with_overhead + safety_buffer
-        
-        # Step 4: Apply profit margin
-        profit = subtotal_with_buffer * (profit_percent / Decimal('100'))
-        profit = DeterministicCalculator.round_to_cents(profit)
-        final_subtotal = subtotal_with_buffer + profit
-        
-        # Step 5: Round to nearest $5
-        final_total = DeterministicCalculator.round_to_nearest_five(final_subtotal)
-        
-        # Generate calculation ID and timestamp
-        calculation_id = str(uuid.uuid4())
-        timestamp = datetime.utcnow()
-        
-        return {
-            "direct_costs": direct_costs,
-            "overhead": overhead,
-            "overhead_percent": str(overhead_percent),
-            "safety_buffer": safety_buffer,
-            "safety_buffer_percent": str(safety_buffer_percent),
-            "profit": profit,
-            "profit_percent": str(profit_percent),
-            "subtotal": final_subtotal,
-            "final_total": final_total,
-            "calculation_id": calculation_id,
-            "timestamp": timestamp.isoformat(),
-            "formula_version": "1.0"
-        }
+        plan = compile_formula(
+            overhead_percent, profit_percent, safety_buffer_percent, formula_version
+        )
+        result = plan.execute(components)
+        result["calculation_id"] = str(uuid.uuid4())
+        result["timestamp"] = datetime.utcnow().isoformat()
+        result["formula_version"] = plan.version
+        return result
     
     @staticmethod
     def calculate_full_estimate(
@@ -244,12 +249,15 @@ class DeterministicCalculator:
         profit_percent: Decimal,
         safety_buffer_percent: Decimal,
         emergency_job: bool = False,
-        weekend_work: bool = False
+        weekend_work: bool = False,
+        formula_version: str = FORMULA_VERSION
     ) -> Dict[str, any]:
         """
         Calculate a complete estimate with all components.
         
         This is the main entry point that orchestrates all calculations.
+        Pass the formula_version of a stored estimate to recreate it under
+        its original formula.
         
         Returns:
             Complete calculation breakdown with final total
@@ -259,21 +267,15 @@ class DeterministicCalculator:
             miles=travel_miles,
             time_minutes=travel_time_minutes,
             vehicle_rate_per_mile=vehicle_rate_per_mile,
-            driver_hourly_rate=driver_hourly_rate
+            driver_hourly_rate=driver_hourly_rate,
+            formula_version=formula_version
         )
         
-        # Determine labor multipliers
-        multipliers = {}
-        if emergency_job:
-            multipliers["emergency"] = Decimal("2.5")
-        elif weekend_work:
-            multipliers["weekend"] = Decimal("2.0")
-        
         # Calculate labor costs
         labor_costs = DeterministicCalculator.calculate_labor_cost(
             hours=estimated_hours,
             crew=crew_rates,
-            multipliers=multipliers
+            multipliers=DeterministicCalculator.labor_multipliers(emergency_job, weekend_work)
         )
         
         # Calculate equipment costs
@@ -283,8 +285,8 @@ class DeterministicCalculator:
         )
         
         # Ensure other costs are Decimal
-        disposal_fees = Decimal(str(disposal_fees))
-        permit_cost = Decimal(str(permit_cost))
+        disposal_fees = _as_decimal(disposal_fees)
+        permit_cost = _as_decimal(permit_cost)
         
         # Combine all cost components
         components = {
@@ -300,10 +302,37 @@ class DeterministicCalculator:
             components=components,
             overhead_percent=overhead_percent,
             profit_percent=profit_percent,
-            safety_buffer_percent=safety_buffer_percent
+            safety_buffer_percent=safety_buffer_percent,
+            formula_version=formula_version
         )
         
         # Create comprehensive result
+        return DeterministicCalculator._build_result(
+            travel_costs, labor_costs, equipment_costs,
+            disposal_fees, permit_cost, components, final_calculation
+        )
+    
+    @staticmethod
+    def labor_multipliers(emergency_job: bool, weekend_work: bool) -> Dict[str, Decimal]:
+        """Labor multipliers for the job; emergency takes precedence over weekend."""
+        multipliers = {}
+        if emergency_job:
+            multipliers["emergency"] = Decimal("2.5")
+        elif weekend_work:
+            multipliers["weekend"] = Decimal("2.0")
+        return multipliers
+    
+    @staticmethod
+    def _build_result(
+        travel_costs: Dict[str, Decimal],
+        labor_costs: Dict[str, Any],
+        equipment_costs: Dict[str, Any],
+        disposal_fees: Decimal,
+        permit_cost: Decimal,
+        components: Dict[str, Decimal],
+        final_calculation: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Assemble the calculate_full_estimate result from its stages."""
         return {
             "travel_breakdown": travel_costs,
             "labor_breakdown": labor_costs,
@@ -315,6 +344,155 @@ class DeterministicCalculator:
             "calculation_checksum": DeterministicCalculator.generate_checksum(final_calculation)
         }
     
+    @staticmethod
+    def changed_stages(previous_inputs: Dict[str, Any], inputs: Dict[str, Any]) -> List[str]:
+        """
+        List the pipeline stages whose inputs differ between two input sets.
+        
+        Inputs are compared by representation, since values such as
+        percentages are echoed into the result ("25.0" vs "25").
+        
+        Args:
+            previous_inputs: calculate_full_estimate arguments of the prior run
+            inputs: New calculate_full_estimate arguments
+            
+        Returns:
+            Stage names from STAGE_INPUTS, in pipeline order
+        """
+        changed = {
+            name for name in inputs
+            if _normalize_input(inputs[name]) != _normalize_input(previous_inputs.get(name))
+        }
+        return [
+            stage for stage, stage_inputs in STAGE_INPUTS.items()
+            if changed.intersection(stage_inputs)
+        ]
+    
+    @staticmethod
+    def formula_stages(previous_version: str, version: str) -> List[str]:
+        """
+        List the pipeline stages priced differently by two formula versions.
+        
+        A stored breakdown can only be carried forward when its stage formula
+        is the same under the version it was priced with. Every stage is
+        listed when the previous version is not registered.
+        
+        Args:
+            previous_version: Formula version of the prior run
+            version: Formula version of the new run
+            
+        Returns:
+            Stage names from STAGE_INPUTS, in pipeline order
+        """
+        if previous_version == version:
+            return []
+        try:
+            previous = get_formula(previous_version)
+        except ValueError:
+            return list(STAGE_INPUTS)
+        current = get_formula(version)
+        return [
+            stage for stage, fields in STAGE_FORMULA_FIELDS.items()
+            if any(getattr(previous, field) != getattr(current, field) for field in fields)
+        ]
+    
+    @staticmethod
+    def recalculate_full_estimate(
+        previous_inputs: Dict[str, Any],
+        previous_result: Dict[str, Any],
+        **inputs: Any
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Recalculate an estimate, recomputing only stages whose inputs changed.
+        
+        Stages whose formula differs between the version of the prior result
+        and the new formula_version (see formula_stages) are recomputed as
+        well. The result is identical
+        to calculate_full_estimate(**inputs) apart from the calculation_id
+        and timestamp, which are only renewed when the margin pipeline runs.
+        
+        Args:
+            previous_inputs: calculate_full_estimate arguments of the prior run
+            previous_result: calculate_full_estimate result of the prior run
+            **inputs: New calculate_full_estimate arguments
+            
+        Returns:
+            Tuple of (result, recomputed stage names)
+        """
+        formula_version = inputs.get("formula_version", FORMULA_VERSION)
+        changed = DeterministicCalculator.changed_stages(previous_inputs, inputs)
+        repriced = DeterministicCalculator.formula_stages(
+            previous_result["final_calculation"].get("formula_version", "1.0"), formula_version
+        )
+        stages = [stage for stage in STAGE_INPUTS if stage in changed or stage in repriced]
+        if not stages:
+            return previous_result, []
+        
+        if "travel" in stages:
+            travel_costs = DeterministicCalculator.calculate_travel_cost(
+                miles=inputs["travel_miles"],
+                time_minutes=inputs["travel_time_minutes"],
+                vehicle_rate_per_mile=inputs["vehicle_rate_per_mile"],
+                driver_hourly_rate=inputs["driver_hourly_rate"],
+                formula_version=formula_version
+            )
+        else:
+            travel_costs = previous_result["travel_breakdown"]
+        
+        if "labor" in stages:
+            labor_costs = DeterministicCalculator.calculate_labor_cost(
+                hours=inputs["estimated_hours"],
+                crew=inputs["crew_rates"],
+                multipliers=DeterministicCalculator.labor_multipliers(
+                    inputs.get("emergency_job", False),
+                    inputs.get("weekend_work", False)
+                )
+            )
+        else:
+            labor_costs = previous_result["labor_breakdown"]
+        
+        if "equipment" in stages:
+            equipment_costs = DeterministicCalculator.calculate_equipment_cost(
+                hours=inputs["estimated_hours"],
+                equipment_list=inputs["equipment_list"]
+            )
+        else:
+            equipment_costs = previous_result["equipment_breakdown"]
+        
+        disposal_fees = _as_decimal(inputs["disposal_fees"])
+        permit_cost = _as_decimal(inputs["permit_cost"])
+        
+        components = {
+            "travel": travel_costs["total"],
+            "labor": labor_costs["total"],
+            "equipment": equipment_costs["total"],
+            "disposal": disposal_fees,
+            "permits": permit_cost
+        }
+        
+        # The margin pipeline only depends on the component totals and percents
+        previous_components = previous_result["cost_components"]
+        if "margins" in stages or any(
+            str(components[key]) != str(previous_components.get(key)) for key in components
+        ):
+            final_calculation = DeterministicCalculator.apply_formula_pipeline(
+                components=components,
+                overhead_percent=inputs["overhead_percent"],
+                profit_percent=inputs["profit_percent"],
+                safety_buffer_percent=inputs["safety_buffer_percent"],
+                formula_version=formula_version
+            )
+            if "margins" not in stages:
+                stages.append("margins")
+        else:
+            final_calculation = previous_result["final_calculation"]
+        
+        result = DeterministicCalculator._build_result(
+            travel_costs, labor_costs, equipment_costs,
+            disposal_fees, permit_cost, components, final_calculation
+        )
+        return result, stages
+    
     @staticmethod
     def generate_checksum(calculation_result: Dict) -> str:
         """
@@ -391,48 +569,134 @@ class TreeServiceCalculator:
     a simpler interface for the API endpoints.
     """
     
-    def __init__(self):
+    def __init__(self, memo: Optional[CalculationMemo] = None):
         self.calculator = DeterministicCalculator()
+        self.memo = memo or get_calculation_memo()
+    
+    @staticmethod
+    def _adjusted_rate(rate: Decimal, adjustment_percent: Any) -> Decimal:
+        """A rate raised (or lowered) by a seasonal percentage, rounded to cents."""
+        if not adjustment_percent:
+            return rate
+        amount = Money.from_value(rate)
+        return (amount + amount.percent(adjustment_percent)).to_decimal()
+    
+    @staticmethod
+    def _build_calculation_kwargs(calculation_input, rates) -> Dict[str, Any]:
+        """
+        Map a CalculationInput schema to calculate_full_estimate arguments.
+        
+        Roles and equipment ids are priced with the given rates, margins come
+        from the effective overhead settings, and a seasonal adjustment in
+        effect is applied to the labor and equipment rates.
+        
+        Args:
+            calculation_input: CalculationInput schema instance
+            rates: CostRates or CostSnapshot for the calculation date
+            
+        Returns:
+            Keyword arguments for DeterministicCalculator.calculate_full_estimate
+            
+        Raises:
+            ValueError: If a rate the input needs is missing
+        """
+        seasonal = rates.seasonal_adjustment
+        labor_adjustment = seasonal.labor_adjustment_percent if seasonal else None
+        equipment_adjustment = seasonal.equipment_adjustment_percent if seasonal else None
+        
+        crew_rates = []
+        for role in calculation_input.labor_rates:
+            rate = rates.labor_rates.get(role)
+            if rate is None:
+                raise ValueError(f"No labor rate found for role: {role}")
+            crew_rates.append({
+                "hourly_rate": TreeServiceCalculator._adjusted_rate(rate, labor_adjustment)
+            })
+        
+        equipment_list = []
+        for equipment_id in calculation_input.equipment_ids:
+            hourly_cost = rates.equipment_costs.get(equipment_id)
+            if hourly_cost is None:
+                raise ValueError(f"Equipment ID {equipment_id} not found or unavailable")
+            equipment_list.append({
+                "id": equipment_id,
+                "hourly_cost": TreeServiceCalculator._adjusted_rate(hourly_cost, equipment_adjustment)
+            })
+        
+        effective_date = rates.calculation_date.isoformat()
+        overhead = rates.overhead
+        if overhead is None:
+            raise ValueError(f"No overhead settings configured for {effective_date}")
+        if rates.vehicle_rate_per_mile is None:
+            raise ValueError(f"No vehicle rates configured for {effective_date}")
+        
+        return dict(
+            travel_miles=calculation_input.travel_miles,
+            travel_time_minutes=calculation_input.travel_time_minutes,
+            estimated_hours=calculation_input.estimated_hours,
+            crew_rates=crew_rates,
+            equipment_list=equipment_list,
+            vehicle_rate_per_mile=rates.vehicle_rate_per_mile,
+            driver_hourly_rate=rates.driver_hourly_rate,
+            disposal_fees=calculation_input.disposal_fees,
+            permit_cost=calculation_input.permit_cost,
+            overhead_percent=overhead.overhead_percent,
+            profit_percent=overhead.profit_percent,
+            safety_buffer_percent=overhead.safety_buffer_percent,
+            emergency_job=calculation_input.emergency_job,
+            weekend_work=calculation_input.weekend_work
+        )
     
-    def calculate_estimate(self, calculation_input) -> 'CalculationResult':
+    def calculate_estimate(
+        self,
+        calculation_input,
+        rates,
+        formula_version: str = FORMULA_VERSION
+    ) -> 'CalculationResult':
         """
         Calculate estimate from CalculationInput schema.
         
+        Identical inputs are served from the shared calculation memo with a
+        fresh calculation_id and timestamp.
+        
         Args:
             calculation_input: CalculationInput schema instance
+            rates: CostRates or CostSnapshot to price the input with
+            formula_version: Formula version to price with (default: current)
             
         Returns:
             CalculationResult schema instance
+            
+        Raises:
+            ValueError: If a rate the input needs is missing
         """
-        from src.schemas.calculation import CalculationResult
-        
-        # Extract input values
-        travel = calculation_input.travel_details
-        labor = calculation_input.labor_details
-        equipment = calculation_input.equipment_details or []
-        margins = calculation_input.margins
+        kwargs = self._build_calculation_kwargs(calculation_input, rates)
+        if formula_version != FORMULA_VERSION:
+            kwargs["formula_version"] = formula_version
         
         # Calculate full estimate
-        result = self.calculator.calculate_full_estimate(
-            travel_miles=travel.miles,
-            travel_time_minutes=travel.estimated_minutes,
-            estimated_hours=labor.estimated_hours,
-            crew_rates=[{"hourly_rate": crew.hourly_rate} for crew in labor.crew],
-            equipment_list=[
-                {"id": eq.equipment_id, "hourly_cost": eq.hourly_cost}
-                for eq in equipment
-            ],
-            vehicle_rate_per_mile=travel.vehicle_rate_per_mile,
-            driver_hourly_rate=travel.driver_hourly_rate,
-            disposal_fees=calculation_input.disposal_fees,
-            permit_cost=calculation_input.permit_cost,
-            overhead_percent=margins.overhead_percent,
-            profit_percent=margins.profit_percent,
-            safety_buffer_percent=margins.safety_buffer_percent,
-            emergency_job=labor.emergency,
-            weekend_work=labor.weekend
+        result = self.memo.calculate(
+            kwargs,
+            self.calculator.calculate_full_estimate,
+            formula_version
         )
         
+        return self._to_calculation_result(result, dict(kwargs, formula_version=formula_version))
+    
+    @staticmethod
+    def _to_calculation_result(
+        result: Dict[str, Any],
+        priced_inputs: Optional[Dict[str, Any]] = None
+    ) -> 'CalculationResult':
+        """
+        Convert a calculate_full_estimate result to a CalculationResult schema.
+        
+        The calculate_full_estimate arguments it was priced from are kept in
+        the details, so a later recalculation compares against the rates
+        actually used rather than the current ones.
+        """
+        from src.schemas.calculation import CalculationResult
+        
         # Extract final calculation
         final_calc = result["final_calculation"]
         
@@ -462,16 +726,18 @@ class TreeServiceCalculator:
                     "profit_percent": final_calc["profit_percent"]
                 },
                 "formula_version": final_calc["formula_version"],
-                "timestamp": final_calc["timestamp"]
+                "timestamp": final_calc["timestamp"],
+                "priced_inputs": priced_inputs
             }
         )
     
-    def calculate_estimate_from_dict(self, calculation_dict: Dict) -> 'CalculationResult':
+    def calculate_estimate_from_dict(self, calculation_dict: Dict, rates) -> 'CalculationResult':
         """
         Calculate estimate from a dictionary (for duplicating estimates).
         
         Args:
             calculation_dict: Dictionary of calculation inputs
+            rates: CostRates or CostSnapshot to price the input with
             
         Returns:
             CalculationResult schema instance
@@ -482,4 +748,153 @@ class TreeServiceCalculator:
         calculation_input = CalculationInput(**calculation_dict)
         
         # Use the main calculation method
-        return self.calculate_estimate(calculation_input)
\ No newline at end of file
+        return self.calculate_estimate(calculation_input, rates)
+    
+    @staticmethod
+    def _from_calculation_result(stored: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a calculate_full_estimate result from a stored CalculationResult dump.
+        
+        Raises:
+            KeyError: If the stored result is missing a breakdown
+        """
+        details = stored["calculation_details"]
+        margins = details["margins_applied"]
+        travel = details["travel_breakdown"]
+        labor = details["labor_breakdown"]
+        equipment = details["equipment_breakdown"]
+        
+        final_calculation = {
+            "direct_costs": _as_decimal(stored["direct_costs"]),
+            "overhead": _as_decimal(stored["overhead_amount"]),
+            "overhead_percent": margins["overhead_percent"],
+            "safety_buffer": _as_decimal(stored["safety_buffer_amount"]),
+            "safety_buffer_percent": margins["safety_buffer_percent"],
+            "profit": _as_decimal(stored["profit_amount"]),
+            "profit_percent": margins["profit_percent"],
+            "subtotal": _as_decimal(stored["subtotal"]),
+            "final_total": _as_decimal(stored["final_total"]),
+            "calculation_id": stored["calculation_id"],
+            "timestamp": details["timestamp"],
+            "formula_version": details["formula_version"]
+        }
+        
+        return DeterministicCalculator._build_result(
+            {key: _as_decimal(value) for key, value in travel.items()},
+            {
+                "base_cost": _as_decimal(labor["base_cost"]),
+                "multipliers_applied": dict(labor["multipliers_applied"]),
+                "total": _as_decimal(labor["total"])
+            },
+            {
+                "itemized": {key: _as_decimal(value) for key, value in equipment["itemized"].items()},
+                "total": _as_decimal(equipment["total"])
+            },
+            _as_decimal(stored["disposal_fees"]),
+            _as_decimal(stored["permit_cost"]),
+            {key: _as_decimal(value) for key, value in details["cost_components"].items()},
+            final_calculation
+        )
+    
+    @staticmethod
+    def _from_priced_inputs(stored: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild calculate_full_estimate arguments from their stored JSON form.
+        
+        Raises:
+            KeyError: If an argument is missing
+        """
+        inputs = {
+            name: _as_decimal(stored[name])
+            for name in (
+                "travel_miles", "estimated_hours", "vehicle_rate_per_mile", "driver_hourly_rate",
+                "disposal_fees", "permit_cost", "overhead_percent", "profit_percent",
+                "safety_buffer_percent"
+            )
+        }
+        inputs["travel_time_minutes"] = int(stored["travel_time_minutes"])
+        inputs["crew_rates"] = [
+            {"hourly_rate": _as_decimal(worker["hourly_rate"])} for worker in stored["crew_rates"]
+        ]
+        inputs["equipment_list"] = [
+            {"id": equipment["id"], "hourly_cost": _as_decimal(equipment["hourly_cost"])}
+            for equipment in stored["equipment_list"]
+        ]
+        inputs["emergency_job"] = bool(stored["emergency_job"])
+        inputs["weekend_work"] = bool(stored["weekend_work"])
+        inputs["formula_version"] = stored["formula_version"]
+        return inputs
+    
+    def recalculate_estimate(
+        self,
+        calculation_input,
+        rates,
+        previous_result: Dict[str, Any]
+    ) -> Tuple['CalculationResult', List[str]]:
+        """
+        Recalculate an existing estimate, recomputing only the stages affected
+        by changed inputs or rates.
+        
+        The new input is compared with the arguments the stored result was
+        priced from, and reused stages must have the same formula under the
+        version they were priced with. Falls back to a full calculation when
+        the stored result predates stored arguments or cannot be rebuilt
+        exactly (the rebuilt result must reproduce the stored checksum and
+        formula version).
+        
+        Args:
+            calculation_input: New CalculationInput schema instance
+            rates: CostRates or CostSnapshot to price the input with
+            previous_result: Stored CalculationResult dump of the estimate
+            
+        Returns:
+            Tuple of (CalculationResult, recomputed stage names)
+        """
+        inputs = self._build_calculation_kwargs(calculation_input, rates)
+        inputs["formula_version"] = FORMULA_VERSION
+        
+        try:
+            prior_inputs = self._from_priced_inputs(previous_result["calculation_details"]["priced_inputs"])
+            prior_result = self._from_calculation_result(previous_result)
+            reusable = (
+                prior_result["calculation_checksum"] == previous_result.get("checksum")
+                and prior_inputs["formula_version"] == prior_result["final_calculation"]["formula_version"]
+            )
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            reusable = False
+        
+        if not reusable:
+            logger.info("Stored calculation not reusable, recalculating in full")
+            result = self.calculator.calculate_full_estimate(**inputs)
+            return self._to_calculation_result(result, inputs), list(STAGE_INPUTS)
+        
+        result, stages = self.calculator.recalculate_full_estimate(
+            prior_inputs, prior_result, **inputs
+        )
+        return self._to_calculation_result(result, inputs), stages
+    
+    def recreate_estimate(
+        self,
+        previous_inputs: Dict[str, Any],
+        previous_result: Dict[str, Any],
+        rates
+    ) -> 'CalculationResult':
+        """
+        Recalculate a stored estimate under the formula version it was priced with.
+        
+        Args:
+            previous_inputs: Stored CalculationInput dump of the estimate
+            previous_result: Stored CalculationResult dump of the estimate
+            rates: CostRates or CostSnapshot of the date the estimate was priced on
+            
+        Returns:
+            CalculationResult schema instance
+        """
+        from src.schemas.calculation import CalculationInput
+        
+        formula_version = previous_result["calculation_details"]["formula_version"]
+        return self.calculate_estimate(
+            CalculationInput(**previous_inputs),
+            rates,
+            formula_version=formula_version
+        )
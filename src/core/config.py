@@ -71,6 +71,31 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     CACHE_TTL_SECONDS: int = 3600
     
+    # In-memory cache fallback: entry and approximate byte budgets, expiry sweep period
+    MEMORY_CACHE_MAX_ENTRIES: int = 10000
+    MEMORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MEMORY_CACHE_SWEEP_INTERVAL_SECONDS: float = 1.0
+    
+    # Optional in-process L1 tier in front of Redis, per key namespace (the
+    # key prefix before the first ":", e.g. "cost_snapshot", "quickbooks")
+    CACHE_L1_NAMESPACES: List[str] = []
+    CACHE_L1_TTL_SECONDS: float = 5.0
+    CACHE_L1_MAX_ENTRIES: int = 1024
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    
+    # get_or_compute: cross-process lock lifetime, and how long/how often
+    # other callers poll for the lock holder's result
+    CACHE_COMPUTE_LOCK_SECONDS: float = 10.0
+    CACHE_COMPUTE_WAIT_SECONDS: float = 5.0
+    CACHE_COMPUTE_POLL_SECONDS: float = 0.05
+    
+    # Redis values at least this many bytes once encoded are zlib-compressed
+    # (0 disables compression)
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+    
+    # In-process memo of full estimate calculations (entries, 0 disables)
+    CALCULATION_MEMO_SIZE: int = 4096
+    
     # Business Rules (using Decimal for precision)
     DEFAULT_OVERHEAD_PERCENT: Decimal = Decimal("25.0")
     DEFAULT_PROFIT_PERCENT: Decimal = Decimal("35.0")
@@ -78,6 +103,9 @@ class Settings(BaseSettings):
     DEFAULT_VEHICLE_RATE_PER_MILE: Decimal = Decimal("0.65")
     DEFAULT_DRIVER_HOURLY_RATE: Decimal = Decimal("25.00")
     
+    # Average driving speed used to derive travel time for quick quotes
+    QUICK_QUOTE_AVERAGE_SPEED_MPH: int = 35
+    
     @field_validator(
         "DEFAULT_OVERHEAD_PERCENT",
         "DEFAULT_PROFIT_PERCENT",
@@ -123,6 +151,8 @@ class Settings(BaseSettings):
     MAX_ESTIMATE_HOURS: Decimal = Decimal("16.0")
     MAX_TRAVEL_MILES: Decimal = Decimal("500.0")
     MAX_CREW_SIZE: int = 10
+    SWEEP_MAX_CELLS: int = 250000
+    BULK_VALIDATION_MAX_ITEMS: int = 1000
     
     # Rounding
     FINAL_TOTAL_ROUNDING: Decimal = Decimal("5.0")
@@ -0,0 +1,221 @@
+"""
+Versioned formula pipelines.
+
+Each formula version is registered once as a FormulaDefinition: the order
+in which margins compound on the direct costs, how the final total is
+rounded and how travel time is priced. A definition compiles, per margin
+set, into a FormulaPlan with the percentages already parsed into exact
+ratios and rendered for output.
+Plans are cached, so the hot path only sums components and does integer
+arithmetic, and stored estimates can be recreated under the version they
+were priced with.
+"""
+from dataclasses import dataclass
+from decimal import Context, Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP
+from functools import lru_cache
+from math import lcm
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.money import Money, divide_rounded, to_ratio
+
+
+CURRENT_FORMULA_VERSION = "1.1"
+
+# Margins a formula can apply, keyed by the percent argument that sets them
+MARGIN_PERCENTS = {
+    "overhead": "overhead_percent",
+    "safety_buffer": "safety_buffer_percent",
+    "profit": "profit_percent"
+}
+
+
+@dataclass(frozen=True)
+class FormulaDefinition:
+    """
+    One version of the pricing formula.
+
+    Margins in ``steps`` are applied in order, each as a percentage of the
+    running subtotal (so later margins compound on earlier ones). The
+    final subtotal is rounded to a multiple of ``round_to`` whole dollars.
+
+    Travel time is priced as minutes * hourly rate / 60 in exact arithmetic
+    unless ``travel_time_precision`` is set; then the hours and their cost
+    are each rounded half-even to that many significant digits first, as
+    the original 10-digit decimal context did.
+    """
+    version: str
+    steps: Tuple[str, ...]
+    round_to: int = 5
+    rounding: str = ROUND_HALF_UP
+    travel_time_precision: Optional[int] = None
+
+    def __post_init__(self):
+        unknown = [step for step in self.steps if step not in MARGIN_PERCENTS]
+        if unknown:
+            raise ValueError(f"Unknown margin steps: {', '.join(unknown)}")
+        if len(set(self.steps)) != len(self.steps):
+            raise ValueError("Each margin can only be applied once")
+
+    def compile(
+        self,
+        overhead_percent: Any,
+        profit_percent: Any,
+        safety_buffer_percent: Any
+    ) -> "FormulaPlan":
+        """Build the execution plan for one margin set."""
+        percents = {
+            "overhead_percent": overhead_percent,
+            "profit_percent": profit_percent,
+            "safety_buffer_percent": safety_buffer_percent
+        }
+        steps = []
+        for step in self.steps:
+            percent = percents[MARGIN_PERCENTS[step]]
+            numerator, denominator = to_ratio(percent)
+            rendered = str(percent if isinstance(percent, Decimal) else Decimal(str(percent)))
+            steps.append((step, numerator, denominator * 100, rendered))
+        return FormulaPlan(self, tuple(steps))
+
+
+class FormulaPlan:
+    """
+    A formula compiled for one margin set.
+
+    ``steps`` holds (margin name, numerator, denominator, rendered percent)
+    with the percentage already divided by 100.
+    """
+
+    __slots__ = ("version", "steps", "round_to", "rounding")
+
+    def __init__(self, definition: FormulaDefinition, steps: Tuple[Tuple[str, int, int, str], ...]):
+        self.version = definition.version
+        self.steps = steps
+        self.round_to = definition.round_to
+        self.rounding = definition.rounding
+
+    def execute(self, components: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply the plan to cost components.
+
+        Components are summed exactly, so their order does not matter.
+
+        Returns:
+            Dictionary with direct_costs, each margin amount and percent,
+            subtotal and final_total
+        """
+        amounts = [to_ratio(value) for value in components.values()]
+        common_d = lcm(*(d for _, d in amounts)) if amounts else 1
+        direct_costs = Money.from_ratio(
+            sum(n * (common_d // d) for n, d in amounts),
+            common_d
+        )
+
+        result: Dict[str, Any] = {"direct_costs": direct_costs.to_decimal()}
+        running = direct_costs.cents
+        for name, numerator, denominator, rendered in self.steps:
+            amount = divide_rounded(running * numerator, denominator, self.rounding)
+            running += amount
+            result[name] = Money(amount).to_decimal()
+            result[f"{name}_percent"] = rendered
+
+        subtotal = Money(running)
+        result["subtotal"] = subtotal.to_decimal()
+        result["final_total"] = subtotal.round_to(self.round_to, self.rounding).to_whole_decimal()
+        return result
+
+
+_formulas: Dict[str, FormulaDefinition] = {}
+
+
+def register_formula(definition: FormulaDefinition) -> FormulaDefinition:
+    """
+    Register a formula version.
+
+    Raises:
+        ValueError: If the version is already registered
+    """
+    if definition.version in _formulas:
+        raise ValueError(f"Formula version {definition.version} is already registered")
+    _formulas[definition.version] = definition
+    return definition
+
+
+def get_formula(version: str = CURRENT_FORMULA_VERSION) -> FormulaDefinition:
+    """
+    Get a registered formula version.
+
+    Raises:
+        ValueError: If the version is unknown
+    """
+    try:
+        return _formulas[version]
+    except KeyError:
+        raise ValueError(f"Unknown formula version: {version}")
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(version: str, overhead: str, profit: str, safety_buffer: str) -> FormulaPlan:
+    return get_formula(version).compile(Decimal(overhead), Decimal(profit), Decimal(safety_buffer))
+
+
+def compile_formula(
+    overhead_percent: Any,
+    profit_percent: Any,
+    safety_buffer_percent: Any,
+    version: str = CURRENT_FORMULA_VERSION
+) -> FormulaPlan:
+    """
+    Get the cached plan for a formula version and margin set.
+
+    Margins are keyed by their string form, since "25" and "25.0" are
+    equal but are echoed differently in results.
+    """
+    return _compile_cached(
+        version, str(overhead_percent), str(profit_percent), str(safety_buffer_percent)
+    )
+
+
+@lru_cache(maxsize=None)
+def _travel_time_context(precision: int) -> Context:
+    return Context(prec=precision, rounding=ROUND_HALF_EVEN)
+
+
+def travel_time_cost(
+    time_minutes: Any,
+    driver_hourly_rate: Any,
+    version: str = CURRENT_FORMULA_VERSION
+) -> Money:
+    """
+    Driver cost of travel time under a formula version.
+
+    Raises:
+        ValueError: If the version is unknown
+    """
+    minutes_n, minutes_d = to_ratio(time_minutes)
+    precision = get_formula(version).travel_time_precision
+    if precision is None:
+        driver_n, driver_d = to_ratio(driver_hourly_rate)
+        return Money.from_ratio(minutes_n * driver_n, minutes_d * driver_d * 60)
+
+    context = _travel_time_context(precision)
+    hours = context.divide(Decimal(minutes_n), Decimal(minutes_d * 60))
+    if not isinstance(driver_hourly_rate, Decimal):
+        driver_hourly_rate = Decimal(str(driver_hourly_rate))
+    return Money.from_value(context.multiply(hours, driver_hourly_rate))
+
+
+# Version 1.0: overhead, then safety buffer, then profit, rounded to the nearest $5;
+# travel hours rounded to 10 digits before pricing
+register_formula(FormulaDefinition(
+    version="1.0",
+    steps=("overhead", "safety_buffer", "profit"),
+    round_to=5,
+    travel_time_precision=10
+))
+
+# Version 1.1: as 1.0, with travel time priced exactly (exact half cents round up)
+register_formula(FormulaDefinition(
+    version="1.1",
+    steps=("overhead", "safety_buffer", "profit"),
+    round_to=5
+))
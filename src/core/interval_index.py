@@ -0,0 +1,111 @@
+"""
+Interval index for effective-dated rows.
+
+An augmented interval tree stored implicitly in arrays: intervals are kept
+sorted by start, the middle of any index range is that range's root, and
+each root records the latest end in its subtree. A date lookup or overlap
+check visits O(log n) subtrees plus the matches it returns, instead of
+scanning (or querying) every row. Intervals are closed, matching the
+``effective_from <= d AND (effective_to IS NULL OR effective_to >= d)``
+queries; an open-ended interval (no end date) never ends.
+
+Writes rebuild the arrays in O(n), which suits cost tables that change a
+few times a year and are read on every calculation.
+"""
+from datetime import date
+from typing import Callable, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+OPEN_END = date.max.toordinal()
+
+
+class IntervalIndex(Generic[T]):
+    """Closed date intervals with attached values."""
+
+    def __init__(self, items: Iterable[Tuple[date, Optional[date], T]] = ()):
+        entries = [(start.toordinal(), self._end(end), value) for start, end, value in items]
+        self._build(entries)
+
+    @staticmethod
+    def _end(end: Optional[date]) -> int:
+        return OPEN_END if end is None else end.toordinal()
+
+    def _build(self, entries: List[Tuple[int, int, T]]) -> None:
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        self._starts = [start for start, _, _ in entries]
+        self._ends = [end for _, end, _ in entries]
+        self._values = [value for _, _, value in entries]
+        self._max_end = list(self._ends)
+        if entries:
+            self._augment(0, len(entries))
+
+    def _augment(self, lo: int, hi: int) -> int:
+        """Fill in the latest end of each subtree; returns the range's latest end."""
+        mid = (lo + hi) // 2
+        latest = self._ends[mid]
+        if lo < mid:
+            latest = max(latest, self._augment(lo, mid))
+        if mid + 1 < hi:
+            latest = max(latest, self._augment(mid + 1, hi))
+        self._max_end[mid] = latest
+        return latest
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def add(self, start: date, end: Optional[date], value: T) -> None:
+        """Add an interval."""
+        entries = list(zip(self._starts, self._ends, self._values))
+        entries.append((start.toordinal(), self._end(end), value))
+        self._build(entries)
+
+    def remove_where(self, predicate: Callable[[T], bool]) -> int:
+        """Remove intervals whose value matches; returns how many were removed."""
+        entries = list(zip(self._starts, self._ends, self._values))
+        kept = [entry for entry in entries if not predicate(entry[2])]
+        if len(kept) != len(entries):
+            self._build(kept)
+        return len(entries) - len(kept)
+
+    def at(self, when: date) -> List[T]:
+        """Values whose interval contains a date, ordered by start."""
+        return self.overlapping(when, when)
+
+    def overlapping(self, start: date, end: Optional[date]) -> List[T]:
+        """Values whose interval overlaps [start, end], ordered by start."""
+        low, high = start.toordinal(), self._end(end)
+        matches: List[int] = []
+        self._search(0, len(self._values), low, high, matches)
+        return [self._values[i] for i in matches]
+
+    def overlaps(
+        self,
+        start: date,
+        end: Optional[date],
+        predicate: Optional[Callable[[T], bool]] = None
+    ) -> bool:
+        """Whether any (matching) interval overlaps [start, end]."""
+        return any(
+            predicate is None or predicate(value)
+            for value in self.overlapping(start, end)
+        )
+
+    def _search(self, lo: int, hi: int, low: int, high: int, matches: List[int]) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        # Nothing in this subtree ends late enough to reach the query
+        if self._max_end[mid] < low:
+            return
+        self._search(lo, mid, low, high, matches)
+        # This interval and everything to its right start after the query
+        if self._starts[mid] > high:
+            return
+        if self._ends[mid] >= low:
+            matches.append(mid)
+        self._search(mid + 1, hi, low, high, matches)
@@ -0,0 +1,169 @@
+"""
+Quick quotes from averaged rates.
+
+Prices a ballpark from a QuickCalculationInput using an in-process rate
+snapshot, so the request path never touches the database and only builds
+the totals (no per-stage breakdowns or CalculationResult). Travel time is
+derived from the distance at an average driving speed. With the same
+rates a quick quote equals the full calculation for a crew and equipment
+list at the average rates.
+"""
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from decimal import Decimal
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from src.core.config import settings
+from src.core.formulas import CURRENT_FORMULA_VERSION, compile_formula, travel_time_cost
+from src.utils.money import Money, divide_rounded, to_ratio
+
+
+@dataclass(frozen=True)
+class QuickQuoteRates:
+    """Immutable snapshot of the rates used for quick quotes."""
+    vehicle_rate_per_mile: Decimal
+    driver_hourly_rate: Decimal
+    overhead_percent: Decimal
+    profit_percent: Decimal
+    safety_buffer_percent: Decimal
+    average_speed_mph: int
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+    # Cost data version and date the rates were loaded for (None: configured defaults)
+    version: Optional[int] = None
+    calculation_date: Optional[date] = None
+
+    @classmethod
+    def from_settings(cls) -> "QuickQuoteRates":
+        """Snapshot of the configured default rates."""
+        return cls(
+            vehicle_rate_per_mile=settings.DEFAULT_VEHICLE_RATE_PER_MILE,
+            driver_hourly_rate=settings.DEFAULT_DRIVER_HOURLY_RATE,
+            overhead_percent=settings.DEFAULT_OVERHEAD_PERCENT,
+            profit_percent=settings.DEFAULT_PROFIT_PERCENT,
+            safety_buffer_percent=settings.DEFAULT_SAFETY_BUFFER_PERCENT,
+            average_speed_mph=settings.QUICK_QUOTE_AVERAGE_SPEED_MPH
+        )
+
+    def with_cost_rates(self, rates: Any, version: Optional[int] = None) -> "QuickQuoteRates":
+        """
+        Copy of this snapshot updated from loaded cost data.
+
+        Args:
+            rates: CostRates loaded by CalculationService.load_cost_rates
+            version: Cost data version read before the rates were loaded
+        """
+        changes: Dict[str, Any] = {
+            "loaded_at": datetime.utcnow(),
+            "version": version,
+            "calculation_date": rates.calculation_date
+        }
+        if rates.vehicle_rate_per_mile is not None:
+            changes["vehicle_rate_per_mile"] = rates.vehicle_rate_per_mile
+            changes["driver_hourly_rate"] = rates.driver_hourly_rate
+        if rates.overhead is not None:
+            changes["overhead_percent"] = rates.overhead.overhead_percent
+            changes["profit_percent"] = rates.overhead.profit_percent
+            changes["safety_buffer_percent"] = rates.overhead.safety_buffer_percent
+        return replace(self, **changes)
+
+
+_rates = QuickQuoteRates.from_settings()
+_rates_lock = Lock()
+
+
+def get_quick_quote_rates() -> QuickQuoteRates:
+    """Get the current rate snapshot."""
+    return _rates
+
+
+def set_quick_quote_rates(rates: QuickQuoteRates) -> None:
+    """Replace the rate snapshot; quotes in progress keep the one they read."""
+    global _rates
+    with _rates_lock:
+        _rates = rates
+
+
+@dataclass
+class QuickQuote:
+    """A quick quote; money values are integer cents."""
+    travel_minutes: int
+    travel_cost: int
+    labor_cost: int
+    equipment_cost: int
+    direct_costs: int
+    final_total: int
+    formula_version: str
+    rates_loaded_at: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "travel_minutes": self.travel_minutes,
+            "travel_cost": str(Money(self.travel_cost)),
+            "labor_cost": str(Money(self.labor_cost)),
+            "equipment_cost": str(Money(self.equipment_cost)),
+            "direct_costs": str(Money(self.direct_costs)),
+            "final_total": str(self.final_total // 100),
+            "formula_version": self.formula_version,
+            "rates_loaded_at": self.rates_loaded_at.isoformat()
+        }
+
+
+def quick_quote(
+    travel_miles: Any,
+    estimated_hours: Any,
+    crew_size: int,
+    average_hourly_rate: Any,
+    equipment_count: int = 0,
+    average_equipment_rate: Any = 0,
+    rates: Optional[QuickQuoteRates] = None
+) -> QuickQuote:
+    """
+    Price a quick quote.
+
+    Args:
+        travel_miles: One-way distance in miles
+        estimated_hours: Estimated work hours
+        crew_size: Number of crew members
+        average_hourly_rate: Average crew hourly rate
+        equipment_count: Number of pieces of equipment
+        average_equipment_rate: Average equipment hourly cost
+        rates: Rate snapshot (default: the current snapshot)
+
+    Returns:
+        QuickQuote with component and final totals
+    """
+    rates = rates or _rates
+    miles_n, miles_d = to_ratio(travel_miles)
+    hours_n, hours_d = to_ratio(estimated_hours)
+
+    # Travel: distance at the vehicle rate plus driving time at the driver rate
+    travel_minutes = divide_rounded(miles_n * 60, miles_d * rates.average_speed_mph)
+    vehicle_n, vehicle_d = to_ratio(rates.vehicle_rate_per_mile)
+    travel = (
+        Money.from_ratio(miles_n * vehicle_n, miles_d * vehicle_d)
+        + travel_time_cost(travel_minutes, rates.driver_hourly_rate)
+    )
+
+    crew_n, crew_d = to_ratio(average_hourly_rate)
+    labor = Money.from_ratio(hours_n * crew_n * crew_size, hours_d * crew_d)
+
+    # Each piece is rounded to cents, as in the itemized equipment breakdown
+    equipment_n, equipment_d = to_ratio(average_equipment_rate)
+    equipment = Money(
+        Money.from_ratio(hours_n * equipment_n, hours_d * equipment_d).cents * equipment_count
+    )
+
+    plan = compile_formula(rates.overhead_percent, rates.profit_percent, rates.safety_buffer_percent)
+    final = plan.execute({"travel": travel, "labor": labor, "equipment": equipment})
+
+    return QuickQuote(
+        travel_minutes=travel_minutes,
+        travel_cost=travel.cents,
+        labor_cost=labor.cents,
+        equipment_cost=equipment.cents,
+        direct_costs=Money.from_value(final["direct_costs"]).cents,
+        final_total=Money.from_value(final["final_total"]).cents,
+        formula_version=CURRENT_FORMULA_VERSION,
+        rates_loaded_at=rates.loaded_at
+    )
@@ -0,0 +1,253 @@
+"""
+Monte Carlo price ranges for jobs with uncertain inputs.
+
+Samples estimated hours, travel minutes and disposal volume from simple
+distributions and prices every sample through the batch pricing stages,
+giving percentile totals and a safety buffer backed by the spread of the
+direct costs instead of a flat default.
+"""
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_CEILING
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.core.batch_calculator import (
+    BatchCalculator, MILES_PLACES, MONEY_PLACES, PERCENT_PLACES, VEHICLE_RATE_PLACES,
+    format_whole_dollars, round_half_up_div, to_fixed_point
+)
+from src.utils.money import divide_rounded, to_ratio
+
+
+DISTRIBUTION_KINDS = ("fixed", "uniform", "triangular", "pert")
+
+# Suggested safety buffers are rounded up to this step (percent)
+SAFETY_BUFFER_STEP = Decimal("0.5")
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    A bounded distribution for one uncertain input.
+
+    ``mode`` is the most likely value (used by triangular and PERT, and as
+    the point estimate for every kind).
+    """
+    kind: str
+    low: float
+    mode: float
+    high: float
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTION_KINDS:
+            raise ValueError(f"Distribution must be one of: {', '.join(DISTRIBUTION_KINDS)}")
+        if not self.low <= self.mode <= self.high:
+            raise ValueError("Distribution requires low <= mode <= high")
+        if self.low < 0:
+            raise ValueError("Distribution values cannot be negative")
+
+    @classmethod
+    def fixed(cls, value: float) -> "Distribution":
+        return cls("fixed", value, value, value)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw ``size`` float samples."""
+        if self.kind == "fixed" or self.low == self.high:
+            return np.full(size, float(self.mode))
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high, size)
+        if self.kind == "triangular":
+            return rng.triangular(self.low, self.mode, self.high, size)
+
+        # PERT: a beta distribution scaled to [low, high] and weighted to the mode
+        span = self.high - self.low
+        alpha = 1 + 4 * (self.mode - self.low) / span
+        beta = 1 + 4 * (self.high - self.mode) / span
+        return self.low + rng.beta(alpha, beta, size) * span
+
+
+@dataclass
+class PriceRange:
+    """Outcome of a Monte Carlo run; money values are integer cents."""
+    samples: int
+    point_total: int
+    p10: int
+    p50: int
+    p90: int
+    target_percentile: int
+    suggested_safety_buffer_percent: Decimal
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "point_total": format_whole_dollars(self.point_total),
+            "p10": format_whole_dollars(self.p10),
+            "p50": format_whole_dollars(self.p50),
+            "p90": format_whole_dollars(self.p90),
+            "target_percentile": self.target_percentile,
+            "suggested_safety_buffer_percent": str(self.suggested_safety_buffer_percent)
+        }
+
+
+class RiskSimulator:
+    """
+    Prices a job over sampled hours, travel minutes and disposal volume.
+
+    The base job is given as calculate_full_estimate keyword arguments.
+    Disposal volume is priced as volume * fee per unit when a volume
+    distribution is supplied; otherwise the base disposal fees are used.
+    """
+
+    def __init__(self, base_inputs: Dict[str, Any]):
+        self.base_inputs = base_inputs
+
+        def scalar(name: str, places: int) -> np.ndarray:
+            return to_fixed_point([base_inputs[name]], places, name)
+
+        self.miles = scalar("travel_miles", MILES_PLACES)
+        self.vehicle_rate = scalar("vehicle_rate_per_mile", VEHICLE_RATE_PLACES)
+        self.driver_rate = scalar("driver_hourly_rate", MONEY_PLACES)
+        self.permit_cost = scalar("permit_cost", MONEY_PLACES)
+        self.disposal_fees = scalar("disposal_fees", MONEY_PLACES)
+        self.overhead_pct = scalar("overhead_percent", PERCENT_PLACES)
+        self.profit_pct = scalar("profit_percent", PERCENT_PLACES)
+        self.buffer_pct = scalar("safety_buffer_percent", PERCENT_PLACES)
+        self.crew_total = to_fixed_point(
+            [worker["hourly_rate"] for worker in base_inputs["crew_rates"]],
+            MONEY_PLACES, "crew_rates"
+        ).sum()
+        self.equipment_rates = to_fixed_point(
+            [equipment["hourly_cost"] for equipment in base_inputs["equipment_list"]],
+            MONEY_PLACES, "equipment_list"
+        )
+        self.multiplier = BatchCalculator.labor_multipliers(
+            1, base_inputs.get("emergency_job", False), base_inputs.get("weekend_work", False)
+        )
+
+    def direct_costs(
+        self,
+        hours: np.ndarray,
+        minutes: np.ndarray,
+        disposal: np.ndarray
+    ) -> np.ndarray:
+        """
+        Direct costs in cents for fixed-point hours (hundredths), whole minutes
+        and disposal fees (cents).
+        """
+        travel = BatchCalculator.travel_costs(self.miles, minutes, self.vehicle_rate, self.driver_rate)
+        labor = BatchCalculator.labor_costs(hours, self.crew_total, self.multiplier)
+        if len(self.equipment_rates):
+            equipment = BatchCalculator.equipment_costs(hours, self.equipment_rates)
+        else:
+            equipment = 0
+        return travel["total"] + labor["total"] + equipment + disposal + self.permit_cost
+
+    def run(
+        self,
+        hours: Distribution,
+        travel_minutes: Optional[Distribution] = None,
+        disposal_volume: Optional[Distribution] = None,
+        disposal_fee_per_unit: Optional[Decimal] = None,
+        samples: int = 10000,
+        target_percentile: int = 90,
+        seed: Optional[int] = None
+    ) -> PriceRange:
+        """
+        Run the simulation.
+
+        Args:
+            hours: Distribution of estimated work hours
+            travel_minutes: Distribution of travel minutes (default: base value)
+            disposal_volume: Distribution of disposal volume (default: base fees)
+            disposal_fee_per_unit: Fee per unit of disposal volume (required with a volume)
+            samples: Number of samples
+            target_percentile: Percentile of direct costs the buffer should cover
+            seed: Seed for reproducible runs
+
+        Returns:
+            PriceRange with percentile totals and a suggested safety buffer
+
+        Raises:
+            ValueError: If the inputs are invalid, including a disposal volume
+                without a positive fee per unit
+        """
+        if samples < 1:
+            raise ValueError("At least one sample is required")
+        if not 50 <= target_percentile <= 99:
+            raise ValueError("Target percentile must be between 50 and 99")
+
+        if disposal_volume is not None and (disposal_fee_per_unit is None or disposal_fee_per_unit <= 0):
+            # A zero fee would silently price the sampled volume at nothing
+            raise ValueError("A disposal volume requires a disposal fee per unit greater than zero")
+
+        rng = np.random.default_rng(seed)
+        travel_minutes = travel_minutes or Distribution.fixed(float(self.base_inputs["travel_time_minutes"]))
+
+        # Quantize samples to the scales the calculator accepts
+        sampled_hours = np.maximum(np.rint(hours.sample(rng, samples) * 100).astype(np.int64), 1)
+        sampled_minutes = np.rint(travel_minutes.sample(rng, samples)).astype(np.int64)
+        if disposal_volume is not None:
+            fee_cents = int(to_fixed_point([disposal_fee_per_unit], MONEY_PLACES, "disposal_fee_per_unit")[0])
+
+            def disposal_cents(volume: np.ndarray) -> np.ndarray:
+                # volume is in hundredths of a unit
+                return round_half_up_div(volume * fee_cents, 100)
+
+            sampled_disposal = disposal_cents(
+                np.rint(disposal_volume.sample(rng, samples) * 100).astype(np.int64)
+            )
+            point_disposal = disposal_cents(np.array([round(disposal_volume.mode * 100)]))
+        else:
+            sampled_disposal = np.broadcast_to(self.disposal_fees, (samples,))
+            point_disposal = self.disposal_fees
+
+        direct = self.direct_costs(sampled_hours, sampled_minutes, sampled_disposal)
+        totals = BatchCalculator.apply_formula_pipeline(
+            direct, self.overhead_pct, self.profit_pct, self.buffer_pct
+        )["final_total"]
+
+        point_direct = self.direct_costs(
+            np.array([round(hours.mode * 100)], dtype=np.int64),
+            np.array([round(travel_minutes.mode)], dtype=np.int64),
+            point_disposal
+        )
+        point_total = BatchCalculator.apply_formula_pipeline(
+            point_direct, self.overhead_pct, self.profit_pct, self.buffer_pct
+        )["final_total"]
+
+        p10, p50, p90 = np.percentile(totals, [10, 50, 90], method="higher")
+
+        return PriceRange(
+            samples=samples,
+            point_total=int(point_total[0]),
+            p10=int(p10),
+            p50=int(p50),
+            p90=int(p90),
+            target_percentile=target_percentile,
+            suggested_safety_buffer_percent=self.suggest_safety_buffer(
+                direct, int(point_direct[0]), target_percentile
+            )
+        )
+
+    @staticmethod
+    def suggest_safety_buffer(direct: np.ndarray, point_direct: int, target_percentile: int) -> Decimal:
+        """
+        Safety buffer that lifts the point estimate to a percentile of direct costs.
+
+        Overhead, buffer and profit all scale the direct costs, so a buffer
+        of (P_target / point - 1) makes the quoted price cover the target
+        percentile outcome. Rounded up to SAFETY_BUFFER_STEP, never negative.
+        """
+        if point_direct <= 0:
+            return Decimal("0.0")
+
+        target = int(np.percentile(direct, target_percentile, method="higher"))
+        step_n, step_d = to_ratio(SAFETY_BUFFER_STEP)
+
+        # steps = ceil(((target / point) - 1) * 100 / step), in exact integers
+        steps = divide_rounded(
+            (target - point_direct) * 100 * step_d,
+            point_direct * step_n,
+            ROUND_CEILING
+        )
+        return max(steps, 0) * SAFETY_BUFFER_STEP
@@ -0,0 +1,84 @@
+"""
+Day-of-year lookup for seasonal adjustments.
+
+Seasonal adjustments recur every year between a start and end month/day,
+possibly wrapping over the new year. Rather than evaluating every window
+on each lookup, a SeasonalCalendar is compiled once per set of active
+adjustments into 366 slots (one per day of a leap year, so February 29
+has its own) holding the ids of the adjustments in effect that day.
+"""
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+DAYS_IN_CALENDAR = 366
+
+# Day of year in a leap year, so every month/day has a slot
+_LEAP_YEAR = 2000
+
+
+def calendar_slot(when: date) -> int:
+    """Slot (0-365) of a date's month and day."""
+    return date(_LEAP_YEAR, when.month, when.day).timetuple().tm_yday - 1
+
+
+def in_season(adjustment: Any, month: int, day: int) -> bool:
+    """Whether a month/day falls in an adjustment's start/end window."""
+    after_start = month > adjustment.start_month or (
+        month == adjustment.start_month and day >= adjustment.start_day
+    )
+    before_end = month < adjustment.end_month or (
+        month == adjustment.end_month and day <= adjustment.end_day
+    )
+    if adjustment.start_month <= adjustment.end_month:
+        # Normal case: adjustment doesn't span year boundary
+        return after_start and before_end
+    # Adjustment spans year boundary (e.g., Dec to Feb)
+    return after_start or before_end
+
+
+class SeasonalCalendar:
+    """
+    Adjustments in effect on each day of the year.
+
+    Adjustments need id, start_month, start_day, end_month and end_day
+    attributes; lookups return them in the order they were given.
+    """
+
+    def __init__(self, adjustments: Iterable[Any] = ()):
+        self._adjustments: Dict[Any, Any] = {}
+        slots: List[List[Any]] = [[] for _ in range(DAYS_IN_CALENDAR)]
+        for adjustment in adjustments:
+            self._adjustments[adjustment.id] = adjustment
+
+        day = date(_LEAP_YEAR, 1, 1)
+        for slot in slots:
+            for adjustment_id, adjustment in self._adjustments.items():
+                if in_season(adjustment, day.month, day.day):
+                    slot.append(adjustment_id)
+            day += timedelta(days=1)
+        self._slots: Tuple[Tuple[Any, ...], ...] = tuple(tuple(slot) for slot in slots)
+
+    def __len__(self) -> int:
+        return len(self._adjustments)
+
+    def ids_on(self, when: date) -> Tuple[Any, ...]:
+        """Ids of the adjustments in effect on a date."""
+        return self._slots[calendar_slot(when)]
+
+    def on(self, when: date) -> List[Any]:
+        """Adjustments in effect on a date."""
+        return [self._adjustments[adjustment_id] for adjustment_id in self.ids_on(when)]
+
+    def between(self, start: date, end: date) -> List[Any]:
+        """
+        Adjustments in effect on any day from start to end inclusive, in
+        the order they first take effect.
+        """
+        seen: Dict[Any, None] = {}
+        # Any 366 consecutive days cover every month/day that can occur
+        days = min((end - start).days + 1, DAYS_IN_CALENDAR)
+        for offset in range(max(days, 0)):
+            for adjustment_id in self.ids_on(start + timedelta(days=offset)):
+                seen.setdefault(adjustment_id)
+        return [self._adjustments[adjustment_id] for adjustment_id in seen]
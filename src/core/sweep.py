@@ -0,0 +1,232 @@
+"""
+Scenario sweep engine for negotiation grids.
+
+Prices a base job across a grid of up to three axes (hours, crew size,
+overhead, profit, safety buffer) using the batch pricing stages. Each
+stage is evaluated only over the axes it depends on and NumPy
+broadcasting expands it to the full grid, so travel cost is computed
+once and labor/equipment once per hours/crew combination regardless of
+how many margin cells are requested.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from src.core.batch_calculator import (
+    BatchCalculator, FORMULA_VERSION, HOURS_PLACES, MILES_PLACES,
+    MINUTES_PLACES, MONEY_PLACES, PERCENT_PLACES, VEHICLE_RATE_PLACES,
+    format_whole_dollars, to_fixed_point
+)
+from src.core.config import settings
+
+
+SWEEP_PARAMETERS = (
+    "estimated_hours",
+    "crew_size",
+    "overhead_percent",
+    "profit_percent",
+    "safety_buffer_percent"
+)
+
+MAX_SWEEP_AXES = 3
+
+
+class SweepResult:
+    """
+    Grid of final totals produced by a sweep.
+
+    ``final_total`` is an int64 array of cents with one dimension per axis,
+    in the order the axes were given.
+    """
+
+    def __init__(self, axes: List[Tuple[str, List[Any]]], final_total: np.ndarray):
+        self.axes = axes
+        self.final_total = final_total
+        self.formula_version = FORMULA_VERSION
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.final_total.shape
+
+    def header(self) -> Dict[str, Any]:
+        """Describe the grid layout for clients."""
+        return {
+            "axes": [
+                {"parameter": name, "values": [str(value) for value in values]}
+                for name, values in self.axes
+            ],
+            "shape": list(self.shape),
+            "unit": "dollars",
+            "formula_version": self.formula_version
+        }
+
+    def iter_rows(self) -> Iterator[Tuple[List[int], List[int]]]:
+        """
+        Yield the grid one row (last axis) at a time.
+
+        Yields:
+            Tuple of (index into the leading axes, final totals in whole dollars)
+        """
+        rows = self.final_total.reshape(-1, self.shape[-1]) // 100
+        leading_shape = self.shape[:-1]
+
+        for flat_index, row in enumerate(rows):
+            index = list(np.unravel_index(flat_index, leading_shape)) if leading_shape else []
+            yield [int(i) for i in index], row.tolist()
+
+    def total_at(self, *index: int) -> Decimal:
+        """Return one cell as a whole-dollar Decimal."""
+        return Decimal(format_whole_dollars(int(self.final_total[index])))
+
+
+class ScenarioSweep:
+    """
+    Prices a base calculation over a grid of parameter values.
+
+    The base job is given as calculate_full_estimate keyword arguments.
+    Margins are used as given; job-size overhead adjustments applied during
+    input enrichment are not re-evaluated per hours value.
+    """
+
+    def __init__(self, base_inputs: Dict[str, Any]):
+        self.base_inputs = base_inputs
+        self.crew_rates = to_fixed_point(
+            [worker["hourly_rate"] for worker in base_inputs["crew_rates"]],
+            MONEY_PLACES,
+            "crew_rates"
+        )
+        if not len(self.crew_rates):
+            raise ValueError("Base scenario must have at least one crew member")
+
+        self.equipment_rates = to_fixed_point(
+            [equipment["hourly_cost"] for equipment in base_inputs["equipment_list"]],
+            MONEY_PLACES,
+            "equipment_list"
+        )
+
+    @staticmethod
+    def validate_axes(axes: Sequence[Tuple[str, Sequence[Any]]]) -> None:
+        """
+        Check axis names, value limits and grid size.
+
+        Raises:
+            ValueError: If the grid is invalid or too large
+        """
+        if not axes or len(axes) > MAX_SWEEP_AXES:
+            raise ValueError(f"A sweep needs between 1 and {MAX_SWEEP_AXES} axes")
+
+        names = [name for name, _ in axes]
+        if len(set(names)) != len(names):
+            raise ValueError("Each parameter can only be swept once")
+
+        cells = 1
+        for name, values in axes:
+            if name not in SWEEP_PARAMETERS:
+                raise ValueError(f"Cannot sweep parameter: {name}")
+            if not values:
+                raise ValueError(f"Axis {name} has no values")
+            if name == "crew_size":
+                sizes = [Decimal(str(v)) for v in values]
+                if any(size != size.to_integral_value() for size in sizes):
+                    raise ValueError("Crew size values must be whole numbers")
+                if not all(1 <= size <= settings.MAX_CREW_SIZE for size in sizes):
+                    raise ValueError(f"Crew size must be between 1 and {settings.MAX_CREW_SIZE}")
+            if name == "estimated_hours" and not all(
+                Decimal("0") < Decimal(str(v)) <= settings.MAX_ESTIMATE_HOURS for v in values
+            ):
+                raise ValueError(
+                    f"Estimated hours must be greater than zero and at most {settings.MAX_ESTIMATE_HOURS}"
+                )
+            cells *= len(values)
+
+        if cells > settings.SWEEP_MAX_CELLS:
+            raise ValueError(f"Sweep has {cells} cells, maximum is {settings.SWEEP_MAX_CELLS}")
+
+    def crew_hourly_totals(self, sizes: Sequence[int]) -> np.ndarray:
+        """
+        Sum of crew rates in cents for each crew size.
+
+        A crew of size n is the first n members of the base crew; members
+        beyond the base crew are priced at the last member's rate.
+        """
+        sizes = np.asarray([int(size) for size in sizes], dtype=np.int64)
+        prefix = np.cumsum(self.crew_rates)
+        base_size = len(self.crew_rates)
+
+        within = prefix[np.minimum(sizes, base_size) - 1]
+        extra = np.maximum(sizes - base_size, 0) * self.crew_rates[-1]
+        return within + extra
+
+    def run(self, axes: Sequence[Tuple[str, Sequence[Any]]]) -> SweepResult:
+        """
+        Price the base job over the grid of axes.
+
+        Args:
+            axes: Sequence of (parameter, values) pairs, one per grid dimension
+
+        Returns:
+            SweepResult with final totals in cents
+        """
+        self.validate_axes(axes)
+        inputs = self.base_inputs
+        positions = {name: position for position, (name, _) in enumerate(axes)}
+        ndim = len(axes)
+
+        def along_axis(name: str, values: np.ndarray) -> np.ndarray:
+            """Shape a 1-D column so it broadcasts along its own axis."""
+            shape = [1] * ndim
+            shape[positions[name]] = -1
+            return values.reshape(shape)
+
+        def column(name: str, places: int) -> np.ndarray:
+            """Swept values along their axis, or the base value as a 0-d array."""
+            if name in positions:
+                values = axes[positions[name]][1]
+                return along_axis(name, to_fixed_point(list(values), places, name))
+            return to_fixed_point([inputs[name]], places, name).reshape(())
+
+        # Travel does not depend on any sweep parameter: price it once
+        travel = BatchCalculator.travel_costs(
+            column("travel_miles", MILES_PLACES),
+            column("travel_time_minutes", MINUTES_PLACES),
+            column("vehicle_rate_per_mile", VEHICLE_RATE_PLACES),
+            column("driver_hourly_rate", MONEY_PLACES)
+        )["total"]
+
+        # Labor and equipment vary only along the hours and crew axes
+        hours = column("estimated_hours", HOURS_PLACES)
+        if "crew_size" in positions:
+            crew_total = along_axis(
+                "crew_size", self.crew_hourly_totals(axes[positions["crew_size"]][1])
+            )
+        else:
+            crew_total = self.crew_rates.sum()
+
+        multiplier = BatchCalculator.labor_multipliers(
+            1, inputs.get("emergency_job", False), inputs.get("weekend_work", False)
+        ).reshape(())
+        labor = BatchCalculator.labor_costs(hours, crew_total, multiplier)["total"]
+
+        if len(self.equipment_rates):
+            equipment = BatchCalculator.equipment_costs(
+                hours.reshape(-1), self.equipment_rates
+            ).reshape(hours.shape)
+        else:
+            equipment = 0
+
+        fees = column("disposal_fees", MONEY_PLACES) + column("permit_cost", MONEY_PLACES)
+        direct_costs = travel + labor + equipment + fees
+
+        # Margins broadcast the direct costs across the remaining axes
+        pipeline = BatchCalculator.apply_formula_pipeline(
+            direct_costs,
+            column("overhead_percent", PERCENT_PLACES),
+            column("profit_percent", PERCENT_PLACES),
+            column("safety_buffer_percent", PERCENT_PLACES)
+        )
+
+        grid_shape = tuple(len(values) for _, values in axes)
+        final_total = np.broadcast_to(pipeline["final_total"], grid_shape)
+
+        return SweepResult([(name, list(values)) for name, values in axes], final_total)
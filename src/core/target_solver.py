@@ -0,0 +1,197 @@
+"""
+Reverse solver from a target price to job configurations.
+
+Given a base job and a target final total, prices every combination of
+the variables allowed to move (profit percent, crew size, hours) in one
+vectorized sweep and returns the configurations whose rounded final
+total is nearest the target, preferring those that change the base job
+least. Returned configurations are re-priced with DeterministicCalculator,
+so their totals are exactly what the calculate endpoints would quote.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.calculator import DeterministicCalculator
+from src.core.config import settings
+from src.core.sweep import ScenarioSweep
+from src.utils.money import Money
+
+
+SOLVER_VARIABLES = ("profit_percent", "crew_size", "estimated_hours")
+
+
+def default_variable_range(name: str) -> Tuple[Decimal, Decimal, Decimal]:
+    """Default (low, high, step) searched for a variable."""
+    if name == "profit_percent":
+        return Decimal("0"), Decimal("100"), Decimal("0.5")
+    if name == "crew_size":
+        return Decimal("1"), Decimal(settings.MAX_CREW_SIZE), Decimal("1")
+    if name == "estimated_hours":
+        return Decimal("0.5"), settings.MAX_ESTIMATE_HOURS, Decimal("0.5")
+    raise ValueError(f"Cannot solve for parameter: {name}")
+
+
+@dataclass
+class TargetSolution:
+    """One configuration near the target; money values are integer cents."""
+    values: Dict[str, Any]
+    final_total: int
+    difference: int
+
+    @property
+    def exact(self) -> bool:
+        return self.difference == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "values": {name: str(value) for name, value in self.values.items()},
+            "final_total": str(self.final_total // 100),
+            "difference": str(Money(self.difference)),
+            "exact": self.exact
+        }
+
+
+class TargetPriceSolver:
+    """
+    Finds configurations of a base job that price closest to a target.
+
+    The base job is given as calculate_full_estimate keyword arguments.
+    Crew sizes follow the sweep engine: a crew of n is the first n base
+    members, with members beyond the base crew at the last member's rate.
+    """
+
+    def __init__(self, base_inputs: Dict[str, Any]):
+        self.base_inputs = base_inputs
+        self.sweep = ScenarioSweep(base_inputs)
+
+    def base_value(self, name: str) -> Decimal:
+        if name == "crew_size":
+            return Decimal(len(self.base_inputs["crew_rates"]))
+        return Decimal(str(self.base_inputs[name]))
+
+    def candidate_values(
+        self,
+        name: str,
+        low: Optional[Decimal] = None,
+        high: Optional[Decimal] = None,
+        step: Optional[Decimal] = None
+    ) -> List[Any]:
+        """
+        Values searched for a variable, limited to valid calculation inputs.
+
+        Crew sizes are returned as integers, other variables as Decimals.
+
+        Raises:
+            ValueError: If the variable is unknown or no value is valid
+        """
+        default_low, default_high, default_step = default_variable_range(name)
+        low = default_low if low is None else Decimal(str(low))
+        high = default_high if high is None else Decimal(str(high))
+        step = default_step if step is None else Decimal(str(step))
+        if step <= 0 or high < low:
+            raise ValueError(f"Invalid search range for {name}")
+
+        count = int((high - low) / step) + 1
+        if count > settings.SWEEP_MAX_CELLS:
+            raise ValueError(f"Search range for {name} has more than {settings.SWEEP_MAX_CELLS} values")
+        values = [low + step * i for i in range(count)]
+
+        if name == "crew_size":
+            values = [value for value in values if value == value.to_integral_value()]
+        if name in ("crew_size", "estimated_hours"):
+            values = [value for value in values if self._is_valid(name, value)]
+        if name == "profit_percent":
+            values = [value for value in values if value >= 0]
+
+        if not values:
+            raise ValueError(f"No valid values for {name} in the search range")
+        if name == "crew_size":
+            return [int(value) for value in values]
+        return values
+
+    def _is_valid(self, name: str, value: Decimal) -> bool:
+        """Check a candidate with the calculator's input limits."""
+        checked = {
+            "travel_miles": Decimal(str(self.base_inputs["travel_miles"])),
+            "estimated_hours": Decimal(str(self.base_inputs["estimated_hours"])),
+            "crew_size": len(self.base_inputs["crew_rates"])
+        }
+        checked[name] = int(value) if name == "crew_size" else value
+        is_valid, _ = DeterministicCalculator.validate_calculation_inputs(**checked)
+        return is_valid
+
+    def solve(
+        self,
+        target_total: Decimal,
+        variables: Sequence[Tuple[str, Optional[Decimal], Optional[Decimal], Optional[Decimal]]],
+        max_results: int = 5
+    ) -> List[TargetSolution]:
+        """
+        Find the configurations nearest a target final total.
+
+        Args:
+            target_total: Desired final total in dollars
+            variables: (name, low, high, step) per variable allowed to move;
+                None bounds use the defaults
+            max_results: Number of configurations to return
+
+        Returns:
+            Solutions ordered by distance from the target, then by how far
+            they move from the base job
+        """
+        names = [name for name, *_ in variables]
+        for name in names:
+            if name not in SOLVER_VARIABLES:
+                raise ValueError(f"Cannot solve for parameter: {name}")
+        if max_results < 1:
+            raise ValueError("At least one result is required")
+
+        axes = [
+            (name, self.candidate_values(name, low, high, step))
+            for name, low, high, step in variables
+        ]
+
+        grid = self.sweep.run(axes).final_total
+        target_cents = Money.from_value(target_total).cents
+        distance = np.abs(grid - target_cents).reshape(-1)
+
+        # Prefer small moves: sum of each axis' move as a fraction of its searched span
+        change = np.zeros(grid.shape, dtype=np.float64)
+        for position, (name, values) in enumerate(axes):
+            numeric = np.array([float(value) for value in values])
+            span = (numeric.max() - numeric.min()) or 1.0
+            moves = np.abs(numeric - float(self.base_value(name))) / span
+            shape = [1] * len(axes)
+            shape[position] = -1
+            change = change + moves.reshape(shape)
+
+        order = np.lexsort((change.reshape(-1), distance))[:max_results]
+
+        solutions = []
+        for flat_index in order:
+            index = np.unravel_index(int(flat_index), grid.shape)
+            values = {name: axis_values[i] for (name, axis_values), i in zip(axes, index)}
+            final_total = self.price(values)
+            solutions.append(TargetSolution(
+                values=values,
+                final_total=final_total,
+                difference=final_total - target_cents
+            ))
+        return solutions
+
+    def price(self, values: Dict[str, Any]) -> int:
+        """Price one configuration with DeterministicCalculator, in cents."""
+        inputs = dict(self.base_inputs)
+        if "crew_size" in values:
+            crew = list(self.base_inputs["crew_rates"])
+            size = int(values["crew_size"])
+            inputs["crew_rates"] = crew[:size] + [crew[-1]] * max(size - len(crew), 0)
+        for name in ("profit_percent", "estimated_hours"):
+            if name in values:
+                inputs[name] = Decimal(str(values[name]))
+
+        result = DeterministicCalculator.calculate_full_estimate(**inputs)
+        return Money.from_value(result["final_calculation"]["final_total"]).cents
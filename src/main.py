@@ -16,6 +16,9 @@ from src.api import auth, estimates, costs, external
 from src.core.cache import init_cache, close_cache
 from src.core.rate_limit import limiter, rate_limit_exceeded_handler
 from src.core.monitoring import init_sentry, track_request_metrics, PerformanceMonitor
+from src.services.calculation import init_quick_quote_rates
+from src.services.cost_index import init_cost_index
+from src.services.repricing import start_repricing_scheduler, stop_repricing_scheduler
 # Future imports - will be added as we create them
 # from src.api import reports
 # from src.db.session import init_db
@@ -63,10 +66,18 @@ async def lifespan(app: FastAPI):
     await init_cache()
     logger.info("Cache initialized")
     
+    # Load effective-dated cost indexes and the quick-quote rates
+    await init_cost_index()
+    await init_quick_quote_rates()
+    
+    # Re-price open estimates when dated rates take effect
+    start_repricing_scheduler()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    stop_repricing_scheduler()
     
     # Close database connections
     # await close_db()
@@ -214,6 +225,10 @@ async def health_check():
         health_status["checks"]["external_apis"] = {"status": "error", "error": str(e)}
         health_status["status"] = "degraded"
     
+    # Report calculation memo effectiveness
+    from src.core.calculation_memo import get_calculation_memo
+    health_status["checks"]["calculation_memo"] = get_calculation_memo().stats()
+    
     # TODO: Add database health check when implemented
     
     return health_status
@@ -3,8 +3,7 @@ Audit log model for tracking all changes to entities.
 """
 from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, Text, Uuid
 from sqlalchemy.sql import func
 import uuid
 
@@ -20,7 +19,7 @@ class AuditLog(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     audit_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),  # Native UUID on PostgreSQL, CHAR(32) elsewhere
         default=uuid.uuid4,
         unique=True,
         nullable=False,
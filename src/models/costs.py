@@ -5,12 +5,13 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 from sqlalchemy import (
-    Column, String, Date, Numeric, Boolean, Integer, 
+    Column, String, Date, Numeric, Boolean, Integer, Text,
     CheckConstraint, Index, UniqueConstraint, ForeignKey
 )
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.ext.hybrid import hybrid_property
 
+from src.db.session import Base
 from src.models.base import BaseModel
 
 
@@ -309,4 +310,21 @@ class SeasonalAdjustment(BaseModel):
             return start_month_day <= check_month_day <= end_month_day
         else:
             # Season crosses year boundary
-            return check_month_day >= start_month_day or check_month_day <= end_month_day
\ No newline at end of file
+            return check_month_day >= start_month_day or check_month_day <= end_month_day
+
+
+class CostTimelineSegment(Base):
+    """
+    Pre-serialized effective-costs payload for one segment of the cost
+    timeline: a date range over which the effective-dated cost rows don't
+    change, combined with one set of seasonal adjustments in effect.
+    Rows are tagged with the hash of the cost rows they were built from.
+    """
+    __tablename__ = "cost_timeline_segments"
+    
+    content_hash = Column(String(64), primary_key=True)  # CostIndex.content_hash
+    segment_key = Column(String(255), primary_key=True)
+    segment_start = Column(Date, nullable=False)
+    segment_end = Column(Date, nullable=True)  # None for the open-ended last segment
+    payload = Column(Text, nullable=False)  # JSON without effective_date
+
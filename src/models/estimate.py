@@ -12,6 +12,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
+from src.db.session import Base
 from src.models.base import BaseModel
 
 
@@ -95,7 +96,6 @@ class Estimate(BaseModel):
     customer_notes = Column(Text, nullable=True)  # Shown on estimate
     
     # Relationships
-    created_by_user = relationship("User", foreign_keys=[BaseModel.created_by])
     approved_by_user = relationship("User", foreign_keys=[approved_by])
     
     # Indexes for common queries
@@ -184,4 +184,27 @@ class Estimate(BaseModel):
             },
             "status": self.status.value if self.status else None,
             "customer_notes": self.customer_notes
-        }
\ No newline at end of file
+        }
+
+class EstimateCostRef(Base):
+    """
+    Reverse index from a cost rate (labor role or equipment id) to the open
+    estimates whose calculation inputs use it. Kept in step with the estimate
+    on create, update and status changes; only DRAFT/PENDING estimates have rows.
+    """
+    __tablename__ = "estimate_cost_refs"
+    
+    ref_type = Column(String(20), primary_key=True)  # "role" or "equipment"
+    ref_key = Column(String(100), primary_key=True)  # Role name or equipment id
+    estimate_id = Column(
+        Integer,
+        ForeignKey("estimates.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    __table_args__ = (
+        Index('idx_estimate_cost_refs_estimate', 'estimate_id'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<EstimateCostRef({self.ref_type}={self.ref_key}, estimate_id={self.estimate_id})>"
@@ -2,7 +2,7 @@
 Calculation schemas for request/response validation.
 """
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel, Field, validator
 
@@ -152,15 +152,21 @@ class FinalCalculation(BaseModel):
 
 
 class CalculationResult(BaseModel):
-    """Schema for complete calculation result."""
-    travel_breakdown: TravelBreakdown
-    labor_breakdown: LaborBreakdown
-    equipment_breakdown: EquipmentBreakdown
+    """Schema for complete calculation result (stored on the estimate)."""
+    calculation_id: str
+    travel_cost: Decimal
+    labor_cost: Decimal
+    equipment_cost: Decimal
     disposal_fees: Decimal
     permit_cost: Decimal
-    cost_components: Dict[str, Decimal]
-    final_calculation: FinalCalculation
-    calculation_checksum: str
+    direct_costs: Decimal
+    overhead_amount: Decimal
+    safety_buffer_amount: Decimal
+    profit_amount: Decimal
+    subtotal: Decimal
+    final_total: Decimal
+    checksum: str
+    calculation_details: Dict[str, Any]  # Breakdowns, margins applied, formula version
     
     class Config:
         json_encoders = {
@@ -196,6 +202,151 @@ class CalculationComparisonInput(BaseModel):
         return v
 
 
+class SweepAxis(BaseModel):
+    """Schema for one axis of a scenario sweep."""
+    parameter: str = Field(
+        ...,
+        description="estimated_hours, crew_size, overhead_percent, profit_percent or safety_buffer_percent"
+    )
+    start: Optional[Decimal] = Field(None, ge=0)
+    stop: Optional[Decimal] = Field(None, ge=0)
+    step: Optional[Decimal] = Field(None, gt=0)
+    values: Optional[List[Decimal]] = Field(None, min_items=1)
+    
+    @validator('parameter')
+    def validate_parameter(cls, v):
+        """Only parameters the sweep engine can vary are allowed."""
+        from src.core.sweep import SWEEP_PARAMETERS
+        if v not in SWEEP_PARAMETERS:
+            raise ValueError(f"Parameter must be one of: {', '.join(SWEEP_PARAMETERS)}")
+        return v
+    
+    @validator('start', 'stop', 'step', 'values')
+    def validate_whole_crew_sizes(cls, v, values):
+        """Crew sizes are whole numbers of workers."""
+        if v is not None and values.get('parameter') == 'crew_size':
+            if any(value != value.to_integral_value() for value in (v if isinstance(v, list) else [v])):
+                raise ValueError("Crew size values must be whole numbers")
+        return v
+    
+    def expand(self) -> List[Decimal]:
+        """Return the axis values, expanding an inclusive start/stop/step range."""
+        if self.values:
+            return list(self.values)
+        if self.start is None or self.stop is None or self.step is None:
+            raise ValueError(f"Axis {self.parameter} needs either values or start, stop and step")
+        if self.stop < self.start:
+            raise ValueError(f"Axis {self.parameter} stop must not be below start")
+        
+        count = int((self.stop - self.start) / self.step) + 1
+        if count > settings.SWEEP_MAX_CELLS:
+            raise ValueError(f"Axis {self.parameter} has more than {settings.SWEEP_MAX_CELLS} values")
+        return [self.start + self.step * i for i in range(count)]
+
+
+class ScenarioSweepInput(BaseModel):
+    """Schema for pricing a base scenario over a grid of parameter values."""
+    base_scenario: CalculationInput
+    axes: List[SweepAxis] = Field(..., min_items=1, max_items=3)
+    
+    @validator('axes')
+    def validate_unique_axes(cls, v):
+        """Each parameter can only be swept once."""
+        parameters = [axis.parameter for axis in v]
+        if len(set(parameters)) != len(parameters):
+            raise ValueError("Each parameter can only be swept once")
+        return v
+
+
+class PriceDistribution(BaseModel):
+    """Schema for a bounded distribution of an uncertain input."""
+    kind: str = Field("triangular", description="fixed, uniform, triangular or pert")
+    low: Decimal = Field(..., ge=0)
+    mode: Decimal = Field(..., ge=0)
+    high: Decimal = Field(..., ge=0)
+    
+    @validator('kind')
+    def validate_kind(cls, v):
+        """Only supported distributions are allowed."""
+        from src.core.risk import DISTRIBUTION_KINDS
+        if v not in DISTRIBUTION_KINDS:
+            raise ValueError(f"Kind must be one of: {', '.join(DISTRIBUTION_KINDS)}")
+        return v
+    
+    @validator('high')
+    def validate_bounds(cls, v, values):
+        """Ensure low <= mode <= high."""
+        if 'low' in values and 'mode' in values and not values['low'] <= values['mode'] <= v:
+            raise ValueError("Distribution requires low <= mode <= high")
+        return v
+
+
+class RiskAnalysisInput(BaseModel):
+    """Schema for a Monte Carlo price range of a scenario."""
+    base_scenario: CalculationInput
+    estimated_hours: PriceDistribution
+    travel_minutes: Optional[PriceDistribution] = None
+    disposal_volume: Optional[PriceDistribution] = None
+    disposal_fee_per_unit: Optional[Decimal] = Field(None, gt=0)  # Required with disposal_volume
+    samples: int = Field(default=10000, ge=100, le=200000)
+    target_percentile: int = Field(default=90, ge=50, le=99)
+    seed: Optional[int] = None
+    
+    @validator('estimated_hours')
+    def validate_hours(cls, v):
+        """Sampled hours must stay within the estimate limits."""
+        if v.high > settings.MAX_ESTIMATE_HOURS:
+            raise ValueError(f"Estimated hours exceeds maximum of {settings.MAX_ESTIMATE_HOURS} hours")
+        return v
+    
+    @validator('disposal_fee_per_unit', always=True)
+    def validate_disposal_fee(cls, v, values):
+        """A disposal volume is priced with a fee per unit, never at zero."""
+        if values.get('disposal_volume') is not None and v is None:
+            raise ValueError("disposal_fee_per_unit is required when disposal_volume is given")
+        return v.quantize(Decimal('0.01')) if v is not None else v
+
+
+class SolverVariable(BaseModel):
+    """Schema for a variable the target-price solver may move."""
+    parameter: str = Field(..., description="profit_percent, crew_size or estimated_hours")
+    low: Optional[Decimal] = Field(None, ge=0)
+    high: Optional[Decimal] = Field(None, ge=0)
+    step: Optional[Decimal] = Field(None, gt=0)
+    
+    @validator('parameter')
+    def validate_parameter(cls, v):
+        """Only parameters the solver can vary are allowed."""
+        from src.core.target_solver import SOLVER_VARIABLES
+        if v not in SOLVER_VARIABLES:
+            raise ValueError(f"Parameter must be one of: {', '.join(SOLVER_VARIABLES)}")
+        return v
+
+
+class TargetPriceInput(BaseModel):
+    """Schema for solving a base scenario toward a target final total."""
+    base_scenario: CalculationInput
+    target_total: Decimal = Field(..., gt=0, decimal_places=2)
+    variables: List[SolverVariable] = Field(..., min_items=1, max_items=3)
+    max_results: int = Field(default=5, ge=1, le=20)
+    
+    @validator('variables')
+    def validate_unique_variables(cls, v):
+        """Each parameter can only be solved for once."""
+        parameters = [variable.parameter for variable in v]
+        if len(set(parameters)) != len(parameters):
+            raise ValueError("Each parameter can only be solved for once")
+        return v
+
+
+class BulkValidationInput(BaseModel):
+    """Schema for validating many calculation inputs against one cost snapshot."""
+    inputs: List[Dict[str, Any]] = Field(
+        ..., min_items=1, max_items=settings.BULK_VALIDATION_MAX_ITEMS
+    )  # Raw CalculationInput payloads, so schema errors are reported per item
+    effective_date: Optional[date] = None  # Default: today
+
+
 class HistoricalCalculationQuery(BaseModel):
     """Schema for querying historical calculations."""
     estimate_id: Optional[int] = None
@@ -4,7 +4,7 @@ Cost management schemas for request/response validation.
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 
 
 class LaborRateBase(BaseModel):
@@ -416,4 +416,37 @@ class EffectiveCostsResponse(BaseModel):
     overhead_settings: Optional[OverheadSettingsResponse]
     vehicle_rates: List[VehicleRateResponse]
     disposal_fees: List[DisposalFeeResponse]
-    seasonal_adjustments: List[SeasonalAdjustmentResponse]
\ No newline at end of file
+    seasonal_adjustments: List[SeasonalAdjustmentResponse]
+
+# Cost Impact Preview Schemas
+class ProposedLaborRate(BaseModel):
+    """A proposed hourly rate for a labor role."""
+    role: str = Field(..., min_length=1, max_length=100)
+    hourly_rate: Decimal = Field(..., ge=0, decimal_places=2)
+
+
+class ProposedEquipmentCost(BaseModel):
+    """A proposed hourly cost for a piece of equipment, or taking it out of service."""
+    equipment_id: int = Field(..., gt=0)
+    hourly_cost: Optional[Decimal] = Field(None, ge=0)
+    out_of_service: bool = False
+    
+    @field_validator('hourly_cost')
+    @classmethod
+    def quantize_hourly_cost(cls, v):
+        """Ensure proper decimal precision."""
+        return v.quantize(Decimal('0.01')) if v is not None else v
+    
+    @model_validator(mode='after')
+    def validate_change(self):
+        """Require exactly one of a new hourly cost or removal from service."""
+        if self.out_of_service == (self.hourly_cost is not None):
+            raise ValueError('Give exactly one of hourly_cost or out_of_service')
+        return self
+
+
+class CostImpactPreviewRequest(BaseModel):
+    """Proposed rate changes to preview against open estimates."""
+    labor_rates: List[ProposedLaborRate] = Field(default=[], max_items=50)
+    equipment_costs: List[ProposedEquipmentCost] = Field(default=[], max_items=50)
+    effective_date: Optional[date] = None
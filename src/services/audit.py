@@ -12,6 +12,10 @@ from src.models.audit import AuditLog
 from src.models.base import BaseModel
 
 
+# Audit action kind by the verb an API action name starts with
+ACTION_KINDS = {"create": "INSERT", "delete": "DELETE", "restore": "RESTORE"}
+
+
 class AuditService:
     """Service for managing audit logs."""
     
@@ -76,6 +80,50 @@ class AuditService:
         
         return audit_log
     
+    @staticmethod
+    async def log_action(
+        db: AsyncSession,
+        user_id: str,
+        action: str,
+        entity_type: str,
+        entity_id: str,
+        details: Optional[Dict[str, Any]] = None,
+        correlation_id: Optional[str] = None
+    ) -> AuditLog:
+        """
+        Log an API action on an entity.
+        
+        The action name and its details are stored as context; the action
+        column records the kind of change (INSERT for create_* actions,
+        DELETE for delete_*, RESTORE for restore_*, otherwise UPDATE).
+        
+        Args:
+            db: Database session
+            user_id: ID of the user performing the action
+            action: Action name (e.g. "update_estimate")
+            entity_type: Kind of entity acted on (e.g. "estimate")
+            entity_id: ID of the entity
+            details: Action details, JSON-serializable
+            correlation_id: ID for tracking related changes
+            
+        Returns:
+            Created audit log entry
+        """
+        audit_log = AuditLog.create_audit_log(
+            table_name=entity_type,
+            record_id=int(entity_id),
+            action=ACTION_KINDS.get(action.split("_", 1)[0], "UPDATE"),
+            changed_by=user_id,
+            context={"action": action, **(details or {})},
+            correlation_id=correlation_id
+        )
+        
+        db.add(audit_log)
+        await db.commit()
+        await db.refresh(audit_log)
+        
+        return audit_log
+    
     @staticmethod
     async def get_entity_history(
         db: AsyncSession,
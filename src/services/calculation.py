@@ -1,11 +1,14 @@
 """
 Calculation service layer that orchestrates cost calculations.
 """
-from typing import Dict, List, Optional, Any
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Any
 from datetime import date, datetime
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
 import structlog
 
 from src.models.costs import (
@@ -13,22 +16,260 @@ from src.models.costs import (
     VehicleRate, DisposalFee, SeasonalAdjustment
 )
 from src.schemas.calculation import CalculationInput, CalculationResult
+from src.core.cache import CacheManager, get_cache
 from src.core.calculator import TreeServiceCalculator
 from src.core.config import settings
+from src.services.cost_index import CostIndex, get_cost_index
 from src.services.external_apis import get_external_api_service, GoogleMapsError
 
 
 logger = structlog.get_logger()
 
 
+@dataclass(frozen=True)
+class OverheadRates:
+    """Margin percentages of the effective OverheadSettings row."""
+    overhead_percent: Decimal
+    profit_percent: Decimal
+    safety_buffer_percent: Decimal
+
+
+@dataclass(frozen=True)
+class SeasonalRate:
+    """Seasonal adjustment values (same attributes as SeasonalAdjustment)."""
+    season_name: str
+    labor_adjustment_percent: Decimal
+    equipment_adjustment_percent: Decimal
+
+
+@dataclass
+class CostRates:
+    """
+    Cost data used to price calculation inputs, detached from the session
+    so it can be reused across many inputs and pickled to worker processes.
+    """
+    calculation_date: date
+    labor_rates: Dict[str, Decimal] = field(default_factory=dict)
+    equipment_costs: Dict[int, Decimal] = field(default_factory=dict)
+    overhead: Optional[OverheadRates] = None
+    vehicle_rate_per_mile: Optional[Decimal] = None
+    driver_hourly_rate: Optional[Decimal] = None
+    seasonal_adjustment: Optional[SeasonalRate] = None
+
+
+@dataclass(frozen=True)
+class CostSnapshot:
+    """
+    Immutable cost data for one effective date, tagged with the cost data
+    version it was built under. Has the same attributes as CostRates, so it
+    can be passed wherever inputs are priced with rates.
+    """
+    version: int
+    calculation_date: date
+    labor_rates: Mapping[str, Decimal] = field(default_factory=dict)
+    equipment_costs: Mapping[int, Decimal] = field(default_factory=dict)
+    overhead: Optional[OverheadRates] = None
+    vehicle_rate_per_mile: Optional[Decimal] = None
+    driver_hourly_rate: Optional[Decimal] = None
+    seasonal_adjustment: Optional[SeasonalRate] = None
+    
+    def __post_init__(self):
+        object.__setattr__(self, "labor_rates", MappingProxyType(dict(self.labor_rates)))
+        object.__setattr__(self, "equipment_costs", MappingProxyType(dict(self.equipment_costs)))
+    
+    @classmethod
+    def from_rates(cls, rates: CostRates, version: int) -> "CostSnapshot":
+        return cls(
+            version=version,
+            calculation_date=rates.calculation_date,
+            labor_rates=rates.labor_rates,
+            equipment_costs=rates.equipment_costs,
+            overhead=rates.overhead,
+            vehicle_rate_per_mile=rates.vehicle_rate_per_mile,
+            driver_hourly_rate=rates.driver_hourly_rate,
+            seasonal_adjustment=rates.seasonal_adjustment
+        )
+    
+    def to_rates(self) -> CostRates:
+        """Mutable, picklable copy of the snapshot's rates."""
+        return CostRates(
+            calculation_date=self.calculation_date,
+            labor_rates=dict(self.labor_rates),
+            equipment_costs=dict(self.equipment_costs),
+            overhead=self.overhead,
+            vehicle_rate_per_mile=self.vehicle_rate_per_mile,
+            driver_hourly_rate=self.driver_hourly_rate,
+            seasonal_adjustment=self.seasonal_adjustment
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form for the shared cache; Decimals are kept as strings."""
+        overhead = self.overhead
+        seasonal = self.seasonal_adjustment
+        return {
+            "version": self.version,
+            "calculation_date": self.calculation_date.isoformat(),
+            "labor_rates": {role: str(rate) for role, rate in self.labor_rates.items()},
+            "equipment_costs": {str(eq_id): str(cost) for eq_id, cost in self.equipment_costs.items()},
+            "overhead": {
+                "overhead_percent": str(overhead.overhead_percent),
+                "profit_percent": str(overhead.profit_percent),
+                "safety_buffer_percent": str(overhead.safety_buffer_percent)
+            } if overhead else None,
+            "vehicle_rate_per_mile": (
+                str(self.vehicle_rate_per_mile) if self.vehicle_rate_per_mile is not None else None
+            ),
+            "driver_hourly_rate": (
+                str(self.driver_hourly_rate) if self.driver_hourly_rate is not None else None
+            ),
+            "seasonal_adjustment": {
+                "season_name": seasonal.season_name,
+                "labor_adjustment_percent": str(seasonal.labor_adjustment_percent),
+                "equipment_adjustment_percent": str(seasonal.equipment_adjustment_percent)
+            } if seasonal else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CostSnapshot":
+        overhead = data["overhead"]
+        seasonal = data["seasonal_adjustment"]
+        return cls(
+            version=data["version"],
+            calculation_date=date.fromisoformat(data["calculation_date"]),
+            labor_rates={role: Decimal(rate) for role, rate in data["labor_rates"].items()},
+            equipment_costs={int(eq_id): Decimal(cost) for eq_id, cost in data["equipment_costs"].items()},
+            overhead=OverheadRates(
+                **{name: Decimal(value) for name, value in overhead.items()}
+            ) if overhead else None,
+            vehicle_rate_per_mile=(
+                Decimal(data["vehicle_rate_per_mile"])
+                if data["vehicle_rate_per_mile"] is not None else None
+            ),
+            driver_hourly_rate=(
+                Decimal(data["driver_hourly_rate"])
+                if data["driver_hourly_rate"] is not None else None
+            ),
+            seasonal_adjustment=SeasonalRate(
+                season_name=seasonal["season_name"],
+                labor_adjustment_percent=Decimal(seasonal["labor_adjustment_percent"]),
+                equipment_adjustment_percent=Decimal(seasonal["equipment_adjustment_percent"])
+            ) if seasonal else None
+        )
+
+
+class CostSnapshotCache:
+    """
+    Cost snapshots per effective date, held in-process and in the shared cache.
+    
+    Every cost write bumps a version counter in the shared cache. A snapshot
+    is reused while its version is current, so after the first calculation
+    for a date (in any process) calculations need no cost queries. The bump
+    happens after the write commits, so a snapshot tagged with the current
+    version never predates it.
+    """
+    
+    VERSION_KEY = "cost_snapshot:version"
+    
+    def __init__(self, cache: Optional[CacheManager] = None, max_dates: int = 32):
+        self._cache = cache
+        self.max_dates = max_dates
+        self._snapshots: "OrderedDict[date, CostSnapshot]" = OrderedDict()
+    
+    @property
+    def cache(self) -> CacheManager:
+        return self._cache or get_cache()
+    
+    @staticmethod
+    def snapshot_key(version: int, calculation_date: date) -> str:
+        return f"cost_snapshot:{version}:{calculation_date.isoformat()}"
+    
+    async def current_version(self) -> int:
+        return int(await self.cache.get(self.VERSION_KEY) or 0)
+    
+    async def get(
+        self,
+        calculation_date: date,
+        loader: Callable[[date], Awaitable[CostRates]]
+    ) -> CostSnapshot:
+        """
+        Get the current snapshot for a date, building it with ``loader`` if
+        neither this process nor the shared cache has it.
+        """
+        version = await self.current_version()
+        
+        snapshot = self._snapshots.get(calculation_date)
+        if snapshot is not None and snapshot.version == version:
+            self._snapshots.move_to_end(calculation_date)
+            return snapshot
+        
+        key = self.snapshot_key(version, calculation_date)
+        cached = await self.cache.get(key)
+        if isinstance(cached, dict):
+            snapshot = CostSnapshot.from_dict(cached)
+        else:
+            snapshot = CostSnapshot.from_rates(await loader(calculation_date), version)
+            await self.cache.set(key, snapshot.to_dict())
+            logger.info(
+                "Built cost snapshot",
+                calculation_date=calculation_date.isoformat(),
+                version=version
+            )
+        
+        self._snapshots[calculation_date] = snapshot
+        self._snapshots.move_to_end(calculation_date)
+        while len(self._snapshots) > self.max_dates:
+            self._snapshots.popitem(last=False)
+        return snapshot
+    
+    @classmethod
+    def table_version_key(cls, table_name: str) -> str:
+        return f"{cls.VERSION_KEY}:{table_name}"
+    
+    async def table_version(self, table_name: str) -> int:
+        """Version counter of one cost table, bumped by writes to that table."""
+        return int(await self.cache.get(self.table_version_key(table_name)) or 0)
+    
+    async def invalidate(self, table_name: Optional[str] = None) -> Optional[int]:
+        """
+        Bump the cost data version so every process rebuilds its snapshots,
+        and the written table's version if given.
+        """
+        self._snapshots.clear()
+        if table_name:
+            await self.cache.increment(self.table_version_key(table_name))
+        version = await self.cache.increment(self.VERSION_KEY)
+        logger.info("Cost snapshots invalidated", version=version)
+        return version
+
+
+_cost_snapshots = CostSnapshotCache()
+
+
+def get_cost_snapshots() -> CostSnapshotCache:
+    """Get the process-wide cost snapshot cache."""
+    return _cost_snapshots
+
+
+async def invalidate_cost_snapshots() -> None:
+    """Invalidate cost snapshots; call after any cost write commits."""
+    await _cost_snapshots.invalidate()
+
+
 class CalculationService:
     """
     Service layer for orchestrating calculations with current cost data.
     """
     
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        snapshots: Optional[CostSnapshotCache] = None,
+        cost_index: Optional[CostIndex] = None
+    ):
         self.db = db
         self.calculator = TreeServiceCalculator()
+        self.snapshots = snapshots or get_cost_snapshots()
+        self.cost_index = cost_index or get_cost_index()
     
     async def calculate_estimate(
         self,
@@ -62,8 +303,10 @@ class CalculationService:
                     origin=origin_address,
                     destination=destination_address
                 )
-                # Update the calculation input with actual distance
-                calculation_input.travel_details.miles = Decimal(str(travel_distance.distance_miles))
+                # Price with the actual distance, leaving the caller's input unchanged
+                calculation_input = calculation_input.model_copy(
+                    update={"travel_miles": Decimal(str(travel_distance.distance_miles))}
+                )
                 logger.info(
                     "Used Google Maps for distance calculation",
                     miles=travel_distance.distance_miles,
@@ -75,256 +318,188 @@ class CalculationService:
                     error=str(e)
                 )
         
-        # Validate and enrich input with current costs
-        enriched_input = await self._enrich_calculation_input(
-            calculation_input,
-            calculation_date
-        )
-        
-        # Perform calculation
-        result = self.calculator.calculate_estimate(enriched_input)
-        
-        # Apply seasonal adjustments if any
-        seasonal_adjustment = await self._get_seasonal_adjustment(calculation_date)
-        if seasonal_adjustment:
-            result = self._apply_seasonal_adjustment(result, seasonal_adjustment)
-        
-        return result
+        # Price the input with the cost rates effective on the date
+        snapshot = await self.get_cost_snapshot(calculation_date)
+        return self.calculator.calculate_estimate(calculation_input, snapshot)
     
-    async def _enrich_calculation_input(
+    async def calculation_kwargs(
         self,
         calculation_input: CalculationInput,
-        calculation_date: date
-    ) -> CalculationInput:
+        calculation_date: Optional[date] = None
+    ) -> Dict[str, Any]:
         """
-        Enrich calculation input with current cost data from database.
+        Price an input's roles and equipment into calculate_full_estimate arguments.
+        
+        Used by the analysis engines (sweeps, price ranges, target solving),
+        which vary these arguments rather than the input schema.
+        
+        Raises:
+            ValueError: If a rate the input needs is missing
+        """
+        snapshot = await self.get_cost_snapshot(calculation_date or date.today())
+        return self.calculator._build_calculation_kwargs(calculation_input, snapshot)
+    
+    async def get_cost_snapshot(self, calculation_date: date) -> CostSnapshot:
+        """Get the cost snapshot for a date, loading it only when stale."""
+        return await self.snapshots.get(calculation_date, self.load_cost_rates)
+    
+    async def load_cost_rates(self, calculation_date: date) -> CostRates:
+        """
+        Load every rate used for pricing once, as plain values.
+        
+        Lookups are served by the cost index, which costs a single query
+        only when cost data changed since it was loaded. The result can be
+        applied to many inputs (or sent to worker processes) without
+        further queries.
         """
-        # Get current rates
         labor_rates = await self._get_labor_rates(calculation_date)
         equipment_costs = await self._get_equipment_costs()
         overhead_settings = await self._get_overhead_settings(calculation_date)
         vehicle_rates = await self._get_vehicle_rates(calculation_date)
+        seasonal_adjustment = await self._get_seasonal_adjustment(calculation_date)
         
-        # Update crew hourly rates from database
-        for crew_member in calculation_input.labor_details.crew:
-            rate = labor_rates.get(crew_member.role)
-            if rate:
-                crew_member.hourly_rate = rate.hourly_rate
-        
-        # Update equipment hourly costs from database
-        if calculation_input.equipment_details:
-            equipment_map = {eq.id: eq for eq in equipment_costs}
-            for equipment in calculation_input.equipment_details:
-                eq_data = equipment_map.get(equipment.equipment_id)
-                if eq_data:
-                    equipment.hourly_cost = eq_data.hourly_cost
-        
-        # Update overhead settings
+        overhead = None
         if overhead_settings:
-            calculation_input.margins.overhead_percent = overhead_settings.base_overhead_percent
-            
-            # Apply large job discount if applicable
-            if calculation_input.labor_details.estimated_hours > overhead_settings.large_job_threshold:
-                discount = overhead_settings.large_job_discount_percent
-                calculation_input.margins.overhead_percent -= discount
-            
-            # Apply small job premium if applicable
-            elif calculation_input.labor_details.estimated_hours < overhead_settings.small_job_threshold:
-                premium = overhead_settings.small_job_premium_percent
-                calculation_input.margins.overhead_percent += premium
-        
-        # Update vehicle rates
-        if vehicle_rates:
-            # Use the first active vehicle rate (could be enhanced to select specific vehicle type)
-            vehicle_rate = vehicle_rates[0]
-            calculation_input.travel_details.vehicle_rate_per_mile = vehicle_rate.rate_per_mile
-            calculation_input.travel_details.driver_hourly_rate = vehicle_rate.driver_hourly_rate
+            overhead = OverheadRates(
+                overhead_percent=overhead_settings.overhead_percent,
+                profit_percent=overhead_settings.profit_percent,
+                safety_buffer_percent=(
+                    overhead_settings.safety_buffer_percent
+                    if overhead_settings.safety_buffer_percent is not None
+                    else settings.DEFAULT_SAFETY_BUFFER_PERCENT
+                )
+            )
         
-        return calculation_input
-    
-    async def _get_labor_rates(self, effective_date: date) -> Dict[str, LaborRate]:
-        """Get labor rates effective on the given date."""
-        query = select(LaborRate).where(
-            and_(
-                LaborRate.deleted_at.is_(None),
-                LaborRate.effective_from <= effective_date,
-                or_(
-                    LaborRate.effective_to.is_(None),
-                    LaborRate.effective_to >= effective_date
+        # Use the first active vehicle rate (could be enhanced to select specific vehicle type)
+        vehicle_rate = vehicle_rates[0] if vehicle_rates else None
+        
+        return CostRates(
+            calculation_date=calculation_date,
+            labor_rates={role: rate.hourly_rate for role, rate in labor_rates.items()},
+            equipment_costs={eq.id: eq.hourly_rate for eq in equipment_costs},
+            overhead=overhead,
+            vehicle_rate_per_mile=vehicle_rate.rate_per_mile if vehicle_rate else None,
+            driver_hourly_rate=vehicle_rate.driver_hourly_rate if vehicle_rate else None,
+            seasonal_adjustment=(
+                SeasonalRate(
+                    season_name=seasonal_adjustment.season_name,
+                    labor_adjustment_percent=seasonal_adjustment.labor_adjustment_percent or Decimal("0"),
+                    equipment_adjustment_percent=(
+                        seasonal_adjustment.equipment_adjustment_percent or Decimal("0")
+                    )
                 )
+                if seasonal_adjustment else None
             )
         )
-        
-        result = await self.db.execute(query)
-        rates = result.scalars().all()
+    
+    async def _get_cost_index(self) -> CostIndex:
+        """Get the effective-dated cost index, reloading it if cost data changed."""
+        return await self.cost_index.ensure_current(self.db)
+    
+    async def _get_labor_rates(self, effective_date: date) -> Dict[str, LaborRate]:
+        """Get labor rates effective on the given date."""
+        index = await self._get_cost_index()
+        rates = index.as_of(LaborRate.__tablename__, effective_date, lambda rate: rate.is_active)
         
         return {rate.role: rate for rate in rates}
     
     async def _get_equipment_costs(self) -> List[EquipmentCost]:
         """Get available equipment costs."""
-        query = select(EquipmentCost).where(
-            and_(
-                EquipmentCost.deleted_at.is_(None),
-                EquipmentCost.available == True
-            )
-        )
-        
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        index = await self._get_cost_index()
+        return [eq for eq in index.rows(EquipmentCost.__tablename__) if eq.is_available]
     
     async def _get_overhead_settings(self, effective_date: date) -> Optional[OverheadSettings]:
-        """Get overhead settings effective on the given date."""
-        query = select(OverheadSettings).where(
-            and_(
-                OverheadSettings.deleted_at.is_(None),
-                OverheadSettings.effective_from <= effective_date,
-                or_(
-                    OverheadSettings.effective_to.is_(None),
-                    OverheadSettings.effective_to >= effective_date
-                )
-            )
+        """Get overhead settings effective on the given date (the latest to start)."""
+        index = await self._get_cost_index()
+        settings_rows = index.as_of(
+            OverheadSettings.__tablename__, effective_date, lambda row: row.is_active
         )
-        
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return settings_rows[-1] if settings_rows else None
     
     async def _get_vehicle_rates(self, effective_date: date) -> List[VehicleRate]:
         """Get vehicle rates effective on the given date."""
-        query = select(VehicleRate).where(
-            and_(
-                VehicleRate.deleted_at.is_(None),
-                VehicleRate.effective_from <= effective_date,
-                or_(
-                    VehicleRate.effective_to.is_(None),
-                    VehicleRate.effective_to >= effective_date
-                )
-            )
-        )
-        
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        index = await self._get_cost_index()
+        return index.as_of(VehicleRate.__tablename__, effective_date, lambda rate: rate.is_active)
     
     async def _get_seasonal_adjustment(self, check_date: date) -> Optional[SeasonalAdjustment]:
         """Get active seasonal adjustment for the given date."""
-        query = select(SeasonalAdjustment).where(
-            and_(
-                SeasonalAdjustment.deleted_at.is_(None),
-                SeasonalAdjustment.active == True
-            )
-        )
-        
-        result = await self.db.execute(query)
-        adjustments = result.scalars().all()
-        
-        # Check if date falls within any adjustment period
-        month = check_date.month
-        day = check_date.day
-        
-        for adj in adjustments:
-            if adj.start_month <= adj.end_month:
-                # Normal case: adjustment doesn't span year boundary
-                if (month > adj.start_month or (month == adj.start_month and day >= adj.start_day)) and \
-                   (month < adj.end_month or (month == adj.end_month and day <= adj.end_day)):
-                    return adj
-            else:
-                # Adjustment spans year boundary (e.g., Dec to Feb)
-                if (month > adj.start_month or (month == adj.start_month and day >= adj.start_day)) or \
-                   (month < adj.end_month or (month == adj.end_month and day <= adj.end_day)):
-                    return adj
-        
-        return None
-    
-    def _apply_seasonal_adjustment(
-        self,
-        result: CalculationResult,
-        adjustment: SeasonalAdjustment
-    ) -> CalculationResult:
-        """Apply seasonal adjustment to the calculation result."""
-        # Calculate adjustment amount on the subtotal (before final rounding)
-        adjustment_amount = result.subtotal * (adjustment.adjustment_percent / Decimal('100'))
-        adjustment_amount = adjustment_amount.quantize(Decimal('0.01'))
-        
-        # Update the result
-        result.subtotal += adjustment_amount
-        result.final_total = (result.subtotal / Decimal('5')).quantize(
-            Decimal('1'), rounding=Decimal.ROUND_HALF_UP
-        ) * Decimal('5')
-        
-        # Add adjustment details to calculation details
-        if 'seasonal_adjustment' not in result.calculation_details:
-            result.calculation_details['seasonal_adjustment'] = {
-                'name': adjustment.name,
-                'percent': str(adjustment.adjustment_percent),
-                'amount': str(adjustment_amount)
-            }
-        
-        return result
+        index = await self._get_cost_index()
+        adjustments = index.seasonal_calendar.on(check_date)
+        return adjustments[0] if adjustments else None
     
     async def validate_calculation_inputs(
         self,
-        calculation_input: CalculationInput
+        calculation_input: CalculationInput,
+        effective_date: Optional[date] = None
     ) -> tuple[bool, Optional[str]]:
         """
         Validate calculation inputs against business rules and data availability.
         
+        Args:
+            calculation_input: The calculation input data
+            effective_date: Date whose rates must exist (default: today)
+        
         Returns:
             Tuple of (is_valid, error_message)
         """
-        # Check travel distance
-        if calculation_input.travel_details.miles > settings.MAX_TRAVEL_MILES:
-            return False, f"Travel distance exceeds maximum of {settings.MAX_TRAVEL_MILES} miles"
-        
-        # Check estimated hours
-        if calculation_input.labor_details.estimated_hours > settings.MAX_ESTIMATE_HOURS:
-            return False, f"Estimated hours exceeds maximum of {settings.MAX_ESTIMATE_HOURS} hours"
+        snapshot = await self.get_cost_snapshot(effective_date or date.today())
+        errors = self.input_errors(calculation_input, snapshot)
+        if errors:
+            return False, errors[0]
+        return True, None
+    
+    async def validate_calculation_inputs_batch(
+        self,
+        calculation_inputs: Sequence[CalculationInput],
+        effective_date: Optional[date] = None
+    ) -> List[List[str]]:
+        """
+        Validate many calculation inputs against one cost snapshot.
         
-        # Check crew size
-        crew_size = len(calculation_input.labor_details.crew)
-        if crew_size > settings.MAX_CREW_SIZE:
-            return False, f"Crew size {crew_size} exceeds maximum of {settings.MAX_CREW_SIZE}"
+        Args:
+            calculation_inputs: Inputs to validate
+            effective_date: Date whose rates are checked (default: today)
         
-        # Validate labor roles exist
-        labor_rates = await self._get_labor_rates(date.today())
-        for crew_member in calculation_input.labor_details.crew:
-            if crew_member.role not in labor_rates:
-                return False, f"No labor rate found for role: {crew_member.role}"
+        Returns:
+            Errors for each input, in order (empty when the input is valid)
+        """
+        snapshot = await self.get_cost_snapshot(effective_date or date.today())
+        return [self.input_errors(calculation_input, snapshot) for calculation_input in calculation_inputs]
+    
+    @staticmethod
+    def input_errors(calculation_input: CalculationInput, snapshot: CostSnapshot) -> List[str]:
+        """Every business-rule and data-availability error for one input."""
+        errors = []
+        
+        if calculation_input.travel_miles > settings.MAX_TRAVEL_MILES:
+            errors.append(f"Travel distance exceeds maximum of {settings.MAX_TRAVEL_MILES} miles")
+        if calculation_input.estimated_hours > settings.MAX_ESTIMATE_HOURS:
+            errors.append(f"Estimated hours exceeds maximum of {settings.MAX_ESTIMATE_HOURS} hours")
+        if calculation_input.crew_size > settings.MAX_CREW_SIZE:
+            errors.append(
+                f"Crew size {calculation_input.crew_size} exceeds maximum of {settings.MAX_CREW_SIZE}"
+            )
         
-        # Validate equipment exists and is available
-        if calculation_input.equipment_details:
-            equipment_costs = await self._get_equipment_costs()
-            equipment_ids = {eq.id for eq in equipment_costs}
-            
-            for equipment in calculation_input.equipment_details:
-                if equipment.equipment_id not in equipment_ids:
-                    return False, f"Equipment ID {equipment.equipment_id} not found or unavailable"
+        for role in dict.fromkeys(calculation_input.labor_rates):
+            if role not in snapshot.labor_rates:
+                errors.append(f"No labor rate found for role: {role}")
         
-        # Check overhead settings exist
-        overhead_settings = await self._get_overhead_settings(date.today())
-        if not overhead_settings:
-            return False, "No overhead settings configured for current date"
+        for equipment_id in dict.fromkeys(calculation_input.equipment_ids):
+            if equipment_id not in snapshot.equipment_costs:
+                errors.append(f"Equipment ID {equipment_id} not found or unavailable")
         
-        # Check vehicle rates exist
-        vehicle_rates = await self._get_vehicle_rates(date.today())
-        if not vehicle_rates:
-            return False, "No vehicle rates configured for current date"
+        effective_date = snapshot.calculation_date.isoformat()
+        if not snapshot.overhead:
+            errors.append(f"No overhead settings configured for {effective_date}")
+        if snapshot.vehicle_rate_per_mile is None:
+            errors.append(f"No vehicle rates configured for {effective_date}")
         
-        return True, None
+        return errors
     
     async def get_available_roles(self) -> List[str]:
         """Get list of roles with active labor rates."""
-        query = select(LaborRate.role).distinct().where(
-            and_(
-                LaborRate.deleted_at.is_(None),
-                LaborRate.effective_from <= date.today(),
-                or_(
-                    LaborRate.effective_to.is_(None),
-                    LaborRate.effective_to >= date.today()
-                )
-            )
-        )
-        
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        labor_rates = await self._get_labor_rates(date.today())
+        return list(labor_rates)
     
     async def get_available_equipment(self) -> List[Dict[str, Any]]:
         """Get list of available equipment with details."""
@@ -333,11 +508,61 @@ class CalculationService:
         return [
             {
                 "id": eq.id,
-                "name": eq.name,
-                "type": eq.type,
-                "hourly_cost": str(eq.hourly_cost),
-                "daily_cost": str(eq.daily_cost) if eq.daily_cost else None,
-                "setup_cost": str(eq.setup_cost) if eq.setup_cost else None
+                "name": eq.equipment_name,
+                "type": eq.equipment_type,
+                "hourly_cost": str(eq.hourly_rate),
+                "daily_cost": str(eq.daily_rate) if eq.daily_rate else None
             }
             for eq in equipment_list
-        ]
\ No newline at end of file
+        ]
+
+async def refresh_quick_quote_rates(calculation_date: Optional[date] = None) -> None:
+    """
+    Reload the quick-quote rate snapshot from today's cost data.
+    
+    Runs with its own database session, so it can be used as a background task.
+    The snapshot is tagged with the cost data version read before loading,
+    so a write that lands during the load is picked up by the next
+    refresh_stale_quick_quote_rates.
+    """
+    from src.core.quick_quote import get_quick_quote_rates, set_quick_quote_rates
+    from src.db.session import async_session_maker
+    
+    version = await get_cost_snapshots().current_version()
+    async with async_session_maker() as db:
+        rates = await CalculationService(db).load_cost_rates(calculation_date or date.today())
+    
+    set_quick_quote_rates(get_quick_quote_rates().with_cost_rates(rates, version))
+    logger.info("Quick quote rates refreshed", version=version)
+
+
+_quick_quote_refresh_lock = asyncio.Lock()
+
+
+async def refresh_stale_quick_quote_rates() -> bool:
+    """
+    Reload the quick-quote rates if cost data changed (in any process) or
+    the day turned over since they were loaded.
+    
+    Costs one shared-cache read when the rates are current.
+    
+    Returns:
+        Whether the rates were reloaded
+    """
+    from src.core.quick_quote import get_quick_quote_rates
+    
+    async with _quick_quote_refresh_lock:
+        rates = get_quick_quote_rates()
+        version = await get_cost_snapshots().current_version()
+        if rates.version == version and rates.calculation_date == date.today():
+            return False
+        await refresh_quick_quote_rates()
+        return True
+
+
+async def init_quick_quote_rates() -> None:
+    """Load the quick-quote rates at startup; the configured defaults stay if this fails."""
+    try:
+        await refresh_quick_quote_rates()
+    except Exception as e:
+        logger.warning("Quick quote rates not loaded at startup", error=str(e))
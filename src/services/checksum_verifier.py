@@ -0,0 +1,238 @@
+"""
+Integrity verification of stored estimate checksums.
+
+Streams the estimates table in primary-key order with a server-side
+cursor, recomputes DeterministicCalculator.generate_checksum from each
+stored calculation_result in a process pool, and records mismatches.
+Progress is checkpointed to a file so an interrupted run can resume;
+memory use is bounded by the batch size and the number of batches in
+flight, not by the table size.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from src.core.calculator import DeterministicCalculator
+from src.models.estimate import Estimate
+
+
+logger = structlog.get_logger()
+
+
+def stored_result_checksum(calculation_result: Dict[str, Any]) -> str:
+    """
+    Recompute the checksum of a stored CalculationResult dump.
+
+    Args:
+        calculation_result: The estimate's calculation_result column
+
+    Returns:
+        SHA-256 checksum as generate_checksum would produce it
+    """
+    details = calculation_result.get("calculation_details") or {}
+    return DeterministicCalculator.generate_checksum({
+        "direct_costs": calculation_result.get("direct_costs", 0),
+        "overhead": calculation_result.get("overhead_amount", 0),
+        "safety_buffer": calculation_result.get("safety_buffer_amount", 0),
+        "profit": calculation_result.get("profit_amount", 0),
+        "final_total": calculation_result.get("final_total", 0),
+        "formula_version": details.get("formula_version", "1.0")
+    })
+
+
+def _verify_rows(rows: List[Tuple[int, str, str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Verify a batch of rows; runs in a worker process.
+
+    Args:
+        rows: (id, estimate_number, stored checksum, calculation_result) tuples
+
+    Returns:
+        One record per mismatching or unreadable row
+    """
+    mismatches = []
+    for estimate_id, estimate_number, stored_checksum, calculation_result in rows:
+        try:
+            if isinstance(calculation_result, str):
+                calculation_result = json.loads(calculation_result)
+            computed = stored_result_checksum(calculation_result)
+        except (ValueError, TypeError, AttributeError) as e:
+            mismatches.append({
+                "estimate_id": estimate_id,
+                "estimate_number": estimate_number,
+                "stored_checksum": stored_checksum,
+                "error": str(e)
+            })
+            continue
+
+        if computed != stored_checksum:
+            mismatches.append({
+                "estimate_id": estimate_id,
+                "estimate_number": estimate_number,
+                "stored_checksum": stored_checksum,
+                "computed_checksum": computed
+            })
+    return mismatches
+
+
+@dataclass
+class VerificationReport:
+    """Progress and outcome of a checksum verification run."""
+    last_id: int = 0
+    verified: int = 0
+    mismatches: int = 0
+    resumed_from: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.verified / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "last_id": self.last_id,
+            "verified": self.verified,
+            "mismatches": self.mismatches,
+            "resumed_from": self.resumed_from,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1)
+        }
+
+
+class ChecksumVerifier:
+    """
+    Verifies calculation_checksum for every estimate.
+
+    Batches are handed to the pool as they stream in and their results are
+    consumed in order, so the checkpoint always marks a prefix of the table
+    that is fully verified.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        checkpoint_path: Optional[Path] = None,
+        mismatch_path: Optional[Path] = None,
+        batch_size: int = 1000,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[VerificationReport], None]] = None
+    ):
+        self.db = db
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.mismatch_path = Path(mismatch_path) if mismatch_path else None
+        self.batch_size = batch_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.progress_callback = progress_callback
+        self.report = VerificationReport()
+
+    def load_checkpoint(self) -> None:
+        """Resume counters and position from the checkpoint file, if any."""
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return
+        checkpoint = json.loads(self.checkpoint_path.read_text())
+        self.report.last_id = checkpoint["last_id"]
+        self.report.verified = checkpoint.get("verified", 0)
+        self.report.mismatches = checkpoint.get("mismatches", 0)
+        self.report.resumed_from = self.report.last_id
+
+    def save_checkpoint(self) -> None:
+        """Atomically write the current position."""
+        if not self.checkpoint_path:
+            return
+        checkpoint = {
+            "last_id": self.report.last_id,
+            "verified": self.report.verified,
+            "mismatches": self.report.mismatches,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        temp_path = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + ".tmp")
+        temp_path.write_text(json.dumps(checkpoint))
+        os.replace(temp_path, self.checkpoint_path)
+
+    async def run(self, resume: bool = True) -> VerificationReport:
+        """
+        Verify every estimate after the checkpoint.
+
+        Args:
+            resume: Continue from the checkpoint file instead of the start
+
+        Returns:
+            Final VerificationReport
+        """
+        if resume:
+            self.load_checkpoint()
+
+        # Core columns: rows stay plain tuples, with no ORM identity map to grow
+        estimates = Estimate.__table__.c
+        query = select(
+            estimates.id,
+            estimates.estimate_number,
+            estimates.calculation_checksum,
+            estimates.calculation_result
+        ).where(
+            estimates.id > self.report.last_id
+        ).order_by(estimates.id).execution_options(yield_per=self.batch_size)
+
+        loop = asyncio.get_running_loop()
+        mismatch_file = open(self.mismatch_path, "a" if resume else "w") if self.mismatch_path else None
+        in_flight: Deque[Tuple[int, int, asyncio.Future]] = deque()
+
+        logger.info("Checksum verification started", resume_from=self.report.last_id)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                stream = await self.db.stream(query)
+                async for partition in stream.partitions(self.batch_size):
+                    rows = [tuple(row) for row in partition]
+                    future = loop.run_in_executor(pool, _verify_rows, rows)
+                    in_flight.append((rows[-1][0], len(rows), future))
+
+                    # Bound memory: at most two batches per worker in flight
+                    if len(in_flight) >= self.max_workers * 2:
+                        await self._complete_batch(in_flight.popleft(), mismatch_file)
+
+                while in_flight:
+                    await self._complete_batch(in_flight.popleft(), mismatch_file)
+        finally:
+            if mismatch_file:
+                mismatch_file.close()
+            self.report.finished_at = time.monotonic()
+            logger.info("Checksum verification finished", **self.report.to_dict())
+
+        return self.report
+
+    async def _complete_batch(self, batch: Tuple[int, int, asyncio.Future], mismatch_file) -> None:
+        """Record a finished batch's mismatches and advance the checkpoint."""
+        last_id, row_count, future = batch
+        mismatches = await future
+
+        if mismatch_file:
+            for mismatch in mismatches:
+                mismatch_file.write(json.dumps(mismatch) + "\n")
+            mismatch_file.flush()
+
+        self.report.verified += row_count
+        self.report.mismatches += len(mismatches)
+        self.report.last_id = last_id
+        self.save_checkpoint()
+
+        if self.progress_callback:
+            self.progress_callback(self.report)
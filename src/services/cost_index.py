@@ -0,0 +1,268 @@
+"""
+In-memory interval indexes over the effective-dated cost tables.
+
+Rows are loaded once per cost data version (the counter bumped by every
+cost write, see CostSnapshotCache) as detached records, so "rates as of
+a date" and "does this range overlap" are answered without queries. A
+write made in this process is applied to the index directly; writes from
+other processes show up as a version change and trigger a reload.
+
+Loading is a single round trip: one UNION ALL over every table, each row
+encoded as a JSON object (json_build_object on PostgreSQL, json_object on
+SQLite) so tables with different columns share one result set.
+
+The version counter lives in the shared cache and starts over if the cache
+is reset, so anything persisted or handed to clients is tagged with a hash
+of the indexed rows instead.
+"""
+import asyncio
+import hashlib
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    Boolean, Date, DateTime, Numeric, Table, Text, cast, func, literal_column, select, union_all
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+import structlog
+
+from src.core.interval_index import IntervalIndex
+from src.core.seasonal_calendar import SeasonalCalendar
+from src.models.costs import (
+    DisposalFee, EquipmentCost, LaborRate, OverheadSettings, SeasonalAdjustment, VehicleRate
+)
+
+
+logger = structlog.get_logger()
+
+
+# Indexed models, keyed by table name
+INDEXED_MODELS = {
+    model.__tablename__: model
+    for model in (
+        LaborRate, EquipmentCost, OverheadSettings, VehicleRate, DisposalFee, SeasonalAdjustment
+    )
+}
+
+
+def _json_row(table: Table, dialect_name: str) -> Select:
+    """Select a table's non-deleted rows as (table_name, JSON object text)."""
+    build_object = func.json_build_object if dialect_name == "postgresql" else func.json_object
+    pairs = []
+    for column in table.c:
+        pairs.extend((literal_column(f"'{column.name}'"), column))
+    return select(
+        literal_column(f"'{table.name}'").label("table_name"),
+        cast(build_object(*pairs), Text).label("data")
+    ).where(table.c.deleted_at.is_(None))
+
+
+def cost_rows_query(dialect_name: str) -> Any:
+    """One statement returning every non-deleted row of every indexed table."""
+    return union_all(*(
+        _json_row(model.__table__, dialect_name) for model in INDEXED_MODELS.values()
+    ))
+
+
+def _numeric_decoder(scale: Optional[int]) -> Callable[[Any], Decimal]:
+    if scale is None:
+        return lambda value: Decimal(str(value))
+    exponent = Decimal(1).scaleb(-scale)
+    return lambda value: Decimal(str(value)).quantize(exponent)
+
+
+def _column_decoder(column: Any) -> Optional[Callable[[Any], Any]]:
+    """Converter from a JSON value to what the column type would return."""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return bool
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(column_type, Date):
+        return lambda value: date.fromisoformat(value[:10])
+    if isinstance(column_type, Numeric):
+        return _numeric_decoder(column_type.scale)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _table_decoders(table: Table) -> Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]:
+    return tuple((column.name, _column_decoder(column)) for column in table.c)
+
+
+def decode_cost_row(table: Table, text: str) -> SimpleNamespace:
+    """Cost record from one JSON-encoded row."""
+    data = json.loads(text, parse_float=Decimal)
+    values = {}
+    for name, decode in _table_decoders(table):
+        value = data.get(name)
+        values[name] = decode(value) if decode is not None and value is not None else value
+    return SimpleNamespace(**values)
+
+
+def _canonical_value(value: Any) -> Any:
+    """JSON value of a column, the same whether the row was decoded or refreshed."""
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def cost_record(row: Any) -> SimpleNamespace:
+    """Detached copy of an ORM cost row with the same attributes."""
+    return SimpleNamespace(**row.to_dict())
+
+
+class CostIndex:
+    """
+    One IntervalIndex of non-deleted rows per effective-dated cost table,
+    plus the day-of-year calendar of active seasonal adjustments.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, IntervalIndex[SimpleNamespace]] = {}
+        self.seasonal_calendar = SeasonalCalendar()
+        self.version: Optional[int] = None
+        self._hashes: Dict[str, str] = {}
+        self._lock = asyncio.Lock()
+
+    async def load(self, db: AsyncSession, version: Optional[int] = None) -> None:
+        """Load every indexed table in one query."""
+        dialect_name = db.get_bind().dialect.name
+        result = await db.execute(cost_rows_query(dialect_name))
+
+        rows: Dict[str, List[SimpleNamespace]] = {name: [] for name in INDEXED_MODELS}
+        for table_name, text in result:
+            rows[table_name].append(decode_cost_row(INDEXED_MODELS[table_name].__table__, text))
+
+        indexes = {
+            table_name: IntervalIndex(
+                (record.effective_from, record.effective_to, record) for record in records
+            )
+            for table_name, records in rows.items()
+        }
+        self._indexes = indexes
+        self._hashes = {}
+        self._compile_seasonal_calendar()
+        self.version = version
+        logger.info(
+            "Cost index loaded",
+            version=version,
+            rows={name: len(index) for name, index in indexes.items()}
+        )
+
+    async def ensure_current(self, db: AsyncSession) -> "CostIndex":
+        """Reload the index if the cost data version has moved on."""
+        from src.services.calculation import get_cost_snapshots
+
+        version = await get_cost_snapshots().current_version()
+        if self._indexes and self.version == version:
+            return self
+        async with self._lock:
+            if not self._indexes or self.version != version:
+                await self.load(db, version)
+        return self
+
+    def _compile_seasonal_calendar(self) -> None:
+        self.seasonal_calendar = SeasonalCalendar(
+            adjustment for adjustment in self.rows(SeasonalAdjustment.__tablename__)
+            if adjustment.is_active
+        )
+
+    def as_of(
+        self,
+        table_name: str,
+        effective_date: date,
+        predicate: Optional[Callable[[SimpleNamespace], bool]] = None
+    ) -> List[SimpleNamespace]:
+        """Rows of a table in effect on a date."""
+        rows = self._indexes[table_name].at(effective_date)
+        return [row for row in rows if predicate is None or predicate(row)]
+
+    def rows(self, table_name: str) -> List[SimpleNamespace]:
+        """Every non-deleted row of a table, whatever its effective dates."""
+        return list(self._indexes[table_name])
+
+    def table_hash(self, table_name: str) -> str:
+        """SHA-256 of a table's indexed rows, equal in every process holding the same rows."""
+        digest = self._hashes.get(table_name)
+        if digest is None:
+            rows = sorted(
+                json.dumps(
+                    {name: _canonical_value(value) for name, value in vars(row).items()},
+                    sort_keys=True
+                )
+                for row in self._indexes[table_name]
+            )
+            digest = hashlib.sha256("\n".join(rows).encode()).hexdigest()
+            self._hashes[table_name] = digest
+        return digest
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of every indexed row; unlike the version, it survives a cache reset."""
+        return hashlib.sha256(
+            "".join(self.table_hash(table_name) for table_name in sorted(INDEXED_MODELS)).encode()
+        ).hexdigest()
+
+    def overlaps(
+        self,
+        table_name: str,
+        effective_from: date,
+        effective_to: Optional[date],
+        predicate: Optional[Callable[[SimpleNamespace], bool]] = None
+    ) -> bool:
+        """Whether any (matching) row's effective range overlaps the given range."""
+        return self._indexes[table_name].overlaps(effective_from, effective_to, predicate)
+
+    def record_write(self, row: Any, version: Optional[int]) -> None:
+        """
+        Apply a committed write to the index.
+
+        Args:
+            row: The written ORM instance, refreshed after commit
+            version: Cost data version after the write's bump
+        """
+        if version is None or self.version is None or version != self.version + 1:
+            # Another write happened in between (or the version is unknown): reload
+            self.version = None
+            return
+
+        index = self._indexes.get(row.__tablename__)
+        if index is not None:
+            self._hashes.pop(row.__tablename__, None)
+            index.remove_where(lambda record: record.id == row.id)
+            if row.deleted_at is None:
+                index.add(row.effective_from, row.effective_to, cost_record(row))
+            if row.__tablename__ == SeasonalAdjustment.__tablename__:
+                self._compile_seasonal_calendar()
+        self.version = version
+
+
+_cost_index = CostIndex()
+
+
+def get_cost_index() -> CostIndex:
+    """Get the process-wide cost index."""
+    return _cost_index
+
+
+async def init_cost_index() -> None:
+    """Load the cost index at startup; it loads lazily if this fails."""
+    from src.db.session import async_session_maker
+
+    try:
+        async with async_session_maker() as db:
+            await _cost_index.ensure_current(db)
+    except Exception as e:
+        logger.warning("Cost index not loaded at startup", error=str(e))
@@ -0,0 +1,112 @@
+"""
+Reverse index from cost rates to the open estimates that use them.
+
+Each DRAFT/PENDING estimate has one estimate_cost_refs row per labor role
+and equipment id in its calculation inputs. Rows are rewritten in the same
+transaction as the estimate, so "which open estimates does this rate
+change touch" is an index lookup instead of a scan of every estimate's
+JSON inputs.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.estimate import Estimate, EstimateCostRef
+from src.services.repricing import REPRICEABLE_STATUSES
+
+
+REF_ROLE = "role"
+REF_EQUIPMENT = "equipment"
+
+
+def cost_refs_for_inputs(calculation_inputs: Optional[Dict[str, Any]]) -> Set[Tuple[str, str]]:
+    """
+    (ref_type, ref_key) pairs of the rates a stored calculation input uses.
+
+    Reads the role and equipment lists of the input schema as well as the
+    crew and equipment details the calculation service enriches.
+    """
+    if not calculation_inputs:
+        return set()
+
+    refs = set()
+    for role in calculation_inputs.get("labor_rates") or []:
+        refs.add((REF_ROLE, str(role)))
+    for equipment_id in calculation_inputs.get("equipment_ids") or []:
+        refs.add((REF_EQUIPMENT, str(equipment_id)))
+
+    labor_details = calculation_inputs.get("labor_details") or {}
+    for crew_member in labor_details.get("crew") or []:
+        if crew_member.get("role"):
+            refs.add((REF_ROLE, str(crew_member["role"])))
+    for equipment in calculation_inputs.get("equipment_details") or []:
+        if equipment.get("equipment_id") is not None:
+            refs.add((REF_EQUIPMENT, str(equipment["equipment_id"])))
+
+    return refs
+
+
+async def sync_estimate_cost_refs(
+    db: AsyncSession,
+    estimate_id: int,
+    calculation_inputs: Optional[Dict[str, Any]],
+    estimate_status: Any,
+    deleted: bool = False
+) -> None:
+    """
+    Rewrite an estimate's cost references in the current transaction.
+
+    Closed or deleted estimates have their references removed. The caller
+    commits.
+    """
+    table = EstimateCostRef.__table__
+    await db.execute(delete(table).where(table.c.estimate_id == estimate_id))
+
+    if deleted or estimate_status not in REPRICEABLE_STATUSES:
+        return
+    refs = cost_refs_for_inputs(calculation_inputs)
+    if refs:
+        await db.execute(insert(table), [
+            {"ref_type": ref_type, "ref_key": ref_key, "estimate_id": estimate_id}
+            for ref_type, ref_key in sorted(refs)
+        ])
+
+
+async def find_affected_estimates(
+    db: AsyncSession,
+    roles: Iterable[str] = (),
+    equipment_ids: Iterable[int] = ()
+) -> List[Any]:
+    """
+    Open estimates using any of the given roles or equipment ids.
+
+    Returns:
+        (id, estimate_number, calculation_inputs, final_total) rows in id order
+    """
+    keys = [(REF_ROLE, str(role)) for role in roles]
+    keys += [(REF_EQUIPMENT, str(equipment_id)) for equipment_id in equipment_ids]
+    if not keys:
+        return []
+
+    refs = EstimateCostRef.__table__
+    estimates = Estimate.__table__
+    matching_ids = select(refs.c.estimate_id).where(or_(*(
+        and_(refs.c.ref_type == ref_type, refs.c.ref_key == ref_key)
+        for ref_type, ref_key in keys
+    )))
+    query = select(
+        estimates.c.id,
+        estimates.c.estimate_number,
+        estimates.c.calculation_inputs,
+        estimates.c.final_total
+    ).where(
+        and_(
+            estimates.c.id.in_(matching_ids),
+            estimates.c.status.in_(REPRICEABLE_STATUSES),
+            estimates.c.deleted_at.is_(None)
+        )
+    ).order_by(estimates.c.id)
+
+    result = await db.execute(query)
+    return result.all()
@@ -0,0 +1,241 @@
+"""
+Materialized effective-costs timeline.
+
+The effective costs for a date only change where an effective-dated row
+(labor, overhead or vehicle rate) starts or ends, or where the seasonal
+adjustments in effect change. The timeline splits the calendar at those
+boundaries into segments and serializes each distinct segment's payload
+once per cost data content (see CostIndex.content_hash). Payloads are kept
+in-process, in the shared cache and in the cost_timeline_segments table,
+so another process (or a restart) picks them up instead of rebuilding.
+They are keyed by the content hash rather than the cost data version,
+which starts over when the shared cache is reset.
+
+Payloads are JSON objects without the effective_date field, which is
+spliced in per request.
+"""
+import asyncio
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from src.core.cache import CacheManager, get_cache
+from src.core.seasonal_calendar import DAYS_IN_CALENDAR
+from src.models.costs import CostTimelineSegment, LaborRate, OverheadSettings, VehicleRate
+from src.services.cost_index import CostIndex
+
+
+logger = structlog.get_logger()
+
+# Tables whose effective dates split the timeline
+DATED_TABLES = (LaborRate.__tablename__, OverheadSettings.__tablename__, VehicleRate.__tablename__)
+
+# Renders the effective-costs payload (without effective_date) for a date
+Renderer = Callable[[CostIndex, date], bytes]
+
+
+def timeline_boundaries(cost_index: CostIndex) -> List[date]:
+    """Sorted first days of the segments of the dated cost tables."""
+    boundaries = {date.min}
+    for table_name in DATED_TABLES:
+        for row in cost_index.rows(table_name):
+            boundaries.add(row.effective_from)
+            if row.effective_to is not None and row.effective_to < date.max:
+                boundaries.add(row.effective_to + timedelta(days=1))
+    return sorted(boundaries)
+
+
+def splice_effective_date(payload: bytes, effective_date: date) -> bytes:
+    """Response body from a segment payload and the requested date."""
+    prefix = b'{"effective_date":"' + effective_date.isoformat().encode() + b'"'
+    if payload == b"{}":
+        return prefix + b"}"
+    return prefix + b"," + payload[1:]
+
+
+class CostTimeline:
+    """Segment payloads of one cost data content."""
+
+    def __init__(self, cost_index: CostIndex, payloads: Optional[Dict[str, bytes]] = None):
+        self.content_hash = cost_index.content_hash
+        self.boundaries = timeline_boundaries(cost_index)
+        self.seasonal_calendar = cost_index.seasonal_calendar
+        self.payloads: Dict[str, bytes] = payloads or {}
+
+    def segment_bounds(self, effective_date: date) -> Tuple[date, Optional[date]]:
+        """First and last day of the dated segment containing a date."""
+        position = bisect_right(self.boundaries, effective_date) - 1
+        start = self.boundaries[position]
+        if position + 1 < len(self.boundaries):
+            return start, self.boundaries[position + 1] - timedelta(days=1)
+        return start, None
+
+    def segment_key(self, effective_date: date) -> str:
+        start, _ = self.segment_bounds(effective_date)
+        seasonal_ids = self.seasonal_calendar.ids_on(effective_date)
+        return f"{start.isoformat()}|{','.join(str(i) for i in seasonal_ids)}"
+
+    def segments(self) -> List[Tuple[str, date, Optional[date], date]]:
+        """
+        Every distinct segment as (key, start, end, representative day).
+
+        A dated segment splits into one segment per distinct set of seasonal
+        adjustments in effect within it; any 366 days cover every set.
+        """
+        segments = []
+        for start in self.boundaries:
+            _, end = self.segment_bounds(start)
+            days = DAYS_IN_CALENDAR
+            if end is not None:
+                days = min((end - start).days + 1, DAYS_IN_CALENDAR)
+            seen = set()
+            day = start
+            for _ in range(days):
+                key = self.segment_key(day)
+                if key not in seen:
+                    seen.add(key)
+                    segments.append((key, start, end, day))
+                if day == date.max:
+                    break
+                day += timedelta(days=1)
+        return segments
+
+    def materialize(
+        self,
+        cost_index: CostIndex,
+        render: Renderer
+    ) -> List[Tuple[str, date, Optional[date]]]:
+        """Render every segment's payload; returns (key, start, end) per segment."""
+        built = []
+        for key, start, end, day in self.segments():
+            self.payloads[key] = render(cost_index, day)
+            built.append((key, start, end))
+        return built
+
+    def body(self, effective_date: date) -> Optional[bytes]:
+        """Pre-serialized response body for a date, if its segment is materialized."""
+        payload = self.payloads.get(self.segment_key(effective_date))
+        if payload is None:
+            return None
+        return splice_effective_date(payload, effective_date)
+
+
+class CostTimelineStore:
+    """
+    The timeline of the current cost data, loaded from this process, the
+    shared cache or the segments table, and materialized only if none has it.
+    """
+
+    def __init__(self, cache: Optional[CacheManager] = None):
+        self._cache = cache
+        self._timeline: Optional[CostTimeline] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def cache(self) -> CacheManager:
+        return self._cache or get_cache()
+
+    @staticmethod
+    def cache_key(content_hash: str) -> str:
+        return f"cost_timeline:{content_hash}"
+
+    async def get(self, db: AsyncSession, cost_index: CostIndex, render: Renderer) -> CostTimeline:
+        """Timeline matching the cost index's rows."""
+        content_hash = cost_index.content_hash
+        timeline = self._timeline
+        if timeline is not None and timeline.content_hash == content_hash:
+            return timeline
+        async with self._lock:
+            timeline = self._timeline
+            if timeline is None or timeline.content_hash != content_hash:
+                timeline = await self._load(db, cost_index, render)
+                self._timeline = timeline
+        return timeline
+
+    async def body(
+        self,
+        db: AsyncSession,
+        cost_index: CostIndex,
+        render: Renderer,
+        effective_date: date
+    ) -> bytes:
+        """Effective-costs response body for a date."""
+        timeline = await self.get(db, cost_index, render)
+        body = timeline.body(effective_date)
+        if body is None:
+            # Missing from a stored timeline: render the segment now
+            key = timeline.segment_key(effective_date)
+            timeline.payloads[key] = render(cost_index, effective_date)
+            body = timeline.body(effective_date)
+        return body
+
+    async def _load(
+        self,
+        db: AsyncSession,
+        cost_index: CostIndex,
+        render: Renderer
+    ) -> CostTimeline:
+        content_hash = cost_index.content_hash
+        cached = await self.cache.get(self.cache_key(content_hash))
+        if isinstance(cached, dict):
+            return CostTimeline(
+                cost_index, {key: payload.encode() for key, payload in cached.items()}
+            )
+
+        table = CostTimelineSegment.__table__
+        result = await db.execute(
+            select(table.c.segment_key, table.c.payload).where(table.c.content_hash == content_hash)
+        )
+        stored = {key: payload.encode() for key, payload in result}
+        if stored:
+            timeline = CostTimeline(cost_index, stored)
+        else:
+            timeline = CostTimeline(cost_index)
+            built = timeline.materialize(cost_index, render)
+            await self._store(db, content_hash, timeline, built)
+
+        await self.cache.set(
+            self.cache_key(content_hash),
+            {key: payload.decode() for key, payload in timeline.payloads.items()}
+        )
+        return timeline
+
+    async def _store(
+        self,
+        db: AsyncSession,
+        content_hash: str,
+        timeline: CostTimeline,
+        built: List[Tuple[str, date, Optional[date]]]
+    ) -> None:
+        """Replace the stored segments with this content's."""
+        table = CostTimelineSegment.__table__
+        try:
+            await db.execute(delete(table).where(table.c.content_hash != content_hash))
+            await db.execute(insert(table), [
+                {
+                    "content_hash": content_hash,
+                    "segment_key": key,
+                    "segment_start": start,
+                    "segment_end": end,
+                    "payload": timeline.payloads[key].decode()
+                }
+                for key, start, end in built
+            ])
+            await db.commit()
+        except IntegrityError:
+            # Another process stored this content first
+            await db.rollback()
+        logger.info("Cost timeline materialized", content_hash=content_hash, segments=len(built))
+
+
+_cost_timeline = CostTimelineStore()
+
+
+def get_cost_timeline() -> CostTimelineStore:
+    """Get the process-wide cost timeline store."""
+    return _cost_timeline
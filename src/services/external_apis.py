@@ -7,7 +7,7 @@ Includes:
 - Fuel price API for current fuel costs
 """
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Type
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 import httpx
@@ -160,12 +160,28 @@ class ExternalAPIService:
         if self.fuel_api_client:
             await self.fuel_api_client.aclose()
     
+    async def _cached(self, key: str, compute, ttl: int, stale_ttl: Optional[int] = None):
+        """
+        Get a cached value, computing it at most once across concurrent
+        callers. API errors propagate; if the cache itself fails the value
+        is computed directly.
+        """
+        if not self.cache:
+            return await compute()
+        try:
+            return await self.cache.get_or_compute(key, compute, ttl=ttl, stale_ttl=stale_ttl)
+        except ExternalAPIError:
+            raise
+        except Exception as e:
+            logger.warning("Cache get_or_compute failed", key=key, error=str(e))
+            return await compute()
+    
+    @staticmethod
+    def _as_model(model: Type[BaseModel], cached: Any) -> BaseModel:
+        """Cached models come back as models; entries cached as dicts are rebuilt."""
+        return cached if isinstance(cached, model) else model(**cached)
+    
     # Google Maps Distance Matrix API
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(httpx.HTTPError)
-    )
     async def calculate_travel_distance(
         self,
         origin: str,
@@ -186,17 +202,25 @@ class ExternalAPIService:
         Raises:
             GoogleMapsError: If API call fails
         """
-        # Check cache first
-        cache_key = f"distance:{origin}:{destination}"
-        if self.cache:
-            try:
-                cached = await self.cache.get(cache_key)
-                if cached:
-                    logger.info("Using cached distance calculation", origin=origin, destination=destination)
-                    return TravelDistance(**cached)
-            except Exception as e:
-                logger.warning("Cache get failed", error=str(e))
+        async def fetch() -> TravelDistance:
+            return await self._fetch_travel_distance(origin, destination, departure_time)
         
+        # Cached for 24 hours; concurrent requests for a route share one API call
+        cached = await self._cached(f"distance:{origin}:{destination}", fetch, ttl=86400)
+        return self._as_model(TravelDistance, cached)
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(httpx.HTTPError)
+    )
+    async def _fetch_travel_distance(
+        self,
+        origin: str,
+        destination: str,
+        departure_time: Optional[datetime] = None
+    ) -> TravelDistance:
+        """Call the Distance Matrix API for one route, uncached."""
         try:
             # Prepare API parameters
             params = {
@@ -246,13 +270,6 @@ class ExternalAPIService:
                 duration_text=element["duration"]["text"]
             )
             
-            # Cache the result for 24 hours
-            if self.cache:
-                try:
-                    await self.cache.set(cache_key, result.model_dump(), expire=86400)
-                except Exception as e:
-                    logger.warning("Cache set failed", error=str(e))
-            
             logger.info(
                 "Calculated travel distance",
                 origin=origin,
@@ -278,15 +295,13 @@ class ExternalAPIService:
         This is a simplified version - in production, you'd need proper OAuth flow.
         """
         # TODO: Implement proper OAuth2 token management
-        # For now, assume token is stored in settings or cache
-        if self.cache:
-            try:
-                cached_token = await self.cache.get("quickbooks:token")
-                if cached_token:
-                    return cached_token
-            except Exception as e:
-                logger.warning("Cache get failed for QB token", error=str(e))
-        
+        # For now, assume token is stored in settings or cache.
+        # Access tokens live an hour; keep them a little less so a refresh,
+        # done by one caller at a time, happens before they expire.
+        return await self._cached("quickbooks:token", self._refresh_quickbooks_token, ttl=3300)
+    
+    async def _refresh_quickbooks_token(self) -> str:
+        """Obtain a new QuickBooks access token."""
         # In production, implement token refresh logic here
         raise QuickBooksError("QuickBooks token not available")
     
@@ -462,11 +477,6 @@ class ExternalAPIService:
         return response.json()["Customer"]["Id"]
     
     # Fuel Price API Integration
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(httpx.HTTPError)
-    )
     async def get_current_fuel_price(
         self,
         location: str = "local",
@@ -485,17 +495,21 @@ class ExternalAPIService:
         Raises:
             FuelAPIError: If API call fails
         """
-        # Check cache first (cache for 4 hours)
-        cache_key = f"fuel:{location}:{fuel_type}"
-        if self.cache:
-            try:
-                cached = await self.cache.get(cache_key)
-                if cached:
-                    logger.info("Using cached fuel price", location=location, fuel_type=fuel_type)
-                    return FuelPrice(**cached)
-            except Exception as e:
-                logger.warning("Cache get failed", error=str(e))
+        async def fetch() -> FuelPrice:
+            return await self._fetch_fuel_price(location, fuel_type)
         
+        # Fresh for 4 hours, then served for up to another hour while one
+        # caller refreshes it in the background
+        cached = await self._cached(f"fuel:{location}:{fuel_type}", fetch, ttl=14400, stale_ttl=3600)
+        return self._as_model(FuelPrice, cached)
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(httpx.HTTPError)
+    )
+    async def _fetch_fuel_price(self, location: str, fuel_type: str) -> FuelPrice:
+        """Get the fuel price from the provider, uncached."""
         try:
             # This is a mock implementation - replace with actual fuel API
             # Some options: GasBuddy API, EIA.gov API, or commercial providers
@@ -524,13 +538,6 @@ class ExternalAPIService:
                 source="mock_api"  # Replace with actual source
             )
             
-            # Cache the result
-            if self.cache:
-                try:
-                    await self.cache.set(cache_key, result.model_dump(), expire=14400)  # 4 hours
-                except Exception as e:
-                    logger.warning("Cache set failed", error=str(e))
-            
             logger.info(
                 "Retrieved fuel price",
                 location=location,
@@ -563,26 +570,28 @@ class ExternalAPIService:
         Returns:
             List of TravelDistance objects
         """
-        # Google Maps Distance Matrix API supports up to 25 destinations per request
-        results = []
+        results: Dict[str, TravelDistance] = {}
+        cache_keys = {destination: f"distance:{origin}:{destination}" for destination in destinations}
         
-        for i in range(0, len(destinations), 25):
-            batch = destinations[i:i + 25]
+        # Look every destination up in one round trip, sharing the
+        # single-route cache entries
+        if self.cache:
+            try:
+                cached = await self.cache.get_many(cache_keys.values())
+            except Exception as e:
+                logger.warning("Cache get_many failed", error=str(e))
+                cached = {}
+            for destination, cache_key in cache_keys.items():
+                if cache_key in cached:
+                    results[destination] = self._as_model(TravelDistance, cached[cache_key])
+        
+        missing = [destination for destination in cache_keys if destination not in results]
+        
+        # Google Maps Distance Matrix API supports up to 25 destinations per request
+        for i in range(0, len(missing), 25):
+            batch = missing[i:i + 25]
             batch_destinations = "|".join(batch)
             
-            # Check cache for batch
-            cache_key = f"batch_distance:{origin}:{hash(batch_destinations)}"
-            cached = None
-            if self.cache:
-                try:
-                    cached = await self.cache.get(cache_key)
-                except Exception as e:
-                    logger.warning("Cache get failed", error=str(e))
-            
-            if cached:
-                results.extend([TravelDistance(**d) for d in cached])
-                continue
-            
             try:
                 params = {
                     "origins": origin,
@@ -603,7 +612,7 @@ class ExternalAPIService:
                     logger.error("Batch distance calculation failed", status=data["status"])
                     continue
                 
-                batch_results = []
+                batch_results = {}
                 for idx, element in enumerate(data["rows"][0]["elements"]):
                     if element["status"] == "OK":
                         distance_miles = element["distance"]["value"] * 0.000621371
@@ -617,26 +626,25 @@ class ExternalAPIService:
                             distance_text=element["distance"]["text"],
                             duration_text=element["duration"]["text"]
                         )
-                        batch_results.append(result)
+                        batch_results[batch[idx]] = result
                 
-                # Cache batch results
-                if self.cache:
+                # Cache batch results, pipelined into one round trip
+                if self.cache and batch_results:
                     try:
-                        await self.cache.set(
-                            cache_key,
-                            [r.model_dump() for r in batch_results],
+                        await self.cache.set_many(
+                            {cache_keys[destination]: result for destination, result in batch_results.items()},
                             expire=86400
                         )
                     except Exception as e:
-                        logger.warning("Cache set failed", error=str(e))
+                        logger.warning("Cache set_many failed", error=str(e))
                 
-                results.extend(batch_results)
+                results.update(batch_results)
                 
             except Exception as e:
                 logger.error("Batch distance calculation error", error=str(e))
                 # Continue with next batch
         
-        return results
+        return [results[destination] for destination in destinations if destination in results]
     
     # Health check methods
     async def check_google_maps_health(self) -> bool:
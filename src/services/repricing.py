@@ -0,0 +1,400 @@
+"""
+Bulk re-pricing of open estimates after cost changes.
+
+Streams DRAFT/PENDING estimates in primary-key order, prices them in a
+process pool with rates loaded once per job, writes changed
+estimates back with batched UPDATEs and records one audit batch sharing a
+correlation ID.
+
+Cost writes that are already in effect start a job right away. Rows dated
+to start (or end) later change prices when the day arrives, so a
+scheduler checks every day whether the rates in effect changed overnight
+and re-prices then.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import os
+import time
+import uuid
+
+from sqlalchemy import select, update, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from src.core.calculator import TreeServiceCalculator
+from src.core.calculation_memo import CalculationMemo
+from src.models.audit import AuditLog
+from src.models.estimate import Estimate, EstimateStatus
+from src.services.calculation import CalculationService, CostRates
+
+
+logger = structlog.get_logger()
+
+REPRICEABLE_STATUSES = (EstimateStatus.DRAFT, EstimateStatus.PENDING)
+
+# The daily check runs this long after midnight, and its per-date claim
+# in the shared cache outlives the day
+BOUNDARY_DELAY_SECONDS = 300
+BOUNDARY_CLAIM_SECONDS = 2 * 24 * 3600
+
+MONEY_COLUMNS = (
+    "travel_cost", "labor_cost", "equipment_cost", "disposal_fees", "permit_cost",
+    "direct_costs", "overhead_amount", "safety_buffer_amount", "profit_amount",
+    "subtotal", "final_total"
+)
+
+# Rates for the current job, set once per worker process
+_worker_rates: Optional[CostRates] = None
+
+
+def _init_worker(rates: CostRates) -> None:
+    """Process pool initializer: keep the job's rates in the worker."""
+    global _worker_rates
+    _worker_rates = rates
+
+
+def _reprice_rows(
+    rows: List[Tuple[int, Dict[str, Any]]],
+    rates: Optional[CostRates] = None
+) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Price a chunk of estimates.
+
+    Runs in a worker process, so it only takes and returns plain data.
+
+    Args:
+        rows: (estimate id, stored calculation inputs) pairs
+        rates: Cost rates (defaults to the worker's rates)
+
+    Returns:
+        (estimate id, {"result": JSON-safe CalculationResult dump} or None,
+        error or None) per row
+    """
+    from src.schemas.calculation import CalculationInput
+
+    rates = rates or _worker_rates
+    # Each job prices distinct estimates, so the memo would only add overhead
+    calculator = TreeServiceCalculator(memo=CalculationMemo(max_entries=0))
+    priced = []
+
+    for estimate_id, calculation_inputs in rows:
+        try:
+            result = calculator.calculate_estimate(CalculationInput(**calculation_inputs), rates)
+            priced.append((estimate_id, {"result": result.model_dump(mode="json")}, None))
+        except (ValueError, KeyError, TypeError, ArithmeticError) as e:
+            priced.append((estimate_id, None, str(e)))
+
+    return priced
+
+
+def price_rows(
+    rows: List[Tuple[int, Dict[str, Any]]],
+    rates: CostRates
+) -> Dict[int, Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Price estimates in this process; (payload, error) by estimate id."""
+    return {
+        estimate_id: (payload, error)
+        for estimate_id, payload, error in _reprice_rows(rows, rates)
+    }
+
+
+@dataclass
+class RepricingReport:
+    """Progress and outcome of a re-pricing job."""
+    job_id: str
+    reason: str
+    status: str = "running"
+    scanned: int = 0
+    repriced: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.scanned / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "reason": self.reason,
+            "status": self.status,
+            "scanned": self.scanned,
+            "repriced": self.repriced,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors[:50]
+        }
+
+
+# Reports of jobs started in this process, by job ID
+_job_reports: Dict[str, RepricingReport] = {}
+
+
+def get_repricing_report(job_id: str) -> Optional[RepricingReport]:
+    """Get the report of a job started in this process."""
+    return _job_reports.get(job_id)
+
+
+class RepricingJob:
+    """
+    Re-prices every DRAFT/PENDING estimate with the rates effective on a date.
+
+    Chunks are read with keyset pagination on the primary key. While the
+    pool prices one chunk the next one is fetched, keeping at most
+    ``max_workers`` chunks in flight.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        reason: str,
+        chunk_size: int = 200,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[RepricingReport], None]] = None
+    ):
+        self.db: Optional[AsyncSession] = None
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.progress_callback = progress_callback
+        self.report = RepricingReport(job_id=str(uuid.uuid4()), reason=reason)
+        _job_reports[self.report.job_id] = self.report
+
+    async def run(self, db: AsyncSession, calculation_date: Optional[date] = None) -> RepricingReport:
+        """
+        Run the job to completion.
+
+        Args:
+            db: Database session used for reads and writes
+            calculation_date: Date whose rates are applied (default: today)
+
+        Returns:
+            Final RepricingReport
+        """
+        self.db = db
+        calculation_date = calculation_date or date.today()
+        snapshot = await CalculationService(self.db).get_cost_snapshot(calculation_date)
+        rates = snapshot.to_rates()
+        loop = asyncio.get_running_loop()
+
+        logger.info(
+            "Re-pricing job started",
+            job_id=self.report.job_id,
+            reason=self.report.reason,
+            calculation_date=calculation_date.isoformat()
+        )
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(rates,)
+            ) as pool:
+                in_flight: List[Tuple[Dict[int, Any], asyncio.Future]] = []
+                last_id = 0
+
+                while True:
+                    chunk = await self._fetch_chunk(last_id)
+                    if not chunk:
+                        break
+                    last_id = chunk[-1].id
+
+                    rows = [(estimate.id, estimate.calculation_inputs) for estimate in chunk]
+                    future = loop.run_in_executor(pool, _reprice_rows, rows)
+                    in_flight.append(({estimate.id: estimate for estimate in chunk}, future))
+
+                    if len(in_flight) >= self.max_workers:
+                        await self._write_chunk(*in_flight.pop(0))
+
+                for estimates, future in in_flight:
+                    await self._write_chunk(estimates, future)
+
+            self.report.status = "completed"
+        except Exception:
+            self.report.status = "failed"
+            raise
+        finally:
+            self.report.finished_at = time.monotonic()
+            logger.info("Re-pricing job finished", **self.report.to_dict())
+
+        return self.report
+
+    async def _fetch_chunk(self, after_id: int) -> List[Any]:
+        """Fetch the next chunk of open estimates after a primary key."""
+        query = select(
+            Estimate.id,
+            Estimate.calculation_inputs,
+            Estimate.calculation_checksum,
+            Estimate.final_total
+        ).where(
+            and_(
+                Estimate.id > after_id,
+                Estimate.status.in_(REPRICEABLE_STATUSES),
+                Estimate.deleted_at.is_(None)
+            )
+        ).order_by(Estimate.id).limit(self.chunk_size)
+
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def _write_chunk(self, estimates: Dict[int, Any], future: asyncio.Future) -> None:
+        """Write a priced chunk back with one bulk UPDATE and its audit rows."""
+        priced = await future
+        updates = []
+        audit_logs = []
+
+        for estimate_id, payload, error in priced:
+            self.report.scanned += 1
+            if error:
+                self.report.failed += 1
+                self.report.errors.append({"estimate_id": estimate_id, "error": error})
+                continue
+
+            previous = estimates[estimate_id]
+            result = payload["result"]
+            if result["checksum"] == previous.calculation_checksum:
+                self.report.unchanged += 1
+                continue
+
+            values = {column: Decimal(result[column]) for column in MONEY_COLUMNS}
+            updates.append({
+                "id": estimate_id,
+                "calculation_id": result["calculation_id"],
+                "calculation_result": result,
+                "calculation_checksum": result["checksum"],
+                "updated_by": self.user_id,
+                **values
+            })
+            audit_logs.append(AuditLog.create_audit_log(
+                table_name=Estimate.__tablename__,
+                record_id=estimate_id,
+                action="UPDATE",
+                changed_by=self.user_id,
+                old_values={
+                    "final_total": str(previous.final_total),
+                    "calculation_checksum": previous.calculation_checksum
+                },
+                new_values={
+                    "final_total": result["final_total"],
+                    "calculation_checksum": result["checksum"]
+                },
+                changed_fields=["calculation_result", *MONEY_COLUMNS],
+                context={"reason": self.report.reason, "job_id": self.report.job_id},
+                correlation_id=self.report.job_id
+            ))
+
+        if updates:
+            # ORM bulk UPDATE by primary key: one executemany per chunk
+            await self.db.execute(update(Estimate), updates)
+            self.db.add_all(audit_logs)
+            await self.db.commit()
+            self.report.repriced += len(updates)
+
+        if self.progress_callback:
+            self.progress_callback(self.report)
+
+        logger.info(
+            "Re-pricing progress",
+            job_id=self.report.job_id,
+            scanned=self.report.scanned,
+            repriced=self.report.repriced,
+            rows_per_second=round(self.report.rows_per_second, 1)
+        )
+
+
+async def run_repricing_job(
+    job: RepricingJob,
+    calculation_date: Optional[date] = None
+) -> RepricingReport:
+    """
+    Run a re-pricing job with its own database session.
+
+    Used from background tasks, where the request session is already closed.
+    """
+    from src.db.session import async_session_maker
+
+    async with async_session_maker() as db:
+        return await job.run(db, calculation_date)
+
+
+async def rates_changed_on(db: AsyncSession, calculation_date: date) -> bool:
+    """Whether the rates in effect on a date differ from the day before's."""
+    service = CalculationService(db)
+    current = (await service.get_cost_snapshot(calculation_date)).to_rates()
+    previous = (await service.get_cost_snapshot(calculation_date - timedelta(days=1))).to_rates()
+    return replace(previous, calculation_date=calculation_date) != current
+
+
+async def run_boundary_repricing(calculation_date: Optional[date] = None) -> Optional[RepricingReport]:
+    """
+    Re-price open estimates if the rates change on a date: a cost row starts
+    or ends, or a seasonal adjustment begins or lapses.
+
+    Only the first process to claim the date in the shared cache checks it.
+
+    Returns:
+        The job's report, or None if the date was claimed or nothing changed
+    """
+    from src.core.cache import get_cache
+    from src.db.session import async_session_maker
+
+    calculation_date = calculation_date or date.today()
+    cache = get_cache()
+    claim_key = f"repricing:boundary:{calculation_date.isoformat()}"
+    claims = await cache.increment(claim_key)
+    if claims is not None and claims > 1:
+        return None
+    await cache.expire(claim_key, BOUNDARY_CLAIM_SECONDS)
+
+    async with async_session_maker() as db:
+        if not await rates_changed_on(db, calculation_date):
+            logger.info("No rate changes take effect", calculation_date=calculation_date.isoformat())
+            return None
+        job = RepricingJob(user_id="system", reason=f"rates_effective:{calculation_date.isoformat()}")
+        return await job.run(db, calculation_date)
+
+
+async def repricing_scheduler() -> None:
+    """Run run_boundary_repricing now and shortly after every midnight."""
+    while True:
+        try:
+            await run_boundary_repricing()
+        except Exception as e:
+            logger.error("Boundary re-pricing failed", error=str(e))
+
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        await asyncio.sleep((midnight - now).total_seconds() + BOUNDARY_DELAY_SECONDS)
+
+
+_scheduler: Optional[asyncio.Task] = None
+
+
+def start_repricing_scheduler() -> None:
+    """Start the daily re-pricing check on the running event loop."""
+    global _scheduler
+    if _scheduler is None or _scheduler.done():
+        _scheduler = asyncio.get_running_loop().create_task(repricing_scheduler())
+
+
+def stop_repricing_scheduler() -> None:
+    """Stop the daily re-pricing check."""
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.cancel()
+        _scheduler = None
@@ -0,0 +1,198 @@
+"""
+Fixed-point money type for financial calculations.
+
+Amounts are held as integer cents and every rounding step is explicit,
+so results never depend on the process-wide Decimal context. Values are
+converted back to Decimal only at API boundaries.
+"""
+from decimal import (
+    Decimal, ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN,
+    ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING
+)
+from functools import total_ordering
+from typing import Any, Tuple
+
+
+SUPPORTED_ROUNDING = frozenset({
+    ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN,
+    ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING
+})
+
+
+def to_ratio(value: Any) -> Tuple[int, int]:
+    """
+    Convert a numeric value to an exact (numerator, denominator) pair.
+
+    Floats go through str() first so 0.1 means one tenth, matching the
+    Decimal(str(x)) conversions used elsewhere.
+
+    Args:
+        value: Decimal, int, float, str or Money
+
+    Returns:
+        Tuple of integers with a positive denominator
+
+    Raises:
+        ValueError: If the value is not a finite number
+    """
+    if isinstance(value, int):
+        return value, 1
+    if isinstance(value, Money):
+        return value.cents, 100
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    try:
+        return value.as_integer_ratio()
+    except (ValueError, OverflowError):
+        raise ValueError(f"Cannot convert {value} to an exact amount")
+
+
+def divide_rounded(numerator: int, denominator: int, rounding: str = ROUND_HALF_UP) -> int:
+    """
+    Divide two integers and round to an integer.
+
+    Rounding modes follow the decimal module semantics (ROUND_HALF_UP
+    rounds ties away from zero, ROUND_DOWN truncates toward zero, ...).
+
+    Args:
+        numerator: Dividend
+        denominator: Non-zero divisor
+        rounding: One of the decimal module rounding constants
+
+    Returns:
+        Rounded integer quotient
+    """
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+
+    quotient, remainder = divmod(numerator, denominator)
+    if not remainder:
+        return quotient
+
+    # quotient is the floor; decide whether to step up to the ceiling
+    if rounding == ROUND_HALF_UP:
+        twice = remainder * 2
+        if twice != denominator:
+            return quotient + (twice > denominator)
+        return quotient + (numerator >= 0)
+    if rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + 1
+    if rounding == ROUND_DOWN:
+        return quotient + (numerator < 0)
+    if rounding == ROUND_UP:
+        return quotient + (numerator >= 0)
+    if rounding == ROUND_HALF_EVEN:
+        twice = remainder * 2
+        if twice != denominator:
+            return quotient + (twice > denominator)
+        return quotient + (quotient & 1)
+    if rounding == ROUND_HALF_DOWN:
+        twice = remainder * 2
+        if twice != denominator:
+            return quotient + (twice > denominator)
+        return quotient + (numerator < 0)
+
+    raise ValueError(f"Unsupported rounding mode: {rounding}")
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Convert integer cents to a Decimal with two places (e.g. 12345 -> 123.45)."""
+    # String construction is exact regardless of the context precision
+    return Decimal(f"{cents}E-2")
+
+
+@total_ordering
+class Money:
+    """
+    Amount of money stored as integer cents.
+
+    Instances are treated as immutable: every operation returns a new Money.
+    Arithmetic between Money values is exact; operations that can produce
+    fractions of a cent take an explicit rounding mode (half up by default).
+    """
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents: int = 0):
+        self.cents = cents
+
+    @classmethod
+    def from_ratio(cls, numerator: int, denominator: int, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Create from an exact dollar ratio, rounding to cents."""
+        return cls(divide_rounded(numerator * 100, denominator, rounding))
+
+    @classmethod
+    def from_value(cls, value: Any, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Create from a dollar amount (Decimal, int, float or str), rounding to cents."""
+        if isinstance(value, Money):
+            return value
+        numerator, denominator = to_ratio(value)
+        return cls.from_ratio(numerator, denominator, rounding)
+
+    def multiply(self, factor: Any, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Multiply by a factor, rounding the product to cents."""
+        numerator, denominator = to_ratio(factor)
+        return Money(divide_rounded(self.cents * numerator, denominator, rounding))
+
+    def percent(self, percent: Any, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Return ``percent`` percent of this amount (e.g. 25.5 for 25.5%), rounded to cents."""
+        numerator, denominator = to_ratio(percent)
+        return Money(divide_rounded(self.cents * numerator, denominator * 100, rounding))
+
+    def round_to(self, increment: int, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Round to a multiple of ``increment`` whole dollars (e.g. 5 for the nearest $5)."""
+        step = increment * 100
+        return Money(divide_rounded(self.cents, step, rounding) * step)
+
+    def to_decimal(self) -> Decimal:
+        """Convert to a Decimal with two decimal places."""
+        return cents_to_decimal(self.cents)
+
+    def to_whole_decimal(self) -> Decimal:
+        """Convert a whole-dollar amount to a Decimal without decimal places."""
+        if self.cents % 100:
+            raise ValueError(f"{self!r} is not a whole-dollar amount")
+        return Decimal(self.cents // 100)
+
+    def __add__(self, other: "Money") -> "Money":
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> "Money":
+        # Allows sum() over Money values
+        if other == 0:
+            return self
+        return NotImplemented
+
+    def __sub__(self, other: "Money") -> "Money":
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self) -> "Money":
+        return Money(-self.cents)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        return NotImplemented
+
+    def __lt__(self, other: "Money") -> bool:
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.cents)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __repr__(self) -> str:
+        return f"Money('{self.to_decimal()}')"
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
@@ -1,8 +1,19 @@
 """
 Rounding utilities for financial calculations.
+
+Rounding is done on exact integer cents via src.utils.money, so results
+do not depend on the active Decimal context.
 """
 from decimal import Decimal, ROUND_HALF_UP, ROUND_DOWN, ROUND_UP
 
+from src.utils.money import Money, to_ratio, divide_rounded
+
+
+def _round_to_multiple(value: Decimal, step: int, rounding) -> Decimal:
+    """Round a dollar value to a multiple of ``step`` whole dollars."""
+    numerator, denominator = to_ratio(value)
+    return Decimal(divide_rounded(numerator, denominator * step, rounding) * step)
+
 
 def round_to_cents(value: Decimal, rounding=ROUND_HALF_UP) -> Decimal:
     """
@@ -15,7 +26,7 @@ def round_to_cents(value: Decimal, rounding=ROUND_HALF_UP) -> Decimal:
     Returns:
         Rounded decimal value
     """
-    return value.quantize(Decimal('0.01'), rounding=rounding)
+    return Money.from_value(value, rounding).to_decimal()
 
 
 def round_to_nearest_five(value: Decimal) -> Decimal:
@@ -33,7 +44,7 @@ def round_to_nearest_five(value: Decimal) -> Decimal:
     Returns:
         Value rounded to nearest $5
     """
-    return (value / Decimal('5')).quantize(Decimal('1'), rounding=ROUND_HALF_UP) * Decimal('5')
+    return _round_to_multiple(value, 5, ROUND_HALF_UP)
 
 
 def round_to_nearest_ten(value: Decimal) -> Decimal:
@@ -46,7 +57,7 @@ def round_to_nearest_ten(value: Decimal) -> Decimal:
     Returns:
         Value rounded to nearest $10
     """
-    return (value / Decimal('10')).quantize(Decimal('1'), rounding=ROUND_HALF_UP) * Decimal('10')
+    return _round_to_multiple(value, 10, ROUND_HALF_UP)
 
 
 def round_down_to_five(value: Decimal) -> Decimal:
@@ -59,7 +70,7 @@ def round_down_to_five(value: Decimal) -> Decimal:
     Returns:
         Value rounded down to nearest $5
     """
-    return (value / Decimal('5')).quantize(Decimal('1'), rounding=ROUND_DOWN) * Decimal('5')
+    return _round_to_multiple(value, 5, ROUND_DOWN)
 
 
 def round_up_to_five(value: Decimal) -> Decimal:
@@ -72,7 +83,7 @@ def round_up_to_five(value: Decimal) -> Decimal:
     Returns:
         Value rounded up to nearest $5
     """
-    return (value / Decimal('5')).quantize(Decimal('1'), rounding=ROUND_UP) * Decimal('5')
+    return _round_to_multiple(value, 5, ROUND_UP)
 
 
 def calculate_percentage(base: Decimal, percentage: Decimal) -> Decimal:
@@ -86,8 +97,9 @@ def calculate_percentage(base: Decimal, percentage: Decimal) -> Decimal:
     Returns:
         Calculated percentage amount rounded to cents
     """
-    result = base * (percentage / Decimal('100'))
-    return round_to_cents(result)
+    base_n, base_d = to_ratio(base)
+    percent_n, percent_d = to_ratio(percentage)
+    return Money.from_ratio(base_n * percent_n, base_d * percent_d * 100).to_decimal()
 
 
 def add_percentage(base: Decimal, percentage: Decimal) -> Decimal:
@@ -101,8 +113,10 @@ def add_percentage(base: Decimal, percentage: Decimal) -> Decimal:
     Returns:
         Base amount plus percentage, rounded to cents
     """
-    addition = calculate_percentage(base, percentage)
-    return round_to_cents(base + addition)
+    base_n, base_d = to_ratio(base)
+    percent_n, percent_d = to_ratio(percentage)
+    addition = Money.from_ratio(base_n * percent_n, base_d * percent_d * 100)
+    return Money.from_ratio(base_n * 100 + addition.cents * base_d, base_d * 100).to_decimal()
 
 
 def format_currency(value: Decimal, include_cents: bool = True) -> str:
@@ -120,7 +134,7 @@ def format_currency(value: Decimal, include_cents: bool = True) -> str:
         return f"${value:,.2f}"
     else:
         # Round to whole dollars first
-        whole_dollars = value.quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+        whole_dollars = _round_to_multiple(value, 1, ROUND_HALF_UP)
         return f"${whole_dollars:,.0f}"
 
 
@@ -0,0 +1,6 @@
+"""
+Benchmark suite for the calculator and request path.
+
+Run with ``python -m tests.benchmarks run`` and compare runs with
+``python -m tests.benchmarks compare``.
+"""
@@ -0,0 +1,106 @@
+"""
+Benchmark command line.
+
+Usage:
+    python -m tests.benchmarks run [-k PATTERN] [--output FILE]
+    python -m tests.benchmarks compare BASELINE CURRENT [--alpha A] [--threshold T]
+
+``run`` times every registered benchmark and writes a JSON results file
+(by default the baseline). ``compare`` exits with status 1 when any
+benchmark in CURRENT is significantly slower than in BASELINE.
+"""
+from pathlib import Path
+import argparse
+import sys
+
+from tests.benchmarks import bench_cache, bench_calculator, bench_service  # noqa: F401 - registers benchmarks
+from tests.benchmarks.harness import (
+    Runner, compare_results, format_duration, get_benchmarks, load_results, save_results
+)
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def run(args: argparse.Namespace) -> int:
+    benchmarks = get_benchmarks(args.k)
+    if not benchmarks:
+        print(f"No benchmarks match {args.k!r}")
+        return 1
+
+    runner = Runner(rounds=args.rounds, min_sample_time=args.min_sample_time)
+    results = []
+    try:
+        for bench in benchmarks:
+            result = runner.run(bench)
+            results.append(result)
+            print(
+                f"{bench.name:<45} {format_duration(result.median):>10} "
+                f"± {format_duration(result.stdev):>10}  ({result.loops} loops x {len(result.samples)})"
+            )
+    finally:
+        runner.close()
+
+    save_results(args.output, results)
+    print(f"\nWrote {len(results)} results to {args.output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    comparisons = compare_results(baseline, current, alpha=args.alpha, threshold=args.threshold)
+
+    for comparison in comparisons:
+        if comparison.regression:
+            verdict = "SLOWER"
+        elif comparison.improvement:
+            verdict = "faster"
+        else:
+            verdict = ""
+        print(
+            f"{comparison.name:<45} {format_duration(comparison.baseline_median):>10} -> "
+            f"{format_duration(comparison.current_median):>10}  x{comparison.ratio:.3f}  "
+            f"p={comparison.p_value:.4f}  {verdict}"
+        )
+
+    for name in sorted(set(baseline) ^ set(current)):
+        print(f"{name:<45} only in {'baseline' if name in baseline else 'current'}")
+
+    regressions = [comparison for comparison in comparisons if comparison.regression]
+    if regressions:
+        print(f"\n{len(regressions)} significant slowdown(s) beyond {args.threshold:.0%}")
+        return 1
+
+    print("\nNo significant slowdowns")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Time benchmarks and write a results file")
+    run_parser.add_argument("-k", default=None, help="Only run benchmarks whose name contains this")
+    run_parser.add_argument("--output", type=Path, default=DEFAULT_BASELINE,
+                            help="Results file (default: %(default)s)")
+    run_parser.add_argument("--rounds", type=int, default=30, help="Samples per benchmark")
+    run_parser.add_argument("--min-sample-time", type=float, default=0.005,
+                            help="Minimum seconds per sample (default: %(default)s)")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="Fail on significant slowdowns")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--alpha", type=float, default=0.01,
+                                help="Significance level (default: %(default)s)")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Ignore median changes below this fraction (default: %(default)s)")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Cache benchmarks: per-key versus batched access to a Redis stand-in, and
+value encoding.
+
+The stand-in keeps data in a dict and sleeps for a fixed round-trip time
+per command (or per pipeline), which is what batching saves against a
+real server.
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+
+from src.core import cache_codec
+from src.core.cache import RedisCache
+from src.services.external_apis import FuelPrice
+from tests.benchmarks.harness import benchmark
+
+
+ROUND_TRIP_SECONDS = 0.0002
+BATCH_SIZE = 100
+
+
+class LatencyRedis:
+    """The redis.asyncio client commands RedisCache uses, with a simulated round trip each."""
+
+    def __init__(self, round_trip: float = ROUND_TRIP_SECONDS):
+        self.round_trip = round_trip
+        self.data: Dict[str, bytes] = {}
+        self.round_trips = 0
+
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        await asyncio.sleep(self.round_trip)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        await self._round_trip()
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        await self._round_trip()
+        self.data[key] = value
+        return True
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        await self._round_trip()
+        return [self.data.get(key) for key in keys]
+
+    async def delete(self, *keys: str) -> int:
+        await self._round_trip()
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction: bool = True) -> "LatencyPipeline":
+        return LatencyPipeline(self)
+
+
+class LatencyPipeline:
+    """Queues SETs and sends them in one round trip."""
+
+    def __init__(self, server: LatencyRedis):
+        self.server = server
+        self.commands: List[Any] = []
+
+    async def __aenter__(self) -> "LatencyPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.commands = []
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> "LatencyPipeline":
+        self.commands.append((key, value))
+        return self
+
+    async def execute(self) -> List[bool]:
+        await self.server._round_trip()
+        for key, value in self.commands:
+            self.server.data[key] = value
+        return [True] * len(self.commands)
+
+
+def latency_cache(server: LatencyRedis) -> RedisCache:
+    """RedisCache talking to the stand-in."""
+    cache = RedisCache("redis://stand-in")
+    cache.redis_client = server
+    cache._connected = True
+    return cache
+
+
+def distance_entries() -> Dict[str, Any]:
+    return {
+        f"distance:origin:destination-{i}": {"distance_miles": 10.0 + i, "duration_minutes": 15 + i}
+        for i in range(BATCH_SIZE)
+    }
+
+
+@benchmark("cache.get_per_key")
+async def bench_cache_get_per_key():
+    """100 cached distances read with one GET each (baseline)."""
+    cache = latency_cache(LatencyRedis())
+    entries = distance_entries()
+    await cache.set_many(entries)
+
+    async def read():
+        for key in entries:
+            await cache.get(key)
+
+    return read
+
+
+@benchmark("cache.get_many")
+async def bench_cache_get_many():
+    """100 cached distances read with a single MGET."""
+    cache = latency_cache(LatencyRedis())
+    entries = distance_entries()
+    await cache.set_many(entries)
+
+    async def read():
+        await cache.get_many(entries)
+
+    return read
+
+
+@benchmark("cache.set_per_key")
+async def bench_cache_set_per_key():
+    """100 distances written with one SET EX each (baseline)."""
+    cache = latency_cache(LatencyRedis())
+    entries = distance_entries()
+
+    async def write():
+        for key, value in entries.items():
+            await cache.set(key, value, 86400)
+
+    return write
+
+
+@benchmark("cache.set_many")
+async def bench_cache_set_many():
+    """100 distances written with one pipeline of SET EX."""
+    cache = latency_cache(LatencyRedis())
+    entries = distance_entries()
+
+    async def write():
+        await cache.set_many(entries, 86400)
+
+    return write
+
+
+def fuel_price_rows() -> List[Dict[str, Any]]:
+    """Dumped fuel prices: money, timestamps and text."""
+    updated = datetime(2024, 7, 1, 12, 30)
+    return [
+        FuelPrice(
+            price_per_gallon=Decimal("3.50") + Decimal(i) / 100,
+            fuel_type="diesel",
+            location=f"zip-{i:05d}",
+            last_updated=updated + timedelta(minutes=i),
+            source="benchmark"
+        ).model_dump()
+        for i in range(BATCH_SIZE)
+    ]
+
+
+def retyped(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """What a caller of the JSON path does to get Decimal and datetime values back."""
+    for row in rows:
+        row["price_per_gallon"] = Decimal(row["price_per_gallon"])
+        row["last_updated"] = datetime.fromisoformat(row["last_updated"])
+    return rows
+
+
+@benchmark("cache.encode_json")
+def bench_cache_encode_json():
+    """Encode 100 fuel price rows with json.dumps(default=str) (baseline)."""
+    rows = fuel_price_rows()
+    return lambda: json.dumps(rows, default=str).encode()
+
+
+@benchmark("cache.encode_codec")
+def bench_cache_encode_codec():
+    """Encode 100 fuel price rows with the versioned orjson codec, tagging types."""
+    rows = fuel_price_rows()
+    return lambda: cache_codec.encode(rows)
+
+
+@benchmark("cache.decode_json")
+def bench_cache_decode_json():
+    """Decode 100 fuel price rows with json.loads and convert the strings back (baseline)."""
+    data = json.dumps(fuel_price_rows(), default=str).encode()
+    return lambda: retyped(json.loads(data))
+
+
+@benchmark("cache.decode_codec")
+def bench_cache_decode_codec():
+    """Decode 100 fuel price rows with the codec, which restores the types itself."""
+    data = cache_codec.encode(fuel_price_rows())
+    return lambda: cache_codec.decode(data)
+
+
+@benchmark("cache.decode_json_untyped")
+def bench_cache_decode_json_untyped():
+    """Decode 100 distances (no Decimal or datetime values) with json.loads (baseline)."""
+    data = json.dumps(distance_entries()).encode()
+    return lambda: json.loads(data)
+
+
+@benchmark("cache.decode_codec_untyped")
+def bench_cache_decode_codec_untyped():
+    """Decode 100 distances with the codec: orjson only, no tag walk."""
+    data = cache_codec.encode(distance_entries())
+    return lambda: cache_codec.decode(data)
@@ -0,0 +1,140 @@
+"""
+Calculator benchmarks: pricing stages, the full estimate and schema conversion.
+"""
+from datetime import date
+from decimal import Decimal
+
+from src.core.calculation_memo import CalculationMemo
+from src.core.calculator import DeterministicCalculator, TreeServiceCalculator
+from src.core.quick_quote import quick_quote
+from src.schemas.calculation import CalculationInput
+from src.services.calculation import CostRates, OverheadRates
+from tests.benchmarks.harness import benchmark
+
+
+CREW_ROLES = ("crew_lead", "climber", "groundsman")
+
+FULL_ESTIMATE_INPUTS = {
+    "travel_miles": Decimal("25.5"),
+    "travel_time_minutes": 45,
+    "estimated_hours": Decimal("6.5"),
+    "crew_rates": [
+        {"hourly_rate": Decimal("45.00")},
+        {"hourly_rate": Decimal("30.00")},
+        {"hourly_rate": Decimal("30.00")}
+    ],
+    "equipment_list": [
+        {"id": 1, "hourly_cost": Decimal("75.00")},
+        {"id": 2, "hourly_cost": Decimal("45.00")}
+    ],
+    "vehicle_rate_per_mile": Decimal("0.655"),
+    "driver_hourly_rate": Decimal("25.00"),
+    "disposal_fees": Decimal("150.00"),
+    "permit_cost": Decimal("75.00"),
+    "overhead_percent": Decimal("25.0"),
+    "profit_percent": Decimal("35.0"),
+    "safety_buffer_percent": Decimal("10.0"),
+    "emergency_job": False,
+    "weekend_work": True
+}
+
+
+def calculation_input() -> CalculationInput:
+    """The FULL_ESTIMATE_INPUTS job as the API receives it."""
+    inputs = FULL_ESTIMATE_INPUTS
+    return CalculationInput(
+        travel_miles=inputs["travel_miles"],
+        travel_time_minutes=inputs["travel_time_minutes"],
+        crew_size=len(CREW_ROLES),
+        estimated_hours=inputs["estimated_hours"],
+        labor_rates=list(CREW_ROLES),
+        equipment_ids=[equipment["id"] for equipment in inputs["equipment_list"]],
+        disposal_fees=inputs["disposal_fees"],
+        permit_cost=inputs["permit_cost"],
+        emergency_job=inputs["emergency_job"],
+        weekend_work=inputs["weekend_work"]
+    )
+
+
+def calculation_rates() -> CostRates:
+    """Rates that price calculation_input() as FULL_ESTIMATE_INPUTS."""
+    inputs = FULL_ESTIMATE_INPUTS
+    return CostRates(
+        calculation_date=date(2024, 7, 1),
+        labor_rates={
+            role: worker["hourly_rate"] for role, worker in zip(CREW_ROLES, inputs["crew_rates"])
+        },
+        equipment_costs={
+            equipment["id"]: equipment["hourly_cost"] for equipment in inputs["equipment_list"]
+        },
+        overhead=OverheadRates(
+            overhead_percent=inputs["overhead_percent"],
+            profit_percent=inputs["profit_percent"],
+            safety_buffer_percent=inputs["safety_buffer_percent"]
+        ),
+        vehicle_rate_per_mile=inputs["vehicle_rate_per_mile"],
+        driver_hourly_rate=inputs["driver_hourly_rate"],
+        seasonal_adjustment=None
+    )
+
+
+@benchmark("calculator.travel_cost")
+def bench_travel_cost():
+    """DeterministicCalculator.calculate_travel_cost."""
+    inputs = FULL_ESTIMATE_INPUTS
+    return lambda: DeterministicCalculator.calculate_travel_cost(
+        miles=inputs["travel_miles"],
+        time_minutes=inputs["travel_time_minutes"],
+        vehicle_rate_per_mile=inputs["vehicle_rate_per_mile"],
+        driver_hourly_rate=inputs["driver_hourly_rate"]
+    )
+
+
+@benchmark("calculator.labor_cost")
+def bench_labor_cost():
+    """DeterministicCalculator.calculate_labor_cost with a weekend multiplier."""
+    inputs = FULL_ESTIMATE_INPUTS
+    multipliers = DeterministicCalculator.labor_multipliers(False, True)
+    return lambda: DeterministicCalculator.calculate_labor_cost(
+        hours=inputs["estimated_hours"],
+        crew=inputs["crew_rates"],
+        multipliers=multipliers
+    )
+
+
+@benchmark("calculator.full_estimate")
+def bench_full_estimate():
+    """DeterministicCalculator.calculate_full_estimate."""
+    return lambda: DeterministicCalculator.calculate_full_estimate(**FULL_ESTIMATE_INPUTS)
+
+
+@benchmark("calculator.calculate_estimate")
+def bench_calculate_estimate():
+    """TreeServiceCalculator.calculate_estimate with the memo disabled."""
+    calculator = TreeServiceCalculator(memo=CalculationMemo(max_entries=0))
+    calculation = calculation_input()
+    rates = calculation_rates()
+    return lambda: calculator.calculate_estimate(calculation, rates)
+
+
+@benchmark("calculator.calculate_estimate_memo_hit")
+def bench_calculate_estimate_memo_hit():
+    """TreeServiceCalculator.calculate_estimate served from the memo."""
+    calculator = TreeServiceCalculator(memo=CalculationMemo(max_entries=16))
+    calculation = calculation_input()
+    rates = calculation_rates()
+    calculator.calculate_estimate(calculation, rates)
+    return lambda: calculator.calculate_estimate(calculation, rates)
+
+
+@benchmark("calculator.quick_quote")
+def bench_quick_quote():
+    """quick_quote from averaged rates and the rate snapshot."""
+    return lambda: quick_quote(
+        travel_miles=Decimal("25.5"),
+        estimated_hours=Decimal("6.5"),
+        crew_size=3,
+        average_hourly_rate=Decimal("35.00"),
+        equipment_count=2,
+        average_equipment_rate=Decimal("60.00")
+    )
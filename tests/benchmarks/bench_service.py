@@ -0,0 +1,288 @@
+"""
+Request-path benchmarks against a seeded SQLite database.
+
+Each benchmark creates its own database file in a temporary directory so
+runs do not depend on (or touch) the configured database.
+"""
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import AsyncIterator, Tuple
+import asyncio
+import tempfile
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.security import security
+from src.models.base import BaseModel
+from src.models.costs import EquipmentCost, LaborRate, OverheadSettings, VehicleRate
+from src.models.user import User, UserRole
+from tests.benchmarks.bench_calculator import calculation_input
+from tests.benchmarks.harness import benchmark
+
+
+LIST_ESTIMATES_SEED = 200
+
+# Cost-load benchmarks: concurrent loads sharing a small pool, years of rate
+# history, and a simulated network round trip per statement
+COST_LOAD_CONCURRENCY = 16
+COST_LOAD_POOL_SIZE = 4
+COST_HISTORY_PERIODS = 40
+COST_LOAD_ROUND_TRIP_SECONDS = 0.001
+
+CREATE_ESTIMATE_PAYLOAD = {
+    "customer_name": "Benchmark Customer",
+    "customer_email": "customer@example.com",
+    "customer_phone": "555-1234",
+    "job_address": "456 Oak Ave",
+    "job_description": "Remove large oak tree",
+    "calculation_input": {
+        "travel_miles": "25.5",
+        "travel_time_minutes": 45,
+        "crew_size": 3,
+        "estimated_hours": "6.5",
+        "labor_rates": ["crew_lead", "climber", "groundsman"],
+        "equipment_ids": [1, 2],
+        "disposal_fees": "150.00",
+        "permit_cost": "75.00"
+    }
+}
+
+
+def seed_cost_data(session: AsyncSession) -> None:
+    """Add one current rate of each kind the calculation service reads."""
+    effective_from = date.today() - timedelta(days=30)
+    for role, rate in (("crew_lead", "45.00"), ("climber", "35.00"), ("groundsman", "25.00")):
+        session.add(LaborRate(
+            role=role, hourly_rate=Decimal(rate), effective_from=effective_from, created_by="benchmark"
+        ))
+    for name, equipment_type, rate in (("Chipper", "chipper", "75.00"), ("Bucket truck", "vehicle", "45.00")):
+        session.add(EquipmentCost(
+            equipment_name=name, equipment_type=equipment_type, hourly_rate=Decimal(rate),
+            effective_from=effective_from, created_by="benchmark"
+        ))
+    session.add(OverheadSettings(
+        setting_name="standard", overhead_percent=Decimal("25.0"), profit_percent=Decimal("35.0"),
+        effective_from=effective_from, is_default=True, created_by="benchmark"
+    ))
+    session.add(VehicleRate(
+        vehicle_type="truck", rate_per_mile=Decimal("0.655"), driver_hourly_rate=Decimal("25.00"),
+        effective_from=effective_from, created_by="benchmark"
+    ))
+
+
+@asynccontextmanager
+async def seeded_database() -> AsyncIterator[Tuple[AsyncEngine, async_sessionmaker]]:
+    """A temporary SQLite database with the schema and cost data."""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(BaseModel.metadata.create_all)
+
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_maker() as session:
+            seed_cost_data(session)
+            await session.commit()
+
+        try:
+            yield engine, session_maker
+        finally:
+            await engine.dispose()
+
+
+@asynccontextmanager
+async def cost_history_database() -> AsyncIterator[async_sessionmaker]:
+    """A temporary SQLite database of rate history behind a small connection pool."""
+    from src.services.cost_index import INDEXED_MODELS
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(directory) / 'costs.db'}",
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=COST_LOAD_POOL_SIZE,
+            max_overflow=0
+        )
+        tables = [model.__table__ for model in INDEXED_MODELS.values()]
+        start = date.today() - timedelta(days=90 * COST_HISTORY_PERIODS)
+        periods = [
+            (start + timedelta(days=90 * i), start + timedelta(days=90 * (i + 1) - 1))
+            for i in range(COST_HISTORY_PERIODS)
+        ]
+
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: BaseModel.metadata.create_all(sync_conn, tables=tables))
+            await conn.execute(LaborRate.__table__.insert(), [
+                {"role": role, "hourly_rate": Decimal(rate) + i, "created_by": "benchmark",
+                 "effective_from": effective_from, "effective_to": effective_to}
+                for role, rate in (("crew_lead", "45.00"), ("climber", "35.00"), ("groundsman", "25.00"))
+                for i, (effective_from, effective_to) in enumerate(periods)
+            ])
+            await conn.execute(EquipmentCost.__table__.insert(), [
+                {"equipment_name": f"Equipment {i}", "equipment_type": "chipper",
+                 "hourly_rate": Decimal("75.00"), "effective_from": start, "created_by": "benchmark"}
+                for i in range(20)
+            ])
+            await conn.execute(OverheadSettings.__table__.insert(), [
+                {"setting_name": "standard", "overhead_percent": Decimal("25.0"),
+                 "profit_percent": Decimal("35.0"), "effective_from": effective_from,
+                 "effective_to": effective_to, "created_by": "benchmark"}
+                for effective_from, effective_to in periods
+            ])
+            await conn.execute(VehicleRate.__table__.insert(), [
+                {"vehicle_type": "truck", "rate_per_mile": Decimal("0.655"),
+                 "driver_hourly_rate": Decimal("25.00"), "effective_from": effective_from,
+                 "effective_to": effective_to, "created_by": "benchmark"}
+                for effective_from, effective_to in periods
+            ])
+
+        # Runs on the connection's worker thread, so the connection is held meanwhile
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda *args: time.sleep(COST_LOAD_ROUND_TRIP_SECONDS)
+        )
+
+        try:
+            yield async_sessionmaker(engine, class_=AsyncSession)
+        finally:
+            await engine.dispose()
+
+
+def per_table_cost_index():
+    """CostIndex loading one query per table, as before the single-query load."""
+    from src.core.interval_index import IntervalIndex
+    from src.services.cost_index import INDEXED_MODELS, CostIndex
+
+    class PerTableCostIndex(CostIndex):
+        async def load(self, db: AsyncSession, version=None) -> None:
+            indexes = {}
+            for table_name, model in INDEXED_MODELS.items():
+                table = model.__table__
+                result = await db.execute(select(table).where(table.c.deleted_at.is_(None)))
+                indexes[table_name] = IntervalIndex(
+                    (row.effective_from, row.effective_to, SimpleNamespace(**row._mapping))
+                    for row in result
+                )
+            self._indexes = indexes
+            self.version = version
+
+    return PerTableCostIndex
+
+
+async def load_costs(session_maker: async_sessionmaker, index_class) -> None:
+    async with session_maker() as db:
+        await index_class().load(db)
+
+
+@asynccontextmanager
+async def api_client(session_maker: async_sessionmaker) -> AsyncIterator[AsyncClient]:
+    """Client for the app on the benchmark database, authenticated as an estimator."""
+    from src.api.deps import get_db
+    from src.main import app
+
+    async with session_maker() as session:
+        user = User(
+            username="benchmark",
+            email="benchmark@example.com",
+            full_name="Benchmark User",
+            hashed_password=security.get_password_hash("BenchmarkPassword123!"),
+            role=UserRole.ESTIMATOR,
+            is_active=True,
+            is_verified=True
+        )
+        session.add(user)
+        await session.commit()
+        token = security.create_access_token(
+            data={"sub": user.username, "user_id": user.id, "role": user.role.value}
+        )
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://bench",
+            headers={"Authorization": f"Bearer {token}"}
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@benchmark("service.calculate_estimate")
+async def bench_service_calculate_estimate():
+    """CalculationService.calculate_estimate: rate lookups plus calculation."""
+    from src.services.calculation import CalculationService
+
+    async with seeded_database() as (_, session_maker):
+        async with session_maker() as session:
+            service = CalculationService(session)
+            calculation = calculation_input()
+
+            async def calculate():
+                await service.calculate_estimate(calculation)
+
+            yield calculate
+
+
+@benchmark("service.load_costs_per_table")
+async def bench_load_costs_per_table():
+    """Concurrent cost index loads on a busy pool, one round trip per table (baseline)."""
+    index_class = per_table_cost_index()
+    async with cost_history_database() as session_maker:
+        async def load():
+            await asyncio.gather(*(
+                load_costs(session_maker, index_class) for _ in range(COST_LOAD_CONCURRENCY)
+            ))
+
+        yield load
+
+
+@benchmark("service.load_costs_union")
+async def bench_load_costs_union():
+    """Concurrent CostIndex.load on a busy pool, a single UNION ALL round trip each."""
+    from src.services.cost_index import CostIndex
+
+    async with cost_history_database() as session_maker:
+        async def load():
+            await asyncio.gather(*(
+                load_costs(session_maker, CostIndex) for _ in range(COST_LOAD_CONCURRENCY)
+            ))
+
+        yield load
+
+
+@benchmark("api.create_estimate")
+async def bench_api_create_estimate():
+    """POST /api/estimates."""
+    async with seeded_database() as (_, session_maker):
+        async with api_client(session_maker) as client:
+            async def create():
+                response = await client.post("/api/estimates/", json=CREATE_ESTIMATE_PAYLOAD)
+                response.raise_for_status()
+
+            yield create
+
+
+@benchmark("api.list_estimates")
+async def bench_api_list_estimates():
+    """GET /api/estimates, one page of 20 from a seeded table."""
+    async with seeded_database() as (_, session_maker):
+        async with api_client(session_maker) as client:
+            for _ in range(LIST_ESTIMATES_SEED):
+                response = await client.post("/api/estimates/", json=CREATE_ESTIMATE_PAYLOAD)
+                response.raise_for_status()
+
+            async def list_page():
+                response = await client.get("/api/estimates/", params={"page": 2, "page_size": 20})
+                response.raise_for_status()
+
+            yield list_page
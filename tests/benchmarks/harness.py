@@ -0,0 +1,292 @@
+"""
+Benchmark registry, timing and regression statistics.
+
+A benchmark is a factory registered with @benchmark. The factory does the
+setup and returns (or yields, if it needs teardown) the zero-argument
+callable to time; both the factory and the callable may be async.
+
+Each benchmark is calibrated so one sample takes at least
+``min_sample_time`` seconds, then timed for ``rounds`` samples of
+per-call time. Comparisons use a one-sided Mann-Whitney U test on the
+samples, so a slowdown only fails the gate when it is both statistically
+significant and larger than the noise threshold.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import inspect
+import json
+import math
+import platform
+import statistics
+import time
+
+
+BASELINE_FORMAT_VERSION = 1
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark factory."""
+    name: str
+    factory: Callable[[], Any]
+    description: str = ""
+
+
+_registry: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Register a benchmark factory under a dotted name."""
+    def register(factory: Callable) -> Callable:
+        if name in _registry:
+            raise ValueError(f"Benchmark {name} is already registered")
+        description = (inspect.getdoc(factory) or "").split("\n")[0]
+        _registry[name] = Benchmark(name=name, factory=factory, description=description)
+        return factory
+    return register
+
+
+def get_benchmarks(pattern: Optional[str] = None) -> List[Benchmark]:
+    """Registered benchmarks whose name contains pattern, in name order."""
+    return [
+        _registry[name] for name in sorted(_registry)
+        if not pattern or pattern in name
+    ]
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-call timings of one benchmark, in seconds."""
+    name: str
+    loops: int
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "loops": self.loops,
+            "median": self.median,
+            "mean": self.mean,
+            "stdev": self.stdev,
+            "min": min(self.samples),
+            "max": max(self.samples),
+            "samples": self.samples
+        }
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "BenchmarkResult":
+        return cls(name=name, loops=data["loops"], samples=list(data["samples"]))
+
+
+class Runner:
+    """
+    Times benchmarks.
+
+    Async benchmarks run on one event loop owned by the runner, so
+    factories and timed callables share connections and sessions.
+    """
+
+    def __init__(self, rounds: int = 30, min_sample_time: float = 0.005, warmup: int = 3):
+        self.rounds = rounds
+        self.min_sample_time = min_sample_time
+        self.warmup = warmup
+        self.loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self.loop.close()
+
+    def run(self, bench: Benchmark) -> BenchmarkResult:
+        """Set up, calibrate and time one benchmark."""
+        factory = bench.factory
+
+        # Generator factories are resumed after timing so their teardown runs
+        if inspect.isasyncgenfunction(factory):
+            generator = factory()
+            func = self.loop.run_until_complete(generator.__anext__())
+            result = self._measure(bench.name, func)
+            try:
+                self.loop.run_until_complete(generator.__anext__())
+            except StopAsyncIteration:
+                pass
+            return result
+
+        if inspect.isgeneratorfunction(factory):
+            generator = factory()
+            func = next(generator)
+            result = self._measure(bench.name, func)
+            next(generator, None)
+            return result
+
+        func = factory()
+        if inspect.isawaitable(func):
+            func = self.loop.run_until_complete(func)
+        return self._measure(bench.name, func)
+
+    def _measure(self, name: str, func: Callable) -> BenchmarkResult:
+        if asyncio.iscoroutinefunction(func):
+            async def timed(loops: int) -> float:
+                start = time.perf_counter()
+                for _ in range(loops):
+                    await func()
+                return time.perf_counter() - start
+
+            def time_loops(loops: int) -> float:
+                return self.loop.run_until_complete(timed(loops))
+        else:
+            def time_loops(loops: int) -> float:
+                start = time.perf_counter()
+                for _ in range(loops):
+                    func()
+                return time.perf_counter() - start
+
+        for _ in range(self.warmup):
+            time_loops(1)
+
+        # Double the loop count until one sample is long enough to time reliably
+        loops = 1
+        while time_loops(loops) < self.min_sample_time:
+            loops *= 2
+
+        samples = [time_loops(loops) / loops for _ in range(self.rounds)]
+        return BenchmarkResult(name=name, loops=loops, samples=samples)
+
+
+def save_results(path: Path, results: List[BenchmarkResult]) -> None:
+    """Write results and machine details to a JSON baseline file."""
+    payload = {
+        "version": BASELINE_FORMAT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine()
+        },
+        "benchmarks": {result.name: result.to_dict() for result in results}
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+
+
+def load_results(path: Path) -> Dict[str, BenchmarkResult]:
+    """Read a baseline file written by save_results."""
+    payload = json.loads(Path(path).read_text())
+    if payload.get("version") != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported baseline format in {path}")
+    return {
+        name: BenchmarkResult.from_dict(name, data)
+        for name, data in payload["benchmarks"].items()
+    }
+
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """
+    One-sided Mann-Whitney U test that current tends to be larger.
+
+    Uses the normal approximation with tie and continuity corrections,
+    which is accurate for the 20+ samples per side the runner collects.
+
+    Returns:
+        p-value (small means current is significantly slower)
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        raise ValueError("Both sample sets must be non-empty")
+
+    # Rank the pooled samples, averaging ranks over ties
+    pooled = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class Comparison:
+    """Baseline vs current result for one benchmark."""
+    name: str
+    baseline_median: float
+    current_median: float
+    p_value: float
+    regression: bool
+    improvement: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.current_median / self.baseline_median
+
+
+def compare_results(
+    baseline: Dict[str, BenchmarkResult],
+    current: Dict[str, BenchmarkResult],
+    alpha: float = 0.01,
+    threshold: float = 0.10
+) -> List[Comparison]:
+    """
+    Compare benchmarks present in both result sets.
+
+    Args:
+        baseline: Results to compare against
+        current: New results
+        alpha: Significance level of the one-sided tests
+        threshold: Minimum relative change of the median to report
+
+    Returns:
+        One Comparison per shared benchmark, in name order
+    """
+    comparisons = []
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name], current[name]
+        slower_p = mann_whitney_greater(after.samples, before.samples)
+        faster_p = mann_whitney_greater(before.samples, after.samples)
+        ratio = after.median / before.median
+
+        comparisons.append(Comparison(
+            name=name,
+            baseline_median=before.median,
+            current_median=after.median,
+            p_value=min(slower_p, faster_p),
+            regression=slower_p < alpha and ratio > 1 + threshold,
+            improvement=faster_p < alpha and ratio < 1 - threshold
+        ))
+    return comparisons
+
+
+def format_duration(seconds: float) -> str:
+    """Format a per-call time with a readable unit."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
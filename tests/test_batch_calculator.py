@@ -0,0 +1,192 @@
+"""
+Tests for the vectorized batch pricing engine.
+"""
+import random
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.core.calculator import DeterministicCalculator
+from src.core.batch_calculator import FORMULA_VERSION, BatchCalculator, to_fixed_point
+from src.core.formulas import FormulaDefinition, register_formula
+
+
+def random_job(rng: random.Random) -> dict:
+    """Build one random job within the schema limits."""
+    emergency = rng.random() < 0.15
+    return {
+        "travel_miles": Decimal(rng.randint(0, 5000)) / 10,
+        "travel_time_minutes": rng.randint(0, 600),
+        "estimated_hours": Decimal(rng.randint(5, 160)) / 10,
+        "crew_rates": [
+            Decimal(rng.randint(1500, 12000)) / 100
+            for _ in range(rng.randint(1, 10))
+        ],
+        "equipment_rates": [
+            Decimal(rng.randint(0, 30000)) / 100
+            for _ in range(rng.randint(0, 6))
+        ],
+        "vehicle_rate_per_mile": Decimal(rng.randint(300, 1500)) / 1000,
+        "driver_hourly_rate": Decimal(rng.randint(1500, 6000)) / 100,
+        "disposal_fees": Decimal(rng.randint(0, 100000)) / 100,
+        "permit_cost": Decimal(rng.randint(0, 50000)) / 100,
+        "overhead_percent": Decimal(rng.randint(0, 500)) / 10,
+        "profit_percent": Decimal(rng.randint(0, 600)) / 10,
+        "safety_buffer_percent": Decimal(rng.randint(0, 250)) / 10,
+        "emergency_job": emergency,
+        "weekend_work": not emergency and rng.random() < 0.25
+    }
+
+
+def scalar_estimate(job: dict, formula_version: str = FORMULA_VERSION) -> dict:
+    """Price one job through the scalar calculator."""
+    return DeterministicCalculator.calculate_full_estimate(
+        travel_miles=job["travel_miles"],
+        travel_time_minutes=job["travel_time_minutes"],
+        estimated_hours=job["estimated_hours"],
+        crew_rates=[{"hourly_rate": rate} for rate in job["crew_rates"]],
+        equipment_list=[
+            {"id": idx, "hourly_cost": rate}
+            for idx, rate in enumerate(job["equipment_rates"])
+        ],
+        vehicle_rate_per_mile=job["vehicle_rate_per_mile"],
+        driver_hourly_rate=job["driver_hourly_rate"],
+        disposal_fees=job["disposal_fees"],
+        permit_cost=job["permit_cost"],
+        overhead_percent=job["overhead_percent"],
+        profit_percent=job["profit_percent"],
+        safety_buffer_percent=job["safety_buffer_percent"],
+        emergency_job=job["emergency_job"],
+        weekend_work=job["weekend_work"],
+        formula_version=formula_version
+    )
+
+
+def batch_estimate(jobs: list):
+    """Price jobs through the batch calculator."""
+    columns = {key: [job[key] for job in jobs] for key in jobs[0]}
+    return BatchCalculator.calculate_batch(**columns)
+
+
+class TestBatchParity:
+    """The batch engine must match the scalar path row for row."""
+
+    def test_randomized_parity(self):
+        """Test totals and checksums on randomized inputs."""
+        rng = random.Random(20240719)
+        jobs = [random_job(rng) for _ in range(2000)]
+
+        batch = batch_estimate(jobs)
+        checksums = batch.checksums()
+
+        for index, job in enumerate(jobs):
+            scalar = scalar_estimate(job)
+            final = scalar["final_calculation"]
+            row = batch.row(index)
+
+            assert row["travel_cost"] == scalar["travel_breakdown"]["total"]
+            assert row["labor_cost"] == scalar["labor_breakdown"]["total"]
+            assert row["equipment_cost"] == scalar["equipment_breakdown"]["total"]
+            for key in ("direct_costs", "overhead", "safety_buffer", "profit", "subtotal"):
+                assert row[key] == final[key], (index, key)
+            assert str(row["final_total"]) == str(final["final_total"])
+            assert checksums[index] == scalar["calculation_checksum"], index
+
+    @pytest.mark.parametrize("formula_version, cents", [("1.0", 5), ("1.1", 6)])
+    def test_half_cent_travel_time(self, formula_version, cents):
+        """Test both paths round travel time the way the formula version does."""
+        job = random_job(random.Random(1))
+        # 2 minutes at $1.65/h is exactly $0.055, but 0.03333333333 h costs less
+        job.update(travel_time_minutes=2, driver_hourly_rate=Decimal("1.65"))
+
+        columns = {key: [job[key]] for key in job}
+        batch = BatchCalculator.calculate_batch(**columns, formula_version=formula_version)
+        scalar = scalar_estimate(job, formula_version=formula_version)
+
+        assert batch.time_cost[0] == cents
+        assert scalar["travel_breakdown"]["time_cost"] == Decimal(cents) / 100
+        assert batch.checksum(0) == scalar["calculation_checksum"]
+        assert batch.row(0)["formula_version"] == formula_version
+
+    def test_travel_time_matches_decimal_context(self):
+        """Test the vectorized 10-digit time cost on every minute count up to 10 hours."""
+        rng = random.Random(60)
+        minutes = np.arange(601, dtype=np.int64)
+        rates = np.array([rng.randint(100, 20000) for _ in minutes], dtype=np.int64)
+
+        batch = BatchCalculator.travel_time_costs(minutes, rates, precision=10)
+
+        for count, rate, cents in zip(minutes.tolist(), rates.tolist(), batch.tolist()):
+            scalar = DeterministicCalculator.calculate_travel_cost(
+                Decimal("0"), count, Decimal("0"), Decimal(rate) / 100, formula_version="1.0"
+            )
+            assert scalar["time_cost"] == Decimal(cents) / 100, (count, rate)
+
+    def test_rejects_other_margin_pipelines(self):
+        """Test versions the batch pipeline does not implement are refused."""
+        register_formula(FormulaDefinition(version="test-batch-profit-first", steps=("profit", "overhead")))
+        job = random_job(random.Random(2))
+        columns = {key: [job[key]] for key in job}
+
+        with pytest.raises(ValueError, match="does not support formula version"):
+            BatchCalculator.calculate_batch(**columns, formula_version="test-batch-profit-first")
+
+    def test_shared_scalar_columns(self):
+        """Test rate and margin columns can be shared by the whole batch."""
+        result = BatchCalculator.calculate_batch(
+            travel_miles=["10.0", "20.0"],
+            travel_time_minutes=[30, 60],
+            estimated_hours=["4.0", "8.0"],
+            crew_rates=[["50.00", "35.00"], ["50.00"]],
+            equipment_rates=[["75.00"], []],
+            vehicle_rate_per_mile="0.65",
+            driver_hourly_rate="25.00",
+            disposal_fees=["0", "150.00"],
+            permit_cost="0",
+            overhead_percent="25.0",
+            profit_percent="35.0",
+            safety_buffer_percent="10.0"
+        )
+
+        assert len(result) == 2
+        assert result.labor_cost.tolist() == [34000, 40000]
+        assert result.equipment_cost.tolist() == [30000, 0]
+        assert all(total % 500 == 0 for total in result.final_total.tolist())
+
+
+class TestBatchValidation:
+    """Test input conversion and validation."""
+
+    def test_rejects_negative_values(self):
+        """Test negative inputs are rejected."""
+        with pytest.raises(ValueError, match="cannot be negative"):
+            to_fixed_point(["-1.0"], 2, "travel_miles")
+
+    def test_rejects_excess_precision(self):
+        """Test values that cannot be represented exactly are rejected."""
+        with pytest.raises(ValueError, match="decimal places"):
+            to_fixed_point(["1.005"], 2, "disposal_fees")
+
+    def test_numeric_columns(self):
+        """Test int and float arrays are scaled without parsing each value."""
+        assert to_fixed_point(np.array([0, 2, 15]), 2, "permit_cost").tolist() == [0, 200, 1500]
+        assert to_fixed_point([0.655, 1.2], 3, "vehicle_rate_per_mile").tolist() == [655, 1200]
+        assert to_fixed_point(np.array([12.5, 0.1]), 2, "hours").dtype == np.int64
+
+        with pytest.raises(ValueError, match="decimal places"):
+            to_fixed_point([1.005], 2, "disposal_fees")
+        with pytest.raises(ValueError, match="cannot be negative"):
+            to_fixed_point(np.array([3, -1]), 2, "permit_cost")
+        with pytest.raises(ValueError, match="cannot parse"):
+            to_fixed_point([float("nan")], 2, "permit_cost")
+
+    def test_rejects_malformed_decimals(self):
+        """Test strings that are not decimals are rejected."""
+        with pytest.raises(ValueError, match=r"travel_miles\[1\]: cannot parse"):
+            to_fixed_point(["1.0", "ten"], 2, "travel_miles")
+
+    def test_scalar_broadcast(self):
+        """Test scalars broadcast to the batch size."""
+        assert to_fixed_point("0.65", 3, "vehicle_rate_per_mile", size=3).tolist() == [650] * 3
+        assert to_fixed_point(["1.5"], 2, "hours").dtype == np.int64
@@ -0,0 +1,100 @@
+"""
+Tests for the benchmark harness statistics and runner.
+"""
+import random
+
+from tests.benchmarks.harness import (
+    Benchmark, BenchmarkResult, Runner, compare_results, load_results,
+    mann_whitney_greater, save_results
+)
+
+
+def noisy_samples(center: float, count: int = 30, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [center * (1 + rng.gauss(0, 0.02)) for _ in range(count)]
+
+
+class TestMannWhitney:
+    """One-sided rank test."""
+
+    def test_shifted_samples_are_significant(self):
+        """Test a clear slowdown gives a tiny p-value in one direction only."""
+        baseline = noisy_samples(1.0, seed=1)
+        slower = noisy_samples(1.2, seed=2)
+        assert mann_whitney_greater(slower, baseline) < 0.001
+        assert mann_whitney_greater(baseline, slower) > 0.999
+
+    def test_same_distribution_is_not_significant(self):
+        """Test samples from one distribution are not flagged."""
+        assert mann_whitney_greater(noisy_samples(1.0, seed=3), noisy_samples(1.0, seed=4)) > 0.01
+
+    def test_all_ties(self):
+        """Test identical constant samples give no evidence."""
+        assert mann_whitney_greater([1.0] * 10, [1.0] * 10) == 1.0
+
+
+class TestCompareResults:
+    """Regression gate."""
+
+    def test_regression_needs_significance_and_threshold(self):
+        """Test only slowdowns beyond the threshold fail."""
+        baseline = {
+            "small": BenchmarkResult("small", 1, noisy_samples(1.0, seed=5)),
+            "large": BenchmarkResult("large", 1, noisy_samples(1.0, seed=6)),
+            "gone": BenchmarkResult("gone", 1, noisy_samples(1.0, seed=7))
+        }
+        current = {
+            "small": BenchmarkResult("small", 1, noisy_samples(1.05, seed=8)),
+            "large": BenchmarkResult("large", 1, noisy_samples(1.5, seed=9))
+        }
+
+        comparisons = {c.name: c for c in compare_results(baseline, current, threshold=0.10)}
+
+        assert set(comparisons) == {"small", "large"}
+        assert not comparisons["small"].regression
+        assert comparisons["large"].regression
+        assert comparisons["large"].ratio > 1.4
+
+    def test_improvement(self):
+        """Test a significant speedup is reported as an improvement."""
+        baseline = {"fast": BenchmarkResult("fast", 1, noisy_samples(2.0, seed=10))}
+        current = {"fast": BenchmarkResult("fast", 1, noisy_samples(1.0, seed=11))}
+
+        comparison, = compare_results(baseline, current)
+        assert comparison.improvement and not comparison.regression
+
+
+class TestRunner:
+    """Timing and result files."""
+
+    def test_sync_and_async_factories(self, tmp_path):
+        """Test plain and async generator factories, including teardown."""
+        calls = []
+
+        def sync_factory():
+            return lambda: calls.append("sync")
+
+        async def async_factory():
+            async def call():
+                calls.append("async")
+            yield call
+            calls.append("teardown")
+
+        runner = Runner(rounds=3, min_sample_time=0.0001, warmup=1)
+        try:
+            results = [
+                runner.run(Benchmark("sync", sync_factory)),
+                runner.run(Benchmark("async", async_factory))
+            ]
+        finally:
+            runner.close()
+
+        assert calls[-1] == "teardown"
+        assert "sync" in calls and "async" in calls
+        assert all(len(result.samples) == 3 and result.median > 0 for result in results)
+
+        path = tmp_path / "baseline.json"
+        save_results(path, results)
+        loaded = load_results(path)
+        assert loaded["sync"].samples == results[0].samples
+        assert loaded["async"].loops == results[1].loops
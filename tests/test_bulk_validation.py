@@ -0,0 +1,112 @@
+"""
+Tests for validating many calculation inputs against one cost snapshot.
+"""
+import asyncio
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.schemas.calculation import CalculationInput
+from src.services.calculation import CalculationService, CostRates, CostSnapshotCache
+from tests.test_cost_snapshot import (
+    CALCULATION_DATE, memory_cache, sample_rates, seeded_cost_engine, seeded_service
+)
+
+
+def calculation_input(**changes) -> CalculationInput:
+    values = {
+        "travel_miles": Decimal("25.5"),
+        "travel_time_minutes": 45,
+        "crew_size": 2,
+        "estimated_hours": Decimal("6.5"),
+        "labor_rates": ["climber", "groundsman"],
+        "equipment_ids": [1, 2]
+    }
+    values.update(changes)
+    return CalculationInput(**values)
+
+
+def validate(inputs, rates: CostRates, effective_date: date):
+    """Validate through CalculationService with the snapshot already cached."""
+    async def scenario():
+        snapshots = CostSnapshotCache(memory_cache())
+        loads = []
+
+        async def loader(calculation_date):
+            loads.append(calculation_date)
+            return rates
+
+        await snapshots.get(effective_date, loader)
+        service = CalculationService(db=None, snapshots=snapshots)
+        errors = await service.validate_calculation_inputs_batch(inputs, effective_date)
+        return errors, loads
+
+    return asyncio.run(scenario())
+
+
+class TestBulkValidation:
+    """Every input is checked against the same snapshot."""
+
+    def test_reports_errors_per_item(self):
+        """Test valid and invalid inputs are reported in order, with every error."""
+        effective_date = date(2024, 7, 1)
+        inputs = [
+            calculation_input(),
+            calculation_input(labor_rates=["climber", "arborist"]),
+            calculation_input(crew_size=1, labor_rates=["ghost"], equipment_ids=[1, 99, 99])
+        ]
+
+        errors, loads = validate(inputs, sample_rates(effective_date), effective_date)
+
+        assert loads == [effective_date]
+        assert errors == [
+            [],
+            ["No labor rate found for role: arborist"],
+            ["No labor rate found for role: ghost", "Equipment ID 99 not found or unavailable"]
+        ]
+
+    def test_missing_rates_for_effective_date(self):
+        """Test inputs fail when the historical date has no overhead or vehicle rates."""
+        effective_date = date(2019, 1, 1)
+        rates = CostRates(
+            calculation_date=effective_date,
+            labor_rates={"climber": Decimal("40.00"), "groundsman": Decimal("28.00")},
+            equipment_costs={1: Decimal("70.00"), 2: Decimal("40.00")}
+        )
+
+        errors, _ = validate([calculation_input()], rates, effective_date)
+
+        assert errors == [[
+            "No overhead settings configured for 2019-01-01",
+            "No vehicle rates configured for 2019-01-01"
+        ]]
+
+    def test_validates_against_seeded_database(self, tmp_path: Path):
+        """Test the real loader feeds single and batch validation the same errors."""
+        inputs = [
+            calculation_input(),
+            calculation_input(labor_rates=["climber", "arborist"], equipment_ids=[1, 3])
+        ]
+
+        async def scenario():
+            engine = await seeded_cost_engine(tmp_path / "costs.db")
+            async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+                service = seeded_service(db)
+                batch = await service.validate_calculation_inputs_batch(inputs, CALCULATION_DATE)
+                single = [
+                    await service.validate_calculation_inputs(calculation, CALCULATION_DATE)
+                    for calculation in inputs
+                ]
+            await engine.dispose()
+            return batch, single
+
+        batch, single = asyncio.run(scenario())
+
+        # The inactive role and the unavailable equipment are not loaded
+        assert batch == [
+            [],
+            ["No labor rate found for role: arborist", "Equipment ID 3 not found or unavailable"]
+        ]
+        assert single == [(True, None), (False, "No labor rate found for role: arborist")]
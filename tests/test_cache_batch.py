@@ -0,0 +1,80 @@
+"""
+Tests for batched multi-key cache operations.
+"""
+import asyncio
+
+from src.core.cache import CacheManager
+from tests.benchmarks.bench_cache import LatencyRedis, latency_cache
+
+
+class TestRedisBatch:
+    """Batched calls cost one round trip however many keys they touch."""
+
+    def test_round_trips(self):
+        """Test set_many, get_many and delete_many each take a single round trip."""
+        server = LatencyRedis(round_trip=0)
+        cache = latency_cache(server)
+        entries = {f"distance:a:{i}": {"miles": i} for i in range(100)}
+
+        async def scenario():
+            assert await cache.set_many(entries, 60)
+            await cache.set("plain", "text")
+            values = await cache.get_many([*entries, "plain", "missing"])
+            deleted = await cache.delete_many(["distance:a:0", "distance:a:1", "missing"])
+            return values, deleted
+
+        values, deleted = asyncio.run(scenario())
+        assert values == {**entries, "plain": "text"}
+        assert deleted == 2
+        assert server.round_trips == 4
+
+    def test_empty_batches_skip_the_server(self):
+        """Test batches with no keys don't touch Redis."""
+        server = LatencyRedis(round_trip=0)
+        cache = latency_cache(server)
+
+        async def scenario():
+            return await cache.get_many([]), await cache.set_many({}), await cache.delete_many([])
+
+        assert asyncio.run(scenario()) == ({}, True, 0)
+        assert server.round_trips == 0
+
+
+class TestManagerBatch:
+    """CacheManager batches through Redis or the in-memory fallback alike."""
+
+    def test_memory_fallback(self):
+        """Test the batch operations without Redis."""
+        cache = CacheManager()
+        cache.use_redis = False
+
+        async def scenario():
+            await cache.set_many({"a": 1, "b": 2}, 60)
+            values = await cache.get_many(["a", "b", "c"])
+            deleted = await cache.delete_many(["a", "c"])
+            return values, deleted, await cache.get_many(["a", "b"])
+
+        assert asyncio.run(scenario()) == ({"a": 1, "b": 2}, 1, {"b": 2})
+
+    def test_l1_served_keys_skip_redis(self):
+        """Test opted-in keys already in L1 aren't read from Redis, and batch writes invalidate them."""
+        server = LatencyRedis(round_trip=0)
+        cache = CacheManager(l1_namespaces=["cost_snapshot"])
+        cache.redis_cache = latency_cache(server)
+        cache.redis_cache.publish = lambda channel, message: asyncio.sleep(0, 0)
+        cache._initialized = True
+        cache.l1_active = True
+
+        async def scenario():
+            await cache.set_many({"cost_snapshot:version": 1, "distance:a:b": 2})
+            await cache.get_many(["cost_snapshot:version", "distance:a:b"])
+            # Changed behind the cache's back: only keys outside L1 see it
+            server.data["cost_snapshot:version"] = b"9"
+            server.data["distance:a:b"] = b"9"
+            cached = await cache.get_many(["cost_snapshot:version", "distance:a:b"])
+            await cache.set_many({"cost_snapshot:version": 5})
+            return cached, await cache.get_many(["cost_snapshot:version"])
+
+        cached, updated = asyncio.run(scenario())
+        assert cached == {"cost_snapshot:version": 1, "distance:a:b": 9}
+        assert updated == {"cost_snapshot:version": 5}
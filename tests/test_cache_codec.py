@@ -0,0 +1,83 @@
+"""
+Tests for the versioned cache value codec.
+"""
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.core import cache_codec
+from src.core.cache_codec import CacheCodecError, OrjsonCodec
+from src.services.external_apis import FuelPrice
+
+
+class TestCacheCodec:
+    """Values come back from Redis as the same types they were stored as."""
+
+    def test_round_trips_types_exactly(self):
+        """Test Decimal scale, aware datetimes, dates and times survive a round trip."""
+        value = {
+            "price": Decimal("3.50"),
+            "rates": [Decimal("0.655"), Decimal("-1E+2")],
+            "updated": datetime(2024, 7, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+            "naive": datetime(2024, 7, 1, 12, 30),
+            "day": date(2024, 7, 1),
+            "start": time(7, 30),
+            "text": "123",
+            "flag": True,
+            "nothing": None
+        }
+        decoded = cache_codec.decode(cache_codec.encode(value))
+        assert decoded == value
+        assert str(decoded["price"]) == "3.50"
+        assert type(decoded["naive"]) is datetime and type(decoded["day"]) is date
+
+    def test_round_trips_pydantic_models(self):
+        """Test a model, also nested in a container, comes back as the model."""
+        price = FuelPrice(
+            price_per_gallon=Decimal("4.25"),
+            fuel_type="diesel",
+            location="local",
+            last_updated=datetime(2024, 7, 1, 12, 0),
+            source="test"
+        )
+        decoded = cache_codec.decode(cache_codec.encode({"latest": price}))
+        assert decoded == {"latest": price}
+        assert isinstance(decoded["latest"], FuelPrice)
+
+    def test_integers_stay_incrementable(self):
+        """Test integers are stored as plain digits Redis INCR accepts."""
+        assert cache_codec.encode(42) == b"42"
+        assert cache_codec.decode(b"43") == 43
+        assert cache_codec.decode(cache_codec.encode(True)) is True
+
+    def test_large_values_are_compressed(self):
+        """Test payloads over the threshold are compressed and smaller ones aren't."""
+        codec = OrjsonCodec(compress_min_bytes=256)
+        large = {"rows": ["tree removal"] * 200}
+        small = {"rows": ["tree removal"]}
+
+        encoded_large = codec.encode(large)
+        encoded_small = codec.encode(small)
+        assert encoded_large[0] == codec.version
+        assert encoded_large[1] & cache_codec.FLAG_COMPRESSED
+        assert not encoded_small[1] & cache_codec.FLAG_COMPRESSED
+        assert len(encoded_large) < len(json.dumps(large))
+        assert cache_codec.decode(encoded_large) == large
+        assert cache_codec.decode(encoded_small) == small
+
+    def test_reads_values_written_before_versioning(self):
+        """Test plain JSON text and raw strings from the old format still decode."""
+        assert cache_codec.decode(b'{"miles": 12.5}') == {"miles": 12.5}
+        assert cache_codec.decode(b"quickbooks-token") == "quickbooks-token"
+        assert cache_codec.decode(b"") is None
+
+    def test_refuses_models_outside_the_app(self):
+        """Test a tagged model is only rebuilt from the application's own modules."""
+        payload = json.dumps({
+            cache_codec.TYPE_TAG: "model", "c": "os:PathLike", "v": {}
+        }).encode()
+        data = bytes((OrjsonCodec.version, cache_codec.FLAG_TAGGED)) + payload
+        with pytest.raises(CacheCodecError):
+            cache_codec.decode(data)
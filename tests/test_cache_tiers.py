@@ -0,0 +1,112 @@
+"""
+Tests for the in-process L1 tier in front of Redis.
+"""
+import asyncio
+import json
+
+from src.core.cache import CacheManager
+
+
+class FakeRedis:
+    """Stands in for one Redis server shared by several processes."""
+
+    def __init__(self):
+        self.data = {}
+        self.reads = 0
+        self.subscribers = []
+
+    def client(self) -> "FakeRedisCache":
+        return FakeRedisCache(self)
+
+
+class FakeRedisCache:
+    """The RedisCache methods CacheManager uses, over a FakeRedis."""
+
+    def __init__(self, server: FakeRedis):
+        self.server = server
+
+    async def get(self, key):
+        self.server.reads += 1
+        value = self.server.data.get(key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, key, value, expire=None):
+        self.server.data[key] = json.dumps(value)
+        return True
+
+    async def delete(self, key):
+        return self.server.data.pop(key, None) is not None
+
+    async def increment(self, key, amount=1):
+        value = int(json.loads(self.server.data.get(key, "0"))) + amount
+        self.server.data[key] = json.dumps(value)
+        return value
+
+    async def clear_pattern(self, pattern):
+        return 0
+
+    async def publish(self, channel, message):
+        # Deliver like the invalidation listener does, to every other process
+        for manager in self.server.subscribers:
+            if message["origin"] != manager._instance_id:
+                await manager._apply_invalidation(message)
+        return len(self.server.subscribers)
+
+
+def process(server: FakeRedis) -> CacheManager:
+    """A CacheManager connected to the fake server and subscribed to invalidations."""
+    manager = CacheManager(l1_namespaces=["cost_snapshot"])
+    manager.redis_cache = server.client()
+    manager._initialized = True
+    manager.l1_active = True
+    server.subscribers.append(manager)
+    return manager
+
+
+class TestL1Tier:
+    """Opted-in keys are served in-process and stay coherent across processes."""
+
+    def test_hot_keys_served_from_l1(self):
+        """Test repeated reads of an opted-in key reach Redis once; others every time."""
+        server = FakeRedis()
+        cache = process(server)
+
+        async def scenario():
+            await cache.set("cost_snapshot:version", 3)
+            await cache.set("distance:a:b", 12)
+            for _ in range(5):
+                assert await cache.get("cost_snapshot:version") == 3
+                assert await cache.get("distance:a:b") == 12
+
+        asyncio.run(scenario())
+        assert server.reads == 1 + 5
+
+    def test_writes_invalidate_other_processes(self):
+        """Test a write in one process is seen by another's next read."""
+        server = FakeRedis()
+        first, second = process(server), process(server)
+
+        async def scenario():
+            await first.set("cost_snapshot:version", 1)
+            assert await second.get("cost_snapshot:version") == 1
+            await first.increment("cost_snapshot:version")
+            assert await second.get("cost_snapshot:version") == 2
+            await second.delete("cost_snapshot:version")
+            return await first.get("cost_snapshot:version")
+
+        assert asyncio.run(scenario()) is None
+
+    def test_l1_bypassed_while_unsubscribed(self):
+        """Test the L1 isn't used while invalidations can't be received."""
+        server = FakeRedis()
+        cache = process(server)
+        cache.l1_active = False
+
+        async def scenario():
+            await cache.set("cost_snapshot:version", 1)
+            await cache.get("cost_snapshot:version")
+            await cache.get("cost_snapshot:version")
+
+        asyncio.run(scenario())
+        assert server.reads == 2
+        assert cache.l1_cache.stats()["entries"] == 0
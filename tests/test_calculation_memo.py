@@ -0,0 +1,112 @@
+"""
+Tests for the full estimate calculation memo.
+"""
+from decimal import Decimal
+
+from src.core.calculator import DeterministicCalculator, FORMULA_VERSION
+from src.core.calculation_memo import CalculationMemo, make_calculation_key
+
+
+def estimate_inputs(**overrides) -> dict:
+    """Build calculate_full_estimate keyword arguments."""
+    inputs = {
+        "travel_miles": Decimal("25.5"),
+        "travel_time_minutes": 45,
+        "estimated_hours": Decimal("6.5"),
+        "crew_rates": [{"hourly_rate": Decimal("45.00")}, {"hourly_rate": Decimal("30.00")}],
+        "equipment_list": [{"id": 2, "hourly_cost": Decimal("120.00")}, {"id": 1, "hourly_cost": Decimal("75.00")}],
+        "vehicle_rate_per_mile": Decimal("0.655"),
+        "driver_hourly_rate": Decimal("25.00"),
+        "disposal_fees": Decimal("150.00"),
+        "permit_cost": Decimal("0"),
+        "overhead_percent": Decimal("25.0"),
+        "profit_percent": Decimal("35.0"),
+        "safety_buffer_percent": Decimal("10.0"),
+        "emergency_job": False,
+        "weekend_work": True
+    }
+    inputs.update(overrides)
+    return inputs
+
+
+class CountingCalculator:
+    """Wraps calculate_full_estimate and counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, **inputs):
+        self.calls += 1
+        return DeterministicCalculator.calculate_full_estimate(**inputs)
+
+
+class TestCalculationMemo:
+    """Test memo hits, misses and eviction."""
+
+    def test_hit_returns_fresh_id_and_same_totals(self):
+        """Test a repeated calculation is served from the memo."""
+        memo = CalculationMemo(max_entries=8)
+        calculate = CountingCalculator()
+
+        first = memo.calculate(estimate_inputs(), calculate, FORMULA_VERSION)
+        second = memo.calculate(estimate_inputs(), calculate, FORMULA_VERSION)
+
+        assert calculate.calls == 1
+        assert second["calculation_checksum"] == first["calculation_checksum"]
+        assert second["final_calculation"]["final_total"] == first["final_calculation"]["final_total"]
+        assert (
+            second["final_calculation"]["calculation_id"]
+            != first["final_calculation"]["calculation_id"]
+        )
+        assert memo.stats()["hit_rate"] == 0.5
+
+    def test_results_are_independent_copies(self):
+        """Test mutating a returned result does not poison the memo."""
+        memo = CalculationMemo(max_entries=8)
+        calculate = CountingCalculator()
+
+        first = memo.calculate(estimate_inputs(), calculate, FORMULA_VERSION)
+        first["labor_breakdown"]["total"] = Decimal("0")
+
+        second = memo.calculate(estimate_inputs(), calculate, FORMULA_VERSION)
+        assert second["labor_breakdown"]["total"] != Decimal("0")
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        memo = CalculationMemo(max_entries=2)
+        calculate = CountingCalculator()
+
+        for hours in ("1.0", "2.0", "1.0", "3.0", "1.0"):
+            memo.calculate(estimate_inputs(estimated_hours=Decimal(hours)), calculate, FORMULA_VERSION)
+
+        assert calculate.calls == 3
+        assert memo.stats()["evictions"] == 1
+
+    def test_disabled(self):
+        """Test a zero-size memo always calculates."""
+        memo = CalculationMemo(max_entries=0)
+        calculate = CountingCalculator()
+
+        memo.calculate(estimate_inputs(), calculate, FORMULA_VERSION)
+        memo.calculate(estimate_inputs(), calculate, FORMULA_VERSION)
+
+        assert calculate.calls == 2
+
+
+class TestCalculationKey:
+    """Test key normalization."""
+
+    def test_crew_order_is_ignored(self):
+        """Test crew order does not change the key."""
+        crew = estimate_inputs()["crew_rates"]
+        assert make_calculation_key(estimate_inputs(), "1.0") == make_calculation_key(
+            estimate_inputs(crew_rates=list(reversed(crew))), "1.0"
+        )
+
+    def test_representation_and_version_matter(self):
+        """Test inputs echoed in the result and the formula version are part of the key."""
+        key = make_calculation_key(estimate_inputs(), "1.0")
+
+        assert key != make_calculation_key(estimate_inputs(overhead_percent=Decimal("25")), "1.0")
+        assert key != make_calculation_key(estimate_inputs(), "2.0")
+        assert key == make_calculation_key(estimate_inputs(travel_miles="25.5"), "1.0")
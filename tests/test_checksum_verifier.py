@@ -0,0 +1,104 @@
+"""
+Tests for the stored checksum verifier.
+"""
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.calculator import DeterministicCalculator
+from src.db.session import Base
+from src.models.estimate import Estimate
+from src.models.user import User
+from src.services.checksum_verifier import ChecksumVerifier, stored_result_checksum
+
+
+def stored_result(final_total: str = "1235") -> dict:
+    """A stored CalculationResult dump with string amounts."""
+    return {
+        "direct_costs": "700.00",
+        "overhead_amount": "175.00",
+        "safety_buffer_amount": "87.50",
+        "profit_amount": "336.88",
+        "final_total": final_total,
+        "calculation_details": {"formula_version": "1.0"}
+    }
+
+
+def estimate_row(estimate_id: int, checksum: str, result: dict) -> dict:
+    """Minimal estimates row."""
+    money = {
+        column: Decimal("0") for column in (
+            "travel_cost", "labor_cost", "equipment_cost", "direct_costs", "overhead_amount",
+            "safety_buffer_amount", "profit_amount", "subtotal", "final_total"
+        )
+    }
+    return {
+        "id": estimate_id,
+        "estimate_number": f"EST-{estimate_id:04d}",
+        "customer_name": "Customer",
+        "job_address": "1 Oak St",
+        "job_description": "Removal",
+        "calculation_inputs": {},
+        "calculation_id": "calc",
+        "calculation_result": result,
+        "calculation_checksum": checksum,
+        "valid_until": date(2030, 1, 1),
+        "created_by": "system",
+        **money
+    }
+
+
+def test_stored_result_checksum_matches_calculator():
+    """Test the stored dump maps onto generate_checksum inputs."""
+    expected = DeterministicCalculator.generate_checksum({
+        "direct_costs": Decimal("700.00"),
+        "overhead": Decimal("175.00"),
+        "safety_buffer": Decimal("87.50"),
+        "profit": Decimal("336.88"),
+        "final_total": Decimal("1235"),
+        "formula_version": "1.0"
+    })
+    assert stored_result_checksum(stored_result()) == expected
+
+
+def test_verifier_streams_and_resumes(tmp_path):
+    """Test mismatches are reported and a second run resumes from the checkpoint."""
+    checksum = stored_result_checksum(stored_result())
+    rows = [estimate_row(i, checksum, stored_result()) for i in range(1, 26)]
+    rows[9]["calculation_result"] = stored_result(final_total="1240")
+    rows[20]["calculation_checksum"] = "0" * 64
+
+    checkpoint = tmp_path / "checkpoint.json"
+    mismatches = tmp_path / "mismatches.jsonl"
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'verify.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all, tables=[User.__table__, Estimate.__table__]
+            )
+            await conn.execute(insert(Estimate.__table__), rows)
+
+        async with AsyncSession(engine) as db:
+            first = await ChecksumVerifier(
+                db, checkpoint, mismatches, batch_size=4, max_workers=2
+            ).run()
+            second = await ChecksumVerifier(
+                db, checkpoint, mismatches, batch_size=4, max_workers=2
+            ).run()
+        await engine.dispose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.verified == 25
+    assert first.mismatches == 2
+    assert json.loads(checkpoint.read_text())["last_id"] == 25
+    assert [json.loads(line)["estimate_id"] for line in mismatches.read_text().splitlines()] == [10, 21]
+
+    assert second.resumed_from == 25
+    assert second.verified == 25
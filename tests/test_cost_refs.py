@@ -0,0 +1,112 @@
+"""
+Tests for the cost reference index of open estimates.
+"""
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.db.session import Base
+from src.models.estimate import Estimate, EstimateCostRef, EstimateStatus
+from src.models.user import User
+from src.services.cost_refs import (
+    cost_refs_for_inputs, find_affected_estimates, sync_estimate_cost_refs
+)
+
+
+def estimate_row(estimate_id: int, calculation_inputs: dict, status: EstimateStatus) -> dict:
+    """Minimal estimates row."""
+    money = {
+        column: Decimal("0") for column in (
+            "travel_cost", "labor_cost", "equipment_cost", "direct_costs", "overhead_amount",
+            "safety_buffer_amount", "profit_amount", "subtotal", "final_total"
+        )
+    }
+    return {
+        "id": estimate_id,
+        "estimate_number": f"EST-{estimate_id:04d}",
+        "customer_name": "Customer",
+        "job_address": "1 Oak St",
+        "job_description": "Removal",
+        "calculation_inputs": calculation_inputs,
+        "calculation_id": "calc",
+        "calculation_result": {},
+        "calculation_checksum": "0" * 64,
+        "status": status,
+        "valid_until": date(2030, 1, 1),
+        "created_by": "system",
+        **money
+    }
+
+
+def test_cost_refs_for_inputs():
+    """Test roles and equipment are read from both input shapes."""
+    refs = cost_refs_for_inputs({
+        "labor_rates": ["Climber", "Groundman"],
+        "equipment_ids": [3],
+        "labor_details": {"crew": [{"role": "Foreman"}, {"role": "Climber"}]},
+        "equipment_details": [{"equipment_id": 7}]
+    })
+    assert refs == {
+        ("role", "Climber"), ("role", "Groundman"), ("role", "Foreman"),
+        ("equipment", "3"), ("equipment", "7")
+    }
+    assert cost_refs_for_inputs(None) == set()
+
+
+def test_sync_and_find_affected_estimates(tmp_path):
+    """Test only open, non-deleted estimates using a rate are found."""
+    inputs = {
+        1: {"labor_rates": ["Climber"], "equipment_ids": [3]},
+        2: {"labor_rates": ["Groundman"], "equipment_ids": []},
+        3: {"labor_rates": ["Climber"], "equipment_ids": []},
+        4: {"labor_rates": ["Climber"], "equipment_ids": [3]}
+    }
+    statuses = {
+        1: EstimateStatus.DRAFT,
+        2: EstimateStatus.PENDING,
+        3: EstimateStatus.APPROVED,
+        4: EstimateStatus.PENDING
+    }
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'refs.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[User.__table__, Estimate.__table__, EstimateCostRef.__table__]
+            )
+            await conn.execute(insert(Estimate.__table__), [
+                estimate_row(estimate_id, inputs[estimate_id], statuses[estimate_id])
+                for estimate_id in inputs
+            ])
+
+        async with AsyncSession(engine) as db:
+            for estimate_id in inputs:
+                await sync_estimate_cost_refs(
+                    db, estimate_id, inputs[estimate_id], statuses[estimate_id]
+                )
+            # Estimate 4 is deleted
+            await sync_estimate_cost_refs(
+                db, 4, inputs[4], statuses[4], deleted=True
+            )
+            await db.commit()
+
+            ref_count = len((await db.execute(select(EstimateCostRef.__table__))).all())
+            by_role = await find_affected_estimates(db, roles=["Climber"])
+            by_equipment = await find_affected_estimates(db, equipment_ids=[3])
+            by_both = await find_affected_estimates(db, roles=["Groundman"], equipment_ids=[3])
+            nothing = await find_affected_estimates(db)
+        await engine.dispose()
+        return ref_count, by_role, by_equipment, by_both, nothing
+
+    ref_count, by_role, by_equipment, by_both, nothing = asyncio.run(run())
+
+    assert ref_count == 3
+    assert [row.id for row in by_role] == [1]
+    assert [row.id for row in by_equipment] == [1]
+    assert [row.id for row in by_both] == [1, 2]
+    assert by_role[0].estimate_number == "EST-0001"
+    assert nothing == []
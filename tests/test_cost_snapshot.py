@@ -0,0 +1,259 @@
+"""
+Tests for per-date cost snapshots.
+"""
+import asyncio
+from dataclasses import FrozenInstanceError
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.cache import CacheManager
+from src.models.costs import (
+    EquipmentCost, LaborRate, OverheadSettings, SeasonalAdjustment, VehicleRate
+)
+from src.schemas.calculation import CalculationInput
+from src.services.calculation import (
+    CalculationService, CostRates, CostSnapshot, CostSnapshotCache, OverheadRates, SeasonalRate
+)
+from src.services.cost_index import INDEXED_MODELS, CostIndex
+
+
+CALCULATION_DATE = date(2024, 7, 1)
+
+
+def memory_cache() -> CacheManager:
+    """Shared cache without Redis, standing in for one Redis instance."""
+    cache = CacheManager()
+    cache.use_redis = False
+    return cache
+
+
+def sample_rates(calculation_date: date = CALCULATION_DATE) -> CostRates:
+    return CostRates(
+        calculation_date=calculation_date,
+        labor_rates={"climber": Decimal("45.00"), "groundsman": Decimal("30.00")},
+        equipment_costs={1: Decimal("75.00"), 2: Decimal("45.50")},
+        overhead=OverheadRates(
+            overhead_percent=Decimal("25.0"),
+            profit_percent=Decimal("35.0"),
+            safety_buffer_percent=Decimal("10.0")
+        ),
+        vehicle_rate_per_mile=Decimal("0.655"),
+        driver_hourly_rate=Decimal("25.00"),
+        seasonal_adjustment=SeasonalRate(
+            season_name="Storm season",
+            labor_adjustment_percent=Decimal("15.0"),
+            equipment_adjustment_percent=Decimal("0.0")
+        )
+    )
+
+
+async def seeded_cost_engine(path: Path) -> AsyncEngine:
+    """
+    SQLite database with the cost tables and the rates in effect on
+    CALCULATION_DATE, next to rows the loader must skip (expired,
+    inactive or unavailable).
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    tables = [model.__table__ for model in INDEXED_MODELS.values()]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: LaborRate.metadata.create_all(sync_conn, tables=tables))
+        # Executemany binds the first row's keys, so flags are set on every row
+        await conn.execute(LaborRate.__table__.insert(), [
+            {"id": 1, "role": "climber", "hourly_rate": Decimal("40.00"), "created_by": "test",
+             "effective_from": date(2023, 1, 1), "effective_to": date(2023, 12, 31), "is_active": True},
+            {"id": 2, "role": "climber", "hourly_rate": Decimal("45.00"), "created_by": "test",
+             "effective_from": date(2024, 1, 1), "effective_to": None, "is_active": True},
+            {"id": 3, "role": "groundsman", "hourly_rate": Decimal("30.00"), "created_by": "test",
+             "effective_from": date(2023, 1, 1), "effective_to": None, "is_active": True},
+            {"id": 4, "role": "arborist", "hourly_rate": Decimal("50.00"), "created_by": "test",
+             "effective_from": date(2023, 1, 1), "effective_to": None, "is_active": False}
+        ])
+        await conn.execute(EquipmentCost.__table__.insert(), [
+            {"id": 1, "equipment_name": "Chipper", "equipment_type": "chipper",
+             "hourly_rate": Decimal("75.00"), "effective_from": date(2023, 1, 1), "created_by": "test",
+             "is_available": True},
+            {"id": 2, "equipment_name": "Bucket truck", "equipment_type": "vehicle",
+             "hourly_rate": Decimal("45.50"), "effective_from": date(2023, 1, 1), "created_by": "test",
+             "is_available": True},
+            {"id": 3, "equipment_name": "Stump grinder", "equipment_type": "grinder",
+             "hourly_rate": Decimal("60.00"), "effective_from": date(2023, 1, 1), "created_by": "test",
+             "is_available": False}
+        ])
+        await conn.execute(OverheadSettings.__table__.insert(), [
+            {"id": 1, "setting_name": "standard", "overhead_percent": Decimal("25.00"),
+             "profit_percent": Decimal("35.00"), "safety_buffer_percent": Decimal("12.00"),
+             "is_default": True, "effective_from": date(2024, 1, 1), "created_by": "test"}
+        ])
+        await conn.execute(VehicleRate.__table__.insert(), [
+            {"id": 1, "vehicle_type": "truck", "rate_per_mile": Decimal("0.655"),
+             "driver_hourly_rate": Decimal("25.00"), "effective_from": date(2023, 1, 1),
+             "created_by": "test"}
+        ])
+        await conn.execute(SeasonalAdjustment.__table__.insert(), [
+            {"id": 1, "season_name": "storm", "start_month": 6, "start_day": 1,
+             "end_month": 9, "end_day": 30, "labor_adjustment_percent": Decimal("10.00"),
+             "equipment_adjustment_percent": Decimal("5.00"), "effective_from": date(2020, 1, 1),
+             "created_by": "test"}
+        ])
+    return engine
+
+
+def seeded_service(db: AsyncSession) -> CalculationService:
+    """Calculation service with its own snapshot cache and cost index."""
+    return CalculationService(db, snapshots=CostSnapshotCache(memory_cache()), cost_index=CostIndex())
+
+
+class CountingLoader:
+    """Loader that records how often cost data was queried."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, calculation_date: date) -> CostRates:
+        self.calls.append(calculation_date)
+        return sample_rates(calculation_date)
+
+
+class TestCostSnapshot:
+    """Snapshots must be immutable and survive the shared cache unchanged."""
+
+    def test_round_trips_through_dict(self):
+        """Test to_dict/from_dict preserves every rate exactly."""
+        snapshot = CostSnapshot.from_rates(sample_rates(), version=3)
+
+        assert CostSnapshot.from_dict(snapshot.to_dict()) == snapshot
+        assert CostSnapshot.from_dict(snapshot.to_dict()).to_rates() == sample_rates()
+
+    def test_is_immutable(self):
+        """Test neither fields nor rate mappings can be changed."""
+        snapshot = CostSnapshot.from_rates(sample_rates(), version=0)
+
+        with pytest.raises(FrozenInstanceError):
+            snapshot.vehicle_rate_per_mile = Decimal("1")
+        with pytest.raises(TypeError):
+            snapshot.labor_rates["climber"] = Decimal("1")
+        with pytest.raises(FrozenInstanceError):
+            snapshot.overhead.overhead_percent = Decimal("1")
+
+
+class TestCostSnapshotCache:
+    """Cost data is loaded once per date and version."""
+
+    def test_loads_once_until_invalidated(self):
+        """Test repeated gets reuse the snapshot and a version bump reloads it."""
+        async def scenario():
+            snapshots = CostSnapshotCache(memory_cache())
+            loader = CountingLoader()
+
+            first = await snapshots.get(CALCULATION_DATE, loader)
+            second = await snapshots.get(CALCULATION_DATE, loader)
+            assert first is second
+            assert len(loader.calls) == 1
+
+            await snapshots.get(date(2024, 12, 1), loader)
+            assert len(loader.calls) == 2
+
+            await snapshots.invalidate()
+            third = await snapshots.get(CALCULATION_DATE, loader)
+            assert third.version == first.version + 1
+            assert len(loader.calls) == 3
+
+        asyncio.run(scenario())
+
+    def test_processes_share_snapshots_and_versions(self):
+        """Test a second process reuses the shared snapshot and sees invalidation."""
+        async def scenario():
+            shared = memory_cache()
+            worker_a = CostSnapshotCache(shared)
+            worker_b = CostSnapshotCache(shared)
+            loader = CountingLoader()
+
+            await worker_a.get(CALCULATION_DATE, loader)
+            from_shared = await worker_b.get(CALCULATION_DATE, loader)
+            assert len(loader.calls) == 1
+            assert from_shared == CostSnapshot.from_rates(sample_rates(), version=0)
+
+            await worker_a.invalidate()
+            rebuilt = await worker_b.get(CALCULATION_DATE, loader)
+            assert rebuilt.version == 1
+            assert len(loader.calls) == 2
+
+        asyncio.run(scenario())
+
+    def test_evicts_least_recent_dates(self):
+        """Test only max_dates snapshots are held in-process."""
+        async def scenario():
+            snapshots = CostSnapshotCache(memory_cache(), max_dates=2)
+            loader = CountingLoader()
+
+            for day in (1, 2, 1, 3):
+                await snapshots.get(date(2024, 7, day), loader)
+
+            assert list(snapshots._snapshots) == [date(2024, 7, 1), date(2024, 7, 3)]
+
+        asyncio.run(scenario())
+
+
+class TestLoadCostRates:
+    """The loader reads the cost model columns in effect on the calculation date."""
+
+    def test_maps_cost_model_columns(self, tmp_path: Path):
+        """Test rates, margins and the seasonal adjustment come from the seeded rows."""
+        async def scenario():
+            engine = await seeded_cost_engine(tmp_path / "costs.db")
+            async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+                rates = await seeded_service(db).load_cost_rates(CALCULATION_DATE)
+            await engine.dispose()
+            return rates
+
+        rates = asyncio.run(scenario())
+
+        assert rates.labor_rates == {"climber": Decimal("45.00"), "groundsman": Decimal("30.00")}
+        assert rates.equipment_costs == {1: Decimal("75.00"), 2: Decimal("45.50")}
+        assert rates.overhead == OverheadRates(
+            overhead_percent=Decimal("25.00"),
+            profit_percent=Decimal("35.00"),
+            safety_buffer_percent=Decimal("12.00")
+        )
+        assert rates.vehicle_rate_per_mile == Decimal("0.655")
+        assert rates.driver_hourly_rate == Decimal("25.00")
+        assert rates.seasonal_adjustment == SeasonalRate(
+            season_name="storm",
+            labor_adjustment_percent=Decimal("10.00"),
+            equipment_adjustment_percent=Decimal("5.00")
+        )
+
+    def test_calculates_flat_input_with_seeded_rates(self, tmp_path: Path):
+        """Test a CalculationInput is priced with the seasonally adjusted rates."""
+        calculation_input = CalculationInput(
+            travel_miles=Decimal("20.0"),
+            travel_time_minutes=30,
+            crew_size=2,
+            estimated_hours=Decimal("4.0"),
+            labor_rates=["climber", "groundsman"],
+            equipment_ids=[1],
+            disposal_fees=Decimal("100.00")
+        )
+
+        async def scenario():
+            engine = await seeded_cost_engine(tmp_path / "costs.db")
+            async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+                result = await seeded_service(db).calculate_estimate(calculation_input, CALCULATION_DATE)
+            await engine.dispose()
+            return result
+
+        result = asyncio.run(scenario())
+
+        # (45.00 + 30.00) * 1.10 per hour for 4 hours; 75.00 * 1.05 per hour
+        assert result.labor_cost == Decimal("330.00")
+        assert result.equipment_cost == Decimal("315.00")
+        assert result.disposal_fees == Decimal("100.00")
+        assert result.direct_costs == (
+            result.travel_cost + result.labor_cost + result.equipment_cost
+            + result.disposal_fees + result.permit_cost
+        )
+        assert str(result.calculation_details["margins_applied"]["safety_buffer_percent"]) == "12.00"
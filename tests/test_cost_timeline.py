@@ -0,0 +1,152 @@
+"""
+Tests for the materialized effective-costs timeline.
+"""
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.cache import CacheManager
+from src.models.costs import CostTimelineSegment, LaborRate, SeasonalAdjustment
+from src.services.cost_index import INDEXED_MODELS, CostIndex
+from src.services.cost_timeline import (
+    CostTimeline, CostTimelineStore, splice_effective_date, timeline_boundaries
+)
+
+
+def memory_cache() -> CacheManager:
+    """Shared cache without Redis."""
+    cache = CacheManager()
+    cache.use_redis = False
+    return cache
+
+
+class CountingRenderer:
+    """Renders labor rates and seasonal ids in effect, counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, cost_index: CostIndex, effective_date: date) -> bytes:
+        self.calls += 1
+        rates = cost_index.as_of(LaborRate.__tablename__, effective_date)
+        return json.dumps({
+            "labor_rates": sorted(str(rate.hourly_rate) for rate in rates),
+            "seasonal": [adjustment.id for adjustment in cost_index.seasonal_calendar.on(effective_date)]
+        }, separators=(",", ":")).encode()
+
+
+async def seeded_engine(path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    tables = [model.__table__ for model in INDEXED_MODELS.values()] + [CostTimelineSegment.__table__]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: LaborRate.metadata.create_all(sync_conn, tables=tables))
+        await conn.execute(LaborRate.__table__.insert(), [
+            {"id": 1, "role": "climber", "hourly_rate": Decimal("40.00"), "created_by": "test",
+             "effective_from": date(2023, 1, 1), "effective_to": date(2023, 12, 31)},
+            {"id": 2, "role": "climber", "hourly_rate": Decimal("45.00"), "created_by": "test",
+             "effective_from": date(2024, 1, 1), "effective_to": None}
+        ])
+        await conn.execute(SeasonalAdjustment.__table__.insert(), [
+            {"id": 1, "season_name": "storm", "start_month": 6, "start_day": 1,
+             "end_month": 9, "end_day": 30, "effective_from": date(2020, 1, 1), "created_by": "test"}
+        ])
+    return engine
+
+
+def test_splice_effective_date():
+    """Test the date is added as the first field of the payload."""
+    body = splice_effective_date(b'{"a":1}', date(2024, 7, 1))
+    assert json.loads(body) == {"effective_date": "2024-07-01", "a": 1}
+    assert json.loads(splice_effective_date(b"{}", date(2024, 7, 1))) == {"effective_date": "2024-07-01"}
+
+
+class TestCostTimeline:
+    """Every date is served from a segment that renders the same as the date itself."""
+
+    def test_segments_match_direct_render(self, tmp_path: Path):
+        """Test segment bodies equal rendering each date directly."""
+        async def scenario():
+            engine = await seeded_engine(tmp_path / "timeline.db")
+            index = CostIndex()
+            async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+                await index.load(db, version=0)
+            await engine.dispose()
+            return index
+
+        index = asyncio.run(scenario())
+        assert timeline_boundaries(index) == [date.min, date(2023, 1, 1), date(2024, 1, 1)]
+
+        render = CountingRenderer()
+        timeline = CostTimeline(index)
+        built = timeline.materialize(index, render)
+        # Each dated segment splits into in-season and out-of-season payloads
+        assert len(built) == 6
+        assert render.calls == 6
+
+        for day in (date(2022, 12, 31), date(2023, 1, 1), date(2023, 6, 1), date(2023, 12, 31),
+                    date(2024, 5, 31), date(2024, 9, 30), date(2031, 7, 4)):
+            expected = {"effective_date": day.isoformat(), **json.loads(render(index, day))}
+            assert json.loads(timeline.body(day)) == expected
+
+    def test_store_reuses_materialized_segments(self, tmp_path: Path):
+        """Test a second process loads segments from the table instead of rendering."""
+        async def scenario():
+            engine = await seeded_engine(tmp_path / "store.db")
+            session_maker = async_sessionmaker(engine, class_=AsyncSession)
+            index = CostIndex()
+            first_render, second_render = CountingRenderer(), CountingRenderer()
+            async with session_maker() as db:
+                await index.load(db, version=4)
+                first = await CostTimelineStore(memory_cache()).body(
+                    db, index, first_render, date(2024, 7, 1)
+                )
+            async with session_maker() as db:
+                # Separate cache: only the table is shared
+                second = await CostTimelineStore(memory_cache()).body(
+                    db, index, second_render, date(2024, 7, 1)
+                )
+            await engine.dispose()
+            return first, second, first_render.calls, second_render.calls
+
+        first, second, first_calls, second_calls = asyncio.run(scenario())
+        assert first == second
+        assert json.loads(first) == {"effective_date": "2024-07-01", "labor_rates": ["45.00"], "seasonal": [1]}
+        assert first_calls == 6
+        assert second_calls == 0
+
+    def test_store_ignores_segments_of_other_cost_rows(self, tmp_path: Path):
+        """Test stored segments are not reused for different rows under the same version."""
+        async def scenario():
+            engine = await seeded_engine(tmp_path / "reset.db")
+            session_maker = async_sessionmaker(engine, class_=AsyncSession)
+            first_render, second_render = CountingRenderer(), CountingRenderer()
+            async with session_maker() as db:
+                index = CostIndex()
+                await index.load(db, version=1)
+                await CostTimelineStore(memory_cache()).body(db, index, first_render, date(2024, 7, 1))
+
+                rate = await db.get(LaborRate, 2)
+                rate.hourly_rate = Decimal("50.00")
+                await db.commit()
+
+                # The version counter started over after a cache reset
+                index = CostIndex()
+                await index.load(db, version=1)
+                body = await CostTimelineStore(memory_cache()).body(
+                    db, index, second_render, date(2024, 7, 1)
+                )
+                stored = (await db.execute(
+                    select(func.count(distinct(CostTimelineSegment.content_hash)))
+                )).scalar()
+            await engine.dispose()
+            return body, second_render.calls, stored
+
+        body, second_calls, stored = asyncio.run(scenario())
+        assert json.loads(body)["labor_rates"] == ["50.00"]
+        assert second_calls == 6
+        assert stored == 1
@@ -0,0 +1,359 @@
+"""
+Tests for estimate endpoints against a seeded SQLite database.
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import AsyncIterator, Tuple
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.api.deps import get_current_active_user, get_db
+from src.api.estimates import router
+from src.core.calculator import (
+    DeterministicCalculator, FORMULA_VERSION, STAGE_INPUTS, TreeServiceCalculator
+)
+from src.models.audit import AuditLog
+from src.models.costs import OverheadSettings
+from src.models.estimate import Estimate, EstimateCostRef
+from src.models.user import UserRole
+from src.schemas.calculation import CalculationInput
+from src.services.calculation import CalculationService, invalidate_cost_snapshots
+from tests.test_cost_snapshot import seeded_cost_engine
+
+
+ESTIMATOR = SimpleNamespace(id=1, username="estimator", role=UserRole.ESTIMATOR)
+
+BASE_SCENARIO = {
+    "travel_miles": "20.0",
+    "travel_time_minutes": 30,
+    "crew_size": 2,
+    "estimated_hours": "4.0",
+    "labor_rates": ["climber", "groundsman"],
+    "equipment_ids": [1],
+    "disposal_fees": "100.00",
+    "permit_cost": "25.00"
+}
+
+
+@asynccontextmanager
+async def estimates_client(path: Path) -> AsyncIterator[Tuple[AsyncClient, async_sessionmaker]]:
+    """Client for the estimates router on a seeded database, as an estimator."""
+    engine = await seeded_cost_engine(path)
+    async with engine.begin() as conn:
+        for model in (Estimate, EstimateCostRef, AuditLog):
+            await conn.run_sync(
+                lambda sync_conn, table=model.__table__: table.create(sync_conn)
+            )
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/estimates")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: ESTIMATOR
+
+    # Snapshots and the cost index are process-wide: start from this database
+    await invalidate_cost_snapshots()
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client, session_maker
+    finally:
+        await engine.dispose()
+
+
+async def base_kwargs(session_maker: async_sessionmaker) -> dict:
+    """calculate_full_estimate arguments of BASE_SCENARIO with today's rates."""
+    async with session_maker() as db:
+        return await CalculationService(db).calculation_kwargs(CalculationInput(**BASE_SCENARIO))
+
+
+def priced_total(kwargs: dict, **overrides) -> Decimal:
+    total = DeterministicCalculator.calculate_full_estimate(**dict(kwargs, **overrides))
+    return total["final_calculation"]["final_total"]
+
+
+def whole_dollars(kwargs: dict, **overrides) -> int:
+    total = DeterministicCalculator.calculate_full_estimate(**dict(kwargs, **overrides))
+    return int(total["final_calculation"]["final_total"])
+
+
+class TestSweepEndpoint:
+    """The sweep prices a CalculationInput with the seeded cost rates."""
+
+    def test_streams_grid_priced_with_cost_rates(self, tmp_path: Path):
+        """Test every cell matches pricing the scenario with the same rates."""
+        hours = ["4.0", "6.0"]
+        profits = ["30.0", "35.0"]
+
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, session_maker):
+                response = await client.post("/api/estimates/sweep", json={
+                    "base_scenario": BASE_SCENARIO,
+                    "axes": [
+                        {"parameter": "estimated_hours", "values": hours},
+                        {"parameter": "profit_percent", "values": profits}
+                    ]
+                })
+                return response, await base_kwargs(session_maker)
+
+        response, kwargs = asyncio.run(scenario())
+
+        assert response.status_code == 200
+        header, *rows = [json.loads(line) for line in response.text.splitlines()]
+        assert header["shape"] == [2, 2]
+        assert [row["index"] for row in rows] == [[0], [1]]
+        for i, row in enumerate(rows):
+            assert row["final_totals"] == [
+                whole_dollars(kwargs, estimated_hours=Decimal(hours[i]), profit_percent=Decimal(profit))
+                for profit in profits
+            ]
+
+    def test_rejects_fractional_crew_size(self, tmp_path: Path):
+        """Test a crew size axis of 2.5 workers is a validation error, not 2 workers."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, _):
+                return await client.post("/api/estimates/sweep", json={
+                    "base_scenario": BASE_SCENARIO,
+                    "axes": [{"parameter": "crew_size", "values": ["2", "2.5"]}]
+                })
+
+        response = asyncio.run(scenario())
+
+        assert response.status_code == 422
+        assert "whole numbers" in response.text
+
+    def test_unknown_role_is_bad_request(self, tmp_path: Path):
+        """Test a role without a labor rate is reported instead of failing the request."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, _):
+                return await client.post("/api/estimates/sweep", json={
+                    "base_scenario": dict(BASE_SCENARIO, labor_rates=["climber", "arborist"]),
+                    "axes": [{"parameter": "profit_percent", "values": ["30.0"]}]
+                })
+
+        response = asyncio.run(scenario())
+
+        assert response.status_code == 400
+        assert "No labor rate found for role: arborist" in response.json()["detail"]
+
+
+class TestPriceRangeEndpoint:
+    """The price range prices a CalculationInput with the seeded cost rates."""
+
+    def test_fixed_inputs_match_point_estimate(self, tmp_path: Path):
+        """Test degenerate distributions give the deterministic total with the same rates."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, session_maker):
+                response = await client.post("/api/estimates/price-range", json={
+                    "base_scenario": BASE_SCENARIO,
+                    "estimated_hours": {"kind": "fixed", "low": "4.0", "mode": "4.0", "high": "4.0"},
+                    "samples": 100,
+                    "seed": 1
+                })
+                return response, await base_kwargs(session_maker)
+
+        response, kwargs = asyncio.run(scenario())
+
+        assert response.status_code == 200
+        body = response.json()
+        expected = str(whole_dollars(kwargs))
+        assert body["point_total"] == body["p10"] == body["p90"] == expected
+
+    def test_disposal_volume_requires_fee(self, tmp_path: Path):
+        """Test a disposal volume without a fee per unit is a validation error."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, _):
+                return await client.post("/api/estimates/price-range", json={
+                    "base_scenario": BASE_SCENARIO,
+                    "estimated_hours": {"kind": "triangular", "low": "3.0", "mode": "4.0", "high": "6.0"},
+                    "disposal_volume": {"kind": "uniform", "low": "2", "mode": "3", "high": "6"},
+                    "samples": 100
+                })
+
+        response = asyncio.run(scenario())
+
+        assert response.status_code == 422
+        assert "disposal_fee_per_unit is required" in response.text
+
+
+class TestSolveTargetEndpoint:
+    """The solver prices a CalculationInput with the seeded cost rates."""
+
+    def test_finds_profit_for_reachable_target(self, tmp_path: Path):
+        """Test a total priced with the same rates at 30% profit is solved exactly."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, session_maker):
+                kwargs = await base_kwargs(session_maker)
+                target = whole_dollars(kwargs, profit_percent=Decimal("30.0"))
+                response = await client.post("/api/estimates/solve-target", json={
+                    "base_scenario": BASE_SCENARIO,
+                    "target_total": f"{target}.00",
+                    "variables": [{"parameter": "profit_percent", "low": "20", "high": "40", "step": "0.5"}]
+                })
+                return response, kwargs, target
+
+        response, kwargs, target = asyncio.run(scenario())
+
+        assert response.status_code == 200
+        best = response.json()["solutions"][0]
+        assert best["exact"] is True
+        assert best["final_total"] == str(target)
+        assert whole_dollars(kwargs, profit_percent=Decimal(best["values"]["profit_percent"])) == target
+
+
+ESTIMATE = {
+    "customer_name": "Jane Customer",
+    "customer_email": "jane@example.com",
+    "job_address": "456 Oak Ave",
+    "job_description": "Remove large oak tree",
+    "calculation_input": BASE_SCENARIO
+}
+
+
+async def audit_context(session_maker: async_sessionmaker, action: str) -> dict:
+    """Context of the latest audit row for an API action."""
+    async with session_maker() as db:
+        logs = (await db.execute(select(AuditLog).order_by(AuditLog.id))).scalars().all()
+    return [log.context for log in logs if log.context["action"] == action][-1]
+
+
+class TestUpdateEndpoint:
+    """PATCH reprices a new CalculationInput with the seeded cost rates."""
+
+    def test_recalculates_changed_stages(self, tmp_path: Path):
+        """Test new hours reprice labor, equipment and margins only."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, session_maker):
+                created = await client.post("/api/estimates/", json=ESTIMATE)
+                assert created.status_code == 200, created.text
+                response = await client.patch(
+                    f"/api/estimates/{created.json()['id']}",
+                    json={"calculation_input": dict(BASE_SCENARIO, estimated_hours="6.0")}
+                )
+                context = await audit_context(session_maker, "update_estimate")
+                return created, response, context, await base_kwargs(session_maker)
+
+        created, response, context, kwargs = asyncio.run(scenario())
+
+        assert response.status_code == 200, response.text
+        assert Decimal(created.json()["final_total"]) == priced_total(kwargs)
+        assert Decimal(response.json()["final_total"]) == priced_total(
+            kwargs, estimated_hours=Decimal("6.0")
+        )
+        assert context["changes"]["recomputed_stages"] == ["labor", "equipment", "margins"]
+
+    def test_recomputes_stages_of_older_formula_version(self, tmp_path: Path):
+        """Test breakdowns priced by an older formula version are not carried forward."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, session_maker):
+                created = await client.post("/api/estimates/", json=ESTIMATE)
+                estimate_id = created.json()["id"]
+
+                async with session_maker() as db:
+                    snapshot = await CalculationService(db).get_cost_snapshot(date.today())
+                    legacy = TreeServiceCalculator().calculate_estimate(
+                        CalculationInput(**BASE_SCENARIO), snapshot, formula_version="1.0"
+                    )
+                    estimate = await db.get(Estimate, estimate_id)
+                    estimate.calculation_result = legacy.model_dump(mode="json")
+                    await db.commit()
+
+                response = await client.patch(
+                    f"/api/estimates/{estimate_id}",
+                    json={"calculation_input": dict(BASE_SCENARIO, disposal_fees="120.00")}
+                )
+                context = await audit_context(session_maker, "update_estimate")
+                async with session_maker() as db:
+                    result = (await db.get(Estimate, estimate_id)).calculation_result
+                return response, context, result, await base_kwargs(session_maker)
+
+        response, context, result, kwargs = asyncio.run(scenario())
+
+        assert response.status_code == 200, response.text
+        assert context["changes"]["recomputed_stages"] == ["travel", "disposal", "margins"]
+        expected = DeterministicCalculator.calculate_full_estimate(
+            **dict(kwargs, disposal_fees=Decimal("120.00"))
+        )
+        assert result["calculation_details"]["travel_breakdown"] == {
+            key: str(value) for key, value in expected["travel_breakdown"].items()
+        }
+        assert result["calculation_details"]["formula_version"] == FORMULA_VERSION
+        assert Decimal(response.json()["final_total"]) == expected["final_calculation"]["final_total"]
+
+    def test_profit_change_only_runs_margins(self, tmp_path: Path, monkeypatch):
+        """Test a new profit percent reprices the stored estimate through the margins only."""
+        calls = []
+
+        def counted(name):
+            stage = getattr(DeterministicCalculator, name)
+
+            def wrapper(*args, **kwargs):
+                calls.append(name)
+                return stage(*args, **kwargs)
+            return staticmethod(wrapper)
+
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, session_maker):
+                created = await client.post("/api/estimates/", json=ESTIMATE)
+
+                async with session_maker() as db:
+                    await db.execute(update(OverheadSettings).values(profit_percent=Decimal("20.00")))
+                    await db.commit()
+                await invalidate_cost_snapshots()
+
+                for name in (
+                    "calculate_full_estimate", "calculate_travel_cost", "calculate_labor_cost",
+                    "calculate_equipment_cost", "apply_formula_pipeline"
+                ):
+                    monkeypatch.setattr(DeterministicCalculator, name, counted(name))
+                response = await client.patch(
+                    f"/api/estimates/{created.json()['id']}",
+                    json={"calculation_input": BASE_SCENARIO}
+                )
+                monkeypatch.undo()
+                context = await audit_context(session_maker, "update_estimate")
+                return response, context, await base_kwargs(session_maker)
+
+        response, context, kwargs = asyncio.run(scenario())
+
+        assert response.status_code == 200, response.text
+        assert context["changes"]["recomputed_stages"] == ["margins"]
+        assert calls == ["apply_formula_pipeline"]
+        assert kwargs["profit_percent"] == Decimal("20.00")
+        assert Decimal(response.json()["final_total"]) == priced_total(kwargs)
+
+    def test_legacy_result_is_recalculated_in_full(self, tmp_path: Path):
+        """Test a stored result without its priced inputs is recalculated in full."""
+        async def scenario():
+            async with estimates_client(tmp_path / "costs.db") as (client, session_maker):
+                created = await client.post("/api/estimates/", json=ESTIMATE)
+                estimate_id = created.json()["id"]
+
+                async with session_maker() as db:
+                    estimate = await db.get(Estimate, estimate_id)
+                    stored = json.loads(json.dumps(estimate.calculation_result))
+                    del stored["calculation_details"]["priced_inputs"]
+                    estimate.calculation_result = stored
+                    await db.commit()
+
+                response = await client.patch(
+                    f"/api/estimates/{estimate_id}",
+                    json={"calculation_input": BASE_SCENARIO}
+                )
+                return response, await audit_context(session_maker, "update_estimate")
+
+        response, context = asyncio.run(scenario())
+
+        assert response.status_code == 200, response.text
+        assert context["changes"]["recomputed_stages"] == list(STAGE_INPUTS)
@@ -0,0 +1,64 @@
+"""
+Tests for ETags and conditional GET handling.
+"""
+import asyncio
+
+from fastapi import Request, Response
+
+from src.core.cache import CacheManager
+from src.core.etag import conditional_response, etag_matches, make_etag
+from src.services.calculation import CostSnapshotCache
+
+
+def request_with(if_none_match: str = None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_make_etag_is_strong_and_stable():
+    """Test the same parts give the same quoted ETag and any change alters it."""
+    etag = make_etag("labor_rates", 3, None)
+    assert etag == make_etag("labor_rates", 3, None)
+    assert etag.startswith('"') and etag.endswith('"') and not etag.startswith("W/")
+    assert etag != make_etag("labor_rates", 4, None)
+
+
+def test_etag_matches():
+    """Test If-None-Match lists, weak validators and the wildcard."""
+    etag = make_etag("x")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_conditional_response():
+    """Test a match gives an empty 304 and a miss tags the endpoint's response."""
+    etag = make_etag("x")
+
+    unchanged = conditional_response(request_with(etag), Response(), etag)
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == etag
+    assert unchanged.body == b""
+
+    response = Response()
+    assert conditional_response(request_with('"stale"'), response, etag) is None
+    assert response.headers["etag"] == etag
+
+
+def test_cost_table_versions():
+    """Test a write bumps its own table's version and the overall version only."""
+    cache = CacheManager()
+    cache.use_redis = False
+    snapshots = CostSnapshotCache(cache)
+
+    async def scenario():
+        await snapshots.invalidate("labor_rates")
+        return (
+            await snapshots.table_version("labor_rates"),
+            await snapshots.table_version("equipment_costs"),
+            await snapshots.current_version()
+        )
+
+    assert asyncio.run(scenario()) == (1, 0, 1)
@@ -7,6 +7,7 @@ from decimal import Decimal
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
 
+from src.core.cache import CacheManager
 from src.services.external_apis import (
     ExternalAPIService,
     TravelDistance,
@@ -29,10 +30,12 @@ async def api_service():
 
 @pytest.fixture
 def mock_cache():
-    """Create a mock cache."""
-    cache = AsyncMock()
-    cache.get = AsyncMock(return_value=None)
-    cache.set = AsyncMock(return_value=True)
+    """Create an in-memory cache whose reads and writes can be inspected."""
+    cache = CacheManager()
+    cache.use_redis = False
+    cache._initialized = True
+    cache.get = AsyncMock(wraps=cache.get)
+    cache.set = AsyncMock(wraps=cache.set)
     return cache
 
 
@@ -331,7 +334,11 @@ class TestFuelPriceIntegration:
             "last_updated": datetime.utcnow().isoformat(),
             "source": "cache"
         }
-        mock_cache.get.return_value = cached_data
+        # Fuel prices are cached with their freshness deadline
+        mock_cache.get.return_value = {
+            "value": cached_data,
+            "fresh_until": datetime.utcnow().timestamp() + 3600
+        }
         
         with patch.object(api_service, 'cache', mock_cache):
             result = await api_service.get_current_fuel_price(
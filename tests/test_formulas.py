@@ -0,0 +1,115 @@
+"""
+Tests for the versioned formula registry.
+"""
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.core.calculator import DeterministicCalculator
+from src.core.formulas import (
+    FormulaDefinition, compile_formula, get_formula, register_formula
+)
+from src.utils.money import Money
+
+
+def reference_pipeline(components, overhead_percent, profit_percent, safety_buffer_percent):
+    """Margin pipeline of versions 1.0 and 1.1 written out step by step."""
+    direct = sum((Money.from_value(value) for value in components.values()), Money())
+    overhead = direct.percent(overhead_percent)
+    buffer = (direct + overhead).percent(safety_buffer_percent)
+    profit = (direct + overhead + buffer).percent(profit_percent)
+    subtotal = direct + overhead + buffer + profit
+    return {
+        "direct_costs": direct.to_decimal(),
+        "overhead": overhead.to_decimal(),
+        "safety_buffer": buffer.to_decimal(),
+        "profit": profit.to_decimal(),
+        "subtotal": subtotal.to_decimal(),
+        "final_total": subtotal.round_to(5).to_whole_decimal()
+    }
+
+
+class TestFormulaRegistry:
+    """Compiled plans and version lookup."""
+
+    @pytest.mark.parametrize("version", ["1.0", "1.1"])
+    def test_version_1_matches_reference(self, version):
+        """Test compiled plans reproduce the step-by-step pipeline."""
+        rng = random.Random(10)
+        for _ in range(500):
+            components = {
+                key: Decimal(rng.randint(0, 500000)) / 100
+                for key in ("travel", "labor", "equipment", "disposal", "permits")
+            }
+            percents = [Decimal(rng.randint(0, 600)) / 10 for _ in range(3)]
+
+            result = DeterministicCalculator.apply_formula_pipeline(
+                components, *percents, formula_version=version
+            )
+            expected = reference_pipeline(components, *percents)
+
+            assert {key: result[key] for key in expected} == expected
+            assert result["formula_version"] == version
+
+    def test_travel_time_rounding_by_version(self):
+        """Test 1.0 keeps the 10-digit hours rounding and 1.1 prices exactly."""
+        # 2 minutes at $15.15/h is exactly $0.505
+        legacy = DeterministicCalculator.calculate_travel_cost(
+            Decimal("10"), 2, Decimal("0.655"), Decimal("15.15"), formula_version="1.0"
+        )
+        exact = DeterministicCalculator.calculate_travel_cost(
+            Decimal("10"), 2, Decimal("0.655"), Decimal("15.15"), formula_version="1.1"
+        )
+
+        assert legacy["time_cost"] == Decimal("0.50")
+        assert exact["time_cost"] == Decimal("0.51")
+        assert legacy["mileage_cost"] == exact["mileage_cost"] == Decimal("6.55")
+        assert get_formula("1.0").travel_time_precision == 10
+        assert get_formula("1.1").travel_time_precision is None
+
+    def test_travel_is_recomputed_when_version_changes(self):
+        """Test moving an estimate to a new formula version reprices travel."""
+        assert DeterministicCalculator.formula_stages("1.0", "1.1") == ["travel", "margins"]
+        assert DeterministicCalculator.formula_stages("1.1", "1.1") == []
+        assert DeterministicCalculator.formula_stages("0.9", "1.1") == [
+            "travel", "labor", "equipment", "disposal", "permits", "margins"
+        ]
+
+    def test_plans_are_cached_by_representation(self):
+        """Test equal margins with different representations get their own plan."""
+        plan = compile_formula(Decimal("25"), Decimal("35.0"), Decimal("10.0"))
+        assert compile_formula(Decimal("25"), Decimal("35.0"), Decimal("10.0")) is plan
+
+        other = compile_formula(Decimal("25.0"), Decimal("35.0"), Decimal("10.0"))
+        assert other is not plan
+        assert other.execute({"labor": Decimal("100")})["overhead_percent"] == "25.0"
+        assert plan.execute({"labor": Decimal("100")})["overhead_percent"] == "25"
+
+    def test_unknown_version(self):
+        """Test unknown versions are rejected."""
+        with pytest.raises(ValueError, match="Unknown formula version"):
+            DeterministicCalculator.apply_formula_pipeline(
+                {"labor": Decimal("100")}, Decimal("25"), Decimal("35"), Decimal("10"),
+                formula_version="0.9"
+            )
+
+    def test_duplicate_and_invalid_definitions(self):
+        """Test registration guards."""
+        with pytest.raises(ValueError, match="already registered"):
+            register_formula(FormulaDefinition(version="1.0", steps=("overhead",)))
+        with pytest.raises(ValueError, match="Unknown margin steps"):
+            FormulaDefinition(version="x", steps=("discount",))
+
+    def test_other_versions_can_reorder_steps(self):
+        """Test a definition applies margins in its own order."""
+        definition = FormulaDefinition(version="test-profit-first", steps=("profit", "overhead"), round_to=1)
+        plan = definition.compile(Decimal("10"), Decimal("50"), Decimal("0"))
+
+        result = plan.execute({"labor": Decimal("100.00")})
+
+        assert result["profit"] == Decimal("50.00")
+        assert result["overhead"] == Decimal("15.00")
+        assert result["final_total"] == Decimal("165")
+        assert "safety_buffer" not in result
+        assert get_formula("1.0").steps == ("overhead", "safety_buffer", "profit")
@@ -0,0 +1,114 @@
+"""
+Tests for single-flight get_or_compute.
+"""
+import asyncio
+import time
+
+from src.core.cache import CacheManager
+from src.core.config import settings
+
+
+def memory_cache() -> CacheManager:
+    """Shared cache without Redis."""
+    cache = CacheManager()
+    cache.use_redis = False
+    return cache
+
+
+class SlowCompute:
+    """Returns its call count after a short delay."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.calls
+
+
+class TestGetOrCompute:
+    """A miss is computed once however many callers ask for it."""
+
+    def test_concurrent_misses_compute_once(self):
+        """Test concurrent callers share one computation and later callers hit the cache."""
+        cache = memory_cache()
+        compute = SlowCompute()
+
+        async def scenario():
+            results = await asyncio.gather(*(cache.get_or_compute("k", compute, ttl=60) for _ in range(10)))
+            return results, await cache.get_or_compute("k", compute, ttl=60)
+
+        results, again = asyncio.run(scenario())
+        assert results == [1] * 10
+        assert again == 1
+        assert compute.calls == 1
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        """Test a failed computation raises for all callers and the next call retries."""
+        cache = memory_cache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        async def scenario():
+            results = await asyncio.gather(
+                *(cache.get_or_compute("k", failing, ttl=60) for _ in range(3)),
+                return_exceptions=True
+            )
+            retried = await cache.get_or_compute("k", SlowCompute(0), ttl=60)
+            return results, retried
+
+        results, retried = asyncio.run(scenario())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(calls) == 1
+        assert retried == 1
+
+    def test_waits_for_lock_held_by_another_process(self, monkeypatch):
+        """Test a caller that can't take the lock polls for the holder's result."""
+        monkeypatch.setattr(settings, "CACHE_COMPUTE_POLL_SECONDS", 0.01)
+        cache = memory_cache()
+        compute = SlowCompute()
+
+        async def locked(lock_key, token):
+            return False
+
+        cache._acquire_lock = locked
+
+        async def other_process():
+            await asyncio.sleep(0.03)
+            await cache.set("k", "theirs", 60)
+
+        async def scenario():
+            _, value = await asyncio.gather(other_process(), cache.get_or_compute("k", compute, ttl=60))
+            return value
+
+        assert asyncio.run(scenario()) == "theirs"
+        assert compute.calls == 0
+
+    def test_serves_stale_while_one_caller_refreshes(self):
+        """Test stale values are returned at once and refreshed in the background once."""
+        cache = memory_cache()
+        compute = SlowCompute()
+
+        async def scenario():
+            first = await cache.get_or_compute("k", compute, ttl=60, stale_ttl=60)
+            envelope = await cache.get("k")
+            envelope["fresh_until"] = time.time() - 1
+            await cache.set("k", envelope, 120)
+
+            stale = await asyncio.gather(
+                *(cache.get_or_compute("k", compute, ttl=60, stale_ttl=60) for _ in range(5))
+            )
+            await asyncio.sleep(0.05)
+            return first, stale, await cache.get_or_compute("k", compute, ttl=60, stale_ttl=60)
+
+        first, stale, refreshed = asyncio.run(scenario())
+        assert first == 1
+        assert stale == [1] * 5
+        assert refreshed == 2
+        assert compute.calls == 2
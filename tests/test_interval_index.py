@@ -0,0 +1,166 @@
+"""
+Tests for the effective-date interval index.
+"""
+import asyncio
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.interval_index import IntervalIndex
+from src.models.costs import LaborRate, VehicleRate
+from src.services.cost_index import INDEXED_MODELS, CostIndex
+
+
+def random_intervals(rng: random.Random, count: int):
+    """Random closed intervals, some open-ended."""
+    base = date(2020, 1, 1)
+    intervals = []
+    for value in range(count):
+        start = base + timedelta(days=rng.randint(0, 1500))
+        end = None if rng.random() < 0.2 else start + timedelta(days=rng.randint(0, 400))
+        intervals.append((start, end, value))
+    return intervals
+
+
+def contains(start, end, low, high) -> bool:
+    return start <= high and (end is None or end >= low)
+
+
+class TestIntervalIndex:
+    """Lookups must match a linear scan."""
+
+    def test_matches_linear_scan(self):
+        """Test date lookups and range overlaps against brute force."""
+        rng = random.Random(14)
+        intervals = random_intervals(rng, 500)
+        index = IntervalIndex(intervals)
+
+        for _ in range(300):
+            low = date(2019, 6, 1) + timedelta(days=rng.randint(0, 2200))
+            high = low + timedelta(days=rng.randint(0, 120))
+            expected = {value for start, end, value in intervals if contains(start, end, low, high)}
+            point = {value for start, end, value in intervals if contains(start, end, low, low)}
+
+            assert set(index.overlapping(low, high)) == expected
+            assert set(index.at(low)) == point
+            assert index.overlaps(low, high) == bool(expected)
+
+    def test_add_and_remove(self):
+        """Test writes keep lookups current."""
+        index = IntervalIndex([(date(2024, 1, 1), date(2024, 6, 30), "h1")])
+        index.add(date(2024, 7, 1), None, "h2")
+
+        assert index.at(date(2024, 6, 30)) == ["h1"]
+        assert index.at(date(2030, 1, 1)) == ["h2"]
+        assert index.overlapping(date(2024, 6, 1), date(2024, 7, 1)) == ["h1", "h2"]
+        assert index.overlaps(date(2025, 1, 1), None, lambda value: value == "h1") is False
+
+        assert index.remove_where(lambda value: value == "h2") == 1
+        assert index.at(date(2030, 1, 1)) == []
+        assert len(index) == 1
+
+
+class TestCostIndex:
+    """The cost index is loaded from the tables in one query and updated on writes."""
+
+    def test_load_and_record_write(self, tmp_path: Path):
+        """Test loaded rows, rates as of a date, overlap checks and applying a write."""
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'costs.db'}")
+            tables = [model.__table__ for model in INDEXED_MODELS.values()]
+            async with engine.begin() as conn:
+                await conn.run_sync(lambda sync_conn: LaborRate.metadata.create_all(sync_conn, tables=tables))
+                await conn.execute(LaborRate.__table__.insert(), [
+                    {"id": 1, "role": "climber", "hourly_rate": Decimal("40.00"), "created_by": "test",
+                     "effective_from": date(2023, 1, 1), "effective_to": date(2023, 12, 31)},
+                    {"id": 2, "role": "climber", "hourly_rate": Decimal("45.00"), "created_by": "test",
+                     "effective_from": date(2024, 1, 1), "effective_to": None},
+                    {"id": 3, "role": "groundsman", "hourly_rate": Decimal("30.00"), "created_by": "test",
+                     "effective_from": date(2023, 1, 1), "effective_to": None}
+                ])
+
+            statements = []
+            event.listen(
+                engine.sync_engine, "before_cursor_execute",
+                lambda conn, cursor, statement, *args: statements.append(statement)
+            )
+            session_maker = async_sessionmaker(engine, class_=AsyncSession)
+            index = CostIndex()
+            async with session_maker() as db:
+                await index.load(db, version=0)
+                assert len(statements) == 1
+                result = await db.execute(select(LaborRate.__table__).order_by(LaborRate.__table__.c.id))
+                expected = [dict(row._mapping) for row in result]
+            await engine.dispose()
+            return index, expected
+
+        index, expected = asyncio.run(scenario())
+        table = LaborRate.__tablename__
+
+        # JSON-decoded rows match what a plain select returns, types included
+        loaded = sorted((vars(row) for row in index.rows(table)), key=lambda row: row["id"])
+        assert loaded == expected
+        assert [type(value) for value in loaded[0].values()] == [type(value) for value in expected[0].values()]
+
+        rates = {rate.role: rate.hourly_rate for rate in index.as_of(table, date(2023, 6, 1))}
+        assert rates == {"climber": Decimal("40.00"), "groundsman": Decimal("30.00")}
+        assert index.as_of(VehicleRate.__tablename__, date(2023, 6, 1)) == []
+        assert index.overlaps(table, date(2023, 6, 1), date(2023, 6, 2), lambda rate: rate.role == "climber")
+        assert not index.overlaps(table, date(2022, 1, 1), date(2022, 12, 31))
+
+        class Written:
+            __tablename__ = table
+
+            def __init__(self, **values):
+                self.__dict__.update(values)
+
+            def to_dict(self):
+                return dict(self.__dict__)
+
+        closed = Written(id=2, role="climber", hourly_rate=Decimal("45.00"), deleted_at=None,
+                         effective_from=date(2024, 1, 1), effective_to=date(2024, 12, 31))
+        index.record_write(closed, version=1)
+        assert index.version == 1
+        assert index.as_of(table, date(2025, 1, 1), lambda rate: rate.role == "climber") == []
+
+        # A skipped version means another process wrote too
+        index.record_write(closed, version=3)
+        assert index.version is None
+
+    def test_content_hash_follows_rows_not_versions(self, tmp_path: Path):
+        """Test a write applied in-process hashes like a fresh load of the same rows."""
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'costs.db'}")
+            tables = [model.__table__ for model in INDEXED_MODELS.values()]
+            async with engine.begin() as conn:
+                await conn.run_sync(lambda sync_conn: LaborRate.metadata.create_all(sync_conn, tables=tables))
+                await conn.execute(LaborRate.__table__.insert(), [
+                    {"id": 1, "role": "climber", "hourly_rate": Decimal("40.00"), "created_by": "test",
+                     "effective_from": date(2023, 1, 1), "effective_to": None}
+                ])
+
+            session_maker = async_sessionmaker(engine, class_=AsyncSession)
+            written, reloaded = CostIndex(), CostIndex()
+            async with session_maker() as db:
+                await written.load(db, version=0)
+                before = written.content_hash
+                rate = await db.get(LaborRate, 1)
+                rate.hourly_rate = Decimal("42.50")
+                await db.commit()
+                await db.refresh(rate)
+                written.record_write(rate, version=1)
+                # Same version number as the first load, as after a cache reset
+                await reloaded.load(db, version=0)
+            await engine.dispose()
+            return before, written, reloaded
+
+        before, written, reloaded = asyncio.run(scenario())
+
+        assert written.content_hash == reloaded.content_hash
+        assert written.content_hash != before
+        assert written.table_hash(LaborRate.__tablename__) == reloaded.table_hash(LaborRate.__tablename__)
+        assert written.table_hash(VehicleRate.__tablename__) == reloaded.table_hash(VehicleRate.__tablename__)
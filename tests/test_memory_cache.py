@@ -0,0 +1,106 @@
+"""
+Tests for the bounded in-memory cache.
+"""
+import asyncio
+
+from src.core.cache import InMemoryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestInMemoryCache:
+    """The fallback cache must stay within its budgets and drop expired keys."""
+
+    def test_lru_eviction_by_entry_count(self):
+        """Test the least recently used entry is evicted first."""
+        cache = InMemoryCache(max_entries=2, max_bytes=10_000)
+
+        async def scenario():
+            await cache.set("a", 1)
+            await cache.set("b", 2)
+            await cache.get("a")
+            await cache.set("c", 3)
+            return [await cache.get(key) for key in ("a", "b", "c")]
+
+        assert asyncio.run(scenario()) == [1, None, 3]
+        assert cache.evictions == 1
+        assert cache.stats()["entries"] == 2
+
+    def test_byte_budget(self):
+        """Test entries are evicted to fit the byte budget and oversized values are refused."""
+        cache = InMemoryCache(max_entries=100, max_bytes=20)
+
+        async def scenario():
+            await cache.set("a", "x" * 10)
+            await cache.set("b", "y" * 10)
+            stored = await cache.set("c", "z" * 100)
+            return stored, await cache.get("a"), await cache.get("b")
+
+        stored, a, b = asyncio.run(scenario())
+        assert stored is False
+        assert a is None
+        assert b == "y" * 10
+        assert cache.stats()["bytes"] == 11
+
+    def test_expiry_on_read_and_sweep(self):
+        """Test expired entries are missing on read and removed by the sweeper."""
+        clock = FakeClock()
+        cache = InMemoryCache(max_entries=100, max_bytes=10_000, clock=clock)
+
+        async def scenario():
+            await cache.set("short", 1, expire=10)
+            await cache.set("long", 2, expire=60)
+            await cache.set("forever", 3)
+            await cache.set("reset", 4, expire=10)
+            await cache.expire("reset", 120)
+            clock.now += 30
+            swept = cache.sweep()
+            return swept, await cache.get("short"), await cache.get("reset"), await cache.get("forever")
+
+        swept, short, reset, forever = asyncio.run(scenario())
+        assert swept == 1
+        assert short is None
+        assert reset == 4
+        assert forever == 3
+        assert cache.expirations == 1
+
+        clock.now += 1000
+        assert asyncio.run(cache.get("long")) is None
+        assert cache.expirations == 2
+        assert cache.sweep() == 1  # "reset"
+        assert cache.stats()["entries"] == 1
+
+    def test_increment_keeps_expiry(self):
+        """Test counters count up and keep their expiry time."""
+        clock = FakeClock()
+        cache = InMemoryCache(max_entries=100, max_bytes=10_000, clock=clock)
+
+        async def scenario():
+            await cache.set("hits", 1, expire=10)
+            first = await cache.increment("hits")
+            second = await cache.increment("hits", 5)
+            clock.now += 11
+            return first, second, await cache.get("hits"), await cache.increment("new")
+
+        assert asyncio.run(scenario()) == (2, 7, None, 1)
+
+    def test_background_sweeper(self):
+        """Test the sweeper task removes expired keys nobody reads."""
+        cache = InMemoryCache(max_entries=100, max_bytes=10_000, sweep_interval=0.01)
+
+        async def scenario():
+            cache.start_sweeper()
+            await cache.set("a", 1, expire=0.02)
+            await asyncio.sleep(0.1)
+            entries = cache.stats()["entries"]
+            await cache.close()
+            return entries
+
+        assert asyncio.run(scenario()) == 0
+        assert cache.expirations == 1
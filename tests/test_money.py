@@ -0,0 +1,92 @@
+"""
+Tests for the integer-cents money layer.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from decimal import (
+    Decimal, localcontext, ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN,
+    ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING
+)
+
+import pytest
+
+from src.core.calculator import DeterministicCalculator
+from src.utils.money import Money, divide_rounded, to_ratio
+from src.utils import rounding
+
+
+class TestDivideRounded:
+    """divide_rounded must agree with Decimal.quantize for every mode."""
+
+    @pytest.mark.parametrize("rounding_mode", [
+        ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN,
+        ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING
+    ])
+    def test_matches_decimal_quantize(self, rounding_mode):
+        """Test quotients against Decimal for positive, negative and tie values."""
+        for numerator in range(-50, 51):
+            for denominator in (1, 2, 4, 10, -4):
+                expected = (Decimal(numerator) / Decimal(denominator)).quantize(
+                    Decimal("1"), rounding=rounding_mode
+                )
+                assert divide_rounded(numerator, denominator, rounding_mode) == int(expected)
+
+    def test_rejects_unknown_mode(self):
+        """Test unsupported rounding modes raise."""
+        with pytest.raises(ValueError):
+            divide_rounded(1, 3, "ROUND_SIDEWAYS")
+
+
+class TestMoney:
+    """Test Money construction and arithmetic."""
+
+    def test_from_value(self):
+        """Test conversion from common dollar representations."""
+        assert Money.from_value(Decimal("12.345")).cents == 1235
+        assert Money.from_value("-12.345").cents == -1235
+        assert Money.from_value(0.1).cents == 10
+        assert Money.from_value(7).cents == 700
+
+    def test_rejects_non_finite(self):
+        """Test NaN and infinity are rejected."""
+        with pytest.raises(ValueError):
+            to_ratio(Decimal("NaN"))
+        with pytest.raises(ValueError):
+            to_ratio(Decimal("Infinity"))
+
+    def test_arithmetic(self):
+        """Test exact addition and rounded percentages."""
+        amount = Money(10001)
+
+        assert amount.percent(Decimal("25.5")).cents == 2550
+        assert amount.multiply("0.5").cents == 5001
+        assert sum([Money(1), Money(2)]) == Money(3)
+        assert Money(123249).round_to(5) == Money(123000)
+        assert Money(123250).round_to(5) == Money(123500)
+        assert str(Money(-5)) == "-0.05"
+
+
+class TestContextIndependence:
+    """Calculations must not depend on the active Decimal context."""
+
+    def test_low_precision_context(self):
+        """Test results are identical under a 3-digit context."""
+        expected = rounding.add_percentage(Decimal("123456.785"), Decimal("17.5"))
+
+        with localcontext() as ctx:
+            ctx.prec = 3
+            assert rounding.add_percentage(Decimal("123456.785"), Decimal("17.5")) == expected
+            assert DeterministicCalculator.round_to_nearest_five(Decimal("123457.50")) == Decimal("123460")
+
+    def test_threads_share_results(self):
+        """Test concurrent callers get the same labor totals."""
+        def labor_total(_):
+            return DeterministicCalculator.calculate_labor_cost(
+                Decimal("7.25"),
+                [{"hourly_rate": Decimal("45.55")}, {"hourly_rate": Decimal("33.33")}],
+                {"weekend": Decimal("2.0")}
+            )["total"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            totals = set(pool.map(labor_total, range(200)))
+
+        assert totals == {Decimal("1143.76")}
@@ -0,0 +1,125 @@
+"""
+Tests for the quick-quote fast path.
+"""
+import asyncio
+import random
+from dataclasses import replace
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.calculator import DeterministicCalculator
+from src.core.quick_quote import (
+    QuickQuoteRates, get_quick_quote_rates, quick_quote, set_quick_quote_rates
+)
+from src.models.costs import OverheadSettings
+from src.services.calculation import (
+    CostRates, OverheadRates, invalidate_cost_snapshots, refresh_stale_quick_quote_rates
+)
+from tests.test_cost_snapshot import seeded_cost_engine
+
+
+class TestQuickQuote:
+    """Quick quotes must agree with the full calculator."""
+
+    def test_matches_full_estimate_at_average_rates(self):
+        """Test random quick inputs against the equivalent full calculation."""
+        rng = random.Random(11)
+        rates = QuickQuoteRates.from_settings()
+
+        for _ in range(300):
+            miles = Decimal(rng.randint(0, 5000)) / 10
+            hours = Decimal(rng.randint(5, 160)) / 10
+            crew_size = rng.randint(1, 10)
+            crew_rate = Decimal(rng.randint(1500, 9000)) / 100
+            equipment_count = rng.randint(0, 10)
+            equipment_rate = Decimal(rng.randint(0, 20000)) / 100
+
+            quote = quick_quote(miles, hours, crew_size, crew_rate, equipment_count, equipment_rate, rates)
+            full = DeterministicCalculator.calculate_full_estimate(
+                travel_miles=miles,
+                travel_time_minutes=quote.travel_minutes,
+                estimated_hours=hours,
+                crew_rates=[{"hourly_rate": crew_rate}] * crew_size,
+                equipment_list=[{"id": i, "hourly_cost": equipment_rate} for i in range(equipment_count)],
+                vehicle_rate_per_mile=rates.vehicle_rate_per_mile,
+                driver_hourly_rate=rates.driver_hourly_rate,
+                disposal_fees=Decimal("0"),
+                permit_cost=Decimal("0"),
+                overhead_percent=rates.overhead_percent,
+                profit_percent=rates.profit_percent,
+                safety_buffer_percent=rates.safety_buffer_percent
+            )
+
+            final = full["final_calculation"]
+            assert Decimal(quote.direct_costs) / 100 == final["direct_costs"]
+            assert Decimal(quote.final_total) / 100 == final["final_total"]
+
+    def test_travel_minutes_from_average_speed(self):
+        """Test travel time is derived from distance and speed."""
+        rates = replace(QuickQuoteRates.from_settings(), average_speed_mph=40)
+        quote = quick_quote(Decimal("30.0"), Decimal("2.0"), 2, Decimal("40.00"), rates=rates)
+
+        assert quote.travel_minutes == 45
+        assert quote.to_dict()["final_total"].isdigit()
+
+    def test_snapshot_refresh_from_cost_rates(self):
+        """Test cost data replaces the configured defaults."""
+        original = get_quick_quote_rates()
+        loaded = CostRates(
+            calculation_date=original.loaded_at.date(),
+            overhead=OverheadRates(
+                overhead_percent=Decimal("30.0"),
+                profit_percent=Decimal("32.5"),
+                safety_buffer_percent=Decimal("10.0")
+            ),
+            vehicle_rate_per_mile=Decimal("0.800"),
+            driver_hourly_rate=Decimal("30.00")
+        )
+
+        try:
+            set_quick_quote_rates(original.with_cost_rates(loaded))
+            refreshed = get_quick_quote_rates()
+            assert refreshed.overhead_percent == Decimal("30.0")
+            assert refreshed.vehicle_rate_per_mile == Decimal("0.800")
+            assert refreshed.profit_percent == Decimal("32.5")
+            assert refreshed.average_speed_mph == original.average_speed_mph
+        finally:
+            set_quick_quote_rates(original)
+
+    def test_stale_snapshot_reloads_after_a_cost_write(self, tmp_path: Path, monkeypatch):
+        """Test the snapshot is reloaded only when the cost data version moves."""
+        original = get_quick_quote_rates()
+
+        async def scenario():
+            engine = await seeded_cost_engine(tmp_path / "costs.db")
+            session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            monkeypatch.setattr("src.db.session.async_session_maker", session_maker)
+            await invalidate_cost_snapshots()
+            try:
+                first = await refresh_stale_quick_quote_rates()
+                loaded = get_quick_quote_rates()
+                current = await refresh_stale_quick_quote_rates()
+
+                # A write from any process bumps the shared version
+                async with session_maker() as db:
+                    await db.execute(update(OverheadSettings).values(profit_percent=Decimal("30.00")))
+                    await db.commit()
+                await invalidate_cost_snapshots()
+                written = await refresh_stale_quick_quote_rates()
+            finally:
+                await engine.dispose()
+            return first, loaded, current, written, get_quick_quote_rates()
+
+        try:
+            first, loaded, current, written, reloaded = asyncio.run(scenario())
+        finally:
+            set_quick_quote_rates(original)
+
+        assert (first, current, written) == (True, False, True)
+        assert loaded.profit_percent == Decimal("35.00")
+        assert loaded.safety_buffer_percent == Decimal("12.00")
+        assert reloaded.profit_percent == Decimal("30.00")
+        assert reloaded.version == loaded.version + 1
@@ -0,0 +1,160 @@
+"""
+Tests for dependency-tracked incremental recalculation.
+"""
+import random
+from decimal import Decimal
+
+from src.core.calculator import DeterministicCalculator, STAGE_INPUTS
+
+
+BASE_INPUTS = {
+    "travel_miles": Decimal("25.5"),
+    "travel_time_minutes": 45,
+    "estimated_hours": Decimal("6.5"),
+    "crew_rates": [{"hourly_rate": Decimal("45.00")}, {"hourly_rate": Decimal("30.00")}],
+    "equipment_list": [{"id": 1, "hourly_cost": Decimal("75.00")}],
+    "vehicle_rate_per_mile": Decimal("0.655"),
+    "driver_hourly_rate": Decimal("25.00"),
+    "disposal_fees": Decimal("150.00"),
+    "permit_cost": Decimal("0.00"),
+    "overhead_percent": Decimal("25.0"),
+    "profit_percent": Decimal("35.0"),
+    "safety_buffer_percent": Decimal("10.0"),
+    "emergency_job": False,
+    "weekend_work": False
+}
+
+CHANGES = {
+    "travel_miles": lambda rng: Decimal(rng.randint(0, 5000)) / 10,
+    "travel_time_minutes": lambda rng: rng.randint(0, 600),
+    "estimated_hours": lambda rng: Decimal(rng.randint(5, 160)) / 10,
+    "crew_rates": lambda rng: [
+        {"hourly_rate": Decimal(rng.randint(1500, 9000)) / 100} for _ in range(rng.randint(1, 5))
+    ],
+    "equipment_list": lambda rng: [
+        {"id": i, "hourly_cost": Decimal(rng.randint(0, 20000)) / 100} for i in range(rng.randint(0, 3))
+    ],
+    "driver_hourly_rate": lambda rng: Decimal(rng.randint(1500, 6000)) / 100,
+    "disposal_fees": lambda rng: Decimal(rng.randint(0, 100000)) / 100,
+    "permit_cost": lambda rng: Decimal(rng.randint(0, 50000)) / 100,
+    "overhead_percent": lambda rng: Decimal(rng.randint(0, 500)) / 10,
+    "profit_percent": lambda rng: Decimal(rng.randint(0, 600)) / 10,
+    "safety_buffer_percent": lambda rng: Decimal(rng.randint(0, 250)) / 10,
+    "weekend_work": lambda rng: rng.random() < 0.5
+}
+
+
+def strip_ids(result: dict) -> dict:
+    """Drop the per-run calculation id and timestamp."""
+    final = {
+        key: value for key, value in result["final_calculation"].items()
+        if key not in ("calculation_id", "timestamp")
+    }
+    return dict(result, final_calculation=final)
+
+
+class TestIncrementalRecalculation:
+    """Incremental results must equal a full recompute."""
+
+    def test_randomized_updates_match_full_recompute(self):
+        """Test random single and multi-field updates."""
+        rng = random.Random(5)
+        inputs = dict(BASE_INPUTS)
+        result = DeterministicCalculator.calculate_full_estimate(**inputs)
+
+        for _ in range(300):
+            new_inputs = dict(inputs)
+            for name in rng.sample(sorted(CHANGES), rng.randint(1, 3)):
+                new_inputs[name] = CHANGES[name](rng)
+
+            incremental, _ = DeterministicCalculator.recalculate_full_estimate(
+                inputs, result, **new_inputs
+            )
+            full = DeterministicCalculator.calculate_full_estimate(**new_inputs)
+
+            assert strip_ids(incremental) == strip_ids(full)
+            assert incremental["calculation_checksum"] == full["calculation_checksum"]
+            inputs, result = new_inputs, incremental
+
+    def test_profit_change_only_runs_margins(self):
+        """Test a profit change reuses every cost stage."""
+        result = DeterministicCalculator.calculate_full_estimate(**BASE_INPUTS)
+        new_inputs = dict(BASE_INPUTS, profit_percent=Decimal("40.0"))
+
+        incremental, stages = DeterministicCalculator.recalculate_full_estimate(
+            BASE_INPUTS, result, **new_inputs
+        )
+
+        assert stages == ["margins"]
+        assert incremental["travel_breakdown"] is result["travel_breakdown"]
+        assert incremental["labor_breakdown"] is result["labor_breakdown"]
+
+    def test_disposal_change(self):
+        """Test a disposal fee change recomputes the disposal and margin stages."""
+        result = DeterministicCalculator.calculate_full_estimate(**BASE_INPUTS)
+        new_inputs = dict(BASE_INPUTS, disposal_fees=Decimal("175.00"))
+
+        _, stages = DeterministicCalculator.recalculate_full_estimate(
+            BASE_INPUTS, result, **new_inputs
+        )
+
+        assert stages == ["disposal", "margins"]
+
+    def test_unchanged_inputs(self):
+        """Test identical inputs return the previous result untouched."""
+        result = DeterministicCalculator.calculate_full_estimate(**BASE_INPUTS)
+        same, stages = DeterministicCalculator.recalculate_full_estimate(
+            BASE_INPUTS, result, **dict(BASE_INPUTS, travel_miles="25.5")
+        )
+
+        assert stages == []
+        assert same is result
+
+    def test_hours_affect_labor_and_equipment(self):
+        """Test the dependency map routes hours to both stages."""
+        stages = DeterministicCalculator.changed_stages(
+            BASE_INPUTS, dict(BASE_INPUTS, estimated_hours=Decimal("8.0"))
+        )
+
+        assert stages == ["labor", "equipment"]
+        assert set(STAGE_INPUTS) == {"travel", "labor", "equipment", "disposal", "permits", "margins"}
+
+    def test_older_formula_version_is_recomputed(self):
+        """Test stages priced differently by the stored formula version are recomputed."""
+        result = DeterministicCalculator.calculate_full_estimate(**dict(BASE_INPUTS, formula_version="1.0"))
+        new_inputs = dict(BASE_INPUTS, permit_cost=Decimal("50.00"))
+
+        incremental, stages = DeterministicCalculator.recalculate_full_estimate(
+            BASE_INPUTS, result, **new_inputs
+        )
+
+        assert stages == ["travel", "permits", "margins"]
+        assert strip_ids(incremental) == strip_ids(
+            DeterministicCalculator.calculate_full_estimate(**new_inputs)
+        )
+
+    def test_profit_change_skips_cost_stage_calls(self, monkeypatch):
+        """Test a profit-only change calls the margin pipeline and no other stage."""
+        result = DeterministicCalculator.calculate_full_estimate(**BASE_INPUTS)
+        calls = []
+
+        def counted(name):
+            stage = getattr(DeterministicCalculator, name)
+
+            def wrapper(*args, **kwargs):
+                calls.append(name)
+                return stage(*args, **kwargs)
+            return staticmethod(wrapper)
+
+        for name in (
+            "calculate_full_estimate", "calculate_travel_cost", "calculate_labor_cost",
+            "calculate_equipment_cost", "apply_formula_pipeline"
+        ):
+            monkeypatch.setattr(DeterministicCalculator, name, counted(name))
+
+        _, stages = DeterministicCalculator.recalculate_full_estimate(
+            BASE_INPUTS, result, **dict(BASE_INPUTS, profit_percent=Decimal("20.0"))
+        )
+
+        assert stages == ["margins"]
+        assert calls == ["apply_formula_pipeline"]
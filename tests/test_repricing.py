@@ -0,0 +1,201 @@
+"""
+Tests for bulk re-pricing of open estimates against a seeded SQLite database.
+"""
+import asyncio
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.calculator import DeterministicCalculator
+from src.models.audit import AuditLog
+from src.models.estimate import Estimate, EstimateStatus
+from src.schemas.calculation import CalculationInput
+from src.services.calculation import CalculationService, invalidate_cost_snapshots
+from src.services.repricing import (
+    RepricingJob, price_rows, rates_changed_on, run_boundary_repricing
+)
+from tests.test_cost_refs import estimate_row
+from tests.test_cost_snapshot import CALCULATION_DATE, seeded_cost_engine
+
+
+SCENARIOS = {
+    1: {
+        "travel_miles": "20.0",
+        "travel_time_minutes": 30,
+        "crew_size": 2,
+        "estimated_hours": "4.0",
+        "labor_rates": ["climber", "groundsman"],
+        "equipment_ids": [1],
+        "disposal_fees": "100.00",
+        "permit_cost": "25.00"
+    },
+    2: {
+        "travel_miles": "5.0",
+        "travel_time_minutes": 15,
+        "crew_size": 1,
+        "estimated_hours": "2.5",
+        "labor_rates": ["groundsman"],
+        "equipment_ids": [2]
+    },
+    # Approved estimates are never re-priced
+    3: {
+        "travel_miles": "5.0",
+        "travel_time_minutes": 15,
+        "crew_size": 1,
+        "estimated_hours": "2.5",
+        "labor_rates": ["groundsman"],
+        "equipment_ids": []
+    },
+    # No rate for the role: reported as a failure, left unchanged
+    4: {
+        "travel_miles": "5.0",
+        "travel_time_minutes": 15,
+        "crew_size": 1,
+        "estimated_hours": "2.5",
+        "labor_rates": ["arborist"],
+        "equipment_ids": []
+    }
+}
+
+STATUSES = {
+    1: EstimateStatus.DRAFT,
+    2: EstimateStatus.PENDING,
+    3: EstimateStatus.APPROVED,
+    4: EstimateStatus.DRAFT
+}
+
+
+async def seeded_estimates_engine(path: Path):
+    """Seeded cost tables plus stale-priced estimates and an audit log."""
+    engine = await seeded_cost_engine(path)
+    async with engine.begin() as conn:
+        for model in (Estimate, AuditLog):
+            await conn.run_sync(
+                lambda sync_conn, table=model.__table__: table.create(sync_conn)
+            )
+        await conn.execute(insert(Estimate.__table__), [
+            estimate_row(estimate_id, SCENARIOS[estimate_id], STATUSES[estimate_id])
+            for estimate_id in SCENARIOS
+        ])
+    return engine
+
+
+async def expected_total(db: AsyncSession, estimate_id: int) -> Decimal:
+    """Final total of a scenario priced with the CALCULATION_DATE rates."""
+    kwargs = await CalculationService(db).calculation_kwargs(
+        CalculationInput(**SCENARIOS[estimate_id]), CALCULATION_DATE
+    )
+    return DeterministicCalculator.calculate_full_estimate(**kwargs)["final_calculation"]["final_total"]
+
+
+class TestRepricingJob:
+    """The job prices stored flat inputs and writes them back in bulk."""
+
+    def test_reprices_open_estimates_with_one_correlation_id(self, tmp_path: Path):
+        """Test open estimates are updated and audited under the job ID."""
+        async def scenario():
+            engine = await seeded_estimates_engine(tmp_path / "costs.db")
+            await invalidate_cost_snapshots()
+            try:
+                async with AsyncSession(engine, expire_on_commit=False) as db:
+                    job = RepricingJob(user_id="pricing", reason="rate change", chunk_size=1, max_workers=1)
+                    report = await job.run(db, CALCULATION_DATE)
+                    estimates = {
+                        estimate.id: estimate
+                        for estimate in (await db.execute(select(Estimate))).scalars()
+                    }
+                    logs = (await db.execute(select(AuditLog).order_by(AuditLog.id))).scalars().all()
+                    totals = {estimate_id: await expected_total(db, estimate_id) for estimate_id in (1, 2)}
+            finally:
+                await engine.dispose()
+            return report, estimates, logs, totals
+
+        report, estimates, logs, totals = asyncio.run(scenario())
+
+        assert report.status == "completed"
+        assert (report.scanned, report.repriced, report.unchanged, report.failed) == (3, 2, 0, 1)
+        assert report.errors[0]["estimate_id"] == 4
+
+        for estimate_id in (1, 2):
+            estimate = estimates[estimate_id]
+            assert estimate.final_total == totals[estimate_id]
+            assert estimate.calculation_checksum == estimate.calculation_result["checksum"]
+            assert Decimal(estimate.calculation_result["final_total"]) == totals[estimate_id]
+            assert estimate.updated_by == "pricing"
+        for estimate_id in (3, 4):
+            assert estimates[estimate_id].final_total == Decimal("0")
+            assert estimates[estimate_id].calculation_checksum == "0" * 64
+
+        assert sorted(log.record_id for log in logs) == [1, 2]
+        assert {log.correlation_id for log in logs} == {report.job_id}
+        assert all(log.context["reason"] == "rate change" for log in logs)
+
+    def test_price_rows_reads_flat_inputs(self, tmp_path: Path):
+        """Test in-process pricing matches the calculator for stored inputs."""
+        async def scenario():
+            engine = await seeded_estimates_engine(tmp_path / "costs.db")
+            await invalidate_cost_snapshots()
+            try:
+                async with AsyncSession(engine) as db:
+                    snapshot = await CalculationService(db).get_cost_snapshot(CALCULATION_DATE)
+                    return snapshot.to_rates(), await expected_total(db, 1)
+            finally:
+                await engine.dispose()
+
+        rates, total = asyncio.run(scenario())
+        priced = price_rows([(1, SCENARIOS[1]), (4, SCENARIOS[4])], rates)
+
+        payload, error = priced[1]
+        assert error is None
+        assert Decimal(payload["result"]["final_total"]) == total
+        assert priced[4][0] is None
+        assert "arborist" in priced[4][1]
+
+
+class TestBoundaryRepricing:
+    """Dated rates re-price open estimates on the day they take effect."""
+
+    def test_rates_changed_on(self, tmp_path: Path):
+        """Test starting rows and seasons count as changes and ordinary days don't."""
+        async def scenario():
+            engine = await seeded_estimates_engine(tmp_path / "costs.db")
+            await invalidate_cost_snapshots()
+            try:
+                async with AsyncSession(engine) as db:
+                    return [
+                        await rates_changed_on(db, day)
+                        for day in (date(2024, 1, 1), date(2024, 6, 1), date(2024, 3, 15))
+                    ]
+            finally:
+                await engine.dispose()
+
+        assert asyncio.run(scenario()) == [True, True, False]
+
+    def test_runs_once_per_date(self, tmp_path: Path, monkeypatch):
+        """Test the first check of a boundary date re-prices and later ones are skipped."""
+        async def scenario():
+            engine = await seeded_estimates_engine(tmp_path / "costs.db")
+            monkeypatch.setattr(
+                "src.db.session.async_session_maker",
+                async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            )
+            await invalidate_cost_snapshots()
+            try:
+                # A date nobody else claims in the shared cache
+                first = await run_boundary_repricing(date(2024, 6, 1))
+                second = await run_boundary_repricing(date(2024, 6, 1))
+                unchanged = await run_boundary_repricing(date(2024, 3, 15))
+            finally:
+                await engine.dispose()
+            return first, second, unchanged
+
+        first, second, unchanged = asyncio.run(scenario())
+
+        assert first.status == "completed"
+        assert (first.repriced, first.failed) == (2, 1)
+        assert first.reason == "rates_effective:2024-06-01"
+        assert second is None
+        assert unchanged is None
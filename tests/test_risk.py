@@ -0,0 +1,92 @@
+"""
+Tests for Monte Carlo price ranges.
+"""
+import time
+from decimal import Decimal
+
+import pytest
+
+from src.core.calculator import DeterministicCalculator
+from src.core.risk import Distribution, RiskSimulator
+
+
+BASE_INPUTS = {
+    "travel_miles": Decimal("25.5"),
+    "travel_time_minutes": 45,
+    "estimated_hours": Decimal("6.5"),
+    "crew_rates": [{"hourly_rate": Decimal("45.00")}, {"hourly_rate": Decimal("30.00")}],
+    "equipment_list": [{"id": 1, "hourly_cost": Decimal("75.00")}],
+    "vehicle_rate_per_mile": Decimal("0.655"),
+    "driver_hourly_rate": Decimal("25.00"),
+    "disposal_fees": Decimal("150.00"),
+    "permit_cost": Decimal("0.00"),
+    "overhead_percent": Decimal("25.0"),
+    "profit_percent": Decimal("35.0"),
+    "safety_buffer_percent": Decimal("10.0"),
+    "emergency_job": False,
+    "weekend_work": False
+}
+
+
+class TestRiskSimulator:
+    """Test percentile totals and buffer suggestions."""
+
+    def test_fixed_inputs_match_point_estimate(self):
+        """Test degenerate distributions reproduce the deterministic total."""
+        result = RiskSimulator(BASE_INPUTS).run(
+            hours=Distribution.fixed(6.5), samples=500, seed=1
+        )
+        expected = DeterministicCalculator.calculate_full_estimate(**BASE_INPUTS)
+
+        total_cents = int(expected["final_calculation"]["final_total"]) * 100
+        assert result.p10 == result.p50 == result.p90 == result.point_total == total_cents
+        assert result.suggested_safety_buffer_percent == Decimal("0.0")
+
+    def test_percentiles_are_ordered(self):
+        """Test a wide hours distribution spreads the totals."""
+        result = RiskSimulator(BASE_INPUTS).run(
+            hours=Distribution("pert", 4, 6.5, 12),
+            travel_minutes=Distribution("triangular", 30, 45, 90),
+            disposal_volume=Distribution("uniform", 2, 3, 6),
+            disposal_fee_per_unit=Decimal("18.50"),
+            samples=10000,
+            seed=7
+        )
+
+        assert result.p10 < result.p50 < result.p90
+        assert all(total % 500 == 0 for total in (result.p10, result.p50, result.p90))
+        assert result.suggested_safety_buffer_percent > 0
+        assert result.suggested_safety_buffer_percent % Decimal("0.5") == 0
+
+    def test_seed_is_reproducible(self):
+        """Test identical seeds give identical ranges."""
+        simulator = RiskSimulator(BASE_INPUTS)
+        hours = Distribution("triangular", 4, 6, 10)
+
+        assert simulator.run(hours, seed=3).to_dict() == simulator.run(hours, seed=3).to_dict()
+
+    def test_ten_thousand_samples_are_fast(self):
+        """Test 10k samples price well under 100 ms."""
+        simulator = RiskSimulator(BASE_INPUTS)
+        start = time.perf_counter()
+        simulator.run(Distribution("pert", 4, 6.5, 12), samples=10000, seed=1)
+        assert time.perf_counter() - start < 0.1
+
+    def test_rejects_invalid_distribution(self):
+        """Test malformed distributions are rejected."""
+        with pytest.raises(ValueError):
+            Distribution("triangular", 5, 4, 6)
+        with pytest.raises(ValueError):
+            Distribution("lognormal", 1, 2, 3)
+
+    def test_disposal_volume_requires_fee(self):
+        """Test a sampled disposal volume is never priced at a default zero fee."""
+        simulator = RiskSimulator(BASE_INPUTS)
+        volume = Distribution("uniform", 2, 3, 6)
+
+        with pytest.raises(ValueError, match="fee per unit"):
+            simulator.run(Distribution.fixed(6.5), disposal_volume=volume, seed=1)
+        with pytest.raises(ValueError, match="fee per unit"):
+            simulator.run(
+                Distribution.fixed(6.5), disposal_volume=volume, disposal_fee_per_unit=Decimal("0"), seed=1
+            )
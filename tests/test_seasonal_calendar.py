@@ -0,0 +1,59 @@
+"""
+Tests for the day-of-year seasonal adjustment lookup.
+"""
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from src.core.seasonal_calendar import SeasonalCalendar, in_season
+
+
+def adjustment(adjustment_id, start, end):
+    return SimpleNamespace(
+        id=adjustment_id,
+        start_month=start[0], start_day=start[1],
+        end_month=end[0], end_day=end[1]
+    )
+
+
+STORM = adjustment(1, (6, 1), (9, 30))
+WINTER = adjustment(2, (12, 1), (2, 28))
+LEAP_DAY = adjustment(3, (2, 29), (2, 29))
+
+
+class TestSeasonalCalendar:
+    """Lookups must match evaluating every window."""
+
+    def test_matches_window_scan(self):
+        """Test every day of two years against the window check."""
+        rng = random.Random(16)
+        adjustments = [STORM, WINTER, LEAP_DAY] + [
+            adjustment(i, (rng.randint(1, 12), rng.randint(1, 28)), (rng.randint(1, 12), rng.randint(1, 28)))
+            for i in range(4, 30)
+        ]
+        calendar = SeasonalCalendar(adjustments)
+
+        day = date(2023, 1, 1)
+        while day < date(2025, 1, 1):
+            expected = [adj for adj in adjustments if in_season(adj, day.month, day.day)]
+            assert calendar.on(day) == expected
+            day += timedelta(days=1)
+
+    def test_wrapping_and_leap_day(self):
+        """Test windows over the new year and February 29."""
+        calendar = SeasonalCalendar([STORM, WINTER, LEAP_DAY])
+
+        assert calendar.ids_on(date(2024, 1, 15)) == (2,)
+        assert calendar.ids_on(date(2024, 2, 29)) == (3,)
+        assert calendar.ids_on(date(2024, 3, 1)) == ()
+        assert calendar.ids_on(date(2024, 7, 4)) == (1,)
+
+    def test_between(self):
+        """Test range queries, including over the new year and longer than a year."""
+        calendar = SeasonalCalendar([STORM, WINTER, LEAP_DAY])
+
+        assert calendar.between(date(2024, 4, 1), date(2024, 6, 30)) == [STORM]
+        assert calendar.between(date(2024, 11, 15), date(2025, 1, 15)) == [WINTER]
+        assert calendar.between(date(2023, 2, 1), date(2023, 3, 31)) == [WINTER]
+        assert calendar.between(date(2023, 3, 1), date(2025, 3, 1)) == [STORM, WINTER, LEAP_DAY]
+        assert calendar.between(date(2024, 5, 1), date(2024, 4, 1)) == []
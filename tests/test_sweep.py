@@ -0,0 +1,106 @@
+"""
+Tests for the scenario sweep engine.
+"""
+from decimal import Decimal
+import itertools
+
+import pytest
+
+from src.core.calculator import DeterministicCalculator
+from src.core.sweep import ScenarioSweep
+
+
+BASE_INPUTS = {
+    "travel_miles": Decimal("25.5"),
+    "travel_time_minutes": 45,
+    "estimated_hours": Decimal("6.5"),
+    "crew_rates": [
+        {"hourly_rate": Decimal("55.00")},
+        {"hourly_rate": Decimal("35.50")},
+        {"hourly_rate": Decimal("28.75")}
+    ],
+    "equipment_list": [
+        {"id": 1, "hourly_cost": Decimal("75.00")},
+        {"id": 2, "hourly_cost": Decimal("120.25")}
+    ],
+    "vehicle_rate_per_mile": Decimal("0.655"),
+    "driver_hourly_rate": Decimal("25.00"),
+    "disposal_fees": Decimal("150.00"),
+    "permit_cost": Decimal("35.00"),
+    "overhead_percent": Decimal("25.0"),
+    "profit_percent": Decimal("35.0"),
+    "safety_buffer_percent": Decimal("10.0"),
+    "emergency_job": False,
+    "weekend_work": True
+}
+
+
+def scalar_total(**overrides) -> Decimal:
+    """Price the base inputs with overrides through the scalar calculator."""
+    inputs = dict(BASE_INPUTS, **overrides)
+    crew_size = inputs.pop("crew_size", None)
+    if crew_size is not None:
+        crew = BASE_INPUTS["crew_rates"]
+        inputs["crew_rates"] = crew[:crew_size] + [crew[-1]] * max(crew_size - len(crew), 0)
+    return DeterministicCalculator.calculate_full_estimate(**inputs)["final_calculation"]["final_total"]
+
+
+class TestScenarioSweep:
+    """Sweep cells must match pricing each scenario individually."""
+
+    def test_three_axis_grid_matches_scalar(self):
+        """Test every cell of an hours x crew x profit grid."""
+        hours = [Decimal("2.0"), Decimal("6.5"), Decimal("16.0")]
+        crew_sizes = [1, 3, 5]
+        profits = [Decimal("20.0"), Decimal("35.0"), Decimal("42.5")]
+
+        result = ScenarioSweep(BASE_INPUTS).run([
+            ("estimated_hours", hours),
+            ("crew_size", crew_sizes),
+            ("profit_percent", profits)
+        ])
+
+        assert result.shape == (3, 3, 3)
+        for (i, h), (j, c), (k, p) in itertools.product(
+            enumerate(hours), enumerate(crew_sizes), enumerate(profits)
+        ):
+            expected = scalar_total(estimated_hours=h, crew_size=c, profit_percent=p)
+            assert result.total_at(i, j, k) == expected, (h, c, p)
+
+    def test_margin_grid_matches_scalar(self):
+        """Test an overhead x safety buffer grid."""
+        overheads = [Decimal(v) for v in ("0", "12.5", "30.0")]
+        buffers = [Decimal(v) for v in ("0", "7.5", "10.0", "25.0")]
+
+        result = ScenarioSweep(BASE_INPUTS).run([
+            ("overhead_percent", overheads),
+            ("safety_buffer_percent", buffers)
+        ])
+
+        for (i, o), (j, b) in itertools.product(enumerate(overheads), enumerate(buffers)):
+            assert result.total_at(i, j) == scalar_total(overhead_percent=o, safety_buffer_percent=b)
+
+    def test_iter_rows(self):
+        """Test rows are streamed along the last axis in whole dollars."""
+        result = ScenarioSweep(BASE_INPUTS).run([
+            ("crew_size", [1, 2]),
+            ("profit_percent", [Decimal("10.0"), Decimal("20.0"), Decimal("30.0")])
+        ])
+
+        rows = list(result.iter_rows())
+        assert [index for index, _ in rows] == [[0], [1]]
+        assert rows[1][1][2] == int(result.total_at(1, 2))
+        assert result.header()["shape"] == [2, 3]
+
+    def test_rejects_invalid_axes(self):
+        """Test unknown parameters, limits and duplicate axes are rejected."""
+        sweep = ScenarioSweep(BASE_INPUTS)
+
+        with pytest.raises(ValueError, match="Cannot sweep"):
+            sweep.run([("travel_miles", [Decimal("1.0")])])
+        with pytest.raises(ValueError, match="Crew size"):
+            sweep.run([("crew_size", [0, 1])])
+        with pytest.raises(ValueError, match="whole numbers"):
+            sweep.run([("crew_size", [Decimal("2"), Decimal("2.5")])])
+        with pytest.raises(ValueError, match="only be swept once"):
+            sweep.run([("profit_percent", [Decimal("1")]), ("profit_percent", [Decimal("2")])])
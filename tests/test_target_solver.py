@@ -0,0 +1,64 @@
+"""
+Tests for the target-price reverse solver.
+"""
+from decimal import Decimal
+
+import pytest
+
+from src.core.calculator import DeterministicCalculator
+from src.core.target_solver import TargetPriceSolver
+from src.utils.money import Money
+from tests.test_recalculation import BASE_INPUTS
+
+
+def brute_force_totals(profits):
+    """Price every profit percent one at a time."""
+    totals = {}
+    for profit in profits:
+        result = DeterministicCalculator.calculate_full_estimate(**dict(BASE_INPUTS, profit_percent=profit))
+        totals[profit] = Money.from_value(result["final_calculation"]["final_total"]).cents
+    return totals
+
+
+class TestTargetPriceSolver:
+    """Solutions must be the nearest priced configurations."""
+
+    def test_nearest_profit_matches_brute_force(self):
+        """Test the best solution is the brute-force nearest total."""
+        solver = TargetPriceSolver(BASE_INPUTS)
+        profits = solver.candidate_values("profit_percent")
+        totals = brute_force_totals(profits)
+        target = Decimal("2500")
+
+        best = min(abs(total - 250000) for total in totals.values())
+        solutions = solver.solve(target, [("profit_percent", None, None, None)], max_results=3)
+
+        assert abs(solutions[0].difference) == best
+        assert all(totals[s.values["profit_percent"]] == s.final_total for s in solutions)
+        assert [abs(s.difference) for s in solutions] == sorted(abs(s.difference) for s in solutions)
+
+    def test_exact_solutions_prefer_small_changes(self):
+        """Test exact hits across several variables come first, least change first."""
+        solver = TargetPriceSolver(BASE_INPUTS)
+        solutions = solver.solve(
+            Decimal("2500"),
+            [("profit_percent", None, None, None), ("estimated_hours", None, None, None),
+             ("crew_size", None, None, None)],
+            max_results=5
+        )
+
+        assert all(solution.exact for solution in solutions)
+        assert all(solution.final_total % 500 == 0 for solution in solutions)
+        assert all(1 <= solution.values["crew_size"] <= 10 for solution in solutions)
+
+    def test_respects_input_limits(self):
+        """Test candidates outside validate_calculation_inputs limits are dropped."""
+        solver = TargetPriceSolver(BASE_INPUTS)
+
+        hours = solver.candidate_values("estimated_hours", Decimal("0"), Decimal("40"), Decimal("4"))
+        assert hours == [Decimal("4"), Decimal("8"), Decimal("12"), Decimal("16")]
+
+        with pytest.raises(ValueError, match="No valid values"):
+            solver.candidate_values("crew_size", Decimal("11"), Decimal("20"))
+        with pytest.raises(ValueError, match="Cannot solve"):
+            solver.solve(Decimal("2500"), [("overhead_percent", None, None, None)])